@@ -4,6 +4,7 @@ from datetime import datetime
 from typing import Dict, Any
 from pathlib import Path
 
+from agent.pv_curve.result import as_dict
 from agent.schemas.session import ChatSession
 
 
@@ -146,7 +147,11 @@ def create_and_save_session(state: dict, provider: str, model_name: str, session
     if state.get("conversation_context"):
         for exchange in state["conversation_context"]:
             if exchange.get("results"):
-                all_results.append(exchange["results"])
+                all_results.append(as_dict(exchange["results"]))
+    exchanges = [
+        {**exchange, "results": as_dict(exchange["results"])} if "results" in exchange else exchange
+        for exchange in state.get("conversation_context", [])
+    ]
     
     metadata = calculate_session_metadata(state, session_start_time)
     
@@ -156,7 +161,7 @@ def create_and_save_session(state: dict, provider: str, model_name: str, session
         end_time=datetime.now(),
         provider=provider,
         model_name=model_name,
-        exchanges=state.get("conversation_context", []),
+        exchanges=exchanges,
         total_exchanges=len(state.get("conversation_context", [])),
         errors=errors,
         final_inputs=state.get("inputs", {}).model_dump() if hasattr(state.get("inputs"), 'model_dump') else state.get("inputs", {}),
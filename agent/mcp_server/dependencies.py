@@ -0,0 +1,80 @@
+"""Lazily built LLM / prompts / retriever shared by every MCP tool call."""
+
+import threading
+import time
+
+from agent.core import setup_dependencies
+
+
+class Dependencies:
+    """
+    Holds the ``(llm, prompts, retriever)`` tuple from ``setup_dependencies``.
+
+    Nothing is built at import; the first tool call that needs a dependency
+    builds all three (opening Chroma and loading the reranker once), and
+    every later call reuses them. ``refresh()`` rebuilds on demand, e.g. after
+    switching provider or updating the vector DB.
+    """
+
+    def __init__(self, provider: str = "ollama", factory=None):
+        """
+        Args:
+            provider: Provider passed to the factory (``"ollama"`` or ``"openai"``).
+            factory: Callable ``provider -> (llm, prompts, retriever)``; defaults to
+                ``agent.core.setup_dependencies``.
+        """
+        self.provider = provider
+        self.factory = factory
+        self.builds = 0
+        self.build_s = None
+        self._deps = None
+        self._lock = threading.Lock()
+
+    def _build(self):
+        factory = self.factory or setup_dependencies
+        start = time.perf_counter()
+        self._deps = tuple(factory(self.provider))
+        self.build_s = time.perf_counter() - start
+        self.builds += 1
+        return self._deps
+
+    def get(self) -> tuple:
+        """Return ``(llm, prompts, retriever)``, building them on first use."""
+        with self._lock:
+            return self._deps if self._deps is not None else self._build()
+
+    def refresh(self, provider: str = None) -> tuple:
+        """Rebuild now (optionally for a new ``provider``) and return the new tuple."""
+        with self._lock:
+            if provider is not None:
+                self.provider = provider
+            return self._build()
+
+    def clear(self) -> None:
+        """Drop the built dependencies; the next ``get()`` rebuilds them."""
+        with self._lock:
+            self._deps = None
+
+    @property
+    def llm(self):
+        return self.get()[0]
+
+    @property
+    def prompts(self):
+        return self.get()[1]
+
+    @property
+    def retriever(self):
+        return self.get()[2]
+
+    def stats(self) -> dict:
+        return {
+            "provider": self.provider,
+            "loaded": self._deps is not None,
+            "builds": self.builds,
+            "last_build_s": self.build_s,
+        }
+
+
+# Shared by every MCP tool
+dependencies = Dependencies()
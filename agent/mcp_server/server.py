@@ -8,7 +8,7 @@ from agent.mcp_server import tools
 mcp = FastMCP("pv-curve-agent")
 
 
-# Register all 11 tools with @mcp.tool() decorators
+# Register all tools with @mcp.tool() decorators
 # Each tool is a thin wrapper that calls the corresponding function in tools.py
 
 @mcp.tool()
@@ -131,6 +131,39 @@ def generate_pv_curve(user_message: str, session_id: str) -> dict:
     return tools.generate_pv_curve_tool(user_message, session_id)
 
 
+@mcp.tool()
+def wait_for_plot(image_path: str, timeout_s: float = 30.0) -> dict:
+    """
+    Wait for the P-V plot PNG from generate_pv_curve to finish rendering.
+    Call this when generate_pv_curve returned plot_ready=False.
+    
+    Args:
+        image_path: image_file_url (or file path) returned by generate_pv_curve
+        timeout_s: Maximum seconds to wait
+        
+    Returns:
+        Dict with ready flag, image file URL, and render time in milliseconds
+    """
+    return tools.wait_for_plot_tool(image_path, timeout_s)
+
+
+@mcp.tool()
+def sweep_pv_curves(session_id: str, axes: dict, max_workers: int = None) -> dict:
+    """
+    Sweep one or more input parameters and compare load margins across the grid of values.
+    Uses the session's current parameters for everything not swept.
+    
+    Args:
+        session_id: Unique session identifier
+        axes: Parameter name -> list of values (e.g. {"power_factor": [0.8, 0.9, 1.0]})
+        max_workers: Optional worker process count
+        
+    Returns:
+        Dict with per-point results, columnar summary table, and simulation counts
+    """
+    return tools.sweep_pv_curves_tool(session_id, axes, max_workers)
+
+
 # @mcp.tool()
 # def analyze_pv_curve(user_message: str, session_id: str) -> dict:
 #     """
@@ -218,6 +251,22 @@ def summarize_results(session_id: str) -> dict:
     return tools.summarize_results_tool(session_id)
 
 
+@mcp.tool()
+def refresh_dependencies(provider: str = None) -> dict:
+    """
+    Rebuild the shared LLM, prompts and retriever used by every tool.
+    Only needed after switching provider or updating the vector database;
+    they are otherwise built once, on first use.
+    
+    Args:
+        provider: Optional new provider ("ollama" or "openai")
+        
+    Returns:
+        Dict with the active provider, rebuild time, and build count
+    """
+    return tools.refresh_dependencies_tool(provider)
+
+
 # Entry point: Run the server when this file is executed
 if __name__ == "__main__":
     mcp.run()
\ No newline at end of file
@@ -2,6 +2,7 @@
 
 from typing import Dict, Any
 from langchain_core.messages import HumanMessage, AIMessage, BaseMessage
+from agent.pv_curve.result import as_dict
 from agent.state.app_state import State
 from agent.schemas.inputs import Inputs
 from agent.schemas.planner import MultiStepPlan
@@ -120,14 +121,17 @@ class StateManager:
         
         # 4. Serialize simple fields (already JSON-compatible)
         serialized["message_type"] = state.get("message_type")
-        serialized["results"] = state.get("results")
+        serialized["results"] = as_dict(state.get("results"))
         serialized["error_info"] = state.get("error_info")
         serialized["current_step"] = state.get("current_step", 0)
         serialized["step_results"] = state.get("step_results", [])
         serialized["is_compound"] = state.get("is_compound", False)
         serialized["retry_count"] = state.get("retry_count", 0)
         serialized["failed_node"] = state.get("failed_node")
-        serialized["conversation_context"] = state.get("conversation_context", [])
+        serialized["conversation_context"] = [
+            {**exchange, "results": as_dict(exchange["results"])} if "results" in exchange else exchange
+            for exchange in state.get("conversation_context", [])
+        ]
         
         return serialized
     
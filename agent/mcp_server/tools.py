@@ -5,8 +5,11 @@ matplotlib.use('Agg')  # Non-interactive backend - no GUI, renders to files only
 from typing import Dict, Any
 from langchain_core.messages import HumanMessage
 from agent.mcp_server.state_manager import state_manager
-from agent.core import setup_dependencies
+from agent.mcp_server.dependencies import dependencies
 from agent.pv_curve.pv_curve import generate_pv_curve
+from agent.pv_curve.plot_renderer import plot_renderer
+from agent.pv_curve.result import as_dict
+from agent.pv_curve.sweep import sweep_pv_curves
 import os
 
 # Import all node functions
@@ -23,8 +26,8 @@ from agent.nodes.advance_step import advance_step
 from agent.nodes.error_handler import error_handler_agent
 from agent.nodes.summary import summary_agent
 
-# Initialize dependencies once (shared across all tools)
-_llm, _prompts, _retriever = setup_dependencies("ollama")
+# LLM, prompts and retriever are built on the first tool call that needs them
+# and shared by every later call (see agent.mcp_server.dependencies).
 
 
 def classify_message_tool(user_message: str, session_id: str) -> Dict[str, Any]:
@@ -45,7 +48,7 @@ def classify_message_tool(user_message: str, session_id: str) -> Dict[str, Any]:
     state["messages"].append(HumanMessage(content=user_message))
     
     # Call the original classify_message function
-    updates = classify_message(state, _llm, _prompts)
+    updates = classify_message(state, dependencies.llm, dependencies.prompts)
     
     # Update state with classification results
     state_manager.update_state(session_id, updates)
@@ -112,7 +115,7 @@ def question_general_tool(user_message: str, session_id: str) -> Dict[str, Any]:
         state["messages"].append(HumanMessage(content=user_message))
     
     # Call the original node function
-    updates = question_general_agent(state, _llm, _prompts, _retriever)
+    updates = question_general_agent(state, *dependencies.get())
     
     # Update state
     state_manager.update_state(session_id, updates)
@@ -147,7 +150,7 @@ def question_parameter_tool(user_message: str, session_id: str) -> Dict[str, Any
         state["messages"].append(HumanMessage(content=user_message))
     
     # Call the original node function
-    updates = question_parameter_agent(state, _llm, _prompts)
+    updates = question_parameter_agent(state, dependencies.llm, dependencies.prompts)
     
     # Update state
     state_manager.update_state(session_id, updates)
@@ -182,7 +185,7 @@ def modify_parameters_tool(user_message: str, session_id: str) -> Dict[str, Any]
         state["messages"].append(HumanMessage(content=user_message))
     
     # Call the original node function
-    updates = parameter_agent(state, _llm, _prompts)
+    updates = parameter_agent(state, dependencies.llm, dependencies.prompts)
     
     # Update state
     state_manager.update_state(session_id, updates)
@@ -216,7 +219,9 @@ def generate_pv_curve_tool(user_message: str, session_id: str) -> Dict[str, Any]
         session_id: Unique session identifier
         
     Returns:
-        Dict with PV curve results, image file URL, and updated state
+        Dict with PV curve results, image file URL, plot_ready flag, and updated state.
+        The PNG is rendered in the background; when plot_ready is False, call
+        wait_for_plot_tool with the image path before opening it.
     """
     try:
         # Auto-detect writable directory for Claude Desktop if env var not set
@@ -245,8 +250,7 @@ def generate_pv_curve_tool(user_message: str, session_id: str) -> Dict[str, Any]
                     os.makedirs(temp_output, exist_ok=True)
                     os.environ["PV_CURVE_OUTPUT_DIR"] = temp_output
         
-        # Create fresh LLM instance for this call
-        llm, prompts, retriever = setup_dependencies("ollama")
+        llm, prompts, retriever = dependencies.get()
         
         state = state_manager.get_state(session_id)
         
@@ -275,11 +279,13 @@ def generate_pv_curve_tool(user_message: str, session_id: str) -> Dict[str, Any]
             # Resolve to absolute path (save_path from generate_pv_curve is already absolute)
             absolute_path = os.path.abspath(save_path)
             image_file_url = f"file://{absolute_path}"
+        future = plot_renderer.get(save_path) if save_path else None
         
         return {
-            "results": results,
+            "results": as_dict(results),
             "response": response_text,
             "image_file_url": image_file_url,
+            "plot_ready": bool(save_path) and (future is None or future.done()),
             "state": state_manager.serialize_state(updated_state),
             "success": True
         }
@@ -303,6 +309,29 @@ def generate_pv_curve_tool(user_message: str, session_id: str) -> Dict[str, Any]
         }
 
 
+def wait_for_plot_tool(image_path: str, timeout_s: float = 30.0) -> Dict[str, Any]:
+    """
+    Wait for a background P-V plot render started by generate_pv_curve_tool.
+    
+    Args:
+        image_path: save_path or file:// image URL returned by generate_pv_curve_tool
+        timeout_s: Maximum seconds to wait
+        
+    Returns:
+        Dict with ready flag, image file URL, and render time in milliseconds
+    """
+    save_path = image_path[len("file://"):] if image_path.startswith("file://") else image_path
+    ready = plot_renderer.wait(save_path, timeout=timeout_s) and os.path.exists(save_path)
+    render_s = plot_renderer.render_time(save_path)
+    
+    return {
+        "ready": ready,
+        "image_file_url": f"file://{os.path.abspath(save_path)}" if ready else None,
+        "render_ms": round(render_s * 1000, 1) if render_s is not None else None,
+        "success": ready
+    }
+
+
 def analyze_pv_curve_tool(user_message: str, session_id: str) -> Dict[str, Any]:
     """
     Generate analysis of PV curve results without creating a visual plot.
@@ -326,8 +355,7 @@ def analyze_pv_curve_tool(user_message: str, session_id: str) -> Dict[str, Any]:
             os.makedirs(project_generated, exist_ok=True)
             os.environ["PV_CURVE_OUTPUT_DIR"] = project_generated
         
-        # Create fresh LLM instance for this call
-        llm, prompts, retriever = setup_dependencies("ollama")
+        llm, prompts, retriever = dependencies.get()
         
         state = state_manager.get_state(session_id)
         
@@ -364,7 +392,7 @@ def analyze_pv_curve_tool(user_message: str, session_id: str) -> Dict[str, Any]:
                 analysis_data = getattr(node_response, "data", {})
         
         return {
-            "results": results,
+            "results": as_dict(results),
             "analysis": analysis_data.get("analysis", ""),
             "response": response_text,
             "state": state_manager.serialize_state(updated_state),
@@ -388,6 +416,48 @@ def analyze_pv_curve_tool(user_message: str, session_id: str) -> Dict[str, Any]:
             "success": False,
             "error": str(e)
         }
+
+
+def sweep_pv_curves_tool(session_id: str, axes: Dict[str, list], max_workers: int = None) -> Dict[str, Any]:
+    """
+    Run a parameter sweep (e.g. power_factor 0.8-1.0) on top of the session's current inputs.
+    
+    Args:
+        session_id: Unique session identifier
+        axes: Mapping of input parameter name -> list of values to sweep
+        max_workers: Optional worker process count (defaults to CPU cores)
+        
+    Returns:
+        Dict with per-point rows, columnar summary table, and simulation counts
+    """
+    try:
+        state = state_manager.get_state(session_id)
+        
+        points = []
+        summary = {}
+        for event in sweep_pv_curves(axes, base_inputs=state["inputs"], max_workers=max_workers):
+            if event["type"] == "point":
+                points.append(event)
+            else:
+                summary = event
+        
+        return {
+            "points": sorted(points, key=lambda row: row["index"]),
+            "table": summary.get("table", {}),
+            "simulations": summary.get("simulations", 0),
+            "success": True
+        }
+        
+    except Exception as e:
+        return {
+            "points": [],
+            "table": {},
+            "response": f"Error running parameter sweep: {str(e)}",
+            "success": False,
+            "error": str(e)
+        }
+
+
 def plan_steps_tool(user_message: str, session_id: str) -> Dict[str, Any]:
     """
     Create a multi-step plan for complex requests.
@@ -406,7 +476,7 @@ def plan_steps_tool(user_message: str, session_id: str) -> Dict[str, Any]:
         state["messages"].append(HumanMessage(content=user_message))
     
     # Call the original node function
-    updates = planner_agent(state, _llm, _prompts)
+    updates = planner_agent(state, dependencies.llm, dependencies.prompts)
     
     # Update state
     state_manager.update_state(session_id, updates)
@@ -506,7 +576,7 @@ def handle_error_tool(session_id: str) -> Dict[str, Any]:
     state = state_manager.get_state(session_id)
     
     # Call the original node function
-    updates = error_handler_agent(state, _llm, _prompts)
+    updates = error_handler_agent(state, dependencies.llm, dependencies.prompts)
     
     # Update state
     state_manager.update_state(session_id, updates)
@@ -555,4 +625,37 @@ def summarize_results_tool(session_id: str) -> Dict[str, Any]:
         "summary": summary_text,
         "state": state_manager.serialize_state(updated_state),
         "success": True
-    }
\ No newline at end of file
+    }
+
+
+def refresh_dependencies_tool(provider: str = None) -> Dict[str, Any]:
+    """
+    Rebuild the shared LLM, prompts and retriever (e.g. after switching provider or updating the vector DB).
+    
+    Args:
+        provider: Optional new provider ("ollama" or "openai"); keeps the current one if omitted
+        
+    Returns:
+        Dict with the active provider, rebuild time in milliseconds, and build count
+    """
+    if provider is not None and provider not in ("ollama", "openai"):
+        return {
+            "response": f"Unknown provider '{provider}'. Choose from ['ollama', 'openai']",
+            "success": False,
+            "error": f"Unknown provider '{provider}'"
+        }
+    try:
+        dependencies.refresh(provider)
+    except Exception as e:
+        return {
+            "response": f"Error refreshing dependencies: {str(e)}",
+            "success": False,
+            "error": str(e)
+        }
+    stats = dependencies.stats()
+    return {
+        "provider": stats["provider"],
+        "build_ms": round(stats["last_build_s"] * 1000, 1),
+        "builds": stats["builds"],
+        "success": True
+    }
@@ -3,32 +3,137 @@ from agent.state.app_state import State
 from agent.schemas.response import NodeResponse
 from agent.utils.context import get_conversation_context
 from agent.utils.display import display_executing_node, console
+from agent.nodes.generation import _cancel_token, _cpf_progress_writer
+from agent.pv_curve.cancellation import SimulationCancelled
+from agent.pv_curve.margin_estimate import estimate_load_margin
+from agent.pv_curve.curve_summary import DEFAULT_TOKEN_BUDGET, estimate_tokens, summarize_results
 from datetime import datetime
+import contextvars
+import json
+import os
+import threading
+from langgraph.config import get_stream_writer
+
+
+def _start_margin_estimate(inputs):
+    """Start a quick load-margin estimate alongside the full CPF run.
+
+    The estimate runs on the native solver in a background thread and is written
+    to the LangGraph ``custom`` stream unless the exact result is ready first.
+
+    Returns:
+        Callable that stops further estimate writes and waits for the thread;
+        a no-op outside a graph run.
+    """
+    try:
+        writer = get_stream_writer()
+    except RuntimeError:
+        return lambda: None
+    cancel_token = _cancel_token()
+    lock = threading.Lock()
+    finished = threading.Event()
+
+    def run():
+        try:
+            estimate = estimate_load_margin(
+                grid=inputs.grid,
+                step_size=inputs.step_size,
+                max_scale=inputs.max_scale,
+                power_factor=inputs.power_factor,
+                capacitive=inputs.capacitive,
+                contingency_lines=inputs.contingency_lines,
+                gen_voltage_setpoints=inputs.gen_voltage_setpoints,
+                cancel_token=cancel_token,
+                backend="native",
+            )
+        except (ValueError, SimulationCancelled):
+            # The full run reports bad inputs and cancellation itself.
+            return
+        if estimate["load_margin_mw"] is None:
+            return
+        with lock:
+            if finished.is_set():
+                return
+            writer({"margin_estimate": {**estimate, "grid": inputs.grid, "bus_id": inputs.bus_id}})
+        console.print(
+            f"[grey50]→ Estimated load margin {estimate['load_margin_mw']:.1f} MW "
+            f"({estimate['low_mw']:.1f}–{estimate['high_mw']:.1f} MW)"
+        )
+
+    # The stream writer looks up the run's config, so the thread needs the node's context.
+    thread = threading.Thread(target=contextvars.copy_context().run, args=(run,), name="margin-estimate", daemon=True)
+    thread.start()
+
+    def finish():
+        with lock:
+            finished.set()
+        thread.join()
+
+    return finish
+
+
+def _cancelled_response(inputs, results):
+    """Reply for a CPF run stopped by its ``CancellationToken``; the LLM analysis is skipped."""
+    content = (
+        f"Analysis of {inputs.grid.upper()} (Bus {inputs.bus_id}) stopped early ({results['cancelled']}); "
+        f"the {results['converged_steps']} points that converged are kept, but no analysis was generated."
+    )
+    node_response = NodeResponse(
+        node_type="analysis",
+        success=True,
+        data={
+            "pv_results": results,
+            "grid_system": inputs.grid,
+            "bus_monitored": inputs.bus_id,
+            "load_margin_mw": results.get("load_margin_mw"),
+            "nose_point_voltage_pu": results.get("nose_point", {}).get("voltage_pu"),
+        },
+        message=content,
+        timestamp=datetime.now(),
+        metadata={
+            "convergence_steps": results["converged_steps"],
+            "analysis_based_on": "current_parameters",
+            "cancelled": results["cancelled"],
+        }
+    )
+    return {"messages": [AIMessage(content=content)], "results": results, "node_response": node_response}
+
 
 def analysis_agent(state: State, llm, prompts, retriever, generate_pv_curve):
     """
     Analysis node: Generates analysis based on current parameters.
     Uses parameter-based approach - regenerates data on-the-fly without creating visual graph.
+    The CPF run streams progress and honours the turn's cancel token; a cancelled
+    run returns the converged points without calling the LLM.
     """
     display_executing_node("analysis")
     
     inputs = state["inputs"]
     
+    finish_estimate = _start_margin_estimate(inputs)
+
     console.print(f"[grey50]→ Generating analysis data from current parameters...")
     
     # Generate analysis data using current parameters (no visual graph)
-    results = generate_pv_curve(
-        grid=inputs.grid,
-        target_bus_idx=inputs.bus_id,
-        step_size=inputs.step_size,
-        max_scale=inputs.max_scale,
-        power_factor=inputs.power_factor,
-        voltage_limit=inputs.voltage_limit,
-        capacitive=inputs.capacitive,
-        skip_plot=True,  # Don't create visual graph, just get analysis data
-        contingency_lines=inputs.contingency_lines,
-        gen_voltage_setpoints=inputs.gen_voltage_setpoints,
-    )
+    try:
+        results = generate_pv_curve(
+            grid=inputs.grid,
+            target_bus_idx=inputs.bus_id,
+            step_size=inputs.step_size,
+            max_scale=inputs.max_scale,
+            power_factor=inputs.power_factor,
+            voltage_limit=inputs.voltage_limit,
+            capacitive=inputs.capacitive,
+            skip_plot=True,  # Don't create visual graph, just get analysis data
+            contingency_lines=inputs.contingency_lines,
+            gen_voltage_setpoints=inputs.gen_voltage_setpoints,
+            progress_callback=_cpf_progress_writer(),
+            cancel_token=_cancel_token(),
+        )
+    finally:
+        finish_estimate()
+    if results.get("cancelled"):
+        return _cancelled_response(inputs, results)
     
     # Retrieve analysis context from vector DB
     analysis_query = (
@@ -61,14 +166,28 @@ def analysis_agent(state: State, llm, prompts, retriever, generate_pv_curve):
     # Run LLM analysis
     console.print(f"[grey50]→ Analyzing results and generating summary...")
     system_prompt = prompts["analysis_agent"]["system"].format(context=context) + comparison_context
+    # Send a budgeted summary rather than every curve point.
+    token_budget = int(os.getenv("PV_CURVE_ANALYSIS_TOKEN_BUDGET") or DEFAULT_TOKEN_BUDGET)
+    results_summary = json.dumps(summarize_results(results, token_budget=token_budget))
     messages = [
         {"role": "system", "content": system_prompt},
         {"role": "user", "content": prompts["analysis_agent"]["user"].format(
-            results=results,
+            results=results_summary,
             grid_system=results['grid_system'].upper()
         )}
     ]
+    prompt_tokens = {
+        "estimated": sum(estimate_tokens(message["content"]) for message in messages),
+        "results_estimated": estimate_tokens(results_summary),
+        "results_budget": token_budget,
+    }
     analysis_reply = llm.invoke(messages)
+    usage = getattr(analysis_reply, "usage_metadata", None) or {}
+    prompt_tokens["input_tokens"] = usage.get("input_tokens")
+    console.print(
+        f"[grey50]→ Prompt tokens: {prompt_tokens['input_tokens'] or '~' + str(prompt_tokens['estimated'])} "
+        f"(results ~{prompt_tokens['results_estimated']} of {token_budget} budget)"
+    )
     
     reply = AIMessage(content=analysis_reply.content)
     
@@ -89,7 +208,8 @@ def analysis_agent(state: State, llm, prompts, retriever, generate_pv_curve):
         timestamp=datetime.now(),
         metadata={
             "convergence_steps": results["converged_steps"],
-            "analysis_based_on": "current_parameters"
+            "analysis_based_on": "current_parameters",
+            "prompt_tokens": prompt_tokens
         }
     )
     
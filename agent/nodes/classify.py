@@ -3,25 +3,35 @@ from agent.schemas.classifier import MessageClassifier
 from agent.schemas.response import NodeResponse
 from datetime import datetime
 from agent.utils.display import display_executing_node
+from agent.utils.tiered_classifier import message_classifier, parse_examples
 
-def classify_message(state: State, llm, prompts):
+def classify_message(state: State, llm, prompts, classifier=None):
     
     display_executing_node("classifier")
 
     last_message = state["messages"][-1]
-    classifier_llm = llm.with_structured_output(MessageClassifier)
-    
-    result = classifier_llm.invoke([
-        {"role": "system", "content": prompts["classifier"]["system"]},
-        {"role": "user", "content": last_message.content}
-    ])
+    system_prompt = prompts["classifier"]["system"]
+    classifier = classifier or message_classifier
+
+    def classify_with_llm(text):
+        classifier_llm = llm.with_structured_output(MessageClassifier)
+        result = classifier_llm.invoke([
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": text}
+        ])
+        return result.message_type
+
+    # Rules and embedding centroids first; the LLM only when both are unsure
+    prediction = classifier.classify(
+        last_message.content, examples=parse_examples(system_prompt), fallback=classify_with_llm
+    )
     
     node_response = NodeResponse(
         node_type="classifier",
         success=True,
-        data={"message_type": result.message_type},
-        message=f"Classified as: {result.message_type}",
-        timestamp=datetime.now()
+        data={"message_type": prediction.message_type},
+        message=f"Classified as: {prediction.message_type}",
+        timestamp=datetime.now(),
+        metadata={"tier": prediction.tier, "confidence": prediction.confidence}
     )
-    return {"message_type": result.message_type, "node_response": node_response}
-
+    return {"message_type": prediction.message_type, "node_response": node_response}
@@ -5,9 +5,28 @@ from agent.schemas.parameter import InputModifier
 from agent.utils.display import display_executing_node, console
 from agent.utils.common_utils import apply_contingency_lines_update
 from agent.nodes.parameter import _parse_gen_voltage_setpoints_string
+from agent.utils.parameter_parser import parse_modifications
 from datetime import datetime
+from langgraph.config import get_config, get_stream_writer
 
-def generation_agent(state: State, llm, prompts, retriever, generate_pv_curve):
+
+def _cpf_progress_writer():
+    """Forward CPF points as LangGraph ``custom`` stream events; None outside a graph run."""
+    try:
+        writer = get_stream_writer()
+    except RuntimeError:
+        return None
+    return lambda point: writer({"cpf_progress": point})
+
+
+def _cancel_token():
+    """Return the run's ``CancellationToken`` from ``config["configurable"]``, if any."""
+    try:
+        return get_config().get("configurable", {}).get("cancel_token")
+    except RuntimeError:
+        return None
+
+def generation_agent(state: State, llm, prompts, retriever, generate_pv_curve, preparse: bool = True):
     
     display_executing_node("generation")
     
@@ -15,12 +34,17 @@ def generation_agent(state: State, llm, prompts, retriever, generate_pv_curve):
     last_message = state["messages"][-1]
     
     # Extract parameters from user's message if they're present
-    # This allows "generate pv curve that power factor is 0.9" to work
-    modifier_llm = llm.with_structured_output(InputModifier)
-    result = modifier_llm.invoke([
-        {"role": "system", "content": prompts["parameter_agent"]["system"].format(current_inputs=inputs)},
-        {"role": "user", "content": last_message.content}
-    ])
+    # This allows "generate pv curve that power factor is 0.9" to work.
+    # A bare "generate the curve" or plain "with pf 0.9" is parsed without the LLM.
+    result = parse_modifications(last_message.content) if preparse else None
+    extraction = "parser"
+    if result is None:
+        modifier_llm = llm.with_structured_output(InputModifier)
+        result = modifier_llm.invoke([
+            {"role": "system", "content": prompts["parameter_agent"]["system"].format(current_inputs=inputs)},
+            {"role": "user", "content": last_message.content}
+        ])
+        extraction = "llm"
     
     # Update inputs if parameters were found in the message
     if result.modifications:
@@ -73,8 +97,11 @@ def generation_agent(state: State, llm, prompts, retriever, generate_pv_curve):
         capacitive=inputs.capacitive,
         continuation=inputs.continuation,
         skip_plot=False,  # Generate the visual graph
+        async_plot=True,  # Render the PNG in the background; numbers are ready now
         contingency_lines=inputs.contingency_lines,
         gen_voltage_setpoints=inputs.gen_voltage_setpoints,
+        progress_callback=_cpf_progress_writer(),
+        cancel_token=_cancel_token(),
     )
     
     load_type = "capacitive" if inputs.capacitive else "inductive"
@@ -84,6 +111,11 @@ def generation_agent(state: State, llm, prompts, retriever, generate_pv_curve):
         f"Load type: {load_type}, Power factor: {inputs.power_factor}\n"
         f"Plot saved to {results['save_path']}"
     )
+    if results.get("cancelled"):
+        generation_content += (
+            f"\nSimulation stopped early ({results['cancelled']}); "
+            f"showing the {results['converged_steps']} points that converged."
+        )
     
     # No analysis here - just generation
     reply = AIMessage(content=generation_content)
@@ -102,7 +134,9 @@ def generation_agent(state: State, llm, prompts, retriever, generate_pv_curve):
         timestamp=datetime.now(),
         metadata={
             "plot_path": results["save_path"],
-            "convergence_steps": results["converged_steps"]
+            "plot_pending": results.get("plot_pending", False),
+            "convergence_steps": results["converged_steps"],
+            "parameter_extraction": extraction
         }
     )
     # Return updated inputs if they were modified
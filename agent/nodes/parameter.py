@@ -1,55 +1,27 @@
 from langchain_core.messages import AIMessage
-import andes
 from agent.state.app_state import State
 from agent.schemas.parameter import InputModifier
 from agent.schemas.response import NodeResponse
 from datetime import datetime
 from agent.utils.display import display_executing_node
 from agent.utils.common_utils import apply_contingency_lines_update
-
-_CASE_MAP = {
-    "ieee14": "ieee14/ieee14.json",
-    "ieee39": "ieee39/ieee39.json",
-    "ieee118": "matpower/case118.m",
-    "ieee300": "matpower/case300.m",
-}
+from agent.utils.parameter_parser import parse_modifications
+from agent.pv_curve.case_cache import CASE_MAP
+from agent.pv_curve.grid_catalog import get_catalog
 
 
 def _validate_contingency_pairs_for_grid(grid, pairs):
     """Raise ValueError if any (from_bus, to_bus) pair does not exist as a line in the grid."""
-    if grid not in _CASE_MAP:
+    if grid not in CASE_MAP:
         return
-
-    ss = andes.load(andes.get_case(_CASE_MAP[grid]), setup=False)
-    line_pairs = set()
-    for uid in range(len(ss.Line.bus1.v)):
-        b1 = int(ss.Line.bus1.v[uid])
-        b2 = int(ss.Line.bus2.v[uid])
-        line_pairs.add(tuple(sorted((b1, b2))))
-
-    for fb, tb in pairs:
-        if tuple(sorted((int(fb), int(tb)))) not in line_pairs:
-            raise ValueError(
-                f"No line found between bus {fb} and bus {tb} in grid '{grid}'."
-            )
+    get_catalog(grid).validate_contingencies(pairs)
 
 
 def _validate_gen_voltage_setpoints(grid, setpoints_dict, voltage_limit_min, voltage_max_pu=1.2):
     """Raise ValueError if a gen index is not a generator or vm_pu is outside [voltage_limit_min, voltage_max_pu]."""
-    if grid not in _CASE_MAP:
+    if grid not in CASE_MAP:
         return
-
-    ss = andes.load(andes.get_case(_CASE_MAP[grid]), setup=False)
-    valid_gen_1based = [int(idx) for idx in ss.PV.idx.v.tolist()]
-    for gen_idx, vm_pu in setpoints_dict.items():
-        if gen_idx not in valid_gen_1based:
-            raise ValueError(
-                f"Generator index {gen_idx} not found in grid '{grid}'. Valid indices: {valid_gen_1based}."
-            )
-        if not (voltage_limit_min <= vm_pu <= voltage_max_pu):
-            raise ValueError(
-                f"Generator {gen_idx} voltage {vm_pu} pu must be between {voltage_limit_min} and {voltage_max_pu} pu."
-            )
+    get_catalog(grid).validate_gen_voltage_setpoints(setpoints_dict, voltage_limit_min, voltage_max_pu)
 
 
 def _parse_gen_voltage_setpoints_string(s):
@@ -82,18 +54,23 @@ def _parse_gen_voltage_setpoints_string(s):
     return out if out else None
 
 
-def parameter_agent(state: State, llm, prompts):
+def parameter_agent(state: State, llm, prompts, preparse: bool = True):
     
     display_executing_node("parameter")
     
     last_message = state["messages"][-1]
-    modifier_llm = llm.with_structured_output(InputModifier)
     current_inputs = state["inputs"]
     
-    result = modifier_llm.invoke([
-        {"role": "system", "content": prompts["parameter_agent"]["system"].format(current_inputs=current_inputs)},
-        {"role": "user", "content": last_message.content}
-    ])
+    # Plain edits ("set pf to 0.9") are parsed directly; the LLM handles the rest
+    result = parse_modifications(last_message.content) if preparse else None
+    extraction = "parser"
+    if result is None or not result.modifications:
+        modifier_llm = llm.with_structured_output(InputModifier)
+        result = modifier_llm.invoke([
+            {"role": "system", "content": prompts["parameter_agent"]["system"].format(current_inputs=current_inputs)},
+            {"role": "user", "content": last_message.content}
+        ])
+        extraction = "llm"
     
     updates = {}
     reply_parts = []
@@ -106,7 +83,8 @@ def parameter_agent(state: State, llm, prompts):
             success=True,
             data={"updated_parameters": [], "current_inputs": current_inputs.model_dump()},
             message=reply_content,
-            timestamp=datetime.now()
+            timestamp=datetime.now(),
+            metadata={"extraction": extraction}
         )
         return {"messages": [reply], "node_response": node_response}
 
@@ -173,7 +151,8 @@ def parameter_agent(state: State, llm, prompts):
             "changes": updates
         },
         message=reply_content,
-        timestamp=datetime.now()
+        timestamp=datetime.now(),
+        metadata={"extraction": extraction}
     )
     return {"messages": [reply], "inputs": new_inputs, "node_response": node_response}
 
@@ -358,20 +358,19 @@ Analyze the provided PV curve simulation results and provide clear, educational
 
 **Understanding the PV Curve Data Structure:**
 
-You will receive detailed point-by-point curve data in the `curve_points` array. Each point contains:
-- `step`: Sequential simulation step number
+You will receive a summary of the simulation: nose point, initial/final conditions, load margins, `voltage_drop` statistics, `voltage_sensitivity` (dV/dP slopes in pu per 100 MW along the upper branch) and `characteristic_points`, a shape-preserving subset of the simulated points (first, nose and last are always included; points are denser where the curve bends). Each row of `characteristic_points.rows` follows `characteristic_points.columns`:
+- `step`: Simulation step number of this point
 - `load_mw`: Actual load value in MW at this point
 - `voltage_pu`: Corresponding voltage in per-unit (1.0 = nominal voltage)
 - `load_scale_factor`: Load multiplier from initial conditions (e.g., 2.5 = 250% of original load)
-- `voltage_drop_from_initial_pu`: Absolute voltage drop from starting point
 - `voltage_drop_percent`: Percentage voltage drop from initial conditions
-- `is_nose_point`: Boolean flag marking the critical maximum loading point (nose point)
+- `dv_dp_pu_per_100mw`: Voltage slope from the previous listed point (more negative = steeper decline)
 
 **Curve Shape Analysis Guidelines:**
 
 1. **Initial Region (Early Steps)**: Look for relatively small voltage drops per load increment - indicates stable operating region
 2. **Middle Region**: Monitor the rate of voltage drop acceleration - steepening indicates approaching stability limits
-3. **Nose Point Region**: The point where `is_nose_point` is true represents maximum loadability - critical for stability analysis
+3. **Nose Point Region**: The point at `nose_point.step` represents maximum loadability - critical for stability analysis
 4. **Post-Nose Region**: Points after the nose point (if continuation is enabled) represent theoretical unstable operation
 
 **Parameter Effects on Curve Shape and Analysis:**
@@ -411,7 +410,7 @@ Use the following relevant technical information to enhance your analysis, but d
 
 {context}
 
-Be concise but thorough, using technical terminology appropriately while ensuring the explanation is educational. Reference specific numerical values from the simulation results, including step-by-step progression through the curve_points data to make your analysis concrete and actionable.
+Be concise but thorough, using technical terminology appropriately while ensuring the explanation is educational. Reference specific numerical values from the simulation results, including the progression through the characteristic_points to make your analysis concrete and actionable.
 """
 
 ANALYSIS_AGENT_USER = """
@@ -423,19 +422,19 @@ Please reference specific numerical values from the following simulation results
 
 **Detailed Analysis Requirements:**
 
-1. **Curve Shape and Progression**: Examine the `curve_points` array to understand:
-   - How voltage drops at each load increment (step-by-step progression)
+1. **Curve Shape and Progression**: Examine the `characteristic_points` and `voltage_sensitivity` to understand:
+   - How voltage drops as load increases (progression between listed points)
    - Where the curve steepens significantly (indicating approaching instability)
    - The voltage drop rate acceleration as load increases
 
 2. **Critical Points Analysis**: 
-   - Identify and explain the nose point (where `is_nose_point` = true)
+   - Identify and explain the nose point (`nose_point`)
    - Analyze load scale factors at different curve regions
    - Reference specific voltage drop percentages at key steps
 
 3. **Key Metrics to Reference**:
    - Grid system: {grid_system}
-   - Nose point load and voltage values from the curve_points
+   - Nose point load and voltage values
    - Load margin (MW and percentage increase possible)
    - Initial vs final conditions progression
    - Total voltage drop and percentage decrease
@@ -452,7 +451,7 @@ Please reference specific numerical values from the following simulation results
 5. **Operational Insights**: 
    - Reference specific steps where voltage stability becomes concerning
    - Identify safe operating regions based on curve progression and parameter settings
-   - Highlight any rapid voltage degradation points in the curve_points data
+   - Highlight any rapid voltage degradation points in the characteristic_points data
    - Explain discrepancies from expected behavior due to parameter choices
    - Recommend parameter adjustments if curve characteristics suggest suboptimal settings
 
@@ -461,7 +460,7 @@ Please reference specific numerical values from the following simulation results
    - Compare curve robustness to expectations for system size (larger systems typically more stable)
    - Identify if simulation parameters revealed full system capability or were limited by safety thresholds
 
-Use the detailed curve_points data to explain not just the overall results, but how the system behaves step-by-step as load increases, while incorporating parameter effects that explain the observed curve shape and characteristics for a comprehensive voltage stability analysis.
+Use the characteristic_points data to explain not just the overall results, but how the system behaves step-by-step as load increases, while incorporating parameter effects that explain the observed curve shape and characteristics for a comprehensive voltage stability analysis.
 """
 
 
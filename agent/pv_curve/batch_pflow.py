@@ -0,0 +1,179 @@
+"""Batched Newton–Raphson power flow: many load / line-outage scenarios of one grid per solve.
+
+Every scenario shares the intact network's admittance pattern. A line outage
+is a rank-2 update that only subtracts the line's four pi-model entries from
+its row of a stacked ``ybus.data`` array. Injections, mismatches and
+convergence checks run on (scenarios x buses) arrays. Each scenario keeps its
+own convergence mask, so a diverging case drops out of the batch without
+stopping the others. Outages that split the network are flagged and not
+solved: unlike ANDES, this model has no per-island reference bus.
+
+Loads stay constant power at any voltage (as in CPF), whereas an ANDES power
+flow converts under-voltage loads to constant impedance. A scenario that
+diverges here can still converge in ANDES, so batch solutions only seed
+ANDES power flows (``outage_warm_starts``) and never decide an outcome.
+"""
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+
+from agent.pv_curve.case_cache import case_cache
+from agent.pv_curve.grid_catalog import get_catalog, line_key
+from agent.pv_curve.native_cpf import MAX_ITER, TOL, Network, _AugmentedJacobian, bus_currents
+from agent.pv_curve.pv_curve import _base_state
+
+
+def stacked_admittances(net: Network, line_outages) -> np.ndarray:
+    """Return one ``ybus.data`` row per scenario with its outaged lines removed.
+
+    Args:
+        net: Intact ``Network``.
+        line_outages: One collection of ``Line`` uids per scenario (empty for intact).
+
+    Returns:
+        Complex array (scenarios x entries) sharing ``net.ybus``'s sparsity pattern.
+    """
+    ydata = np.tile(net.ybus.data, (len(line_outages), 1))
+    for k, uids in enumerate(line_outages):
+        for uid in uids:
+            stamp = net.line_stamps.get(uid)
+            if stamp is not None:  # Lines already out of service have no stamp.
+                positions, values = stamp
+                ydata[k, positions] -= values
+    return ydata
+
+
+def slack_island(net: Network, line_outages) -> np.ndarray:
+    """Return a (scenarios x buses) mask of the buses still connected to the slack bus."""
+    ends = {uid: (f, t) for uid, (f, t, _) in net.line_series.items()}
+    connected = np.ones((len(line_outages), net.n_bus), dtype=bool)
+    for k, uids in enumerate(line_outages):
+        kept = [ends[uid] for uid in ends.keys() - set(uids)]
+        f, t = np.array(kept, dtype=int).reshape(-1, 2).T
+        graph = sparse.coo_matrix((np.ones(f.size), (f, t)), shape=(net.n_bus, net.n_bus))
+        _, labels = connected_components(graph, directed=False)
+        connected[k] = labels == labels[net.slack]
+    return connected
+
+
+def solve_power_flows(net: Network, p_load=None, q_load=None, line_outages=None, warm_start=None,
+                      tol=TOL, max_iter=MAX_ITER):
+    """Solve K power flows of ``net`` together.
+
+    Args:
+        net: Intact ``Network`` (generator setpoints apply to every scenario).
+        p_load, q_load: PQ load P / Q in pu, shaped (scenarios x loads) or (loads,)
+            for every scenario; default to the base case ``net.p0`` / ``net.q0``.
+        line_outages: One collection of ``Line`` uids per scenario; defaults to
+            none. Sets the batch size when the loads are not stacked.
+        warm_start: Optional ``{"v", "a"}`` bus solution used as every scenario's start.
+        tol: Mismatch tolerance (pu).
+        max_iter: Newton iteration limit per scenario.
+
+    Returns:
+        Dict with ``vm`` / ``va`` (scenarios x buses), ``converged`` and ``islanded``
+        (scenarios,) bools, ``connected`` (``slack_island`` mask), ``iterations``
+        (scenarios,) and ``mismatch`` (scenarios,) max |mismatch| at exit (inf when not solved).
+    """
+    p_load = np.atleast_2d(net.p0 if p_load is None else np.asarray(p_load, dtype=float))
+    q_load = np.atleast_2d(net.q0 if q_load is None else np.asarray(q_load, dtype=float))
+    k = max(p_load.shape[0], q_load.shape[0], len(line_outages) if line_outages is not None else 1)
+    p_load = np.broadcast_to(p_load, (k, net.p0.size))
+    q_load = np.broadcast_to(q_load, (k, net.q0.size))
+    if line_outages is None:
+        line_outages = [()] * k
+    elif len(line_outages) != k:
+        raise ValueError(f"Got {len(line_outages)} outage sets for {k} load scenarios.")
+
+    n = net.n_bus
+    ydata = stacked_admittances(net, line_outages)
+    load_map = sparse.csr_matrix((np.ones(net.load_bus.size), (net.load_bus, np.arange(net.load_bus.size))),
+                                 shape=(n, net.load_bus.size))
+    p_spec = net.p_gen - (load_map @ p_load.T).T
+    q_spec = -(load_map @ q_load.T).T
+
+    vm = np.tile(net.v0, (k, 1))
+    va = np.tile(net.a0, (k, 1))
+    if warm_start is not None and len(warm_start["v"]) == n:
+        vm[:, net.pq] = np.asarray(warm_start["v"])[net.pq]
+        va[:, net.pvpq] = np.asarray(warm_start["a"])[net.pvpq]
+
+    jac = _AugmentedJacobian(net, np.zeros(net.pvpq.size + net.pq.size))
+    fixed_row = np.zeros(jac.size + 1)
+    fixed_row[-1] = 1.0
+
+    connected = slack_island(net, line_outages)
+    split = ~connected.all(axis=1)
+    active = ~split
+    converged = np.zeros(k, dtype=bool)
+    iterations = np.where(split, 0, max_iter)
+    mismatch = np.full(k, np.inf)
+    for niter in range(max_iter):
+        idx = np.flatnonzero(active)
+        if idx.size == 0:
+            break
+        V = vm[idx] * np.exp(1j * va[idx])
+        s = V * np.conj(bus_currents(jac.rows, jac.cols, ydata[idx], V, n))
+        F = np.hstack([(s.real - p_spec[idx])[:, net.pvpq], (s.imag - q_spec[idx])[:, net.pq]])
+        mis = np.max(np.abs(F), axis=1) if F.shape[1] else np.zeros(idx.size)
+        mismatch[idx] = mis
+
+        done = mis < tol
+        converged[idx[done]] = True
+        iterations[idx[done]] = niter + 1
+        failed = ~np.isfinite(mis)
+        iterations[idx[failed]] = niter + 1
+        active[idx[done | failed]] = False
+
+        for row, scenario in enumerate(idx):
+            if done[row] or failed[row]:
+                continue
+            try:
+                lu = jac.factor(net, V[row], fixed_row, ydata[scenario])
+            except RuntimeError:  # Singular Jacobian, e.g. an islanded bus.
+                active[scenario] = False
+                iterations[scenario] = niter + 1
+                continue
+            inc = lu.solve(-np.append(F[row], 0.0))[:-1]
+            va[scenario, net.pvpq] += inc[:net.pvpq.size]
+            vm[scenario, net.pq] += inc[net.pvpq.size:]
+
+    return {"vm": vm, "va": va, "converged": converged, "islanded": split, "connected": connected,
+            "iterations": iterations, "mismatch": mismatch}
+
+
+def outage_warm_starts(grid, contingency_sets, gen_voltage_setpoints=None) -> list:
+    """Solve the base-load power flow of many outage sets at once, for use as warm starts.
+
+    Args:
+        grid: Built-in case key.
+        contingency_sets: One list of ``(from_bus, to_bus)`` line outages per scenario.
+        gen_voltage_setpoints: Optional ``{pv_idx: vm_pu}`` shared by every scenario.
+
+    Returns:
+        One ``{"v", "a"}`` bus solution per scenario, or None where it has an
+        unknown line, islands buses or does not converge.
+
+    Raises:
+        ValueError: If a setpoint key is not a PV index of ``grid``.
+    """
+    catalog = get_catalog(grid)
+    setpoints = {catalog.pv_uid(idx): float(vm) for idx, vm in (gen_voltage_setpoints or {}).items()}
+    outages, known = [], []
+    for lines in contingency_sets:
+        uids = [uid for fb, tb in lines or () for uid in catalog.lines.get(line_key(fb, tb), (None,))]
+        known.append(None not in uids)
+        outages.append([uid for uid in uids if uid is not None])
+    if not outages:
+        return []
+
+    batch = solve_power_flows(
+        Network(case_cache.get_template(grid), gen_voltage_setpoints=setpoints),
+        line_outages=outages,
+        warm_start=_base_state(grid),
+    )
+    return [
+        {"v": batch["vm"][k].copy(), "a": batch["va"][k].copy()} if known[k] and batch["converged"][k] else None
+        for k in range(len(outages))
+    ]
@@ -0,0 +1,493 @@
+"""Offline benchmark suite for ``generate_pv_curve`` across every supported grid.
+
+Run from the repository root::
+
+    python -m agent.pv_curve.benchmark --output pv_benchmark.json
+    python -m agent.pv_curve.benchmark --profile quick --baseline pv_benchmark_baseline.json
+
+Each case runs in a fresh spawn-based worker process so peak RSS and the cold
+case load are measured in isolation. Curve cases run on both CPF backends
+(ANDES and native). Case-load cases time ``andes.load`` against a
+``case_cache`` hit on every grid. The full profile also screens a batch of
+N-1 outages on the larger grids with cold and warm-started power flows. Results are written as JSON and, when a
+baseline is given, compared case by case; the exit status is 1 if any case
+regressed beyond the tolerance. Baselines are host-specific and not kept in the
+repository: record one on the machine that runs the comparison
+(``--save-baseline``). Only the profiles below are versioned.
+"""
+
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import andes
+
+from agent.pv_curve.case_cache import CASE_MAP, case_cache
+from agent.pv_curve.screening import in_service_line_pairs
+
+# Parameter matrix per profile; every profile covers every grid in ``CASE_MAP``.
+# ``n1_batch`` outages are screened back to back with and without a warm start;
+# ``case_load`` adds an uncached and a cached set-up case load per grid.
+PROFILES = {
+    "quick": {
+        "step_size": (0.1,),
+        "max_scale": (3.0,),
+        "contingency": (False, True),
+        "plot": (False, True),
+        "backend": ("andes", "native"),
+        "n1_batch": 0,
+        "case_load": True,
+    },
+    "full": {
+        "step_size": (0.1, 0.05),
+        "max_scale": (2.0, 3.0),
+        "contingency": (False, True),
+        "plot": (False, True),
+        "backend": ("andes", "native"),
+        "n1_batch": 8,
+        "case_load": True,
+    },
+}
+
+# Grids large enough for warm-started power flows to matter.
+N1_BATCH_GRIDS = ("ieee118", "ieee300")
+
+# Loads timed per case-load run; a single load is a few milliseconds when cached.
+CASE_LOAD_SAMPLES = 5
+
+# Metrics compared against the baseline and the direction that counts as worse.
+_HIGHER_IS_WORSE = ("wall_s", "peak_rss_mb", "pflow_iterations")
+_LOWER_IS_WORSE = ("points_per_s",)
+
+# Timing deltas (total wall time, or CPF time for points/sec) below this many
+# seconds are treated as noise; small grids finish CPF in a few hundred ms.
+MIN_TIME_DELTA_S = 0.25
+
+# Environment fields that must match for timings to be comparable with a baseline.
+_MACHINE_KEYS = ("host", "cpu_count")
+
+
+def case_id(case: dict) -> str:
+    """Stable identifier used to match a case against the baseline."""
+    if case.get("kind") == "n1_batch":
+        return f"{case['grid']}/n1-batch={len(case['lines'])}/warm={'yes' if case['warm_start'] else 'no'}"
+    if case.get("kind") == "case_load":
+        return f"{case['grid']}/case-load/cached={'yes' if case['cached'] else 'no'}"
+    # ANDES cases keep their original ids so older baselines still match.
+    backend = case.get("backend", "andes")
+    return (
+        f"{case['grid']}/step={case['step_size']:g}/scale={case['max_scale']:g}"
+        f"/n-1={'yes' if case['contingency_lines'] else 'no'}/plot={'yes' if case['plot'] else 'no'}"
+        + (f"/backend={backend}" if backend != "andes" else "")
+    )
+
+
+def _target_bus(grid: str) -> int:
+    """First load bus of ``grid``; every case traces a bus that actually scales."""
+    loads = case_cache.get_template(grid)["models"].get("PQ", ())
+    if not loads:
+        raise ValueError(f"Grid '{grid}' has no PQ loads to benchmark.")
+    return int(loads[0]["bus"])
+
+
+def build_cases(profile: str = "full", grids=None) -> list:
+    """Expand a profile into benchmark cases.
+
+    Args:
+        profile: Key of ``PROFILES``.
+        grids: Optional subset of ``CASE_MAP`` keys; defaults to every grid.
+
+    Returns:
+        List of case dicts in a deterministic order: ``kind="curve"`` cases
+        (``grid``, ``target_bus_idx``, ``step_size``, ``max_scale``,
+        ``contingency_lines``, ``plot``, ``backend``), ``kind="n1_batch"`` cases
+        (``grid``, ``lines``, ``warm_start``) and ``kind="case_load"`` cases (``grid``,
+        ``cached``). Every case carries an ``id``.
+
+    Raises:
+        ValueError: Unknown profile or grid.
+    """
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown profile '{profile}'. Choose from {list(PROFILES)}")
+    grids = list(grids or CASE_MAP)
+    unknown = [grid for grid in grids if grid not in CASE_MAP]
+    if unknown:
+        raise ValueError(f"Unsupported grid(s) {unknown}. Choose from {list(CASE_MAP)}")
+
+    matrix = PROFILES[profile]
+    cases = []
+    for grid in grids:
+        bus = _target_bus(grid)
+        # The lowest-numbered in-service line gives a fixed, reproducible N-1 outage.
+        outage = [in_service_line_pairs(grid)[0]]
+        for step_size, max_scale, contingency, plot, backend in itertools.product(
+            matrix["step_size"], matrix["max_scale"], matrix["contingency"], matrix["plot"], matrix["backend"]
+        ):
+            case = {
+                "kind": "curve",
+                "grid": grid,
+                "target_bus_idx": bus,
+                "step_size": step_size,
+                "max_scale": max_scale,
+                "contingency_lines": outage if contingency else None,
+                "plot": plot,
+                "backend": backend,
+            }
+            cases.append({"id": case_id(case), **case})
+
+    for grid in grids:
+        if not matrix["n1_batch"] or grid not in N1_BATCH_GRIDS:
+            continue
+        lines = in_service_line_pairs(grid)[: matrix["n1_batch"]]
+        for warm_start in (False, True):
+            case = {"kind": "n1_batch", "grid": grid, "lines": lines, "warm_start": warm_start}
+            cases.append({"id": case_id(case), **case})
+
+    for grid in grids if matrix["case_load"] else ():
+        for cached in (False, True):
+            case = {"kind": "case_load", "grid": grid, "cached": cached}
+            cases.append({"id": case_id(case), **case})
+    return cases
+
+
+def _peak_rss_mb():
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _run_case(case: dict, repeat: int) -> dict:
+    """Worker entry point: run one case ``repeat`` times in this process."""
+    from agent.pv_curve.pv_curve import generate_pv_curve
+
+    with tempfile.TemporaryDirectory(prefix="pv-bench-") as output_dir:
+        os.environ["PV_CURVE_OUTPUT_DIR"] = output_dir
+        walls, runs = [], []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = generate_pv_curve(
+                grid=case["grid"],
+                target_bus_idx=case["target_bus_idx"],
+                step_size=case["step_size"],
+                max_scale=case["max_scale"],
+                contingency_lines=case["contingency_lines"],
+                skip_plot=not case["plot"],
+                use_cache=False,
+                backend=case.get("backend", "andes"),
+            )
+            walls.append(time.perf_counter() - start)
+            runs.append(result)
+
+    last = runs[-1]
+    cpf_s = statistics.median(run["timings"]["cpf"] for run in runs)
+    # Solver steps, not reported points: voltage-limit truncation depends on the curve's shape.
+    points = int(last["cpf_points"])
+    return {
+        "wall_s": statistics.median(walls),
+        "wall_s_runs": walls,
+        "peak_rss_mb": _peak_rss_mb(),
+        "cpf_points": points,
+        "points_per_s": points / cpf_s if cpf_s > 0 else None,
+        "pflow_iterations": last["pflow_iterations"],
+        "load_margin_mw": last["load_margin_mw"],
+        "timings": {
+            phase: statistics.median(run["timings"].get(phase, 0.0) for run in runs)
+            for phase in last["timings"]
+        },
+    }
+
+
+def _run_n1_batch(case: dict, repeat: int) -> dict:
+    """Worker entry point: screen ``case["lines"]`` one outage at a time, ``repeat`` times."""
+    from agent.pv_curve.pv_curve import _base_state, _run_cpf
+
+    grid = case["grid"]
+    # Parse (and, when warm, solve the base case) outside the timed region.
+    case_cache.get_template(grid)
+    warm_start = _base_state(grid) if case["warm_start"] else None
+
+    walls, batches = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        batches.append(
+            [
+                _run_cpf(grid, None, 0.1, 3.0, 0.95, False, False, [line], None, warm_start=warm_start)
+                for line in case["lines"]
+            ]
+        )
+        walls.append(time.perf_counter() - start)
+
+    last = batches[-1]
+    cpf_s = statistics.median(sum(t["timings"]["cpf"] for t in batch) for batch in batches)
+    points = sum(int(t["lam"].size) for t in last)
+    return {
+        "wall_s": statistics.median(walls),
+        "wall_s_runs": walls,
+        "peak_rss_mb": _peak_rss_mb(),
+        "cpf_points": points,
+        "points_per_s": points / cpf_s if cpf_s > 0 else None,
+        "pflow_iterations": sum(t["pflow_iterations"] for t in last),
+        "warm_started": sum(bool(t["warm_start"]) for t in last),
+        "timings": {
+            phase: statistics.median(sum(t["timings"].get(phase, 0.0) for t in batch) for batch in batches)
+            for phase in last[0]["timings"]
+        },
+    }
+
+
+def _run_case_load(case: dict, repeat: int) -> dict:
+    """Worker entry point: time getting a set-up system of ``case["grid"]``, uncached or from ``case_cache``."""
+    grid = case["grid"]
+
+    def cached_load():
+        ss = case_cache.acquire(grid)
+        case_cache.setup(ss)
+        case_cache.release(grid, ss)
+
+    def uncached_load():
+        andes.load(andes.get_case(CASE_MAP[grid]), setup=True)
+
+    load = cached_load if case["cached"] else uncached_load
+    if case["cached"]:
+        # Parse and build the pooled system outside the timed region.
+        load()
+    walls = []
+    for _ in range(repeat * CASE_LOAD_SAMPLES):
+        start = time.perf_counter()
+        load()
+        walls.append(time.perf_counter() - start)
+    return {"wall_s": statistics.median(walls), "wall_s_runs": walls, "peak_rss_mb": _peak_rss_mb()}
+
+
+_WORKERS = {"curve": _run_case, "n1_batch": _run_n1_batch, "case_load": _run_case_load}
+
+
+def run_case(case: dict, repeat: int = 1) -> dict:
+    """Benchmark one case in a fresh spawn worker and return its result row."""
+    row = dict(case)
+    worker = _WORKERS[case.get("kind", "curve")]
+    executor = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+    try:
+        row.update({"status": "ok", "error": None, **executor.submit(worker, case, repeat).result()})
+    except Exception as exc:
+        row.update({"status": "error", "error": str(exc)})
+    finally:
+        executor.shutdown()
+    return row
+
+
+def _environment() -> dict:
+    import numpy
+
+    return {
+        "host": platform.node(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "andes": andes.__version__,
+        "numpy": numpy.__version__,
+    }
+
+
+def run_benchmark(profile: str = "full", grids=None, repeat: int = 1, on_case=None) -> dict:
+    """Run every case of ``profile`` and return the JSON-serializable report.
+
+    Args:
+        profile: Key of ``PROFILES``.
+        grids: Optional subset of ``CASE_MAP`` keys.
+        repeat: Runs per case; reported times are medians.
+        on_case: Optional callable receiving each result row as it finishes.
+
+    Returns:
+        ``{"meta": {...}, "cases": [row, ...]}``.
+    """
+    cases = build_cases(profile, grids)
+    started = time.time()
+    rows = []
+    for case in cases:
+        row = run_case(case, repeat)
+        rows.append(row)
+        if on_case is not None:
+            on_case(row)
+    return {
+        "meta": {
+            "profile": profile,
+            "repeat": repeat,
+            "started_at": time.strftime("%Y-%m-%dT%H:%M:%S%z", time.localtime(started)),
+            "duration_s": time.time() - started,
+            "environment": _environment(),
+        },
+        "cases": rows,
+    }
+
+
+# Seconds each timing metric is derived from, used for the noise floor.
+_TIME_BASIS = {
+    "wall_s": lambda row: row["wall_s"],
+    "points_per_s": lambda row: row.get("timings", {}).get("cpf", 0.0),
+}
+
+
+def _seconds(row: dict, metric: str) -> float:
+    return _TIME_BASIS[metric](row)
+
+
+def compare(report: dict, baseline: dict, tolerance: float = 0.25) -> dict:
+    """Compare a report against a baseline report, case by case.
+
+    A metric regresses when it is more than ``tolerance`` (fractional) worse
+    than the baseline; timing metrics whose underlying seconds moved by less
+than ``MIN_TIME_DELTA_S`` are ignored.
+    A different CPF point count is reported as a behaviour change, not a
+    regression.
+
+    Returns:
+        Dict with ``regressions``, ``improvements``, ``changed`` (lists of
+        ``{id, metric, baseline, current, ratio}``), ``missing`` / ``new`` case ids,
+        ``errors`` (case ids that failed now but not in the baseline),
+        ``environment`` (``{field: [baseline, current]}`` for the ``_MACHINE_KEYS``
+        that differ, i.e. timings from another machine) and ``ok``.
+    """
+    base_rows = {row["id"]: row for row in baseline.get("cases", [])}
+    rows = {row["id"]: row for row in report.get("cases", [])}
+    out = {
+        "tolerance": tolerance,
+        "regressions": [],
+        "improvements": [],
+        "changed": [],
+        "missing": [case for case in base_rows if case not in rows],
+        "new": [case for case in rows if case not in base_rows],
+        "errors": [],
+    }
+    base_env = baseline.get("meta", {}).get("environment", {})
+    env = report.get("meta", {}).get("environment", {})
+    out["environment"] = {
+        key: [base_env.get(key), env.get(key)] for key in _MACHINE_KEYS if base_env.get(key) != env.get(key)
+    }
+
+    for case, row in rows.items():
+        base = base_rows.get(case)
+        if base is None:
+            continue
+        if row["status"] != "ok":
+            if base["status"] == "ok":
+                out["errors"].append(case)
+            continue
+        if base["status"] != "ok":
+            continue
+
+        for metric in _HIGHER_IS_WORSE + _LOWER_IS_WORSE:
+            old, new = base.get(metric), row.get(metric)
+            if not old or new is None:
+                continue
+            ratio = new / old
+            entry = {"id": case, "metric": metric, "baseline": old, "current": new, "ratio": ratio}
+            if metric in _TIME_BASIS and abs(_seconds(row, metric) - _seconds(base, metric)) < MIN_TIME_DELTA_S:
+                continue
+            worse = ratio > 1 + tolerance if metric in _HIGHER_IS_WORSE else ratio < 1 - tolerance
+            better = ratio < 1 - tolerance if metric in _HIGHER_IS_WORSE else ratio > 1 + tolerance
+            if worse:
+                out["regressions"].append(entry)
+            elif better:
+                out["improvements"].append(entry)
+
+        if row.get("cpf_points") != base.get("cpf_points"):
+            out["changed"].append(
+                {
+                    "id": case,
+                    "metric": "cpf_points",
+                    "baseline": base.get("cpf_points"),
+                    "current": row.get("cpf_points"),
+                    "ratio": None,
+                }
+            )
+
+    out["ok"] = not out["regressions"] and not out["errors"]
+    return out
+
+
+def _format_row(row: dict) -> str:
+    if row["status"] != "ok":
+        return f"{row['id']:<60} ERROR {row['error']}"
+    rss = f"{row['peak_rss_mb']:.0f} MB" if row["peak_rss_mb"] is not None else "n/a"
+    if row.get("kind") == "case_load":
+        return f"{row['id']:<60} {row['wall_s'] * 1000:7.1f} ms {rss:>8}"
+    pps = f"{row['points_per_s']:.0f}" if row["points_per_s"] is not None else "n/a"
+    return (
+        f"{row['id']:<60} {row['wall_s']:7.2f} s  {rss:>8}  {row['cpf_points']:5d} pts  {pps:>6} pts/s"
+        f"  {row['pflow_iterations']:3d} NR it"
+    )
+
+
+def _format_comparison(comparison: dict) -> str:
+    lines = [f"Baseline comparison (tolerance {comparison['tolerance']:.0%}):"]
+    for key, (old, new) in comparison.get("environment", {}).items():
+        lines.append(f"  WARNING    baseline {key} {old!r}, this run {new!r}; timings may not be comparable")
+    for title, key in (("REGRESSION", "regressions"), ("improved", "improvements"), ("changed", "changed")):
+        for entry in comparison[key]:
+            ratio = f" ({entry['ratio']:.2f}x)" if entry["ratio"] is not None else ""
+            lines.append(f"  {title:<10} {entry['id']} {entry['metric']}: {entry['baseline']} -> {entry['current']}{ratio}")
+    for case in comparison["errors"]:
+        lines.append(f"  {'ERROR':<10} {case} now fails")
+    if comparison["missing"]:
+        lines.append(f"  {len(comparison['missing'])} baseline case(s) not run")
+    if comparison["new"]:
+        lines.append(f"  {len(comparison['new'])} case(s) without a baseline")
+    lines.append("  OK" if comparison["ok"] else "  FAILED")
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark generate_pv_curve across every supported grid.")
+    parser.add_argument("--profile", choices=list(PROFILES), default="full")
+    parser.add_argument("--grids", nargs="+", choices=list(CASE_MAP), help="Subset of grids (default: all)")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per case; times are medians")
+    parser.add_argument("--output", default="pv_benchmark.json", help="Where to write the JSON report")
+    parser.add_argument("--baseline", help="Baseline report from this host to compare against (e.g. pv_benchmark_baseline.json)")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed fractional slowdown per metric")
+    parser.add_argument("--save-baseline", action="store_true", help="Also write the report to --baseline")
+    args = parser.parse_args(argv)
+
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+    if args.save_baseline and not args.baseline:
+        parser.error("--save-baseline needs --baseline")
+
+    report = run_benchmark(args.profile, args.grids, args.repeat, on_case=lambda row: print(_format_row(row), flush=True))
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {args.output} ({len(report['cases'])} cases, {report['meta']['duration_s']:.1f} s)")
+
+    if not args.baseline:
+        return 0
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    comparison = compare(report, baseline, args.tolerance)
+    report["comparison"] = comparison
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(_format_comparison(comparison))
+    return 0 if comparison["ok"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,44 @@
+"""Cancellation tokens with wall-clock and step budgets for CPF runs."""
+
+import threading
+import time
+
+
+class SimulationCancelled(RuntimeError):
+    """Raised inside a CPF run once its ``CancellationToken`` has fired."""
+
+
+class CancellationToken:
+    """
+    Thread-safe stop signal shared between a simulation and its caller.
+
+    The simulation polls ``check`` after each accepted CPF point; any thread may
+    call ``cancel``. The token also fires on its own once ``timeout_s`` seconds
+    have passed since creation or a run goes past ``max_steps`` continuation steps.
+    """
+
+    def __init__(self, timeout_s=None, max_steps=None):
+        self._event = threading.Event()
+        self.reason = None
+        self.timeout_s = timeout_s
+        self.max_steps = max_steps
+        self._deadline = time.monotonic() + float(timeout_s) if timeout_s else None
+
+    def cancel(self, reason: str = "Cancelled by user.") -> None:
+        """Fire the token; the first reason wins."""
+        if not self._event.is_set():
+            self.reason = reason
+            self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        if not self._event.is_set() and self._deadline is not None and time.monotonic() > self._deadline:
+            self.cancel(f"Wall-clock budget of {self.timeout_s:g} s exceeded.")
+        return self._event.is_set()
+
+    def check(self, step=None) -> None:
+        """Raise ``SimulationCancelled`` if the token fired or ``step`` is over budget."""
+        if step is not None and self.max_steps is not None and step > self.max_steps:
+            self.cancel(f"Step budget of {self.max_steps} CPF steps exhausted.")
+        if self.cancelled:
+            raise SimulationCancelled(self.reason)
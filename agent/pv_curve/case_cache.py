@@ -0,0 +1,273 @@
+"""Process-wide cache of parsed ANDES case templates and set-up working systems for the PV engine."""
+
+import threading
+from collections import OrderedDict
+
+import andes
+from andes.system import System
+
+CASE_MAP = {
+    "ieee14": "ieee14/ieee14.json",
+    "ieee39": "ieee39/ieee39_full.xlsx",
+    "ieee118": "matpower/case118.m",
+    "ieee300": "matpower/case300.m",
+}
+
+
+def _parse_case(grid: str) -> dict:
+    """Parse a built-in case from disk into a replayable template.
+
+    Args:
+        grid: Case name key; must exist in ``CASE_MAP``.
+
+    Returns:
+        Dict with ``mva`` (system base) and ``models``, a mapping of ANDES model
+        name -> tuple of input-value records (one dict per device).
+    """
+    ss = andes.load(andes.get_case(CASE_MAP[grid]), setup=False)
+    models = {}
+    for name, mdl in ss.models.items():
+        if mdl.n:
+            models[name] = tuple(mdl.as_df(vin=True).to_dict(orient="records"))
+    return {"mva": float(ss.config.mva), "models": models}
+
+
+def _build_system(template: dict):
+    """Create a fresh, not-yet-setup ANDES system from a parsed template.
+
+    Args:
+        template: Output of ``_parse_case``.
+
+    Returns:
+        ANDES ``System`` equivalent to ``andes.load(case, setup=False)``.
+    """
+    ss = System()
+    ss.config.mva = template["mva"]
+    for name, records in template["models"].items():
+        for record in records:
+            ss.add(name, dict(record))
+    return ss
+
+
+def _snapshot(ss) -> dict:
+    """Record the input state of a freshly set-up ``ss`` for ``_restore``.
+
+    Device status, parameters and constant services are kept on the models by
+    ANDES' own ``snapshot_init`` (the mechanism ``TDS.reinit`` uses); configs,
+    discrete-block switches and routine attributes are copied here.
+    """
+    for mdl in ss.models.values():
+        if mdl.n:
+            mdl.snapshot_init()
+    owners = [*ss.models.values(), *ss.routines.values()]
+    return {
+        "configs": [(obj.config, dict(obj.config.as_dict(refresh=True))) for obj in owners],
+        "discrete": [
+            (block, block.enable)
+            for mdl in ss.models.values() if mdl.n
+            for block in mdl.discrete.values() if hasattr(block, "enable")
+        ],
+        "routines": {name: dict(vars(routine)) for name, routine in ss.routines.items()},
+    }
+
+
+def _restore(ss, snapshot: dict) -> None:
+    """Return a used working system to the state recorded by ``_snapshot``.
+
+    Devices switched off or on are toggled back through ``set_status`` so the
+    connectivity and Y-bus are rebuilt; everything else is copied back in place.
+    """
+    for mdl in ss.models.values():
+        if not mdl.n:
+            continue
+        u_t0 = mdl._uv_t0[0]
+        for uid in (mdl.u.v != u_t0).nonzero()[0]:
+            mdl.set_status(mdl.idx.v[uid], u_t0[uid])
+        mdl.restore_init()
+    for config, values in snapshot["configs"]:
+        for key, value in values.items():
+            setattr(config, key, value)
+    for block, enable in snapshot["discrete"]:
+        block.enable = enable
+    # Drops per-run attributes, including hooks installed on the instance.
+    for name, attributes in snapshot["routines"].items():
+        routine_vars = vars(ss.routines[name])
+        routine_vars.clear()
+        routine_vars.update(attributes)
+
+
+class CaseTemplateCache:
+    """
+    LRU cache of parsed case templates keyed by grid name.
+
+    Each grid is read from disk once. ``acquire`` hands out a set-up working
+    system per concurrent caller: ANDES ``System()`` construction costs about as
+    much as parsing the case, so released systems are pooled and restored to
+    the case data on their next checkout instead of being rebuilt. Contingencies
+    and setpoint overrides applied by one call therefore never leak into
+    another. The converged base-case power-flow state of each grid is kept
+    alongside its template to warm-start variant runs.
+    """
+
+    def __init__(self, max_entries: int = len(CASE_MAP), max_idle_systems: int = 2):
+        """
+        Args:
+            max_entries: Grids kept before the least recently used is evicted.
+            max_idle_systems: Released working systems kept per grid for reuse.
+        """
+        self._store: "OrderedDict[str, dict]" = OrderedDict()
+        self._base_states = {}
+        self._idle = {}
+        self._snapshots = {}
+        self._lock = threading.Lock()
+        self.max_entries = max_entries
+        self.max_idle_systems = max_idle_systems
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.system_builds = 0
+        self.system_reuses = 0
+
+    def get_template(self, grid: str) -> dict:
+        """Return the parsed template for ``grid``, parsing it on first use."""
+        if grid not in CASE_MAP:
+            raise ValueError(f"Unsupported grid '{grid}'. Choose from {list(CASE_MAP)}")
+
+        with self._lock:
+            template = self._store.get(grid)
+            if template is not None:
+                self._store.move_to_end(grid)
+                self.hits += 1
+                return template
+            self.misses += 1
+
+        # Parse outside the lock so other grids are not blocked on disk I/O.
+        template = _parse_case(grid)
+
+        with self._lock:
+            self._store[grid] = template
+            self._store.move_to_end(grid)
+            while len(self._store) > self.max_entries:
+                evicted, _ = self._store.popitem(last=False)
+                self._base_states.pop(evicted, None)
+                self._drop_systems(evicted)
+                self.evictions += 1
+        return template
+
+    def get_base_state(self, grid: str):
+        """Return the cached base-case ``{"v": ..., "a": ...}`` bus solution for ``grid``, or None."""
+        with self._lock:
+            return self._base_states.get(grid)
+
+    def set_base_state(self, grid: str, state: dict) -> None:
+        """Keep a converged base-case bus solution (read-only ``v`` / ``a`` arrays) for ``grid``."""
+        for value in state.values():
+            value.setflags(write=False)
+        with self._lock:
+            self._base_states[grid] = state
+
+    def load(self, grid: str):
+        """Return a fresh working system for ``grid`` (``setup`` not yet called)."""
+        return _build_system(self.get_template(grid))
+
+    def acquire(self, grid: str):
+        """Check out a working system for ``grid``; pass it to ``setup``, then hand it back with ``release``.
+
+        A pooled system comes back restored to the case data and already set
+        up; if none is idle (or the restore fails) a new one is built from the
+        template.
+        """
+        template = self.get_template(grid)
+        with self._lock:
+            idle = self._idle.get(grid)
+            ss = idle.pop() if idle else None
+        if ss is not None:
+            try:
+                _restore(ss, self._snapshots[id(ss)])
+            except Exception:
+                with self._lock:
+                    self._snapshots.pop(id(ss), None)
+            else:
+                with self._lock:
+                    self.system_reuses += 1
+                return ss
+
+        with self._lock:
+            self.system_builds += 1
+        return _build_system(template)
+
+    def setup(self, ss) -> None:
+        """Run ``ss.setup()`` on a newly built system and record its state for reuse; no-op on a pooled one."""
+        if ss.is_setup:
+            return
+        ss.setup()
+        snapshot = _snapshot(ss)
+        with self._lock:
+            self._snapshots[id(ss)] = snapshot
+
+    def release(self, grid: str, ss) -> None:
+        """Return a system from ``acquire`` to the pool; it is restored on its next checkout."""
+        with self._lock:
+            if id(ss) not in self._snapshots:
+                return
+            idle = self._idle.setdefault(grid, [])
+            if grid in self._store and len(idle) < self.max_idle_systems:
+                idle.append(ss)
+            else:
+                del self._snapshots[id(ss)]
+
+    def _drop_systems(self, grid: str) -> None:
+        """Forget the idle systems of ``grid``; caller holds the lock."""
+        for ss in self._idle.pop(grid, ()):
+            self._snapshots.pop(id(ss), None)
+
+    def warm_up(self, grids=None) -> list:
+        """Parse ``grids`` (default: every ``CASE_MAP`` entry) ahead of first use.
+
+        Returns:
+            List of grid names now held in the cache.
+        """
+        for grid in grids or list(CASE_MAP):
+            self.get_template(grid)
+        with self._lock:
+            return list(self._store)
+
+    def stats(self) -> dict:
+        """Return hit/miss/eviction counters and the cached grid names."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._store),
+                "max_entries": self.max_entries,
+                "grids": list(self._store),
+                "base_states": list(self._base_states),
+                "idle_systems": {grid: len(idle) for grid, idle in self._idle.items() if idle},
+                "system_builds": self.system_builds,
+                "system_reuses": self.system_reuses,
+            }
+
+    def clear(self) -> None:
+        """Drop every cached template, base state and pooled system and reset counters."""
+        with self._lock:
+            self._store.clear()
+            self._base_states.clear()
+            self._idle.clear()
+            self._snapshots.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+            self.system_builds = 0
+            self.system_reuses = 0
+
+    def __contains__(self, grid: str) -> bool:
+        with self._lock:
+            return grid in self._store
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+
+# Singleton cache instance shared by every caller in the process
+case_cache = CaseTemplateCache()
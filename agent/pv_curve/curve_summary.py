@@ -0,0 +1,191 @@
+"""Compact, deterministic P–V result summaries for LLM prompts.
+
+The analysis prompt used to embed the whole result, one dict per CPF point,
+so prompt size grew with curve length. ``summarize_results`` keeps the
+scalar metrics (nose point, margins, voltage-drop and sensitivity
+statistics) plus a shape-preserving subset of the curve chosen by a
+top-down Ramer–Douglas–Peucker split, sized to fit a token budget.
+"""
+
+import heapq
+import json
+import math
+
+import numpy as np
+
+from agent.pv_curve.result import PVCurveResult
+
+DEFAULT_TOKEN_BUDGET = 1200
+MAX_CURVE_POINTS = 40
+CHARS_PER_TOKEN = 4  # Rough average for English / JSON text across BPE tokenizers.
+
+POINT_COLUMNS = ("step", "load_mw", "voltage_pu", "load_scale_factor", "voltage_drop_percent", "dv_dp_pu_per_100mw")
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count of ``text`` (``CHARS_PER_TOKEN`` characters per token)."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def _segment_peak(x, y, start, end):
+    """Return (distance, index) of the point in ``(start, end)`` farthest from the chord."""
+    if end - start < 2:
+        return 0.0, None
+    dx, dy = x[end] - x[start], y[end] - y[start]
+    px, py = x[start + 1:end] - x[start], y[start + 1:end] - y[start]
+    norm = math.hypot(dx, dy)
+    dist = np.abs(dx * py - dy * px) / norm if norm > 0 else np.hypot(px, py)
+    k = int(np.argmax(dist))
+    return float(dist[k]), start + 1 + k
+
+
+def simplify_curve(x, y, max_points, keep=()) -> list:
+    """Pick up to ``max_points`` indices that best preserve the shape of ``(x, y)``.
+
+    Ramer–Douglas–Peucker driven by a point budget instead of a tolerance: the
+    segment whose interior point lies farthest from its chord is split first.
+    Both axes are scaled to unit range so MW and pu deviations weigh equally.
+
+    Args:
+        x, y: Curve coordinates, same length.
+        max_points: Point budget (the endpoints and ``keep`` are always included).
+        keep: Extra indices that must be kept, e.g. the nose point.
+
+    Returns:
+        Sorted list of selected indices.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = x.size
+    if n == 0:
+        return []
+    x = (x - x.min()) / (np.ptp(x) or 1.0)
+    y = (y - y.min()) / (np.ptp(y) or 1.0)
+
+    selected = sorted({0, n - 1, *(int(i) for i in keep if 0 <= i < n)})
+    heap = []
+    for start, end in zip(selected, selected[1:]):
+        dist, idx = _segment_peak(x, y, start, end)
+        if idx is not None:
+            heapq.heappush(heap, (-dist, idx, start, end))
+    chosen = set(selected)
+    while heap and len(chosen) < max_points:
+        neg_dist, idx, start, end = heapq.heappop(heap)
+        if neg_dist == 0.0:
+            break
+        chosen.add(idx)
+        for a, b in ((start, idx), (idx, end)):
+            dist, peak = _segment_peak(x, y, a, b)
+            if peak is not None:
+                heapq.heappush(heap, (-dist, peak, a, b))
+    return sorted(chosen)
+
+
+def _slope(load, voltage, i, j):
+    """dV/dP between points ``i`` and ``j`` in pu per 100 MW (None if load does not change)."""
+    dp = load[j] - load[i]
+    return round(float((voltage[j] - voltage[i]) / dp * 100.0), 5) if dp else None
+
+
+def _sensitivity(load, voltage, nose):
+    """dV/dP statistics over the upper branch (pu per 100 MW)."""
+    if nose < 1:
+        return None
+    dp = np.diff(load[:nose + 1])
+    dv = np.diff(voltage[:nose + 1])
+    moving = dp > 0
+    if not moving.any():
+        return None
+    slopes = dv[moving] / dp[moving] * 100.0
+    steepest = int(np.argmin(slopes))
+    return {
+        "initial_pu_per_100mw": round(float(slopes[0]), 5),
+        "near_nose_pu_per_100mw": round(float(slopes[-1]), 5),
+        "steepest_pu_per_100mw": round(float(slopes[steepest]), 5),
+        "steepest_at_load_mw": round(float(load[1:nose + 1][moving][steepest]), 2),
+    }
+
+
+def _point_rows(load, voltage, indices):
+    initial_p, initial_v = float(load[0]), float(voltage[0])
+    rows = []
+    for pos, i in enumerate(indices):
+        scale = load[i] / initial_p if initial_p > 0 else 1.0
+        drop = (initial_v - voltage[i]) / initial_v * 100 if initial_v > 0 else 0.0
+        slope = _slope(load, voltage, indices[pos - 1], i) if pos else None
+        rows.append([i + 1, round(float(load[i]), 2), round(float(voltage[i]), 4), round(float(scale), 3),
+                     round(float(drop), 2), slope])
+    return rows
+
+
+def summarize_results(results, token_budget=DEFAULT_TOKEN_BUDGET, max_points=MAX_CURVE_POINTS) -> dict:
+    """Summarize a ``generate_pv_curve`` result for the analysis prompt.
+
+    Args:
+        results: ``PVCurveResult`` or its legacy dict.
+        token_budget: Approximate token budget for ``json.dumps`` of the summary.
+            Curve points are dropped (never below first / nose / last) to fit.
+        max_points: Upper bound on characteristic curve points.
+
+    Returns:
+        Dict with run inputs, ``nose_point``, initial / final conditions, load
+        margins, ``voltage_drop`` and ``voltage_sensitivity`` statistics, and
+        ``characteristic_points`` (``columns`` / ``rows``; ``dv_dp_pu_per_100mw``
+        is the slope from the previous listed point).
+    """
+    if isinstance(results, PVCurveResult):
+        load, voltage = results.load_mw, results.voltage_pu
+    else:
+        load = np.asarray(results["load_values_mw"], dtype=float)
+        voltage = np.asarray(results["voltage_values_pu"], dtype=float)
+    nose = int(np.argmax(load))
+    initial_v = float(voltage[0])
+
+    summary = {
+        "grid_system": results.get("grid_system"),
+        "target_bus": results.get("target_bus"),
+        "power_factor": results.get("power_factor"),
+        "capacitive_load": results.get("capacitive_load"),
+        "contingency_lines": results.get("contingency_lines"),
+        "gen_voltage_setpoints": results.get("gen_voltage_setpoints"),
+        "voltage_limit": results.get("voltage_limit"),
+        "converged_steps": int(load.size),
+        "nose_point": {
+            "step": nose + 1,
+            "load_mw": round(float(load[nose]), 2),
+            "voltage_pu": round(float(voltage[nose]), 4),
+        },
+        "initial_conditions": {"load_mw": round(float(load[0]), 2), "voltage_pu": round(initial_v, 4)},
+        "final_conditions": {"load_mw": round(float(load[-1]), 2), "voltage_pu": round(float(voltage[-1]), 4)},
+        "load_margin_mw": round(float(results.get("load_margin_mw", load[nose] - load[0])), 2),
+        "load_margin_percent": round(float(results.get("load_margin_percent", 0.0)), 2),
+        "voltage_drop": {
+            "total_pu": round(initial_v - float(voltage[-1]), 4),
+            "total_percent": round((initial_v - float(voltage[-1])) / initial_v * 100, 2) if initial_v > 0 else 0.0,
+            "at_nose_pu": round(initial_v - float(voltage[nose]), 4),
+            "at_nose_percent": round((initial_v - float(voltage[nose])) / initial_v * 100, 2) if initial_v > 0 else 0.0,
+            "min_voltage_pu": round(float(voltage.min()), 4),
+        },
+        "voltage_limit_reached": bool(voltage[-1] < float(results.get("voltage_limit") or 0.0)),
+        "voltage_sensitivity": _sensitivity(load, voltage, nose),
+    }
+    for key in ("cancelled", "margin"):
+        if results.get(key) is not None:
+            summary[key] = results[key]
+
+    base_tokens = estimate_tokens(json.dumps(summary))
+    count = min(max_points, load.size)
+    while True:
+        indices = simplify_curve(load, voltage, count, keep=(nose,))
+        summary["characteristic_points"] = {
+            "columns": list(POINT_COLUMNS),
+            "rows": _point_rows(load, voltage, indices),
+        }
+        tokens = estimate_tokens(json.dumps(summary))
+        if tokens <= token_budget or len(indices) <= 3 or count <= 3:
+            break
+        # Rows cost roughly the same; jump close to the budget, then shrink one at a time.
+        per_row = (tokens - base_tokens) / len(indices)
+        fitted = int((token_budget - base_tokens) // per_row) if per_row > 0 else count - 1
+        count = max(3, min(count - 1, fitted))
+    return summary
@@ -0,0 +1,120 @@
+"""Pre-indexed topology of each built-in grid for O(1) validation and contingency lookup."""
+
+import threading
+
+from agent.pv_curve.case_cache import CASE_MAP, case_cache
+
+
+def line_key(from_bus, to_bus) -> tuple:
+    """Unordered bus pair ``(low, high)`` used to index lines."""
+    a, b = int(from_bus), int(to_bus)
+    return (a, b) if a <= b else (b, a)
+
+
+class GridCatalog:
+    """
+    Read-only lookup tables for one grid, derived from its cached case template.
+
+    Attributes:
+        grid: ``CASE_MAP`` key.
+        mva: System base (MVA).
+        buses: Frozen set of ``Bus.idx`` values.
+        lines: ``line_key`` -> tuple of ``Line`` uids (parallel circuits share a key).
+        in_service_lines: Sorted pairs with at least one in-service circuit.
+        pv_uids: ``PV.idx`` -> uid.
+        base_loads: ``PQ`` bus -> ``(p_mw, q_mvar)`` summed over loads at that bus.
+        total_load_mw: Sum of base-case PQ active power (MW).
+    """
+
+    def __init__(self, grid: str, template: dict):
+        models = template["models"]
+        self.grid = grid
+        self.mva = float(template["mva"])
+        self.buses = frozenset(int(r["idx"]) for r in models.get("Bus", ()))
+
+        lines, in_service = {}, set()
+        # Template record order is the uid order of systems built from it.
+        for uid, record in enumerate(models.get("Line", ())):
+            key = line_key(record["bus1"], record["bus2"])
+            lines[key] = lines.get(key, ()) + (uid,)
+            if float(record.get("u", 1)) != 0:
+                in_service.add(key)
+        self.lines = lines
+        self.in_service_lines = sorted(in_service)
+
+        self.pv_uids = {int(r["idx"]): uid for uid, r in enumerate(models.get("PV", ()))}
+
+        loads = {}
+        for record in models.get("PQ", ()):
+            bus = int(record["bus"])
+            p, q = loads.get(bus, (0.0, 0.0))
+            loads[bus] = (p + float(record["p0"]) * self.mva, q + float(record["q0"]) * self.mva)
+        self.base_loads = loads
+        self.total_load_mw = sum(p for p, _ in loads.values())
+
+    def line_uids(self, from_bus, to_bus) -> tuple:
+        """Return every ``Line`` uid between two buses.
+
+        Raises:
+            ValueError: If no line connects them.
+        """
+        uids = self.lines.get(line_key(from_bus, to_bus))
+        if not uids:
+            raise ValueError(f"No line found between bus {from_bus} and bus {to_bus} in grid '{self.grid}'.")
+        return uids
+
+    def pv_uid(self, gen_idx) -> int:
+        """Return the uid of PV generator ``gen_idx``.
+
+        Raises:
+            ValueError: If it is not a PV index of this grid.
+        """
+        uid = self.pv_uids.get(int(gen_idx))
+        if uid is None:
+            raise ValueError(
+                f"Generator index {gen_idx} not found in grid '{self.grid}'. Valid indices: {sorted(self.pv_uids)}."
+            )
+        return uid
+
+    def validate_bus(self, bus_idx) -> None:
+        """Raise ValueError if ``bus_idx`` is not a bus of this grid."""
+        if int(bus_idx) not in self.buses:
+            raise ValueError(
+                f"Bus {bus_idx} not found in grid '{self.grid}'. Valid range: {min(self.buses)} to {max(self.buses)}."
+            )
+
+    def validate_contingencies(self, pairs) -> None:
+        """Raise ValueError if any ``(from_bus, to_bus)`` pair is not a line."""
+        for fb, tb in pairs or ():
+            self.line_uids(fb, tb)
+
+    def validate_gen_voltage_setpoints(self, setpoints, voltage_min_pu, voltage_max_pu=1.2) -> None:
+        """Raise ValueError for an unknown PV index or a setpoint outside ``[voltage_min_pu, voltage_max_pu]``."""
+        for gen_idx, vm_pu in (setpoints or {}).items():
+            self.pv_uid(gen_idx)
+            if not (voltage_min_pu <= vm_pu <= voltage_max_pu):
+                raise ValueError(
+                    f"Generator {gen_idx} voltage {vm_pu} pu must be between {voltage_min_pu} and {voltage_max_pu} pu."
+                )
+
+
+_catalogs = {}
+_lock = threading.Lock()
+
+
+def get_catalog(grid: str) -> GridCatalog:
+    """Return the ``GridCatalog`` for ``grid``, building it once per process.
+
+    Raises:
+        ValueError: If ``grid`` is not in ``CASE_MAP``.
+    """
+    with _lock:
+        catalog = _catalogs.get(grid)
+    if catalog is not None:
+        return catalog
+    if grid not in CASE_MAP:
+        raise ValueError(f"Unsupported grid '{grid}'. Choose from {list(CASE_MAP)}")
+
+    catalog = GridCatalog(grid, case_cache.get_template(grid))
+    with _lock:
+        return _catalogs.setdefault(grid, catalog)
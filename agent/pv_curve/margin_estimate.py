@@ -0,0 +1,192 @@
+"""Fast load-margin estimate from a few upper-branch CPF points, extrapolated to the nose."""
+
+import time
+
+import numpy as np
+
+from agent.pv_curve.cancellation import CancellationToken, SimulationCancelled
+from agent.pv_curve.pv_curve import _parabolic_nose, _run_cpf
+from agent.pv_curve.trajectory_cache import trajectory_cache, trajectory_key
+
+# Upper-branch CPF points traced before extrapolating.
+ESTIMATE_MAX_POINTS = 16
+# Consecutive points per quadratic fit.
+FIT_WINDOW = 4
+# Coarse continuation step (lambda units); ANDES shrinks it near the nose.
+ESTIMATE_STEP = 2.0
+ESTIMATE_STEP_MAX = 4.0
+# Relative gap between native-solver and ANDES nose lambdas on the built-in
+# cases (up to ~1%); bands from the native backend are widened by it.
+NATIVE_TOLERANCE = 0.015
+
+
+def _window_vertices(lam, V):
+    """Nose estimates from sliding ``FIT_WINDOW``-point fits of lambda against V².
+
+    Near the nose, load is quadratic in the squared voltage of the weakest bus
+    (exact for a two-bus equivalent), so each fit's vertex estimates the
+    maximum lambda. Windows without a concave fit are skipped.
+
+    Returns:
+        List of vertex lambdas, oldest window first.
+    """
+    weakest = int(np.argmin(V[:, -1]))
+    x = V[weakest, :] ** 2
+    vertices = []
+    for end in range(FIT_WINDOW, lam.size + 1):
+        xs, ys = x[end - FIT_WINDOW:end], lam[end - FIT_WINDOW:end]
+        if np.unique(xs).size < 3:
+            continue
+        a, b, c = np.polyfit(xs, ys, 2)
+        if a < 0:
+            vertices.append(float(c - b * b / (4.0 * a)))
+    return vertices
+
+
+def _aitken(e1, e2, e3):
+    """Aitken delta-squared limit of three estimates, or None if they do not converge monotonically."""
+    d1, d2 = e2 - e1, e3 - e2
+    if d1 == 0 or d2 == 0 or (d1 > 0) != (d2 > 0) or abs(d2) >= abs(d1):
+        return None
+    return e3 - d2 * d2 / (d2 - d1)
+
+
+def _band(lam, V):
+    """Return ``(low, high)`` nose-lambda bounds from a partial upper branch, or None."""
+    sampled = float(lam.max())
+    vertices = [v for v in _window_vertices(lam, V) if v >= sampled]
+    if not vertices:
+        return None
+    if len(vertices) < 3:
+        last = vertices[-1]
+        spread = abs(last - vertices[-2]) if len(vertices) == 2 else last - sampled
+        return max(sampled, last - spread), last + spread
+    e1, e2, e3 = vertices[-3:]
+    limit = _aitken(e1, e2, e3)
+    spread = abs(e3 - e2)
+    if limit is None:
+        return max(sampled, e3 - spread), e3 + spread
+    low, high = sorted((e3, limit))
+    return max(sampled, low), high + spread
+
+
+def _cached_trajectory(key_args):
+    """Return a cached non-empty trajectory (NOSE or FULL) for these physics inputs, if any."""
+    for continuation in (False, True):
+        trajectory = trajectory_cache.get(trajectory_key(*key_args[:5], continuation, *key_args[5:]))
+        if trajectory is not None and trajectory["lam"].size:
+            return trajectory
+    return None
+
+
+def _nose_reached(lam):
+    return lam.size >= 2 and float(lam[-1]) < float(lam.max())
+
+
+def estimate_load_margin(
+    grid="ieee39",
+    step_size=0.1,
+    max_scale=3.0,
+    power_factor=0.95,
+    capacitive=False,
+    contingency_lines=None,
+    gen_voltage_setpoints=None,
+    max_points=ESTIMATE_MAX_POINTS,
+    cancel_token=None,
+    backend="andes",
+):
+    """Estimate the load margin without tracing the full P–V curve.
+
+    A cached trajectory for the same physics inputs gives the exact margin.
+    Otherwise up to ``max_points`` coarse CPF points are traced along the upper
+    branch; if the nose is passed the margin is exact, else it is extrapolated
+    from the trend of windowed (lambda, V²) quadratic fits. The partial run may
+    use the native solver (milliseconds instead of a second on large grids, so
+    it can run next to the full ANDES run); its band is then widened by
+    ``NATIVE_TOLERANCE`` and never reported as exact.
+
+    Args:
+        grid: Built-in case key; must exist in ``CASE_MAP``.
+        step_size: CPF step of the full run; only used to find its cached trajectory.
+        max_scale: Load growth factor toward ``p0 * max_scale`` (uniform PQ).
+        power_factor: Constant power-factor magnitude in (0, 1] for Q from P.
+        capacitive: If True, leading reactive convention for Q targets.
+        contingency_lines: Optional list of ``(from_bus, to_bus)`` line outages.
+        gen_voltage_setpoints: Optional ``{pv_idx: vm_pu}``.
+        max_points: CPF point budget for the partial run.
+        cancel_token: Optional ``CancellationToken`` of the surrounding request.
+        backend: CPF solver for the partial run, ``"andes"`` or ``"native"``.
+
+    Returns:
+        Dict with ``load_margin_mw`` (midpoint of the band), ``low_mw`` / ``high_mw``,
+        ``load_margin_percent``, ``exact`` (True when the nose was sampled;
+        the band then only spans the coarse step's error),
+        ``source`` (``"cache"``, ``"cpf"`` or ``"extrapolated"``), ``points`` and
+        ``elapsed_s``; margins are None if no usable upper branch was found.
+
+    Raises:
+        ValueError: Unknown grid or invalid contingencies / setpoints.
+        SimulationCancelled: ``cancel_token`` fired during the partial run.
+    """
+    start = time.perf_counter()
+    trajectory = _cached_trajectory(
+        (grid, step_size, max_scale, power_factor, capacitive, contingency_lines, gen_voltage_setpoints)
+    )
+    source = "cache"
+    if trajectory is None:
+        source = "cpf"
+        budget = CancellationToken(max_steps=max_points)
+
+        def _forward_cancel(_point):
+            if cancel_token is not None:
+                cancel_token.check()
+
+        trajectory = _run_cpf(
+            grid, None, ESTIMATE_STEP, max_scale, power_factor, capacitive, False, contingency_lines,
+            gen_voltage_setpoints, progress=_forward_cancel, cancel_token=budget, step_max=ESTIMATE_STEP_MAX,
+            backend=backend,
+        )
+        # The run stops on either token; only the local budget leaves a usable estimate.
+        if cancel_token is not None and cancel_token.cancelled:
+            raise SimulationCancelled(cancel_token.reason)
+
+    lam, V = trajectory["lam"], trajectory["V"]
+    mw_per_lambda = trajectory["base_p_mw"] * (float(max_scale) - 1.0)
+    exact = source == "cache" or _nose_reached(lam)
+    band = None
+    if lam.size and exact:
+        sampled = float(lam.max())
+        # A coarse run brackets the nose; its parabolic vertex bounds the step error.
+        vertex = _parabolic_nose(lam, V) if source == "cpf" else None
+        band = (sampled, vertex if vertex is not None else sampled)
+    elif lam.size:
+        source = "extrapolated"
+        band = _band(lam, V)
+
+    if band is not None and source != "cache" and backend != "andes":
+        exact = False
+        band = (band[0] * (1.0 - NATIVE_TOLERANCE), band[1] * (1.0 + NATIVE_TOLERANCE))
+
+    result = {
+        "load_margin_mw": None,
+        "low_mw": None,
+        "high_mw": None,
+        "load_margin_percent": None,
+        "exact": bool(exact and band is not None),
+        "source": source,
+        "points": int(lam.size),
+        "elapsed_s": None,
+    }
+    if band is not None:
+        low, high = band[0] * mw_per_lambda, band[1] * mw_per_lambda
+        margin = (low + high) / 2.0
+        result.update(
+            {
+                "load_margin_mw": float(margin),
+                "low_mw": float(low),
+                "high_mw": float(high),
+                "load_margin_percent": float(margin / trajectory["base_p_mw"] * 100) if trajectory["base_p_mw"] > 0 else 0,
+            }
+        )
+    result["elapsed_s"] = time.perf_counter() - start
+    return result
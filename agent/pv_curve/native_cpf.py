@@ -0,0 +1,418 @@
+"""Native NumPy/SciPy continuation power flow for the PV engine (``backend="native"``).
+
+Solves the same static model ANDES uses for CPF (constant-power loads, PV
+buses without reactive limits, one slack) in polar coordinates with a sparse
+Newton–Raphson corrector and a pseudo-arclength predictor. The augmented
+Jacobian keeps one sparsity pattern per network, so each iteration only
+refreshes its data array before the sparse LU solve.
+"""
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse.linalg import splu
+
+# Continuation settings mirror ANDES' CPF defaults so both backends trace comparable curves.
+STEP_MIN = 1e-4
+STEP_MAX = 0.5
+TOL = 1e-6
+MAX_ITER = 20
+MAX_STEPS = 500
+# Prediction-error step adaptation, same rule as ANDES.
+ADAPT_TOL = 0.05
+ADAPT_DAMPING = 0.7
+
+
+class Network:
+    """
+    Static power-flow model of one grid variant, built from a parsed case template.
+
+    Buses keep template order (the ``Bus.idx`` order of an ANDES system built
+    from the same template). Records are read as system-base per-unit values,
+    and the line pi-model follows ANDES' ``Line`` equations.
+
+    Attributes:
+        bus_idx: ``Bus.idx`` values (buses,).
+        ybus: Bus admittance matrix (CSR with an explicit diagonal).
+        slack / pvpq / pq: Bus positions of the slack, of every non-slack bus
+            (angle unknowns) and of load buses (magnitude unknowns).
+        v0 / a0: Starting voltage magnitudes / angles, with slack and PV setpoints applied.
+        p_gen: Scheduled generator injection per bus (pu).
+        load_bus / p0 / q0: Bus position and base-case P / Q (pu) of each PQ load.
+        line_stamps: In-service ``Line`` uid -> ``(positions, values)``: where its
+            four pi-model entries sit in ``ybus.data`` and what they add there.
+        line_series: In-service ``Line`` uid -> ``(from_pos, to_pos, z)`` with its
+            series impedance ``z = r + jx`` (pu).
+    """
+
+    def __init__(self, template, line_outages=(), gen_voltage_setpoints=None):
+        models = template["models"]
+        self.bus_idx = np.array([int(r["idx"]) for r in models["Bus"]], dtype=int)
+        n = self.bus_idx.size
+        pos = {idx: i for i, idx in enumerate(self.bus_idx.tolist())}
+        self.v0 = np.array([float(r.get("v0", 1.0)) for r in models["Bus"]])
+        self.a0 = np.array([float(r.get("a0", 0.0)) for r in models["Bus"]])
+
+        lines, self.line_series = {}, {}
+        outages = set(line_outages)
+        for uid, r in enumerate(models.get("Line", ())):
+            if uid in outages or float(r.get("u", 1)) == 0:
+                continue
+            f, t = pos[int(r["bus1"])], pos[int(r["bus2"])]
+            yhk = 1.0 / ((r["r"] + 1e-8) + 1j * (r["x"] + 1e-8))
+            yh = r["g1"] + 0.5 * r["g"] + 1j * (r["b1"] + 0.5 * r["b"])
+            yk = r["g2"] + 0.5 * r["g"] + 1j * (r["b2"] + 0.5 * r["b"])
+            tap = float(r["tap"]) * np.exp(1j * float(r["phi"]))
+            values = [(yhk + yh) / abs(tap) ** 2, yhk + yk, -yhk / np.conj(tap), -yhk / tap]
+            lines[uid] = (np.array([f, t, f, t]), np.array([f, t, t, f]), np.array(values))
+            self.line_series[uid] = (f, t, 1.0 / yhk)
+
+        rows, cols, vals = [np.arange(n)], [np.arange(n)], [np.zeros(n, dtype=complex)]
+        for r, c, v in lines.values():
+            rows.append(r)
+            cols.append(c)
+            vals.append(v)
+        for r in models.get("Shunt", ()):
+            rows.append([pos[int(r["bus"])]])
+            cols.append([pos[int(r["bus"])]])
+            vals.append([float(r["u"]) * (r["g"] + 1j * r["b"])])
+        self.ybus = sparse.coo_matrix(
+            (np.concatenate(vals), (np.concatenate(rows), np.concatenate(cols))), shape=(n, n)
+        ).tocsr()
+        self.ybus.sort_indices()
+
+        # Sorted (row, col) keys of the CSR entries locate each line stamp in ``ybus.data``.
+        keys = np.repeat(np.arange(n), np.diff(self.ybus.indptr)) * n + self.ybus.indices
+        self.line_stamps = {uid: (np.searchsorted(keys, r * n + c), v) for uid, (r, c, v) in lines.items()}
+
+        setpoints = gen_voltage_setpoints or {}
+        self.p_gen = np.zeros(n)
+        is_pv = np.zeros(n, dtype=bool)
+        for uid, r in enumerate(models.get("PV", ())):
+            if float(r.get("u", 1)) == 0:
+                continue
+            i = pos[int(r["bus"])]
+            is_pv[i] = True
+            self.p_gen[i] += float(r["p0"])
+            self.v0[i] = float(setpoints.get(uid, r["v0"]))
+        slack = [r for r in models.get("Slack", ()) if float(r.get("u", 1)) != 0]
+        if len(slack) != 1:
+            raise ValueError(f"The native backend needs exactly one slack bus, found {len(slack)}.")
+        self.slack = pos[int(slack[0]["bus"])]
+        self.v0[self.slack] = float(slack[0]["v0"])
+        self.a0[self.slack] = float(slack[0].get("a0", 0.0))
+        is_pv[self.slack] = False
+
+        non_slack = np.ones(n, dtype=bool)
+        non_slack[self.slack] = False
+        self.pvpq = np.flatnonzero(non_slack)
+        self.pq = np.flatnonzero(non_slack & ~is_pv)
+
+        loads = [r for r in models.get("PQ", ()) if float(r.get("u", 1)) != 0]
+        self.load_bus = np.array([pos[int(r["bus"])] for r in loads], dtype=int)
+        self.p0 = np.array([float(r["p0"]) for r in loads])
+        self.q0 = np.array([float(r["q0"]) for r in loads])
+
+    @property
+    def n_bus(self) -> int:
+        return self.bus_idx.size
+
+
+def bus_currents(rows, cols, ydata, V, n_bus):
+    """Injected currents ``Y @ V`` for stacked voltages.
+
+    Args:
+        rows, cols: Row / column of each ``ybus.data`` entry.
+        ydata: ``ybus.data`` (entries,) or one row per scenario (scenarios x entries).
+        V: Complex bus voltages (scenarios x buses).
+
+    Returns:
+        Complex currents (scenarios x buses).
+    """
+    terms = ydata * V[:, cols]
+    offsets = (np.arange(V.shape[0]) * n_bus)[:, None] + rows
+    size = V.shape[0] * n_bus
+    real = np.bincount(offsets.ravel(), terms.real.ravel(), size)
+    imag = np.bincount(offsets.ravel(), terms.imag.ravel(), size)
+    return (real + 1j * imag).reshape(V.shape[0], n_bus)
+
+
+class _AugmentedJacobian:
+    """
+    ``[[dF/dx, dF/dlam], [row]]`` with a sparsity pattern fixed at construction.
+
+    ``F`` stacks P mismatches at ``pvpq`` and Q mismatches at ``pq``; ``x``
+    stacks the angles at ``pvpq`` and magnitudes at ``pq``. The last row is the
+    continuation constraint, kept dense so any tangent fits the pattern.
+    """
+
+    def __init__(self, net, dfdl):
+        ybus = net.ybus
+        n = net.n_bus
+        self.rows = np.repeat(np.arange(n), np.diff(ybus.indptr))
+        self.cols = ybus.indices
+        self.diag = np.flatnonzero(self.rows == self.cols)
+        n_p, n_q = net.pvpq.size, net.pq.size
+        self.size = n_p + n_q
+
+        eq_p = np.full(n, -1)
+        eq_p[net.pvpq] = np.arange(n_p)
+        eq_q = np.full(n, -1)
+        eq_q[net.pq] = n_p + np.arange(n_q)
+        var_a, var_m = eq_p, eq_q
+
+        self._blocks = []
+        jrows, jcols = [], []
+        for eqs, var in ((eq_p, var_a), (eq_p, var_m), (eq_q, var_a), (eq_q, var_m)):
+            keep = np.flatnonzero((eqs[self.rows] >= 0) & (var[self.cols] >= 0))
+            self._blocks.append(keep)
+            jrows.append(eqs[self.rows[keep]])
+            jcols.append(var[self.cols[keep]])
+        self.dfdl_rows = np.flatnonzero(dfdl)
+        self.dfdl = dfdl[self.dfdl_rows]
+        jrows += [self.dfdl_rows, np.full(self.size + 1, self.size)]
+        jcols += [np.full(self.dfdl_rows.size, self.size), np.arange(self.size + 1)]
+
+        jrows, jcols = np.concatenate(jrows), np.concatenate(jcols)
+        # Tag each entry with its position so the CSC data order can be replayed every iteration.
+        tags = np.arange(1, jrows.size + 1, dtype=float)
+        shape = (self.size + 1, self.size + 1)
+        self.matrix = sparse.csc_matrix((tags, (jrows, jcols)), shape=shape)
+        self._order = self.matrix.data.astype(int) - 1
+
+    def factor(self, net, V, row, ydata=None):
+        """Refresh the entries at complex bus voltages ``V`` and return the LU factors.
+
+        ``ydata`` optionally replaces ``net.ybus.data`` (same pattern), e.g. with line outages.
+        """
+        y = net.ybus.data if ydata is None else ydata
+        vn = V / np.abs(V)
+        current = bus_currents(self.rows, self.cols, y, V[None, :], net.n_bus)[0]
+        ds_da = 1j * V[self.rows] * np.conj(-y * V[self.cols])
+        ds_da[self.diag] += 1j * V * np.conj(current)
+        ds_dm = V[self.rows] * np.conj(y * vn[self.cols])
+        ds_dm[self.diag] += np.conj(current) * vn
+
+        p_a, p_m, q_a, q_m = self._blocks
+        values = np.concatenate(
+            [ds_da.real[p_a], ds_dm.real[p_m], ds_da.imag[q_a], ds_dm.imag[q_m], self.dfdl, row]
+        )
+        self.matrix.data[:] = values[self._order]
+        return splu(self.matrix)
+
+
+class ContinuationPowerFlow:
+    """
+    Power flow and CPF of one ``Network`` along a load direction.
+
+    Loads follow ``p0 + lam * (p_target - p0)`` (same for Q), like ANDES'
+    ``CPF.run(p0_target=..., q0_target=...)``; generator dispatch is fixed and
+    the slack bus absorbs the difference.
+
+    After ``run``: ``lam`` (points,), ``V`` (buses x points), ``converged``
+    and ``done_msg``.
+    """
+
+    def __init__(self, net, p_target, q_target):
+        self.net = net
+        n = net.n_bus
+        self._p_load = np.bincount(net.load_bus, net.p0, n)
+        self._q_load = np.bincount(net.load_bus, net.q0, n)
+        self._dp = np.bincount(net.load_bus, np.asarray(p_target) - net.p0, n)
+        self._dq = np.bincount(net.load_bus, np.asarray(q_target) - net.q0, n)
+        self._dfdl = np.concatenate([self._dp[net.pvpq], self._dq[net.pq]])
+        self._jac = _AugmentedJacobian(net, self._dfdl)
+        self._fixed_row = np.zeros(self._jac.size + 1)
+        self._fixed_row[-1] = 1.0
+        self.vm = net.v0.copy()
+        self.va = net.a0.copy()
+        self.lam = None
+        self.V = None
+        self.converged = False
+        self.done_msg = ""
+
+    # -- state vector <-> bus voltages -------------------------------------
+
+    def _state(self):
+        return np.concatenate([self.va[self.net.pvpq], self.vm[self.net.pq]])
+
+    def _set_state(self, x):
+        n_p = self.net.pvpq.size
+        self.va[self.net.pvpq] = x[:n_p]
+        self.vm[self.net.pq] = x[n_p:]
+
+    def _mismatch(self, lam):
+        net = self.net
+        V = self.vm * np.exp(1j * self.va)
+        s = V * np.conj(net.ybus @ V)
+        p = s.real - net.p_gen + self._p_load + lam * self._dp
+        q = s.imag + self._q_load + lam * self._dq
+        return V, np.concatenate([p[net.pvpq], q[net.pq]])
+
+    # -- Newton-Raphson -----------------------------------------------------
+
+    def _correct(self, lam, reference=None):
+        """Newton corrector; fixed ``lam`` if ``reference`` is None, else pseudo-arclength.
+
+        ``reference`` is ``(x_prev, lam_prev, step, z)``.
+
+        Returns:
+            Tuple ``(converged, iterations, lam)``.
+        """
+        x = self._state()
+        for niter in range(MAX_ITER):
+            V, F = self._mismatch(lam)
+            if reference is None:
+                constraint, row = 0.0, self._fixed_row
+            else:
+                x_prev, lam_prev, step, z = reference
+                constraint = float(z[:-1] @ (x - x_prev) + z[-1] * (lam - lam_prev) - step)
+                row = z
+            mis = max(float(np.max(np.abs(F))) if F.size else 0.0, abs(constraint))
+            if mis < TOL:
+                return True, niter + 1, lam
+            if not np.isfinite(mis):
+                return False, niter + 1, lam
+            try:
+                inc = self._jac.factor(self.net, V, row).solve(-np.append(F, constraint))
+            except RuntimeError:  # exactly singular
+                return False, niter + 1, lam
+            x = x + inc[:-1]
+            lam = lam + float(inc[-1])
+            self._set_state(x)
+        return False, MAX_ITER, lam
+
+    def solve_power_flow(self, lam=0.0, warm_start=None):
+        """Solve the power flow at loading ``lam`` from ``warm_start`` (``{"v", "a"}``) or the case start.
+
+        Returns:
+            Tuple ``(converged, iterations, warm_started)``; a failed warm start is
+            retried from the case start.
+        """
+        iterations = 0
+        if warm_start is not None and len(warm_start["v"]) == self.net.n_bus:
+            self.vm[self.net.pq] = warm_start["v"][self.net.pq]
+            self.va[self.net.pvpq] = warm_start["a"][self.net.pvpq]
+            ok, iterations, _ = self._correct(lam)
+            if ok:
+                return True, iterations, True
+            self.vm, self.va = self.net.v0.copy(), self.net.a0.copy()
+        ok, niter, _ = self._correct(lam)
+        return ok, iterations + niter, False
+
+    # -- continuation -------------------------------------------------------
+
+    def _tangent(self, z_prev):
+        """Unit tangent ``[dx, dlam]`` at the current point, oriented along ``z_prev``."""
+        V = self.vm * np.exp(1j * self.va)
+        z = np.zeros(self._jac.size + 1)
+        rhs = np.zeros(self._jac.size + 1)
+        rhs[-1] = 1.0
+        try:
+            z[:] = self._jac.factor(self.net, V, self._fixed_row).solve(rhs)
+        except RuntimeError:
+            z[:] = np.nan
+        if not np.all(np.isfinite(z)):
+            # Near singularity: keep the previous direction with no lambda component.
+            z[:] = z_prev
+            z[-1] = 0.0
+        z /= np.linalg.norm(z) or 1.0
+        if float(z @ z_prev) < 0.0:
+            z = -z
+        return z
+
+    def run(self, step, stop_at="NOSE", lam0=0.0, step_max=None, on_point=None):
+        """Trace the P–V curve from the solved point at ``lam0``.
+
+        Follows ANDES' continuation loop: tangent predictor, pseudo-arclength
+        corrector, step halving on failure and prediction-error step
+        adaptation. ``stop_at="NOSE"`` stops at the first lambda decrease (that
+        point included); ``"FULL"`` continues down the lower branch to lambda 0.
+        ``on_point(step, lam, V)`` is called for each accepted point; exceptions
+        it raises abort the run. ``step_max`` defaults to ``STEP_MAX``.
+
+        Returns:
+            ``converged``.
+        """
+        full = str(stop_at).upper() == "FULL"
+        step_max = STEP_MAX if step_max is None else float(step_max)
+        lam = float(lam0)
+        lam_list, V_list = [lam], [self.vm.copy()]
+        if on_point is not None:
+            on_point(0, lam, self.vm)
+
+        x = self._state()
+        z = np.zeros(self._jac.size + 1)
+        z[-1] = 1.0
+        z = self._tangent(z)
+        step = initial_step = float(step)
+        fail_count, nose, failed = 0, False, False
+        self.done_msg = ""
+
+        for _ in range(MAX_STEPS):
+            x_pred = x + step * z[:-1]
+            lam_pred = lam + step * z[-1]
+            self._set_state(x_pred)
+            ok, _, lam_new = self._correct(lam_pred, (x, lam, step, z))
+
+            if not ok:
+                step /= 2
+                fail_count += 1
+                if step < STEP_MIN or fail_count > 10:
+                    if nose:
+                        failed = True
+                        self.done_msg = f"Corrector failed at lambda={lam:.6f}"
+                        break
+                    nose = True
+                    if not full:
+                        self.done_msg = f"Nose point at lambda={lam:.6f}"
+                        break
+                    # Branch switch: flip the lambda direction only.
+                    z[-1] = -z[-1]
+                    step = initial_step
+                    fail_count = 0
+                self._set_state(x)
+                continue
+
+            fail_count = 0
+            lam_prev = lam
+            x, lam = self._state(), lam_new
+            lam_list.append(lam)
+            V_list.append(self.vm.copy())
+            if on_point is not None:
+                on_point(len(lam_list) - 1, lam, self.vm)
+
+            if not nose and lam < lam_prev - 1e-8:
+                nose = True
+                if not full:
+                    self.done_msg = f"Nose point at lambda={lam_prev:.6f}"
+                    break
+
+            if full and nose and lam <= 0.0:
+                # Land exactly on lambda = 0.
+                ok, _, _ = self._correct(0.0)
+                if ok:
+                    lam_list[-1] = 0.0
+                    V_list[-1] = self.vm.copy()
+                    if on_point is not None:
+                        on_point(len(lam_list) - 1, 0.0, self.vm)
+                    self.done_msg = "Full curve traced (returned to lambda=0)"
+                else:
+                    failed = True
+                    self.done_msg = f"Full curve traced but refinement to lambda=0 failed; last lambda={lam:.6f}"
+                break
+
+            z = self._tangent(z)
+            if nose and z[-1] > 0:
+                z[-1] = -z[-1]
+
+            error = max(float(np.max(np.abs(x - x_pred))), abs(lam - lam_pred))
+            scale = min(2.0, 1.0 + ADAPT_DAMPING * (ADAPT_TOL / max(error, 1e-12) - 1))
+            step = min(max(step * scale, STEP_MIN), step_max)
+        else:
+            failed = True
+            self.done_msg = f"Reached max steps ({MAX_STEPS})"
+
+        self.lam = np.array(lam_list, dtype=float)
+        self.V = np.column_stack(V_list)
+        self.converged = len(lam_list) > 1 and not failed
+        return self.converged
@@ -0,0 +1,126 @@
+"""Background P–V plot rendering so simulations return before matplotlib finishes."""
+
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+
+class PlotRenderer:
+    """
+    Bounded thread pool that renders PNGs off the simulation's critical path.
+
+    ``submit`` returns a ``Future`` resolving to the saved path; the same future
+    can be looked up later by that path (relative or absolute) via ``get`` / ``wait``. When more than
+    ``max_pending`` renders are queued the caller renders inline instead
+    (back-pressure), so the queue never grows without bound.
+    """
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 16, max_tracked: int = 256):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pv-plot")
+        self._futures: "OrderedDict[str, Future]" = OrderedDict()
+        self._durations = {}
+        self._lock = threading.Lock()
+        self._render_times = deque(maxlen=256)
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.max_tracked = max_tracked
+        self.pending = 0
+        self.max_pending_seen = 0
+        self.rendered = 0
+        self.failed = 0
+        self.inline = 0
+
+    def _timed(self, render_fn, args, save_path):
+        start = time.perf_counter()
+        try:
+            render_fn(*args)
+        except Exception:
+            with self._lock:
+                self.failed += 1
+            raise
+        finally:
+            with self._lock:
+                self.pending -= 1
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.rendered += 1
+            self._render_times.append(elapsed)
+            self._durations[os.path.abspath(save_path)] = elapsed
+        return save_path
+
+    def submit(self, render_fn, *args, save_path: str) -> Future:
+        """Queue ``render_fn(*args)``, which must write ``save_path``.
+
+        Returns:
+            Future resolving to ``save_path`` once the PNG exists.
+        """
+        with self._lock:
+            self.pending += 1
+            self.max_pending_seen = max(self.max_pending_seen, self.pending)
+            queue_full = self.pending > self.max_pending
+            if queue_full:
+                self.inline += 1
+
+        if queue_full:
+            future = Future()
+            try:
+                future.set_result(self._timed(render_fn, args, save_path))
+            except Exception as exc:
+                future.set_exception(exc)
+        else:
+            future = self._executor.submit(self._timed, render_fn, args, save_path)
+
+        with self._lock:
+            self._futures[os.path.abspath(save_path)] = future
+            while len(self._futures) > self.max_tracked:
+                evicted, _ = self._futures.popitem(last=False)
+                self._durations.pop(evicted, None)
+        return future
+
+    def get(self, save_path: str):
+        """Return the render ``Future`` for ``save_path``, or None if unknown."""
+        with self._lock:
+            return self._futures.get(os.path.abspath(save_path))
+
+    def render_time(self, save_path: str):
+        """Seconds spent rendering ``save_path``, or None if not (yet) rendered here."""
+        with self._lock:
+            return self._durations.get(os.path.abspath(save_path))
+
+    def wait(self, save_path: str, timeout=None) -> bool:
+        """Block until ``save_path`` is rendered; True if it is ready.
+
+        Unknown paths are treated as ready (they were rendered synchronously).
+        Returns False on timeout or render failure.
+        """
+        future = self.get(save_path)
+        if future is None:
+            return True
+        try:
+            future.result(timeout=timeout)
+        except Exception:
+            return False
+        return True
+
+    def stats(self) -> dict:
+        """Return queue depth and render-time counters for monitoring."""
+        with self._lock:
+            times = list(self._render_times)
+            return {
+                "queue_depth": self.pending,
+                "max_queue_depth": self.max_pending_seen,
+                "max_pending": self.max_pending,
+                "workers": self.max_workers,
+                "rendered": self.rendered,
+                "failed": self.failed,
+                "inline": self.inline,
+                "render_time_avg_s": sum(times) / len(times) if times else 0.0,
+                "render_time_max_s": max(times) if times else 0.0,
+                "render_time_last_s": times[-1] if times else 0.0,
+            }
+
+
+# Singleton renderer shared by every caller in the process
+plot_renderer = PlotRenderer()
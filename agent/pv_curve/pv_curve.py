@@ -1,23 +1,40 @@
-"""P–V curve generation using ANDES continuation power flow (CPF)."""
+"""P–V curve generation using ANDES continuation power flow (CPF) or the native backend."""
 
 import os
+import uuid
 from datetime import datetime
 
-import andes
-import matplotlib
 import numpy as np
-
-# FastAPI/web runs this code in a thread pool; macOS GUI backend (macosx) only works on the main thread.
-matplotlib.use("Agg")
-import matplotlib.pyplot as plt
-
-CASE_MAP = {
-    "ieee14": "ieee14/ieee14.json",
-    "ieee39": "ieee39/ieee39_full.xlsx",
-    "ieee118": "matpower/case118.m",
-    "ieee300": "matpower/case300.m",
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from agent.pv_curve.cancellation import SimulationCancelled
+from agent.pv_curve.case_cache import CASE_MAP, case_cache
+from agent.pv_curve.grid_catalog import get_catalog
+from agent.pv_curve.native_cpf import ContinuationPowerFlow, Network
+from agent.pv_curve.plot_renderer import plot_renderer
+from agent.pv_curve.result import PVCurveResult
+from agent.pv_curve.timing import PhaseTimer, timing_stats
+from agent.pv_curve.trajectory_cache import trajectory_cache, trajectory_key
+
+# Reusable P–V figure themes for ``_build_plot``; "preview" trades resolution for speed.
+PLOT_STYLES = {
+    "default": {
+        "figsize": (8, 6),
+        "dpi": 300,
+        "upper": {"marker": "o", "linestyle": "-", "color": "blue"},
+        "lower": {"marker": "x", "linestyle": "-", "color": "red"},
+        "nose": {"color": "red"},
+        "annotation_fontsize": 9,
+    },
 }
+PLOT_STYLES["preview"] = {**PLOT_STYLES["default"], "dpi": 100}
 
+# ``mode="margin"``: refinement levels (each halves the continuation step) before giving up.
+MARGIN_MAX_LEVELS = 6
+
+# CPF solvers selectable through ``backend``; "native" is ``agent.pv_curve.native_cpf``.
+BACKENDS = ("andes", "native")
 
 def _get_output_path(grid: str) -> str:
     """Build the filesystem path for a saved P–V plot PNG.
@@ -26,63 +43,94 @@ def _get_output_path(grid: str) -> str:
         grid: Case name key (e.g. ``ieee39``) used in the output filename.
 
     Returns:
-        Full path under ``PV_CURVE_OUTPUT_DIR`` or ``generated``.
+        Full path under ``PV_CURVE_OUTPUT_DIR`` or ``generated``. A random suffix
+        keeps same-second renders from sharing a file (and a ``plot_renderer`` future).
     """
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     output_dir = os.getenv("PV_CURVE_OUTPUT_DIR") or "generated"
     os.makedirs(output_dir, exist_ok=True)
-    return os.path.join(output_dir, f"pv_curve_{grid}_{timestamp}.png")
+    return os.path.join(output_dir, f"pv_curve_{grid}_{timestamp}_{uuid.uuid4().hex[:8]}.png")
 
 
-def _apply_contingencies(ss, contingency_lines):
-    """Take transmission lines out of service before ``ss.setup()``.
+def _apply_contingencies(ss, contingency_lines, catalog):
+    """Take transmission lines out of service on a set-up system.
 
     Args:
-        ss: ANDES system loaded with ``setup=False``.
+        ss: ANDES system after ``setup()``; ``set_status`` rebuilds its connectivity.
         contingency_lines: List of ``(from_bus, to_bus)`` pairs using **bus indices**
             as in the case file (same convention as ANDES ``Bus.idx``).
+        catalog: ``GridCatalog`` of the grid ``ss`` was built from.
 
     Raises:
         ValueError: If no line exists for a given pair.
     """
-    if not contingency_lines:
-        return
-
-    for fb, tb in contingency_lines:
-        found = False
-        for uid in range(len(ss.Line.bus1.v)):
-            b1 = int(ss.Line.bus1.v[uid])
-            b2 = int(ss.Line.bus2.v[uid])
-            if {b1, b2} == {int(fb), int(tb)}:
-                ss.Line.u.v[uid] = 0
-                found = True
-        if not found:
-            raise ValueError(f"No line found between bus {fb} and bus {tb} in grid.")
+    for fb, tb in contingency_lines or ():
+        for uid in catalog.line_uids(fb, tb):
+            ss.Line.set_status(ss.Line.idx.v[uid], 0)
 
 
-def _apply_gen_voltage_setpoints(ss, gen_voltage_setpoints):
-    """Override PV generator voltage setpoints before ``ss.setup()``.
+def _apply_gen_voltage_setpoints(ss, gen_voltage_setpoints, catalog):
+    """Override PV generator voltage setpoints on a set-up system.
 
     Args:
-        ss: ANDES system loaded with ``setup=False``.
+        ss: ANDES system after ``setup()``.
         gen_voltage_setpoints: Mapping **PV device index** -> voltage magnitude in pu
             (keys must match ``ss.PV.idx``).
+        catalog: ``GridCatalog`` of the grid ``ss`` was built from.
 
     Raises:
         ValueError: If a key is not a valid PV index in this case.
     """
-    if not gen_voltage_setpoints:
-        return
-
-    valid_indices = set(int(idx) for idx in ss.PV.idx.v)
-    for gen_idx, vm_pu in gen_voltage_setpoints.items():
-        gen_idx = int(gen_idx)
-        if gen_idx not in valid_indices:
-            raise ValueError(
-                f"Generator index {gen_idx} not found in grid. Valid indices: {sorted(valid_indices)}"
-            )
-        uid = ss.PV.idx2uid(gen_idx)
-        ss.PV.v0.v[uid] = float(vm_pu)
+    for gen_idx, vm_pu in (gen_voltage_setpoints or {}).items():
+        ss.PV.set("v0", ss.PV.idx.v[catalog.pv_uid(gen_idx)], float(vm_pu))
+
+
+def _solve_power_flow(ss, warm_start=None):
+    """Run ``ss.PFlow`` from a converged bus solution, falling back to the case's own start.
+
+    Args:
+        ss: ANDES system after ``setup()``.
+        warm_start: Optional ``{"v": ..., "a": ...}`` bus voltage magnitudes / angles
+            (one entry per bus) from a converged power flow of the same grid.
+
+    Returns:
+        Tuple ``(iterations, warm_started)``: Newton iterations over every attempt and
+        whether the warm-started solve converged.
+    """
+    if warm_start is None or len(warm_start["v"]) != ss.Bus.n:
+        ss.PFlow.run()
+        return ss.PFlow.niter + 1, False
+
+    # PFlow initializes bus voltages from v0 / a0, so seeding them is a warm start.
+    v0, a0 = ss.Bus.v0.v.copy(), ss.Bus.a0.v.copy()
+    ss.Bus.v0.v[:] = warm_start["v"]
+    ss.Bus.a0.v[:] = warm_start["a"]
+    if ss.PFlow.run():
+        return ss.PFlow.niter + 1, True
+
+    iterations = ss.PFlow.niter + 1
+    ss.Bus.v0.v[:] = v0
+    ss.Bus.a0.v[:] = a0
+    ss.PFlow.run()
+    return iterations + ss.PFlow.niter + 1, False
+
+
+def _base_state(grid):
+    """Return the converged intact base-case ``{"v", "a"}`` bus solution of ``grid``.
+
+    Solved once per process and kept in ``case_cache``; None if it does not converge.
+    """
+    state = case_cache.get_base_state(grid)
+    if state is None:
+        ss = case_cache.acquire(grid)
+        try:
+            case_cache.setup(ss)
+            if ss.PFlow.run():
+                state = {"v": ss.Bus.v.v.copy(), "a": ss.Bus.a.v.copy()}
+                case_cache.set_base_state(grid, state)
+        finally:
+            case_cache.release(grid, ss)
+    return state
 
 
 def _build_targets(ss, max_scale, power_factor, capacitive):
@@ -98,49 +146,671 @@ def _build_targets(ss, max_scale, power_factor, capacitive):
         Tuple ``(p0_base, p0_target, q0_target)`` as arrays suitable for ``ss.CPF.run``.
     """
     p0_base = ss.PQ.p0.v.copy()
+    return (p0_base, *_load_targets(p0_base, max_scale, power_factor, capacitive))
+
+
+def _load_targets(p0_base, max_scale, power_factor, capacitive):
+    """Return ``(p0_target, q0_target)`` for base PQ ``p0`` (see ``_build_targets``)."""
     p0_target = p0_base * float(max_scale)
     sign = -1 if capacitive else 1
     q0_target = sign * p0_target * np.tan(np.arccos(float(power_factor)))
-    return p0_base, p0_target, q0_target
+    return p0_target, q0_target
 
 
-def _build_plot(P_vals, V_vals, nose_idx, target_bus_idx, save_path):
+def _build_plot(P_vals, V_vals, nose_idx, target_bus_idx, save_path, style="default"):
     """Save a P–V figure (MW vs pu voltage) for the monitored bus.
 
+    Draws on a private ``Figure`` / Agg canvas rather than pyplot, so concurrent
+    calls from worker threads never share figure state.
+
     Args:
         P_vals: Sequence of total active load (MW) at each CPF point.
         V_vals: Sequence of voltage magnitude (pu) at the monitored bus.
         nose_idx: Index into ``P_vals`` / ``V_vals`` of the nose (max load) point.
         target_bus_idx: Bus index (same numbering as inputs) for axis label.
         save_path: Output PNG path.
+        style: Key into ``PLOT_STYLES``.
     """
-    plt.figure(figsize=(8, 6))
+    theme = PLOT_STYLES[style]
+    fig = Figure(figsize=theme["figsize"])
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
 
     # If CPF traced full curve, split into upper/lower around the nose.
     if 0 < nose_idx < len(P_vals) - 1:
-        plt.plot(P_vals[: nose_idx + 1], V_vals[: nose_idx + 1], marker="o", linestyle="-", color="blue", label="Upper Branch")
-        plt.plot(P_vals[nose_idx:], V_vals[nose_idx:], marker="x", linestyle="-", color="red", label="Lower Branch")
+        ax.plot(P_vals[: nose_idx + 1], V_vals[: nose_idx + 1], label="Upper Branch", **theme["upper"])
+        ax.plot(P_vals[nose_idx:], V_vals[nose_idx:], label="Lower Branch", **theme["lower"])
     else:
-        plt.plot(P_vals, V_vals, marker="o", linestyle="-", color="blue", label="PV Curve")
+        ax.plot(P_vals, V_vals, label="PV Curve", **theme["upper"])
 
     nose_p = P_vals[nose_idx]
     nose_v = V_vals[nose_idx]
-    plt.scatter(nose_p, nose_v, color="red", zorder=5, label="Nose Point")
-    plt.annotate(
+    ax.scatter(nose_p, nose_v, zorder=5, label="Nose Point", **theme["nose"])
+    ax.annotate(
         f"P={nose_p:.1f} MW\nV={nose_v:.3f} pu",
         xy=(nose_p, nose_v),
         xytext=(nose_p * 1.005, nose_v),
         arrowprops=dict(arrowstyle="->", color="black"),
-        fontsize=9,
+        fontsize=theme["annotation_fontsize"],
     )
 
-    plt.xlabel("Total Active Load P (MW)")
-    plt.ylabel(f"Voltage at Bus {target_bus_idx} (pu)")
-    plt.title("System P–V Curve (Voltage Stability Analysis)")
-    plt.grid(True)
-    plt.legend()
-    plt.savefig(save_path, dpi=300, bbox_inches="tight")
-    plt.close()
+    ax.set_xlabel("Total Active Load P (MW)")
+    ax.set_ylabel(f"Voltage at Bus {target_bus_idx} (pu)")
+    ax.set_title("System P–V Curve (Voltage Stability Analysis)")
+    ax.grid(True)
+    ax.legend()
+    fig.savefig(save_path, dpi=theme["dpi"], bbox_inches="tight")
+
+
+def _check_target_bus(bus_idx, target_bus_idx, grid):
+    """Return the row (uid) of ``target_bus_idx`` in a bus index array.
+
+    Raises:
+        ValueError: If the bus is not part of the grid.
+    """
+    matches = np.flatnonzero(np.asarray(bus_idx) == int(target_bus_idx))
+    if matches.size == 0:
+        raise ValueError(
+            f"Bus {target_bus_idx} not found in grid '{grid}'. Valid range: {min(bus_idx)} to {max(bus_idx)}."
+        )
+    return int(matches[0])
+
+
+def _observe_points(ss, on_point):
+    """Call ``on_point(step, lam, V)`` for each accepted CPF point of ``ss`` while it runs.
+
+    ANDES has no per-step hook, but ``CPF._bus_vmag`` is called exactly when a
+    point is recorded (checked against the ``andes`` version pinned in
+    requirements.txt), so it is wrapped on this (private) system instance only.
+    The final refinement of a FULL / lambda-target run re-reads the last point
+    before ``_lam_last`` moves; that call is not reported again.
+    Exceptions raised by ``on_point`` abort ``CPF.run``.
+
+    Returns:
+        False if this ANDES version has no ``_bus_vmag`` to wrap; the caller then
+        reports the points after the run.
+    """
+    cpf = ss.CPF
+    bus_vmag = getattr(cpf, "_bus_vmag", None)
+    if not callable(bus_vmag):
+        return False
+    last = {"step": -1, "lam": None}
+
+    def _reporting_bus_vmag():
+        V = bus_vmag()
+        lam = 0.0 if last["step"] < 0 else float(getattr(cpf, "_lam_last", 0.0))
+        if lam != last["lam"]:
+            last["step"] += 1
+            last["lam"] = lam
+            on_point(last["step"], lam, V)
+        return V
+
+    cpf._bus_vmag = _reporting_bus_vmag
+    return True
+
+
+def _point_reporter(progress, cancel_token, recorded, base_p_mw, max_scale, target_uid, lam_offset=0.0):
+    """Build the per-point ``on_point(step, lam, V)`` hook shared by both backends.
+
+    Checks ``cancel_token`` (keeping converged points in ``recorded``) and
+    forwards a summary dict to ``progress``; ``lam_offset`` maps the solver's
+    lambda back onto the original scale.
+    """
+
+    def _on_point(step, lam_k, V_k):
+        lam_k += lam_offset
+        if cancel_token is not None:
+            cancel_token.check(step)
+            recorded[step] = (lam_k, np.array(V_k, dtype=float))
+        if progress is not None:
+            progress(
+                {
+                    "step": step,
+                    "lambda": lam_k,
+                    "load_mw": float(base_p_mw * (1.0 + lam_k * (float(max_scale) - 1.0))),
+                    "voltage_pu": float(V_k[target_uid]) if target_uid is not None else None,
+                    "min_voltage_pu": float(np.min(V_k)),
+                }
+            )
+
+    return _on_point
+
+
+def _recorded_trajectory(recorded):
+    """``(lam, V)`` from the points a cancelled run recorded."""
+    steps = sorted(recorded)
+    lam = np.array([recorded[k][0] for k in steps], dtype=float)
+    V = np.column_stack([recorded[k][1] for k in steps]).astype(float)
+    return lam, V
+
+
+def _run_cpf(
+    grid,
+    target_bus_idx,
+    step_size,
+    max_scale,
+    power_factor,
+    capacitive,
+    continuation,
+    contingency_lines,
+    gen_voltage_setpoints,
+    progress=None,
+    cancel_token=None,
+    warm_start=None,
+    start_lambda=0.0,
+    step_max=None,
+    backend="andes",
+):
+    """Run power flow and CPF on a working system of ``grid`` checked out of ``case_cache``.
+
+    ``target_bus_idx`` (optional) is only validated up front so a bad bus fails
+    before the (expensive) simulation; the returned trajectory covers every bus.
+    ``progress`` (optional) is called with a dict (``step``, ``lambda``,
+    ``load_mw``, ``voltage_pu`` at the target bus, ``min_voltage_pu``) per CPF point.
+    ``cancel_token`` (optional ``CancellationToken``) is checked after every point;
+    when it fires the run stops and the points converged so far are returned with
+    ``cancelled`` set to the reason.
+    The power flow starts from ``warm_start`` (``{"v", "a"}`` bus solution) or, if
+    omitted, from the grid's cached converged base case; an intact base-case run
+    stores that state for later variants.
+    ``start_lambda`` > 0 restarts the continuation partway up the curve (loads
+    pre-scaled to that lambda, same load direction); returned ``lam`` values stay
+    on the original scale. ``step_max`` caps the adaptive step growth.
+    ``backend`` selects ANDES or the native NumPy/SciPy solver (``_run_native_cpf``);
+    both return the same trajectory layout.
+
+    Returns:
+        Dict with ``lam`` (points,), ``V`` (buses x points), ``bus_idx`` (buses,),
+        ``base_p_mw`` (total base-case PQ load in MW), convergence flags
+        ``pflow_converged`` / ``cpf_converged`` / ``done_msg``, ``cancelled``,
+        ``pflow_iterations``, ``warm_start`` (True if the warm-started power flow
+        converged) and ``timings`` (seconds per engine phase).
+
+    Raises:
+        SimulationCancelled: If the token fired before two CPF points converged.
+    """
+    if cancel_token is not None:
+        cancel_token.check()
+
+    # Reject bad indices from the pre-indexed catalog before building a system.
+    catalog = get_catalog(grid)
+    if target_bus_idx is not None:
+        catalog.validate_bus(target_bus_idx)
+    catalog.validate_contingencies(contingency_lines)
+    for gen_idx in gen_voltage_setpoints or {}:
+        catalog.pv_uid(gen_idx)
+    if backend == "native":
+        return _run_native_cpf(
+            grid, catalog, target_bus_idx, step_size, max_scale, power_factor, capacitive, continuation,
+            contingency_lines, gen_voltage_setpoints, progress, cancel_token, warm_start, start_lambda, step_max,
+        )
+    if backend != "andes":
+        raise ValueError(f"Unknown backend '{backend}'. Choose from {list(BACKENDS)}")
+
+    timer = PhaseTimer()
+    with timer.phase("case_load"):
+        # A pooled working system of this grid restored to the case data, or a new one;
+        # each call has it to itself until it is released.
+        ss = case_cache.acquire(grid)
+    try:
+        bus_idx = np.array([int(idx) for idx in ss.Bus.idx.v], dtype=int)
+        target_uid = None
+        if target_bus_idx is not None:
+            target_uid = _check_target_bus(bus_idx, target_bus_idx, grid)
+
+        with timer.phase("setup"):
+            case_cache.setup(ss)
+
+        with timer.phase("contingencies"):
+            _apply_contingencies(ss, contingency_lines, catalog)
+            _apply_gen_voltage_setpoints(ss, gen_voltage_setpoints, catalog)
+
+        p0_base, p0_target, q0_target = _build_targets(ss, max_scale, power_factor, capacitive)
+        base_mva = float(getattr(getattr(ss, "config", object()), "mva", 100.0))
+        base_p_mw = float(np.sum(p0_base) * base_mva)
+        start_lambda = float(start_lambda)
+        if start_lambda:
+            q0_base = ss.PQ.q0.v.copy()
+            dp0, dq0 = p0_target - p0_base, q0_target - q0_base
+            ss.PQ.p0.v[:] = p0_base + start_lambda * dp0
+            ss.PQ.q0.v[:] = q0_base + start_lambda * dq0
+            p0_target = p0_base + (start_lambda + 1.0) * dp0
+            q0_target = q0_base + (start_lambda + 1.0) * dq0
+            # CPF turns off the constant-Z conversion of low-voltage loads; the restart power flow must match.
+            ss.PQ.vcmp.enable = False
+
+        base_state = case_cache.get_base_state(grid)
+        with timer.phase("pflow"):
+            pflow_iterations, warm_started = _solve_power_flow(ss, None if start_lambda else warm_start or base_state)
+        intact = not contingency_lines and not gen_voltage_setpoints and not start_lambda
+        if ss.PFlow.converged and base_state is None and intact:
+            case_cache.set_base_state(grid, {"v": ss.Bus.v.v.copy(), "a": ss.Bus.a.v.copy()})
+
+        ss.CPF.config.step = float(step_size)
+        ss.CPF.config.stop_at = "FULL" if continuation else "NOSE"
+        if step_max is not None:
+            ss.CPF.config.step_max = float(step_max)
+        recorded = {}
+        replay = None
+        if progress is not None or cancel_token is not None:
+            on_point = _point_reporter(progress, cancel_token, recorded, base_p_mw, max_scale, target_uid, start_lambda)
+            if not _observe_points(ss, on_point):
+                replay = on_point
+
+        cancelled = None
+        try:
+            with timer.phase("cpf"):
+                ss.CPF.run(p0_target=p0_target, q0_target=q0_target)
+            if replay is not None and ss.CPF.lam is not None:
+                # No per-point hook: report every point once the run has finished.
+                for step, lam_k in enumerate(ss.CPF.lam):
+                    replay(step, float(lam_k), ss.CPF.V[:, step])
+        except SimulationCancelled as exc:
+            if len(recorded) < 2:
+                raise
+            cancelled = str(exc)
+
+        if cancelled is not None:
+            lam, V = _recorded_trajectory(recorded)
+        # CPF leaves lam / V unset when the base-case power flow does not converge.
+        elif ss.CPF.lam is None:
+            lam = np.empty(0, dtype=float)
+            V = np.empty((bus_idx.size, 0), dtype=float)
+        else:
+            lam = start_lambda + np.array(ss.CPF.lam, dtype=float)
+            V = np.array(ss.CPF.V, dtype=float)
+
+        return {
+            "lam": lam,
+            "V": V,
+            "bus_idx": bus_idx,
+            "base_p_mw": base_p_mw,
+            "pflow_converged": bool(ss.PFlow.converged),
+            "cpf_converged": cancelled is None and bool(getattr(ss.CPF, "converged", False)),
+            "done_msg": cancelled or str(getattr(ss.CPF, "done_msg", "") or ""),
+            "cancelled": cancelled,
+            "pflow_iterations": pflow_iterations,
+            "warm_start": warm_started,
+            "timings": timer.timings,
+        }
+    finally:
+        case_cache.release(grid, ss)
+
+
+def _run_native_cpf(
+    grid,
+    catalog,
+    target_bus_idx,
+    step_size,
+    max_scale,
+    power_factor,
+    capacitive,
+    continuation,
+    contingency_lines,
+    gen_voltage_setpoints,
+    progress,
+    cancel_token,
+    warm_start,
+    start_lambda,
+    step_max,
+):
+    """``_run_cpf`` on the native backend; inputs are already validated against ``catalog``.
+
+    The network is built from the same cached case template as the ANDES path,
+    and ``start_lambda`` simply starts the continuation at that loading.
+    """
+    timer = PhaseTimer()
+    with timer.phase("case_load"):
+        template = case_cache.get_template(grid)
+
+    with timer.phase("contingencies"):
+        outages = [uid for fb, tb in contingency_lines or () for uid in catalog.line_uids(fb, tb)]
+        setpoints = {catalog.pv_uid(idx): float(vm) for idx, vm in (gen_voltage_setpoints or {}).items()}
+
+    with timer.phase("setup"):
+        net = Network(template, outages, setpoints)
+        p0_target, q0_target = _load_targets(net.p0, max_scale, power_factor, capacitive)
+        cpf = ContinuationPowerFlow(net, p0_target, q0_target)
+
+    bus_idx = net.bus_idx
+    target_uid = _check_target_bus(bus_idx, target_bus_idx, grid) if target_bus_idx is not None else None
+    base_p_mw = float(np.sum(net.p0) * catalog.mva)
+    start_lambda = float(start_lambda)
+
+    base_state = case_cache.get_base_state(grid)
+    with timer.phase("pflow"):
+        pflow_converged, pflow_iterations, warm_started = cpf.solve_power_flow(
+            start_lambda, warm_start or base_state
+        )
+    intact = not contingency_lines and not gen_voltage_setpoints and not start_lambda
+    if pflow_converged and base_state is None and intact:
+        case_cache.set_base_state(grid, {"v": cpf.vm.copy(), "a": cpf.va.copy()})
+
+    recorded = {}
+    on_point = None
+    if progress is not None or cancel_token is not None:
+        on_point = _point_reporter(progress, cancel_token, recorded, base_p_mw, max_scale, target_uid)
+
+    cancelled = None
+    cpf_converged = False
+    if pflow_converged:
+        try:
+            with timer.phase("cpf"):
+                cpf_converged = cpf.run(
+                    step_size,
+                    "FULL" if continuation else "NOSE",
+                    lam0=start_lambda,
+                    step_max=step_max,
+                    on_point=on_point,
+                )
+        except SimulationCancelled as exc:
+            if len(recorded) < 2:
+                raise
+            cancelled = str(exc)
+
+    if cancelled is not None:
+        lam, V = _recorded_trajectory(recorded)
+    elif cpf.lam is None:
+        lam = np.empty(0, dtype=float)
+        V = np.empty((bus_idx.size, 0), dtype=float)
+    else:
+        lam, V = cpf.lam, cpf.V
+
+    return {
+        "lam": lam,
+        "V": V,
+        "bus_idx": bus_idx,
+        "base_p_mw": base_p_mw,
+        "pflow_converged": bool(pflow_converged),
+        "cpf_converged": cancelled is None and bool(cpf_converged),
+        "done_msg": cancelled or cpf.done_msg,
+        "cancelled": cancelled,
+        "pflow_iterations": pflow_iterations,
+        "warm_start": warm_started,
+        "timings": timer.timings,
+    }
+
+
+def _parabolic_nose(lam, V):
+    """Estimate the nose lambda from the three highest-lambda points.
+
+    Near the nose, lambda is locally quadratic in the weakest bus voltage, so the
+    vertex of ``lambda(V)`` through those points approximates the true maximum
+    between (or just beyond) the sampled points.
+
+    Returns:
+        Estimated maximum lambda (never below the best sampled point), or None
+        with fewer than three distinct points or no concave fit.
+    """
+    if lam.size < 3:
+        return None
+    top = np.sort(np.argsort(lam)[-3:])
+    weakest = int(np.argmin(V[:, top[-1]]))
+    x, y = V[weakest, top], lam[top]
+    if np.unique(x).size < 3:
+        return None
+    a, b, c = np.polyfit(x, y, 2)
+    if a >= 0:
+        return None
+    return max(float(c - b * b / (4.0 * a)), float(lam.max()))
+
+
+def _refine_nose(
+    grid,
+    step_size,
+    max_scale,
+    power_factor,
+    capacitive,
+    contingency_lines,
+    gen_voltage_setpoints,
+    tolerance_mw,
+    max_levels=MARGIN_MAX_LEVELS,
+    progress=None,
+    cancel_token=None,
+    backend="andes",
+):
+    """Trace the upper branch coarsely, then refine only around the nose.
+
+    Each level restarts the continuation from the last point before the current
+    maximum with half the previous step, and the nose is estimated by
+    ``_parabolic_nose``. Refinement stops once the estimate moves by no more
+    than ``tolerance_mw`` (for level 0: once the fitted vertex is within
+    ``tolerance_mw`` of the best sampled point).
+
+    Returns:
+        ``_run_cpf``-style trajectory over the upper branch up to the sampled
+        nose, plus ``margin`` (``lambda``, ``load_margin_mw``, ``tolerance_mw``
+        achieved, ``requested_tolerance_mw``, ``converged``, ``levels``,
+        ``cpf_points`` computed across all levels).
+    """
+    trajectory = _run_cpf(
+        grid, None, step_size, max_scale, power_factor, capacitive, False, contingency_lines,
+        gen_voltage_setpoints, progress=progress, cancel_token=cancel_token, backend=backend,
+    )
+    lam, V = trajectory["lam"], trajectory["V"]
+    timer = PhaseTimer()
+    timer.update(trajectory["timings"])
+    mw_per_lambda = trajectory["base_p_mw"] * (float(max_scale) - 1.0)
+    cpf_points = int(lam.size)
+    pflow_iterations = trajectory["pflow_iterations"]
+
+    estimate = _parabolic_nose(lam, V) if lam.size else None
+    error_mw = float(abs(estimate - lam.max()) * mw_per_lambda) if estimate is not None else float("inf")
+    level, step = 0, float(step_size)
+    while error_mw > tolerance_mw and level < max_levels and not trajectory["cancelled"]:
+        nose = int(np.argmax(lam))
+        if nose == 0:
+            break
+        step /= 2.0
+        refined = _run_cpf(
+            grid, None, step, max_scale, power_factor, capacitive, False, contingency_lines,
+            gen_voltage_setpoints, cancel_token=cancel_token, start_lambda=float(lam[nose - 1]), step_max=step,
+            backend=backend,
+        )
+        timer.update(refined["timings"])
+        pflow_iterations += refined["pflow_iterations"]
+        cpf_points += int(refined["lam"].size)
+        if not refined["pflow_converged"] or refined["lam"].size < 2:
+            break
+        # The restart point duplicates the last kept point.
+        lam = np.concatenate([lam[:nose], refined["lam"][1:]])
+        V = np.concatenate([V[:, :nose], refined["V"][:, 1:]], axis=1)
+        level += 1
+        new_estimate = _parabolic_nose(lam, V)
+        if new_estimate is None:
+            new_estimate = float(lam.max())
+        error_mw = float(abs(new_estimate - estimate) * mw_per_lambda) if estimate is not None else float("inf")
+        estimate = new_estimate
+        if refined["cancelled"]:
+            trajectory = {**trajectory, "cancelled": refined["cancelled"]}
+
+    if lam.size:
+        end = int(np.argmax(lam)) + 1
+        lam, V = lam[:end], V[:, :end]
+    if estimate is None and lam.size:
+        estimate = float(lam.max())
+    return {
+        **trajectory,
+        "lam": lam,
+        "V": V,
+        "done_msg": trajectory["cancelled"] or trajectory["done_msg"],
+        "pflow_iterations": pflow_iterations,
+        "timings": timer.timings,
+        "margin": {
+            "lambda": estimate,
+            "load_margin_mw": estimate * mw_per_lambda if estimate is not None else None,
+            "tolerance_mw": error_mw,
+            "requested_tolerance_mw": float(tolerance_mw),
+            "converged": error_mw <= tolerance_mw,
+            "levels": level,
+            "cpf_points": cpf_points,
+        },
+    }
+
+
+def rank_buses(lam, V, bus_idx, top_k=None):
+    """Rank buses by nose-point voltage and by voltage sensitivity dV/dλ.
+
+    Sensitivity is the finite-difference slope of each bus voltage over the last
+    upper-branch segment before the nose (the CPF tangent direction), so the
+    buses that collapse fastest come first.
+
+    Args:
+        lam: Continuation parameter per point, shape ``(points,)``.
+        V: Bus voltage magnitudes, shape ``(buses, points)``.
+        bus_idx: Bus index for each row of ``V``.
+        top_k: Optional number of buses to keep in each ranking.
+
+    Returns:
+        Dict with ``nose_index`` plus ``by_nose_voltage`` (lowest first) and
+        ``by_sensitivity`` (largest ``|dV/dλ|`` first) lists of
+        ``{"bus", "nose_voltage_pu", "dv_dlambda"}`` rows.
+    """
+    lam = np.asarray(lam, dtype=float)
+    V = np.asarray(V, dtype=float)
+    bus_idx = np.asarray(bus_idx)
+
+    nose = int(np.argmax(lam))
+    nose_v = V[:, nose]
+    if nose > 0 and lam[nose] != lam[nose - 1]:
+        dv_dlam = (V[:, nose] - V[:, nose - 1]) / (lam[nose] - lam[nose - 1])
+    else:
+        dv_dlam = np.zeros_like(nose_v)
+
+    def _rows(order):
+        order = order[:top_k] if top_k else order
+        return [
+            {"bus": int(bus_idx[i]), "nose_voltage_pu": float(nose_v[i]), "dv_dlambda": float(dv_dlam[i])}
+            for i in order
+        ]
+
+    return {
+        "nose_index": nose,
+        "by_nose_voltage": _rows(np.argsort(nose_v, kind="stable")),
+        "by_sensitivity": _rows(np.argsort(-np.abs(dv_dlam), kind="stable")),
+    }
+
+
+def _curve_result(
+    trajectory,
+    timer,
+    grid,
+    target_bus_idx,
+    max_scale,
+    power_factor,
+    voltage_limit,
+    capacitive,
+    contingency_lines,
+    gen_voltage_setpoints,
+    skip_plot=True,
+    async_plot=False,
+    all_buses=False,
+    cpf_cached=False,
+    mode="curve",
+    backend="andes",
+):
+    """Turn a CPF trajectory into the ``generate_pv_curve`` result for ``target_bus_idx``.
+
+    Post-processing (voltage-limit truncation, nose, plot) only; ``timer`` collects
+    its phases. Arguments as in ``generate_pv_curve``.
+
+    Raises:
+        ValueError: Invalid bus or no CPF points.
+    """
+    with timer.phase("post_processing"):
+        bus_uid = _check_target_bus(trajectory["bus_idx"], target_bus_idx, grid)
+        lam = np.array(trajectory["lam"], dtype=float)
+        # Solver steps before voltage-limit truncation; every refinement level in margin mode.
+        cpf_points = trajectory["margin"]["cpf_points"] if trajectory.get("margin") else int(lam.size)
+        voltages = np.array(trajectory["V"][bus_uid, :], dtype=float)
+
+        # convert p.u. base load into MV
+        base_p_mw = trajectory["base_p_mw"]
+        loads_mw = base_p_mw * (1.0 + lam * (float(max_scale) - 1.0))
+
+        # stop tracking when voltage goes below the limit.
+        below_limit_idx = np.where(voltages < float(voltage_limit))[0]
+        end_idx = lam.size
+        if below_limit_idx.size > 0:
+            end_idx = int(below_limit_idx[0]) + 1
+            loads_mw = loads_mw[:end_idx]
+            voltages = voltages[:end_idx]
+            lam = lam[:end_idx]
+
+        if len(loads_mw) == 0:
+            raise ValueError("No CPF result points were produced.")
+
+        max_p_idx = int(np.argmax(loads_mw))
+        nose_p, nose_v = float(loads_mw[max_p_idx]), float(voltages[max_p_idx])
+        p_first, p_last = float(loads_mw[0]), float(loads_mw[-1])
+        v_first, v_last = float(voltages[0]), float(voltages[-1])
+
+    save_path = None
+    plot_pending = False
+    if not skip_plot:
+        save_path = _get_output_path(grid)
+        with timer.phase("plotting"):
+            if async_plot:
+                plot_renderer.submit(_build_plot, loads_mw, voltages, max_p_idx, int(target_bus_idx), save_path, save_path=save_path)
+                plot_pending = True
+            else:
+                _build_plot(loads_mw, voltages, max_p_idx, int(target_bus_idx), save_path)
+
+    result = PVCurveResult(
+        loads_mw,
+        voltages,
+        {
+            "grid_system": grid,
+            "target_bus": int(target_bus_idx),
+            "power_factor": power_factor,
+            "capacitive_load": capacitive,
+            "contingency_lines": contingency_lines,
+            "gen_voltage_setpoints": gen_voltage_setpoints,
+        },
+        nose_point={
+            "load_mw": nose_p,
+            "voltage_pu": nose_v,
+            "index": max_p_idx,
+        },
+        initial_conditions={
+            "load_mw": p_first,
+            "voltage_pu": v_first,
+        },
+        final_conditions={
+            "load_mw": p_last,
+            "voltage_pu": v_last,
+        },
+        voltage_drop_total=v_first - v_last,
+        voltage_drop_percent_total=(v_first - v_last) / v_first * 100 if v_first > 0 else 0,
+        load_margin_mw=nose_p - p_first,
+        load_margin_percent=(nose_p - p_first) / p_first * 100 if p_first > 0 else 0,
+        converged_steps=int(loads_mw.size),
+        cpf_points=cpf_points,
+        voltage_limit=voltage_limit,
+        save_path=save_path,
+        plot_pending=plot_pending,
+        cpf_cached=cpf_cached,
+        cancelled=trajectory.get("cancelled"),
+        pflow_iterations=trajectory.get("pflow_iterations"),
+        warm_start=trajectory.get("warm_start"),
+        mode=mode,
+        backend=backend,
+    )
+    margin = trajectory.get("margin")
+    if margin is not None:
+        result["margin"] = dict(margin)
+        if margin["load_margin_mw"] is not None:
+            result["load_margin_mw"] = float(margin["load_margin_mw"])
+            result["load_margin_percent"] = float(margin["load_margin_mw"] / p_first * 100) if p_first > 0 else 0
+    if all_buses:
+        with timer.phase("post_processing"):
+            # Reuse the full matrix CPF already computed instead of one run per bus.
+            bus_voltages = trajectory["V"][:, :end_idx]
+            result["bus_voltages"] = np.asarray(bus_voltages, dtype=np.float32)
+            result["bus_indices"] = [int(idx) for idx in trajectory["bus_idx"]]
+            result["bus_ranking"] = rank_buses(lam, bus_voltages, trajectory["bus_idx"])
+
+    return result
 
 
 def generate_pv_curve(
@@ -155,8 +825,16 @@ def generate_pv_curve(
     contingency_lines=None,
     gen_voltage_setpoints=None,
     continuation=True,
+    use_cache=True,
+    all_buses=False,
+    async_plot=False,
+    progress_callback=None,
+    cancel_token=None,
+    mode="curve",
+    margin_tol_mw=1.0,
+    backend="andes",
 ):
-    """Run ANDES CPF and return a summary dict plus optional P–V plot.
+    """Run CPF (ANDES or the native backend) and return a summary dict plus optional P–V plot.
 
     Uses uniform PQ scaling toward ``p0 * max_scale`` with Q derived from
     ``power_factor`` and ``capacitive``, per ANDES CPF ``p0_target`` / ``q0_target``.
@@ -170,124 +848,93 @@ def generate_pv_curve(
         voltage_limit: Results are truncated after voltage first drops below this (pu).
         capacitive: If True, leading reactive convention for Q targets.
         skip_plot: If True, do not write a PNG; ``save_path`` in the result is None.
-        contingency_lines: Optional list of ``(from_bus, to_bus)`` line outages before setup.
-        gen_voltage_setpoints: Optional ``{pv_idx: vm_pu}`` before setup.
+        contingency_lines: Optional list of ``(from_bus, to_bus)`` line outages.
+        gen_voltage_setpoints: Optional ``{pv_idx: vm_pu}`` generator voltage overrides.
         continuation: If True, ``stop_at='FULL'``; else ``stop_at='NOSE'``.
+        use_cache: If True, reuse a cached CPF trajectory for identical physics inputs.
+        all_buses: If True, also return ``bus_voltages`` (float32 bus x point matrix over
+            the reported points), ``bus_indices`` and a weakest-bus ``bus_ranking``.
+        async_plot: If True, hand the PNG to the background ``plot_renderer`` and return
+            before it is written; ``plot_renderer.get(save_path)`` yields its future.
+        progress_callback: Optional callable receiving one dict per CPF point while the
+            simulation runs (``step``, ``lambda``, ``load_mw``, ``voltage_pu`` at
+            ``target_bus_idx``, ``min_voltage_pu``). Not called on a trajectory cache hit.
+        cancel_token: Optional ``CancellationToken``; when it fires (user cancel, wall-clock
+            or step budget) the run stops and the curve converged so far is returned.
+        mode: ``"curve"`` traces the full P–V curve at ``step_size``. ``"margin"`` traces
+            only the upper branch with ``step_size`` as a coarse step and refines around
+            the nose (``_refine_nose``); ``continuation`` is ignored.
+        margin_tol_mw: Target load-margin accuracy (MW) for ``mode="margin"``.
+        backend: ``"andes"`` or ``"native"`` (``agent.pv_curve.native_cpf``: same case data
+            and load model, NumPy/SciPy Newton solver; much faster on interactive-sized grids).
 
     Returns:
-        Dict with curve arrays, nose metadata, limits, and ``save_path``.
+        ``PVCurveResult`` (dict-like; ``to_dict()`` gives the plain dict) with curve columns, nose metadata, limits, ``save_path``, ``plot_pending``,
+        ``cpf_cached``, ``cancelled`` (reason string for a partial curve, else None),
+        ``converged_steps`` (reported points) and ``cpf_points`` (converged CPF steps
+        before voltage-limit truncation),
+        ``pflow_iterations`` / ``warm_start`` (see ``_run_cpf``), ``mode``, ``backend`` and
+        ``timings`` (seconds per engine phase that ran, plus ``total``; see
+        ``agent.pv_curve.timing``). Partial curves are never cached. In margin mode
+        ``load_margin_mw`` / ``load_margin_percent`` use the refined nose estimate and
+        ``margin`` reports it with the achieved ``tolerance_mw``.
 
     Raises:
-        ValueError: Unknown grid, invalid bus, no CPF points, or invalid contingencies / setpoints.
+        ValueError: Unknown grid / mode / backend, invalid bus, no CPF points, or invalid contingencies / setpoints.
+        SimulationCancelled: The token fired before any CPF point past the base case converged.
     """
     if grid not in CASE_MAP:
         raise ValueError(f"Unsupported grid '{grid}'. Choose from {list(CASE_MAP)}")
-
-    ss = andes.load(andes.get_case(CASE_MAP[grid]), setup=False)
-
-    bus_indices = set(int(idx) for idx in ss.Bus.idx.v)
-    if int(target_bus_idx) not in bus_indices:
-        raise ValueError(
-            f"Bus {target_bus_idx} not found in grid '{grid}'. Valid range: {min(bus_indices)} to {max(bus_indices)}."
+    if mode not in ("curve", "margin"):
+        raise ValueError(f"Unknown mode '{mode}'. Choose from ['curve', 'margin']")
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}'. Choose from {list(BACKENDS)}")
+    if mode == "margin":
+        if margin_tol_mw <= 0:
+            raise ValueError("margin_tol_mw must be positive.")
+        continuation = False
+
+    # Only physics-relevant inputs key the cache; bus / limit / plot changes reuse the trajectory.
+    key = trajectory_key(
+        grid, step_size, max_scale, power_factor, capacitive, continuation,
+        contingency_lines, gen_voltage_setpoints,
+    )
+    if mode == "margin":
+        key += ("margin", float(margin_tol_mw))
+    if backend != "andes":
+        key += ("backend", backend)
+    timer = PhaseTimer()
+    with timer.phase("cache_lookup"):
+        trajectory = trajectory_cache.get(key) if use_cache else None
+    cpf_cached = trajectory is not None
+    if trajectory is None and mode == "margin":
+        get_catalog(grid).validate_bus(target_bus_idx)
+        trajectory = _refine_nose(
+            grid, step_size, max_scale, power_factor, capacitive, contingency_lines,
+            gen_voltage_setpoints, margin_tol_mw, progress=progress_callback, cancel_token=cancel_token,
+            backend=backend,
         )
-
-    _apply_contingencies(ss, contingency_lines)
-    _apply_gen_voltage_setpoints(ss, gen_voltage_setpoints)
-
-    ss.setup()
-    ss.PFlow.run()
-
-    p0_base, p0_target, q0_target = _build_targets(ss, max_scale, power_factor, capacitive)
-
-    ss.CPF.config.step = float(step_size)
-    ss.CPF.config.stop_at = "FULL" if continuation else "NOSE"
-    ss.CPF.run(p0_target=p0_target, q0_target=q0_target)
-
-    bus_uid = ss.Bus.idx2uid(int(target_bus_idx))
-    lam = np.array(ss.CPF.lam, dtype=float)
-    voltages = np.array(ss.CPF.V[bus_uid, :], dtype=float)
-    # print(f"bus_uid: {bus_uid}\n, lam: {lam}\n, voltages: {voltages}\n")
-
-    # convert p.u. base load into MV
-    base_mva = float(getattr(getattr(ss, "config", object()), "mva", 100.0))
-    base_p_mw = float(np.sum(p0_base) * base_mva)
-    loads_mw = base_p_mw * (1.0 + lam * (float(max_scale) - 1.0))
-    print(f"base_mva: {base_mva},\n base_p_mw: {base_p_mw},\n loads_mw: {loads_mw}\n")
-
-    # stop tracking when voltage goes below the limit.
-    below_limit_idx = np.where(voltages < float(voltage_limit))[0]
-    if below_limit_idx.size > 0:
-        end_idx = int(below_limit_idx[0]) + 1
-        loads_mw = loads_mw[:end_idx]
-        voltages = voltages[:end_idx]
-        lam = lam[:end_idx]
-        # print(end_idx)
-
-    if len(loads_mw) == 0:
-        raise ValueError("No CPF result points were produced.")
-
-    P_vals = [float(v) for v in loads_mw.tolist()]
-    V_vals = [float(v) for v in voltages.tolist()]
-    max_p_idx = int(np.argmax(P_vals))
-    nose_p = P_vals[max_p_idx]
-    nose_v = V_vals[max_p_idx]
-    # print(bus_uid, lam, voltages)
-    save_path = None
-    if not skip_plot:
-        save_path = _get_output_path(grid)
-        _build_plot(P_vals, V_vals, max_p_idx, int(target_bus_idx), save_path)
-
-    curve_points = []
-    initial_voltage = float(V_vals[0])
-    initial_load = float(P_vals[0])
-
-    for i, (load, voltage) in enumerate(zip(P_vals, V_vals)):
-        load_scale = load / initial_load if initial_load > 0 else 1.0
-        voltage_drop_from_initial = initial_voltage - voltage
-        voltage_drop_percent = (voltage_drop_from_initial / initial_voltage) * 100 if initial_voltage > 0 else 0
-        curve_points.append(
-            {
-                "step": i + 1,
-                "load_mw": float(load),
-                "voltage_pu": float(voltage),
-                "load_scale_factor": float(load_scale),
-                "voltage_drop_from_initial_pu": float(voltage_drop_from_initial),
-                "voltage_drop_percent": float(voltage_drop_percent),
-                "is_nose_point": bool(i == max_p_idx),
-            }
+        timer.update(trajectory["timings"])
+        if use_cache and not trajectory.get("cancelled"):
+            trajectory_cache.set(key, trajectory)
+    elif trajectory is None:
+        trajectory = _run_cpf(
+            grid, target_bus_idx, step_size, max_scale, power_factor, capacitive,
+            continuation, contingency_lines, gen_voltage_setpoints,
+            progress=progress_callback, cancel_token=cancel_token, backend=backend,
         )
-
-    return {
-        "grid_system": grid,
-        "target_bus": int(target_bus_idx),
-        "power_factor": power_factor,
-        "capacitive_load": capacitive,
-        "contingency_lines": contingency_lines,
-        "gen_voltage_setpoints": gen_voltage_setpoints,
-        "load_values_mw": P_vals,
-        "voltage_values_pu": V_vals,
-        "curve_points": curve_points,
-        "nose_point": {
-            "load_mw": float(nose_p),
-            "voltage_pu": float(nose_v),
-            "index": int(max_p_idx),
-        },
-        "initial_conditions": {
-            "load_mw": float(P_vals[0]),
-            "voltage_pu": float(V_vals[0]),
-        },
-        "final_conditions": {
-            "load_mw": float(P_vals[-1]),
-            "voltage_pu": float(V_vals[-1]),
-        },
-        "voltage_drop_total": float(V_vals[0] - V_vals[-1]),
-        "voltage_drop_percent_total": float((V_vals[0] - V_vals[-1]) / V_vals[0] * 100) if V_vals[0] > 0 else 0,
-        "load_margin_mw": float(nose_p - P_vals[0]),
-        "load_margin_percent": float((nose_p - P_vals[0]) / P_vals[0] * 100) if P_vals[0] > 0 else 0,
-        "converged_steps": len(P_vals),
-        "voltage_limit": voltage_limit,
-        "save_path": save_path,
-    }
+        timer.update(trajectory["timings"])
+        if use_cache and not trajectory.get("cancelled"):
+            trajectory_cache.set(key, trajectory)
+
+    result = _curve_result(
+        trajectory, timer, grid, target_bus_idx, max_scale, power_factor, voltage_limit, capacitive,
+        contingency_lines, gen_voltage_setpoints, skip_plot=skip_plot, async_plot=async_plot,
+        all_buses=all_buses, cpf_cached=cpf_cached, mode=mode, backend=backend,
+    )
+    timing_stats.record(grid, timer.timings)
+    result["timings"] = {**timer.timings, "total": sum(timer.timings.values())}
+    return result
 
 
 if __name__ == "__main__":
@@ -0,0 +1,259 @@
+"""Columnar P–V curve result: contiguous arrays plus the legacy dict view on demand.
+
+``generate_pv_curve`` used to return per-point Python lists and a seven-key dict
+per curve point. ``PVCurveResult`` keeps only the two float64 columns (load MW,
+monitored-bus voltage pu) and the scalar / metadata fields. ``load_values_mw``,
+``voltage_values_pu`` and ``curve_points`` are still readable keys, but they are
+rebuilt from the columns each time they are read. Callers that index the
+result like a dict keep working, and ``to_dict()`` returns the exact legacy
+layout. ``to_json()`` / ``to_bytes()`` serialize the columns directly instead
+of the per-point dicts.
+"""
+
+import json
+import struct
+from collections.abc import Mapping, MutableMapping
+from functools import cached_property
+
+import numpy as np
+
+CURVE_KEYS = ("load_values_mw", "voltage_values_pu", "curve_points")
+
+_DERIVED = object()  # Field placeholder for a key rebuilt from the columns.
+_MAGIC = b"PVC1"
+_PREFIX = struct.Struct("<4sI")  # Magic, header length.
+
+
+def _jsonable(value):
+    """``json.dumps`` fallback for NumPy values and nested results."""
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, PVCurveResult):
+        return value.to_dict(points=False)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _column(values) -> np.ndarray:
+    column = np.array(values, dtype=np.float64).reshape(-1)
+    column.setflags(write=False)
+    return column
+
+
+class PVCurveResult(MutableMapping):
+    """
+    P–V curve summary backed by contiguous ``load_mw`` / ``voltage_pu`` arrays.
+
+    Behaves as a mutable mapping with the legacy ``generate_pv_curve`` keys, in
+    the legacy order: ``inputs`` first, then ``CURVE_KEYS``, then the summary
+    fields (and any key set later). Curve keys are read-only views; the other
+    per-point columns (``load_scale_factor``, ``voltage_drop_from_initial_pu``,
+    ``voltage_drop_percent``) are computed on first access.
+    """
+
+    def __init__(self, load_mw, voltage_pu, inputs=None, **summary):
+        """
+        Args:
+            load_mw: Total active load (MW) at each reported CPF point.
+            voltage_pu: Monitored-bus voltage (pu) at each point; same length.
+            inputs: Optional mapping of run inputs listed before the curve keys.
+            **summary: Scalar / metadata fields listed after the curve keys.
+
+        Raises:
+            ValueError: If the columns differ in length or a curve key is passed as a field.
+        """
+        self.load_mw = _column(load_mw)
+        self.voltage_pu = _column(voltage_pu)
+        if self.load_mw.size != self.voltage_pu.size:
+            raise ValueError(
+                f"load_mw has {self.load_mw.size} points but voltage_pu has {self.voltage_pu.size}."
+            )
+        inputs = dict(inputs or {})
+        clash = set(CURVE_KEYS) & (inputs.keys() | summary.keys())
+        if clash:
+            raise ValueError(f"{sorted(clash)} are derived from the curve columns.")
+        self._fields = {**inputs, **dict.fromkeys(CURVE_KEYS, _DERIVED), **summary}
+
+    # ------------------------------------------------------------------
+    # Mapping interface
+    # ------------------------------------------------------------------
+
+    def __getitem__(self, key):
+        value = self._fields[key]
+        if value is not _DERIVED:
+            return value
+        if key == "load_values_mw":
+            return self.load_mw.tolist()
+        if key == "voltage_values_pu":
+            return self.voltage_pu.tolist()
+        return self.curve_points()
+
+    def __setitem__(self, key, value):
+        if key in CURVE_KEYS:
+            raise ValueError(f"'{key}' is derived from the curve columns.")
+        self._fields[key] = value
+
+    def __delitem__(self, key):
+        if key in CURVE_KEYS:
+            raise ValueError(f"'{key}' is derived from the curve columns.")
+        del self._fields[key]
+
+    def __iter__(self):
+        return iter(self._fields)
+
+    def __len__(self):
+        return len(self._fields)
+
+    def __repr__(self):
+        # Matches the legacy dict so prompts formatted with the result are unchanged.
+        return repr(self.to_dict())
+
+    # ------------------------------------------------------------------
+    # Columns
+    # ------------------------------------------------------------------
+
+    @cached_property
+    def nose_index(self) -> int:
+        """Index of the maximum-load (nose) point."""
+        return int(np.argmax(self.load_mw)) if self.load_mw.size else 0
+
+    @cached_property
+    def load_scale_factor(self) -> np.ndarray:
+        """Load relative to the first point (1.0 throughout if that load is not positive)."""
+        initial = self.load_mw[0] if self.load_mw.size else 0.0
+        column = self.load_mw / initial if initial > 0 else np.ones_like(self.load_mw)
+        column.setflags(write=False)
+        return column
+
+    @cached_property
+    def voltage_drop_from_initial_pu(self) -> np.ndarray:
+        """Voltage drop (pu) from the first point."""
+        column = self.voltage_pu[0] - self.voltage_pu if self.voltage_pu.size else self.voltage_pu.copy()
+        column.setflags(write=False)
+        return column
+
+    @cached_property
+    def voltage_drop_percent(self) -> np.ndarray:
+        """Voltage drop from the first point as a percentage of it (0 if it is not positive)."""
+        initial = self.voltage_pu[0] if self.voltage_pu.size else 0.0
+        if initial > 0:
+            column = self.voltage_drop_from_initial_pu / initial * 100
+        else:
+            column = np.zeros_like(self.voltage_pu)
+        column.setflags(write=False)
+        return column
+
+    def curve_points(self) -> list:
+        """Build the legacy per-point dicts (``step`` is 1-based)."""
+        nose = self.nose_index
+        return [
+            {
+                "step": i + 1,
+                "load_mw": load,
+                "voltage_pu": voltage,
+                "load_scale_factor": scale,
+                "voltage_drop_from_initial_pu": drop,
+                "voltage_drop_percent": percent,
+                "is_nose_point": i == nose,
+            }
+            for i, (load, voltage, scale, drop, percent) in enumerate(
+                zip(
+                    self.load_mw.tolist(),
+                    self.voltage_pu.tolist(),
+                    self.load_scale_factor.tolist(),
+                    self.voltage_drop_from_initial_pu.tolist(),
+                    self.voltage_drop_percent.tolist(),
+                )
+            )
+        ]
+
+    # ------------------------------------------------------------------
+    # Conversion / serialization
+    # ------------------------------------------------------------------
+
+    def _scalar_fields(self) -> dict:
+        return {key: value for key, value in self._fields.items() if value is not _DERIVED}
+
+    def to_dict(self, points=True) -> dict:
+        """Return the legacy plain-dict result.
+
+        Args:
+            points: If False, omit ``curve_points`` (the columns are still included).
+        """
+        return {key: self[key] for key in self._fields if points or key != "curve_points"}
+
+    def to_json(self, **kwargs) -> str:
+        """Serialize to compact JSON (columns as lists, no ``curve_points``).
+
+        ``from_dict(json.loads(text))`` restores the result; NumPy fields become lists.
+        """
+        kwargs.setdefault("separators", (",", ":"))
+        return json.dumps(self.to_dict(points=False), default=_jsonable, **kwargs)
+
+    def to_bytes(self) -> bytes:
+        """Serialize to a JSON header followed by the raw array buffers.
+
+        Array-valued fields (e.g. ``bus_voltages``) keep their dtype and shape.
+        """
+        arrays = [("load_mw", self.load_mw), ("voltage_pu", self.voltage_pu)]
+        fields = {}
+        for key, value in self._scalar_fields().items():
+            if isinstance(value, np.ndarray):
+                arrays.append((key, np.ascontiguousarray(value)))
+            else:
+                fields[key] = value
+        header = {
+            "order": list(self._fields),
+            "fields": fields,
+            "arrays": [[key, array.dtype.str, list(array.shape)] for key, array in arrays],
+        }
+        encoded = json.dumps(header, default=_jsonable, separators=(",", ":")).encode()
+        return b"".join([_PREFIX.pack(_MAGIC, len(encoded)), encoded, *(array.tobytes() for _, array in arrays)])
+
+    @classmethod
+    def from_bytes(cls, data) -> "PVCurveResult":
+        """Rebuild a result written by ``to_bytes``.
+
+        Raises:
+            ValueError: If ``data`` is not a serialized ``PVCurveResult``.
+        """
+        data = memoryview(data)
+        if len(data) < _PREFIX.size:
+            raise ValueError("Data is too short to be a serialized PVCurveResult.")
+        magic, header_len = _PREFIX.unpack_from(data)
+        if magic != _MAGIC:
+            raise ValueError("Data is not a serialized PVCurveResult.")
+        offset = _PREFIX.size + header_len
+        header = json.loads(bytes(data[_PREFIX.size:offset]))
+
+        fields = dict(header["fields"])
+        for key, dtype, shape in header["arrays"]:
+            dtype = np.dtype(dtype)
+            count = int(np.prod(shape, dtype=np.int64))
+            fields[key] = np.frombuffer(data, dtype=dtype, count=count, offset=offset).reshape(shape).copy()
+            offset += count * dtype.itemsize
+        return cls._from_ordered(fields.pop("load_mw"), fields.pop("voltage_pu"), header["order"], fields)
+
+    @classmethod
+    def from_dict(cls, data: Mapping) -> "PVCurveResult":
+        """Rebuild a result from ``to_dict()`` / ``to_json()`` output (``curve_points`` is optional)."""
+        fields = {key: value for key, value in data.items() if key not in CURVE_KEYS}
+        return cls._from_ordered(data["load_values_mw"], data["voltage_values_pu"], list(data), fields)
+
+    @classmethod
+    def _from_ordered(cls, load_mw, voltage_pu, order, fields):
+        keys = [key for key in order if key in fields or key in CURVE_KEYS]
+        keys += [key for key in fields if key not in keys]
+        first_curve = keys.index(CURVE_KEYS[0]) if CURVE_KEYS[0] in keys else 0
+        inputs = {key: fields[key] for key in keys[:first_curve] if key in fields}
+        summary = {key: fields[key] for key in keys[first_curve:] if key in fields}
+        return cls(load_mw, voltage_pu, inputs, **summary)
+
+
+def as_dict(results, points=True):
+    """Return ``results`` as a plain dict if it is a ``PVCurveResult``, else unchanged.
+
+    For JSON / pydantic boundaries that also see plain dicts or None.
+    """
+    return results.to_dict(points=points) if isinstance(results, PVCurveResult) else results
@@ -0,0 +1,257 @@
+"""Parallel N-1 line contingency screening using ANDES CPF."""
+
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from agent.pv_curve.batch_pflow import outage_warm_starts
+from agent.pv_curve.case_cache import CASE_MAP
+from agent.pv_curve.grid_catalog import get_catalog
+from agent.pv_curve.pv_curve import _base_state, _run_cpf
+from agent.pv_curve.stability_indices import rank_outages
+from agent.pv_curve.timing import timing_stats
+
+# Outcome of a single screened scenario.
+STATUS_CONVERGED = "converged"
+STATUS_NOT_CONVERGED = "not_converged"
+STATUS_PFLOW_DIVERGED = "pflow_diverged"
+STATUS_ERROR = "error"
+STATUS_SCREENED_OUT = "screened_out"
+
+_STATUSES = (STATUS_CONVERGED, STATUS_NOT_CONVERGED, STATUS_PFLOW_DIVERGED, STATUS_ERROR, STATUS_SCREENED_OUT)
+
+
+def in_service_line_pairs(grid: str) -> list:
+    """Return every in-service ``Line`` of ``grid`` as a sorted ``(bus1, bus2)`` pair.
+
+    Parallel circuits collapse into one pair, matching the pair-based outage
+    convention of ``_apply_contingencies``.
+    """
+    return list(get_catalog(grid).in_service_lines)
+
+
+def _summarize_trajectory(trajectory: dict, max_scale: float) -> dict:
+    """Reduce a CPF trajectory to margin / nose metrics for one scenario."""
+    lam = trajectory["lam"]
+    timings = trajectory["timings"]
+    if not trajectory["pflow_converged"]:
+        return {"status": STATUS_PFLOW_DIVERGED, "error": "Base-case power flow did not converge.", "timings": timings}
+    if lam.size == 0:
+        return {
+            "status": STATUS_NOT_CONVERGED,
+            "error": trajectory["done_msg"] or "No CPF points produced.",
+            "timings": timings,
+        }
+
+    nose_idx = int(np.argmax(lam))
+    nose_voltages = trajectory["V"][:, nose_idx]
+    weakest_uid = int(np.argmin(nose_voltages))
+    return {
+        "status": STATUS_CONVERGED if trajectory["cpf_converged"] else STATUS_NOT_CONVERGED,
+        "max_lambda": float(lam[nose_idx]),
+        "load_margin_mw": float(trajectory["base_p_mw"] * lam[nose_idx] * (float(max_scale) - 1.0)),
+        "nose_voltage_pu": float(nose_voltages[weakest_uid]),
+        "weakest_bus": int(trajectory["bus_idx"][weakest_uid]),
+        "points": int(lam.size),
+        "error": None if trajectory["cpf_converged"] else trajectory["done_msg"],
+        "timings": timings,
+    }
+
+
+def _screen_one(task: tuple) -> dict:
+    """Worker entry point: run one scenario and never raise.
+
+    Args:
+        task: ``(grid, line, physics)`` where ``line`` is a bus pair or None for
+            the intact base case and ``physics`` holds CPF keyword inputs.
+    """
+    grid, line, physics = task
+    row = {"line": line}
+    try:
+        trajectory = _run_cpf(
+            grid,
+            None,
+            physics["step_size"],
+            physics["max_scale"],
+            physics["power_factor"],
+            physics["capacitive"],
+            False,  # Screening only needs the nose, not the lower branch.
+            [line] if line else None,
+            physics["gen_voltage_setpoints"],
+            warm_start=physics["warm_start"],
+        )
+        row.update(_summarize_trajectory(trajectory, physics["max_scale"]))
+        row["pflow_iterations"] = trajectory["pflow_iterations"]
+    except Exception as exc:
+        row.update({"status": STATUS_ERROR, "error": str(exc)})
+    return row
+
+
+def _outage_states(grid, lines, gen_voltage_setpoints):
+    """Batched base-load solution per outage (None where unavailable); warm starts are best effort."""
+    try:
+        return outage_warm_starts(grid, [[line] for line in lines], gen_voltage_setpoints)
+    except ValueError:  # Invalid setpoints: every worker reports the error itself.
+        return [None] * len(lines)
+
+
+def _index_summary(row: dict) -> dict:
+    keys = ("pflow_converged", "islanded", "min_singular_value", "l_index_max", "l_index_bus", "line_index_max")
+    return {key: row[key] for key in keys}
+
+
+def _shortlist(grid, lines, shortlist, gen_voltage_setpoints):
+    """Keep the ``shortlist`` most severe outages by static indices for CPF.
+
+    Returns:
+        Tuple ``(ranked, kept)``: ``rank_outages`` rows of every known line (empty
+        if the indices cannot be computed) and the set of lines to simulate.
+        Unknown lines are always kept so their worker reports the error.
+    """
+    catalog = get_catalog(grid)
+    known = [line for line in lines if line in catalog.lines]
+    try:
+        ranked = rank_outages(grid, known, gen_voltage_setpoints)
+    except ValueError:  # Invalid setpoints: every worker reports the error itself.
+        return [], set(lines)
+    screened_out = {row["line"] for row in ranked[shortlist:]}
+    return ranked, {line for line in lines if line not in screened_out}
+
+
+def _rank_key(row: dict):
+    # Converged outages first, most severe (smallest margin) at the top;
+    # non-convergent, failed and screened-out scenarios follow so they stay visible.
+    order = {status: i for i, status in enumerate(_STATUSES)}
+    margin = row.get("load_margin_mw")
+    return (order[row["status"]], margin if margin is not None else float("inf"))
+
+
+def screen_contingencies(
+    grid="ieee39",
+    candidate_lines=None,
+    step_size=0.1,
+    max_scale=3.0,
+    power_factor=0.95,
+    capacitive=False,
+    gen_voltage_setpoints=None,
+    max_workers=None,
+    shortlist=None,
+):
+    """Run one CPF per single-line outage across a process pool and rank the results.
+
+    With ``shortlist``, every outage first gets one batched base-load power flow
+    and static stability indices (``stability_indices.rank_outages``). Only the
+    ``shortlist`` most severe ones run a CPF.
+
+    Args:
+        grid: Built-in case key; must exist in ``CASE_MAP``.
+        candidate_lines: ``(from_bus, to_bus)`` pairs to outage one at a time.
+            Defaults to every in-service ``Line`` in the case.
+        step_size: CPF continuation step (see ``generate_pv_curve``).
+        max_scale: Load growth factor toward ``p0 * max_scale``.
+        power_factor: Constant load power factor used for Q targets.
+        capacitive: If True, leading reactive convention for Q targets.
+        gen_voltage_setpoints: Optional ``{pv_idx: vm_pu}`` applied to every scenario.
+        max_workers: Process count; defaults to the number of host CPU cores.
+        shortlist: Optional number of outages to simulate after index pre-screening;
+            None simulates all of them.
+
+    Returns:
+        Dict with ``base_case`` metrics, ``outages`` (ranked list of per-line rows
+        with ``status``, ``load_margin_mw``, ``margin_reduction_mw``,
+        ``nose_voltage_pu``, ``weakest_bus``, ``pflow_iterations``, ``timings``) and a ``summary`` of status counts.
+        Failed outages are reported with ``status`` and ``error`` instead of
+        aborting the batch. With ``shortlist``, rows also carry their ``indices`` and
+        outages left out of the CPF have status ``screened_out`` (in index order,
+        after every simulated row); ``prescreen`` reports the ranking's size and time.
+
+    Raises:
+        ValueError: Unknown grid or ``shortlist`` below 1.
+    """
+    if grid not in CASE_MAP:
+        raise ValueError(f"Unsupported grid '{grid}'. Choose from {list(CASE_MAP)}")
+    if shortlist is not None and int(shortlist) < 1:
+        raise ValueError("shortlist must be at least 1.")
+
+    if candidate_lines is None:
+        candidate_lines = in_service_line_pairs(grid)
+    lines = list(dict.fromkeys(tuple(sorted((int(fb), int(tb)))) for fb, tb in candidate_lines))
+
+    physics = {
+        "step_size": float(step_size),
+        "max_scale": float(max_scale),
+        "power_factor": float(power_factor),
+        "capacitive": bool(capacitive),
+        "gen_voltage_setpoints": gen_voltage_setpoints,
+        # Solved once here so every (spawned) worker warm-starts its outage power flow.
+        "warm_start": _base_state(grid),
+    }
+    ranked, prescreen = [], None
+    if shortlist is None:
+        # One batched solve of every outage at base load seeds each worker's power flow.
+        states = dict(zip(lines, _outage_states(grid, lines, gen_voltage_setpoints)))
+    else:
+        start = time.perf_counter()
+        ranked, kept = _shortlist(grid, lines, int(shortlist), gen_voltage_setpoints)
+        prescreen = {"ranked": len(ranked), "simulated": len(kept), "elapsed_s": time.perf_counter() - start}
+        states = {row["line"]: row["state"] for row in ranked}
+        lines = [line for line in lines if line in kept]
+
+    tasks = [(grid, None, physics)]
+    for line in lines:
+        state = states.get(line)
+        tasks.append((grid, line, physics if state is None else {**physics, "warm_start": state}))
+    workers = max(1, min(max_workers or os.cpu_count() or 1, len(tasks)))
+
+    rows = []
+    # "spawn" keeps workers safe when called from threaded servers (FastAPI executors).
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+        futures = {executor.submit(_screen_one, task): task for task in tasks}
+        for future in as_completed(futures):
+            try:
+                row = future.result()
+            except Exception as exc:  # Worker process died (e.g. BrokenProcessPool)
+                row = {"line": futures[future][1], "status": STATUS_ERROR, "error": str(exc)}
+            if row.get("timings"):
+                timing_stats.record(grid, row["timings"])
+            rows.append(row)
+
+    base_case = next(row for row in rows if row["line"] is None)
+    outages = [row for row in rows if row["line"] is not None]
+    indices = {row["line"]: _index_summary(row) for row in ranked}
+    for row in outages:
+        if row["line"] in indices:
+            row["indices"] = indices[row["line"]]
+    simulated = {row["line"] for row in outages}
+    outages += [
+        {"line": row["line"], "status": STATUS_SCREENED_OUT, "error": None, "indices": indices[row["line"]]}
+        for row in ranked
+        if row["line"] not in simulated
+    ]
+
+    base_margin = base_case.get("load_margin_mw")
+    for row in outages:
+        margin = row.get("load_margin_mw")
+        row["margin_reduction_mw"] = (
+            float(base_margin - margin) if base_margin is not None and margin is not None else None
+        )
+    outages.sort(key=_rank_key)
+    for rank, row in enumerate(outages, 1):
+        row["rank"] = rank
+
+    summary = {status: 0 for status in _STATUSES}
+    for row in outages:
+        summary[row["status"]] += 1
+    summary["total"] = len(outages)
+
+    return {
+        "grid_system": grid,
+        "base_case": base_case,
+        "outages": outages,
+        "summary": summary,
+        "workers": workers,
+        "prescreen": prescreen,
+    }
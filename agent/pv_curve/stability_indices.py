@@ -0,0 +1,281 @@
+"""Static voltage-stability indices from one power flow per scenario, for ranking before CPF.
+
+Each scenario (base case or line outage) gets one batched base-load power
+flow (``batch_pflow``). Three indices are computed from that solution, all
+vectorized over buses or lines:
+
+* L-index per load bus, from the load-to-generator voltage participation
+  ``F = -Y_LL^-1 Y_LG`` (Kessel & Glavitsch): ``L_j = |1 - (F V_G)_j / V_j|``.
+* Line stability index ``Lmn = 4 X Q_r / (|V_s| sin(theta - delta))^2`` per
+  line, the worse of its two directions (Moghavvemi & Omar).
+* Minimum singular value of the power-flow Jacobian, by inverse iteration on
+  its sparse LU factors, and its critical mode (load-bus participation).
+
+All three reach 1 (L-index, ``Lmn``) or 0 (singular value) at voltage
+collapse. They are cheap proxies for the CPF load margin. Use them to
+shortlist candidates, never to report a margin.
+"""
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse.linalg import splu
+
+from agent.pv_curve.batch_pflow import solve_power_flows, stacked_admittances
+from agent.pv_curve.case_cache import case_cache
+from agent.pv_curve.grid_catalog import get_catalog
+from agent.pv_curve.native_cpf import Network, _AugmentedJacobian
+from agent.pv_curve.pv_curve import _base_state
+
+# Inverse-iteration sweeps for the Jacobian's smallest singular value.
+SVD_ITERATIONS = 30
+
+
+def _sub_pattern(matrix, rows, cols):
+    """CSC sub-block ``matrix[rows][:, cols]`` plus the ``matrix.data`` position of each entry."""
+    tags = sparse.csr_matrix((np.arange(1, matrix.nnz + 1, dtype=float), matrix.indices, matrix.indptr), matrix.shape)
+    block = tags[rows][:, cols].tocsc()
+    order = block.data.astype(int) - 1
+    return sparse.csc_matrix((np.zeros(order.size, dtype=complex), block.indices, block.indptr), block.shape), order
+
+
+def l_index(net: Network, V, ydata) -> np.ndarray:
+    """L-index of every load (``net.pq``) bus.
+
+    Args:
+        net: Intact ``Network``.
+        V: Complex bus voltages (scenarios x buses).
+        ydata: Scenario ``ybus.data`` rows (scenarios x entries), see ``stacked_admittances``.
+
+    Returns:
+        Array (scenarios x ``net.pq``); NaN rows where ``Y_LL`` is singular.
+    """
+    gen = np.setdiff1d(np.arange(net.n_bus), net.pq)
+    y_ll, ll_order = _sub_pattern(net.ybus, net.pq, net.pq)
+    y_lg, lg_order = _sub_pattern(net.ybus, net.pq, gen)
+
+    out = np.full((V.shape[0], net.pq.size), np.nan)
+    for k in range(V.shape[0]):
+        y_ll.data[:] = ydata[k, ll_order]
+        y_lg.data[:] = ydata[k, lg_order]
+        try:
+            v_equivalent = -splu(y_ll).solve(y_lg @ V[k, gen])
+        except RuntimeError:  # Load buses cut off from every generator.
+            continue
+        out[k] = np.abs(1.0 - v_equivalent / V[k, net.pq])
+    return out
+
+
+def line_index(net: Network, V, line_outages) -> np.ndarray:
+    """``Lmn`` of every in-service line (``net.line_series`` order), worse direction.
+
+    Args:
+        net: Intact ``Network``.
+        V: Complex bus voltages (scenarios x buses).
+        line_outages: One collection of ``Line`` uids per scenario; outaged lines get NaN.
+
+    Returns:
+        Array (scenarios x lines).
+    """
+    uids = list(net.line_series)
+    f, t, z = (np.array(column) for column in zip(*net.line_series.values()))
+    y21, y22, y12, y11 = (np.array([net.line_stamps[uid][1][i] for uid in uids]) for i in (3, 1, 2, 0))
+    theta, x = np.angle(z), z.imag
+
+    def _direction(send, recv, y_rs, y_rr):
+        # Reactive power arriving at the receiving end over this line.
+        q_recv = -np.imag(V[:, recv] * np.conj(y_rs * V[:, send] + y_rr * V[:, recv]))
+        delta = np.angle(V[:, send]) - np.angle(V[:, recv])
+        return 4.0 * x * q_recv / (np.abs(V[:, send]) * np.sin(theta - delta)) ** 2
+
+    out = np.maximum(_direction(f, t, y21, y22), _direction(t, f, y12, y11))
+    column = {uid: i for i, uid in enumerate(uids)}
+    for k, outaged in enumerate(line_outages):
+        out[k, [column[uid] for uid in outaged if uid in column]] = np.nan
+    return out
+
+
+def min_singular_value(net: Network, V, ydata):
+    """Smallest singular value of the power-flow Jacobian per scenario and its critical mode.
+
+    Args:
+        net: Intact ``Network``.
+        V: Complex bus voltages (scenarios x buses).
+        ydata: Scenario ``ybus.data`` rows (scenarios x entries).
+
+    Returns:
+        Tuple ``(sigma, participation)``: sigma (scenarios,) and each load bus'
+        share of the right singular vector's magnitude part (scenarios x ``net.pq``,
+        rows sum to 1). The buses that lead the collapse have the largest shares.
+        NaN where the Jacobian is singular.
+    """
+    jac = _AugmentedJacobian(net, np.zeros(net.pvpq.size + net.pq.size))
+    # With no lambda column this factors ``[[J, 0], [0, 1]]``; vectors with a zero last entry stay in J's block.
+    fixed_row = np.zeros(jac.size + 1)
+    fixed_row[-1] = 1.0
+
+    sigma = np.full(V.shape[0], np.nan)
+    participation = np.full((V.shape[0], net.pq.size), np.nan)
+    for k in range(V.shape[0]):
+        try:
+            lu = jac.factor(net, V[k], fixed_row, ydata[k])
+        except RuntimeError:
+            continue
+        x = np.append(np.ones(jac.size), 0.0) / np.sqrt(jac.size)
+        growth = np.nan
+        for _ in range(SVD_ITERATIONS):
+            x = lu.solve(lu.solve(x), trans="T")
+            growth = np.linalg.norm(x)
+            x /= growth
+        sigma[k] = 1.0 / np.sqrt(growth)
+        magnitude = np.abs(x[net.pvpq.size:jac.size])
+        participation[k] = magnitude / magnitude.sum()
+    return sigma, participation
+
+
+def scenario_indices(grid, contingency_sets=None, gen_voltage_setpoints=None, load_scale=1.0):
+    """Solve one power flow per scenario of ``grid`` and compute every index.
+
+    Args:
+        grid: Built-in case key.
+        contingency_sets: One list of ``(from_bus, to_bus)`` line outages per
+            scenario; defaults to the intact case alone.
+        gen_voltage_setpoints: Optional ``{pv_idx: vm_pu}`` shared by every scenario.
+        load_scale: Multiplier on every PQ load's base P and Q.
+
+    Returns:
+        Dict with ``bus_idx`` (buses,), ``load_bus_idx`` (``net.pq``,), power-flow
+        ``converged`` / ``islanded`` (scenarios,), ``generation_cut_mw`` (scheduled PV
+        output cut off from the slack bus, scenarios,), ``voltage`` / ``angle`` (scenarios x buses),
+        ``l_index`` and ``participation`` (scenarios x load buses), ``line_index``
+        (scenarios x lines) and ``min_singular_value`` (scenarios,). Unsolved
+        scenarios hold NaN.
+
+    Raises:
+        ValueError: Unknown line pair or generator index.
+    """
+    catalog = get_catalog(grid)
+    contingency_sets = contingency_sets if contingency_sets is not None else [[]]
+    setpoints = {catalog.pv_uid(idx): float(vm) for idx, vm in (gen_voltage_setpoints or {}).items()}
+    outages = [[uid for fb, tb in lines or () for uid in catalog.line_uids(fb, tb)] for lines in contingency_sets]
+
+    net = Network(case_cache.get_template(grid), gen_voltage_setpoints=setpoints)
+    batch = solve_power_flows(
+        net, net.p0 * load_scale, net.q0 * load_scale, line_outages=outages, warm_start=_base_state(grid)
+    )
+    ydata = stacked_admittances(net, outages)
+    V = batch["vm"] * np.exp(1j * batch["va"])
+    solved = batch["converged"]
+
+    result = {
+        "bus_idx": net.bus_idx,
+        "load_bus_idx": net.bus_idx[net.pq],
+        "converged": solved,
+        "islanded": batch["islanded"],
+        "generation_cut_mw": (~batch["connected"] * net.p_gen).sum(axis=1) * catalog.mva,
+        "voltage": np.where(solved[:, None], batch["vm"], np.nan),
+        "angle": np.where(solved[:, None], batch["va"], np.nan),
+        "l_index": np.full((len(outages), net.pq.size), np.nan),
+        "line_index": np.full((len(outages), len(net.line_series)), np.nan),
+        "min_singular_value": np.full(len(outages), np.nan),
+        "participation": np.full((len(outages), net.pq.size), np.nan),
+    }
+    if solved.any():
+        kept = [outages[k] for k in np.flatnonzero(solved)]
+        result["l_index"][solved] = l_index(net, V[solved], ydata[solved])
+        result["line_index"][solved] = line_index(net, V[solved], kept)
+        sigma, participation = min_singular_value(net, V[solved], ydata[solved])
+        result["min_singular_value"][solved] = sigma
+        result["participation"][solved] = participation
+    return result
+
+
+def _nanmax(values):
+    return None if np.isnan(values).all() else float(np.nanmax(values))
+
+
+def rank_outages(grid, candidate_lines, gen_voltage_setpoints=None) -> list:
+    """Rank single-line outages by static severity, most severe first.
+
+    Islanding outages come first, by the generation they cut off from the slack
+    bus (no index exists for them, and lost generation dominates their margin).
+    Solved outages follow in ascending Jacobian minimum singular value, which of
+    the three indices tracks the CPF load margin best. Outages whose constant-power
+    flow diverges come last: like ``pflow_diverged`` screening rows, they mostly
+    reflect low base-load voltages that ANDES' load model rides through.
+
+    Args:
+        grid: Built-in case key.
+        candidate_lines: ``(from_bus, to_bus)`` pairs, each outaged on its own.
+        gen_voltage_setpoints: Optional ``{pv_idx: vm_pu}`` applied to every outage.
+
+    Returns:
+        List of ``{"line", "pflow_converged", "islanded", "generation_cut_mw",
+        "min_singular_value", "l_index_max", "l_index_bus", "line_index_max", "state"}`` rows, where
+        ``state`` is the ``{"v", "a"}`` base-load solution (None if unsolved).
+
+    Raises:
+        ValueError: Unknown line pair or generator index.
+    """
+    lines = [tuple(line) for line in candidate_lines]
+    indices = scenario_indices(grid, [[line] for line in lines], gen_voltage_setpoints)
+    rows = []
+    for k, line in enumerate(lines):
+        solved = bool(indices["converged"][k])
+        l_values = indices["l_index"][k]
+        rows.append(
+            {
+                "line": line,
+                "pflow_converged": solved,
+                "islanded": bool(indices["islanded"][k]),
+                "generation_cut_mw": float(indices["generation_cut_mw"][k]),
+                "min_singular_value": float(indices["min_singular_value"][k]) if solved else None,
+                "l_index_max": _nanmax(l_values),
+                "l_index_bus": int(indices["load_bus_idx"][np.nanargmax(l_values)]) if _nanmax(l_values) is not None else None,
+                "line_index_max": _nanmax(indices["line_index"][k]),
+                "state": {"v": indices["voltage"][k], "a": indices["angle"][k]} if solved else None,
+            }
+        )
+
+    def _severity(row):
+        if row["islanded"]:
+            return (0, -row["generation_cut_mw"])
+        return (1, row["min_singular_value"]) if row["pflow_converged"] else (2, 0.0)
+
+    rows.sort(key=_severity)
+    return rows
+
+
+def weak_buses(grid, top_k=None, contingency_lines=None, gen_voltage_setpoints=None) -> list:
+    """Rank load buses by their share of the critical (minimum singular value) mode.
+
+    A cheap shortlist of buses to trace or reinforce, from the base-load power
+    flow alone. ``generate_pv_curve(all_buses=True)`` gives the CPF ranking.
+
+    Args:
+        grid: Built-in case key.
+        top_k: Optional number of buses to keep.
+        contingency_lines: Optional ``(from_bus, to_bus)`` line outages.
+        gen_voltage_setpoints: Optional ``{pv_idx: vm_pu}``.
+
+    Returns:
+        List of ``{"bus", "participation", "l_index", "voltage_pu"}`` rows, weakest first.
+
+    Raises:
+        ValueError: Invalid outages / setpoints, or the base-load power flow does not converge.
+    """
+    indices = scenario_indices(grid, [contingency_lines or []], gen_voltage_setpoints)
+    if not indices["converged"][0]:
+        raise ValueError(f"Base-load power flow of grid '{grid}' did not converge; no index ranking available.")
+    participation, l_values = indices["participation"][0], indices["l_index"][0]
+    # ``net.pq`` is sorted, so the load-bus mask keeps the ``load_bus_idx`` order.
+    voltages = indices["voltage"][0, np.isin(indices["bus_idx"], indices["load_bus_idx"])]
+    order = np.argsort(-participation, kind="stable")[:top_k]
+    return [
+        {
+            "bus": int(indices["load_bus_idx"][i]),
+            "participation": float(participation[i]),
+            "l_index": float(l_values[i]),
+            "voltage_pu": float(voltages[i]),
+        }
+        for i in order
+    ]
@@ -0,0 +1,302 @@
+"""Parameter sweeps over ``Inputs`` fields with de-duplicated, concurrent CPF runs."""
+
+import itertools
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from pydantic import ValidationError
+
+from agent.schemas.inputs import Inputs
+from agent.pv_curve.batch_pflow import outage_warm_starts
+from agent.pv_curve.pv_curve import _curve_result, _run_cpf
+from agent.pv_curve.timing import PhaseTimer, timing_stats
+from agent.pv_curve.trajectory_cache import trajectory_cache, trajectory_key
+
+# Upper bound on Cartesian grid size so a single request cannot monopolize the host.
+MAX_SWEEP_POINTS = 256
+
+# Per-point metrics copied from ``generate_pv_curve`` results into sweep rows.
+_METRIC_COLUMNS = (
+    "load_margin_mw",
+    "load_margin_percent",
+    "nose_load_mw",
+    "nose_voltage_pu",
+    "converged_steps",
+)
+
+
+def _pv_kwargs(inputs: Inputs) -> dict:
+    """Map an ``Inputs`` model onto ``generate_pv_curve`` keyword arguments."""
+    return {
+        "grid": inputs.grid,
+        "target_bus_idx": inputs.bus_id,
+        "step_size": inputs.step_size,
+        "max_scale": inputs.max_scale,
+        "power_factor": inputs.power_factor,
+        "voltage_limit": inputs.voltage_limit,
+        "capacitive": inputs.capacitive,
+        "continuation": inputs.continuation,
+        "contingency_lines": inputs.contingency_lines,
+        "gen_voltage_setpoints": inputs.gen_voltage_setpoints,
+    }
+
+
+def _physics_key(inputs: Inputs) -> tuple:
+    return trajectory_key(
+        inputs.grid,
+        inputs.step_size,
+        inputs.max_scale,
+        inputs.power_factor,
+        inputs.capacitive,
+        inputs.continuation,
+        inputs.contingency_lines,
+        inputs.gen_voltage_setpoints,
+    )
+
+
+def expand_sweep(axes: dict, base_inputs=None) -> list:
+    """Expand ``axes`` into the Cartesian grid of validated ``Inputs``.
+
+    Args:
+        axes: Mapping of ``Inputs`` field name -> list of values to sweep.
+        base_inputs: ``Inputs`` (or dict) supplying every non-swept field.
+
+    Returns:
+        List of ``Inputs``, one per grid point, in ``itertools.product`` order.
+
+    Raises:
+        ValueError: Unknown field, empty axis, too many points, or a value that
+            fails ``Inputs`` validation.
+    """
+    if isinstance(base_inputs, Inputs):
+        base = base_inputs.model_dump()
+    else:
+        base = Inputs(**(base_inputs or {})).model_dump()
+
+    if not axes:
+        raise ValueError("Sweep needs at least one parameter axis.")
+    unknown = [name for name in axes if name not in Inputs.model_fields]
+    if unknown:
+        raise ValueError(f"Unknown sweep parameter(s): {unknown}. Choose from {list(Inputs.model_fields)}")
+    empty = [name for name, values in axes.items() if not values]
+    if empty:
+        raise ValueError(f"Sweep axis has no values: {empty}")
+
+    n_points = 1
+    for values in axes.values():
+        n_points *= len(values)
+    if n_points > MAX_SWEEP_POINTS:
+        raise ValueError(f"Sweep has {n_points} points; the limit is {MAX_SWEEP_POINTS}.")
+
+    names = list(axes)
+    points = []
+    for combo in itertools.product(*(axes[name] for name in names)):
+        try:
+            points.append(Inputs(**{**base, **dict(zip(names, combo))}))
+        except ValidationError as exc:
+            raise ValueError(f"Invalid sweep point {dict(zip(names, combo))}: {exc}") from exc
+    return points
+
+
+def _simulate(physics: dict, targets: list, swept: list, include_curves: bool) -> tuple:
+    """Worker entry point: run CPF for one unique physics configuration and post-process its points.
+
+    Returns:
+        ``(trajectory, rows)`` with one ``_point_row`` per ``(index, inputs)`` in ``targets``.
+    """
+    trajectory = _run_cpf(target_bus_idx=None, **physics)
+    return trajectory, [_point_row(index, inputs, swept, include_curves, trajectory) for index, inputs in targets]
+
+
+def _store(key: tuple, trajectory: dict) -> None:
+    # Worker-side engine timings would otherwise never reach this process's histograms.
+    timing_stats.record(key[0], trajectory["timings"])
+    trajectory_cache.set(key, trajectory)
+
+
+def _physics_kwargs(inputs: Inputs) -> dict:
+    kwargs = _pv_kwargs(inputs)
+    for name in ("target_bus_idx", "voltage_limit"):
+        kwargs.pop(name)
+    return kwargs
+
+
+def _warm_starts(pending: dict, points: list) -> dict:
+    """Batch-solve the base-load power flow of every pending outage configuration.
+
+    Configurations sharing a grid and generator setpoints are solved in one
+    batch; the solutions seed each CPF's power flow.
+
+    Returns:
+        Physics key -> ``{"v", "a"}`` warm start, for the configurations that converged.
+    """
+    groups = {}
+    for key, indices in pending.items():
+        inputs = points[indices[0]]
+        if inputs.contingency_lines:
+            setpoints = tuple(sorted((inputs.gen_voltage_setpoints or {}).items()))
+            groups.setdefault((inputs.grid, setpoints), []).append((key, inputs.contingency_lines))
+
+    starts = {}
+    for (grid, setpoints), entries in groups.items():
+        try:
+            states = outage_warm_starts(grid, [lines for _, lines in entries], dict(setpoints))
+        except ValueError:  # Invalid setpoints surface from the CPF run of each point.
+            continue
+        starts.update({key: state for (key, _), state in zip(entries, states) if state is not None})
+    return starts
+
+
+def _point_row(index: int, inputs: Inputs, swept: list, include_curves: bool, trajectory: dict, cpf_cached=False) -> dict:
+    """Post-process one sweep point from its CPF trajectory."""
+    row = {"type": "point", "index": index, "inputs": {name: getattr(inputs, name) for name in swept}}
+    timer = PhaseTimer()
+    try:
+        result = _curve_result(
+            trajectory, timer, inputs.grid, inputs.bus_id, inputs.max_scale, inputs.power_factor,
+            inputs.voltage_limit, inputs.capacitive, inputs.contingency_lines, inputs.gen_voltage_setpoints,
+            cpf_cached=cpf_cached,
+        )
+    except Exception as exc:
+        row.update({"status": "error", "error": str(exc)})
+        return row
+
+    row.update(
+        {
+            "status": "ok",
+            "error": None,
+            "load_margin_mw": result["load_margin_mw"],
+            "load_margin_percent": result["load_margin_percent"],
+            "nose_load_mw": result["nose_point"]["load_mw"],
+            "nose_voltage_pu": result["nose_point"]["voltage_pu"],
+            "converged_steps": result["converged_steps"],
+        }
+    )
+    if include_curves:
+        result["timings"] = {**timer.timings, "total": sum(timer.timings.values())}
+        row["result"] = result.to_dict()
+    return row
+
+
+def sweep_table(rows: list, swept: list) -> dict:
+    """Build a columnar summary (column name -> list) from sweep point rows, ordered by index."""
+    rows = sorted(rows, key=lambda row: row["index"])
+    table = {"index": [row["index"] for row in rows], "status": [row["status"] for row in rows]}
+    for name in swept:
+        table[name] = [row["inputs"][name] for row in rows]
+    for column in _METRIC_COLUMNS:
+        table[column] = [row.get(column) for row in rows]
+    return table
+
+
+def sweep_pv_curves(axes: dict, base_inputs=None, max_workers=None, include_curves=False, executor=None):
+    """Run a Cartesian parameter sweep and stream results as each point finishes.
+
+    Points that only differ in post-processing inputs (``bus_id``,
+    ``voltage_limit``) share one CPF, and trajectories already in the
+    process-wide cache are not re-simulated. Unique simulations run on a
+    spawn-based process pool (or inline when ``max_workers == 1``); outage
+    configurations start their power flow from one batched base-load solve.
+    Workers return finished point rows, so the parent never re-runs a CPF.
+
+    Args:
+        axes: Mapping of ``Inputs`` field name -> list of values.
+        base_inputs: ``Inputs`` (or dict) for every non-swept field; defaults to ``Inputs()``.
+        max_workers: Process count; defaults to the number of host CPU cores.
+        include_curves: If True, each point row carries the full ``generate_pv_curve`` result.
+        executor: Optional shared process pool for the simulations (left running
+            afterwards); by default a pool of ``max_workers`` is created per call.
+
+    Yields:
+        ``{"type": "point", ...}`` rows (``index``, swept ``inputs``, ``status``,
+        margin / nose metrics or ``error``) in completion order, then one final
+        ``{"type": "summary", "table": {...}}`` with columnar results.
+
+    Raises:
+        ValueError: If the sweep definition is invalid (see ``expand_sweep``).
+    """
+    points = expand_sweep(axes, base_inputs)
+    swept = list(axes)
+
+    groups = {}
+    for index, inputs in enumerate(points):
+        groups.setdefault(_physics_key(inputs), []).append(index)
+    # Hold cached trajectories now so an eviction mid-sweep cannot force a re-run.
+    cached = {key: trajectory_cache.get(key) for key in groups}
+    pending = {key: indices for key, indices in groups.items() if cached[key] is None}
+    workers = max(1, min(max_workers or os.cpu_count() or 1, len(pending) or 1))
+
+    warm_starts = _warm_starts(pending, points)
+
+    def _simulation(key):
+        physics = {**_physics_kwargs(points[groups[key][0]]), "warm_start": warm_starts.get(key)}
+        return physics, [(index, points[index]) for index in groups[key]], swept, include_curves
+
+    rows = []
+
+    def _emit(new_rows):
+        for row in new_rows:
+            rows.append(row)
+            yield row
+
+    def _failed(indices, error):
+        return [
+            {
+                "type": "point",
+                "index": index,
+                "inputs": {name: getattr(points[index], name) for name in swept},
+                "status": "error",
+                "error": error,
+            }
+            for index in indices
+        ]
+
+    # Cached trajectories stream out immediately.
+    for key, indices in groups.items():
+        if key not in pending:
+            yield from _emit(
+                _point_row(index, points[index], swept, include_curves, cached[key], cpf_cached=True)
+                for index in indices
+            )
+
+    if workers == 1:
+        for key, indices in pending.items():
+            try:
+                trajectory, point_rows = _simulate(*_simulation(key))
+            except Exception as exc:
+                yield from _emit(_failed(indices, str(exc)))
+                continue
+            _store(key, trajectory)
+            yield from _emit(point_rows)
+    elif pending:
+        # "spawn" keeps workers safe when called from threaded servers (FastAPI executors).
+        own_executor = executor is None
+        if own_executor:
+            executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        futures = {executor.submit(_simulate, *_simulation(key)): key for key in pending}
+        try:
+            for future in as_completed(futures):
+                key = futures[future]
+                try:
+                    trajectory, point_rows = future.result()
+                except Exception as exc:
+                    yield from _emit(_failed(pending[key], str(exc)))
+                    continue
+                # Rows come back post-processed; the trajectory only seeds later requests.
+                _store(key, trajectory)
+                yield from _emit(point_rows)
+        finally:
+            # Consumers may stop iterating early; do not keep burning workers.
+            for future in futures:
+                future.cancel()
+            if own_executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    yield {
+        "type": "summary",
+        "points": len(points),
+        "simulations": len(pending),
+        "workers": workers,
+        "table": sweep_table(rows, swept),
+    }
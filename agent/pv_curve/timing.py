@@ -0,0 +1,110 @@
+"""Low-overhead phase timing for the PV engine, aggregated into per-grid histograms."""
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+
+# Phases reported in ``generate_pv_curve(...)["timings"]``, in execution order.
+PHASES = (
+    "cache_lookup",
+    "case_load",
+    "setup",
+    "contingencies",
+    "pflow",
+    "cpf",
+    "post_processing",
+    "plotting",
+)
+
+# Histogram bucket upper edges in seconds (roughly 1-2-5 per decade, 1 ms .. 60 s).
+BUCKET_EDGES_S = (
+    0.001, 0.002, 0.005,
+    0.01, 0.02, 0.05,
+    0.1, 0.2, 0.5,
+    1.0, 2.0, 5.0,
+    10.0, 20.0, 60.0,
+)
+
+
+class PhaseTimer:
+    """
+    Collects wall-clock seconds per named phase for one simulation.
+
+    ``with timer.phase("setup"): ...`` adds the block's duration to
+    ``timer.timings["setup"]``; repeated phases accumulate.
+    """
+
+    def __init__(self):
+        self.timings = {}
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = self.timings.get(name, 0.0) + (time.perf_counter() - start)
+
+    def update(self, timings: dict) -> None:
+        """Merge phase durations measured elsewhere (e.g. in a worker process)."""
+        for name, seconds in timings.items():
+            self.timings[name] = self.timings.get(name, 0.0) + seconds
+
+
+class TimingStats:
+    """
+    Thread-safe per-grid, per-phase latency histograms.
+
+    Each phase keeps ``count`` / ``sum`` / ``min`` / ``max`` plus counts per
+    ``BUCKET_EDGES_S`` bucket (the final bucket is overflow).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._grids = {}
+
+    def record(self, grid: str, timings: dict) -> None:
+        """Add one run's ``{phase: seconds}`` to ``grid``'s histograms."""
+        with self._lock:
+            phases = self._grids.setdefault(grid, {})
+            for name, seconds in timings.items():
+                hist = phases.get(name)
+                if hist is None:
+                    hist = phases[name] = {
+                        "count": 0,
+                        "sum_s": 0.0,
+                        "min_s": float("inf"),
+                        "max_s": 0.0,
+                        "buckets": [0] * (len(BUCKET_EDGES_S) + 1),
+                    }
+                hist["count"] += 1
+                hist["sum_s"] += seconds
+                hist["min_s"] = min(hist["min_s"], seconds)
+                hist["max_s"] = max(hist["max_s"], seconds)
+                hist["buckets"][bisect.bisect_left(BUCKET_EDGES_S, seconds)] += 1
+
+    def stats(self, grid=None) -> dict:
+        """Return ``{grid: {phase: histogram}}`` (or one grid's phases) with ``mean_s`` filled in."""
+        with self._lock:
+            grids = {grid: self._grids.get(grid, {})} if grid is not None else self._grids
+            out = {}
+            for name, phases in grids.items():
+                out[name] = {
+                    phase: {
+                        **hist,
+                        "buckets": list(hist["buckets"]),
+                        "mean_s": hist["sum_s"] / hist["count"],
+                    }
+                    for phase, hist in phases.items()
+                }
+        out["bucket_edges_s"] = list(BUCKET_EDGES_S)
+        return out
+
+    def clear(self) -> None:
+        with self._lock:
+            self._grids.clear()
+
+
+# Singleton aggregate shared by every caller in the process
+timing_stats = TimingStats()
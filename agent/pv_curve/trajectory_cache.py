@@ -0,0 +1,127 @@
+"""Bounded cache of raw CPF trajectories keyed by physics-relevant inputs."""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+def trajectory_key(
+    grid,
+    step_size,
+    max_scale,
+    power_factor,
+    capacitive,
+    continuation,
+    contingency_lines=None,
+    gen_voltage_setpoints=None,
+) -> tuple:
+    """Build a canonical cache key from the inputs that change the CPF solution.
+
+    Post-processing inputs (``target_bus_idx``, ``voltage_limit``, ``skip_plot``)
+    are deliberately excluded. Line pairs are unordered and de-duplicated, and
+    setpoints are sorted, so equivalent requests share one entry.
+
+    Returns:
+        Hashable tuple.
+    """
+    lines = tuple(sorted({tuple(sorted((int(fb), int(tb)))) for fb, tb in (contingency_lines or [])}))
+    setpoints = tuple(sorted((int(k), float(v)) for k, v in (gen_voltage_setpoints or {}).items()))
+    return (
+        str(grid),
+        float(step_size),
+        float(max_scale),
+        float(power_factor),
+        bool(capacitive),
+        bool(continuation),
+        lines,
+        setpoints,
+    )
+
+
+def _nbytes(trajectory: dict) -> int:
+    return sum(v.nbytes for v in trajectory.values() if isinstance(v, np.ndarray))
+
+
+class TrajectoryCache:
+    """
+    LRU cache of CPF trajectories (``lam`` vector plus the full bus x point
+    voltage matrix). Bounded both by entry count and by total array bytes.
+    Cached arrays are made read-only so callers cannot corrupt shared entries.
+    """
+
+    def __init__(self, max_entries: int = 64, max_bytes: int = 256 * 1024 * 1024):
+        self._store: "OrderedDict[tuple, dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: tuple):
+        """Return the cached trajectory for ``key`` or None."""
+        with self._lock:
+            trajectory = self._store.get(key)
+            if trajectory is None:
+                self.misses += 1
+                return None
+            self._store.move_to_end(key)
+            self.hits += 1
+            return trajectory
+
+    def set(self, key: tuple, trajectory: dict) -> None:
+        """Store ``trajectory`` under ``key``, evicting least recently used entries."""
+        for value in trajectory.values():
+            if isinstance(value, np.ndarray):
+                value.setflags(write=False)
+        size = _nbytes(trajectory)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            old = self._store.pop(key, None)
+            if old is not None:
+                self.total_bytes -= _nbytes(old)
+            self._store[key] = trajectory
+            self.total_bytes += size
+            while len(self._store) > self.max_entries or self.total_bytes > self.max_bytes:
+                _, evicted = self._store.popitem(last=False)
+                self.total_bytes -= _nbytes(evicted)
+                self.evictions += 1
+
+    def stats(self) -> dict:
+        """Return counters and memory usage for monitoring."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "size": len(self._store),
+                "max_entries": self.max_entries,
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+    def clear(self) -> None:
+        """Drop every cached trajectory and reset counters."""
+        with self._lock:
+            self._store.clear()
+            self.total_bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def __contains__(self, key: tuple) -> bool:
+        with self._lock:
+            return key in self._store
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+
+# Singleton cache instance shared by every caller in the process
+trajectory_cache = TrajectoryCache()
@@ -17,7 +17,15 @@ class SessionManager:
         self.session_id = f"session_{self.session_start_time.strftime('%Y%m%d_%H%M%S')}"
 
     def execute_turn_streaming(self, user_input: str, config: Dict[str, Any] = None) -> Generator[Tuple[str, Dict[str, Any]], None, None]:
-        """Execute one turn with streaming updates. Yields (node_name, state_update) tuples."""
+        """Execute one turn with streaming updates. Yields (node_name, state_update) tuples.
+
+        Live CPF points are yielded as ("cpf_progress", {"cpf_progress": {...}}) and a
+        quick load-margin estimate as ("margin_estimate", {"margin_estimate": {...}});
+        neither is merged into the session state.
+
+        A ``CancellationToken`` in ``config["configurable"]["cancel_token"]`` stops an
+        in-flight CPF and ends the turn after the current node.
+        """
         if config is None:
             config = {"recursion_limit": 50}
 
@@ -26,8 +34,15 @@ class SessionManager:
         conversation_context = collect_conversation_context(user_input, self.state, max_exchanges=15)
         self.state["conversation_context"] = conversation_context
 
-        # Stream through the graph execution with stream_mode="updates"
-        for chunk in self.graph.stream(self.state, config=config, stream_mode="updates"):
+        # "updates" yields one chunk per finished node; "custom" carries live CPF
+        # progress written by the generation node while the simulation runs.
+        for mode, chunk in self.graph.stream(self.state, config=config, stream_mode=["updates", "custom"]):
+            if mode == "custom":
+                if isinstance(chunk, dict) and "cpf_progress" in chunk:
+                    yield ("cpf_progress", chunk)
+                elif isinstance(chunk, dict) and "margin_estimate" in chunk:
+                    yield ("margin_estimate", chunk)
+                continue
             # Each chunk is a dict with node name as key and state update as value
             # Example: {'compound_classifier': {'is_compound': False, 'node_response': {...}}}
             for node_name, state_update in chunk.items():
@@ -40,6 +55,10 @@ class SessionManager:
                     else:
                         self.state[key] = value
 
+            cancel_token = config.get("configurable", {}).get("cancel_token")
+            if cancel_token is not None and cancel_token.cancelled:
+                break
+
         if self.state.get("messages") and len(self.state["messages"]) > 0:
             updated_conversation_context = collect_conversation_context(
                 user_input,
@@ -3,6 +3,7 @@ from rich.table import Table
 from rich.markdown import Markdown
 from rich.panel import Panel
 import sys
+from collections.abc import Mapping
 
 console = Console(file=sys.stderr)
 
@@ -109,7 +110,7 @@ def display_node_update(node_name: str, state_update: dict):
     # Display results
     if "results" in state_update and state_update["results"]:
         results = state_update["results"]
-        if isinstance(results, dict):
+        if isinstance(results, Mapping):
             if "plot_path" in results:
                 console.print(f"[green]  ✓ PV Curve generated: {results['plot_path']}[/]")
             if "load_margin_mw" in results:
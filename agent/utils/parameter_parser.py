@@ -0,0 +1,175 @@
+"""Deterministic parameter extraction for the parameter and generation nodes.
+
+``parse_modifications`` turns the common phrasings of every ``InputParameter``
+("ieee118", "118 bus system", "bus 10", "pf 0.9", "contingency 2-3;3-4",
+"line between bus 1 and 2", "generator 1 to 1.05", "1:1.05", "capacitive",
+"0.9 leading", "upper branch only", ...) into the same ``InputModifier`` the
+LLM returns, so the nodes' conversion and validation code is unchanged.
+
+It only answers when it can explain the whole message: any leftover number,
+a parameter keyword it did not extract, a negation or a restore request
+("connect line 1-2 back" needs the current outage list), or an out-of-range
+value makes it return None and the node falls back to the LLM.
+"""
+
+import re
+from typing import Optional
+
+from pydantic import ValidationError
+
+from agent.schemas.inputs import Inputs
+from agent.schemas.parameter import InputModifier, ParameterModification
+
+_NUM = r"(\d+(?:\.\d+)?|\.\d+)"
+_IS = r"\s*(?:to|=|:|is|of|at|as)?\s*"
+
+# Scalar parameters: (name, pattern capturing the value, type)
+_SCALARS = (
+    ("step_size", rf"\bstep\s*size{_IS}{_NUM}", float),
+    ("max_scale", rf"\bmax(?:imum)?\s*(?:load\s*)?(?:scale|multiplier){_IS}{_NUM}\s*x?\b", float),
+    ("power_factor", rf"\b(?:power\s*factor|pf){_IS}{_NUM}", float),
+    ("voltage_limit", rf"\b(?:voltage\s*(?:limit|threshold)|v\s*min){_IS}{_NUM}\s*(?:pu|p\.u\.)?", float),
+    ("bus_id", rf"\b(?:(?:monitor(?:ed)?\s+)?bus(?:\s*(?:id|number|index))?|index){_IS}#?(\d+)\b", int),
+)
+_GRID = (
+    re.compile(r"\bieee[\s-]?(\d+)\b"),
+    re.compile(r"\b(\d+)[\s-]?bus(?:es)?(?:\s+(?:system|grid|case|network))?\b(?!\s*(?:to|=|:|is|of|at|#)?\s*\d)"),
+)
+
+_PAIR_LIST = re.compile(r"\b\d+\s*-\s*\d+(?:\s*(?:;|,|and)\s*\d+\s*-\s*\d+)*\b")
+_LINE_BETWEEN = re.compile(
+    r"\b(?:transmission\s+)?(?:line|branch)\s+(?:between|from)\s+(?:bus(?:es)?\s+)?(\d+)\s+(?:and|to|-)\s+(?:bus\s+)?(\d+)\b"
+)
+_CLEAR_CONTINGENCY = re.compile(
+    r"\b(?:(?:clear|no)\s+(?:all\s+)?(?:the\s+)?(?:contingenc(?:y|ies)|outages?)"
+    r"|contingenc(?:y|ies){_IS}none)\b(?!\s*\d)".replace("{_IS}", _IS)
+)
+
+_SETPOINT_LIST = re.compile(rf"\b(\d+)\s*:\s*{_NUM}(?:\s*,\s*\d+\s*:\s*{_NUM})*")
+_GEN_SETPOINT = re.compile(
+    rf"\bgen(?:erator)?\s*(\d+)(?:\s*(?:voltage|setpoint|set\s*point|vm))?{_IS}{_NUM}\s*(?:pu|p\.u\.)?"
+)
+_CLEAR_SETPOINTS = re.compile(r"\bclear\s+(?:all\s+)?(?:the\s+)?(?:generator\s+)?(?:voltage\s+)?set\s*points?\b")
+
+_CONTINUATION_ON = re.compile(
+    r"\b(?:(?:continuous|mirrored|full)\s+curve|(?:include|show)\s+(?:the\s+)?(?:lower|bottom)(?:\s+branch)?"
+    r"|enable\s+(?:the\s+)?(?:continuation|mirror(?:ed|ing)?(?:\s+branch)?)|continuation\s*(?:to|=|:)?\s*(?:on|true|yes))\b"
+)
+_CONTINUATION_OFF = re.compile(
+    r"\b(?:upper\s+branch(?:\s+only)?|stops?\s+at\s+(?:the\s+)?nose(?:\s+point)?"
+    r"|disable\s+(?:the\s+)?(?:continuation|mirror(?:ed|ing)?(?:\s+branch)?)|continuation\s*(?:to|=|:)?\s*(?:off|false|no))\b"
+)
+# A leading power factor is a capacitive load, a lagging one inductive.
+_LOAD_TYPE = re.compile(r"\b(capacitive|inductive|leading|lagging)(?:\s+(?:load|power\s*factor|pf))?\b")
+
+# Words that, left over after extraction, mean a parameter was mentioned but not understood.
+_KEYWORDS = {
+    "grid": r"\bgrid|\bieee|\bsystem\b",
+    "bus_id": r"\bbus|\bindex\b",
+    "step_size": r"\bstep",
+    "max_scale": r"\bscale|\bmultiplier",
+    "power_factor": r"\bpower\s*factor|\bpf\b",
+    "voltage_limit": r"\bvoltage\s*(?:limit|threshold)|\blimit\b|\bthreshold",
+    "capacitive": r"\bcapacitive|\binductive|\bleading|\blagging|\bload\s*type",
+    "continuation": r"\bcontinu|\bmirror|\bbranch|\bnose\b",
+    "contingency_lines": r"\bcontingenc|\boutage|\bline|\btrip",
+    "gen_voltage_setpoints": r"\bgen(?:erator)?\b|\bset\s*points?\b",
+}
+# Removals ("remove line 1-2 from the outages") are list differences against the
+# current inputs, which only the LLM prompt sees; never read them as additions.
+_HAND_OFF = re.compile(
+    r"\b(?:not|don'?t|no|never|without|except|exclude|instead|remove|drop|delete|restore|reconnect|connect|back"
+    r"|undo|revert|previous|default|reset|same)\b"
+)
+
+
+def _validated(parameter, value) -> bool:
+    try:
+        Inputs(**{parameter: value})
+    except ValidationError:
+        return False
+    return True
+
+
+class _Extraction:
+    """Collects modifications and blanks out the text they were read from."""
+
+    def __init__(self, text):
+        self.text = text
+        self.modifications = {}
+        self.ambiguous = False
+
+    def take(self, match, parameter, value, extends=False):
+        """Record ``value``; ``extends`` marks a longer list replacing the one read so far."""
+        if not extends and parameter in self.modifications and self.modifications[parameter] != value:
+            self.ambiguous = True
+        self.modifications[parameter] = value
+        start, end = match.span()
+        self.text = self.text[:start] + " " * (end - start) + self.text[end:]
+
+
+def parse_modifications(message: str) -> Optional[InputModifier]:
+    """Extract parameter changes from ``message`` without the LLM.
+
+    Args:
+        message: User message.
+
+    Returns:
+        ``InputModifier`` (possibly with no modifications) when every parameter
+        mention in the message was understood, otherwise None.
+    """
+    found = _Extraction(" ".join(message.lower().split()))
+
+    # Multi-number forms first, so their digits are not read as bus ids or grids.
+    for match in list(_CLEAR_CONTINGENCY.finditer(found.text)):
+        found.take(match, "contingency_lines", "none")
+    pairs = []
+    for match in list(_LINE_BETWEEN.finditer(found.text)):
+        pairs.append(f"{match.group(1)}-{match.group(2)}")
+        found.take(match, "contingency_lines", ";".join(pairs), extends=True)
+    if re.search(_KEYWORDS["contingency_lines"], found.text):
+        for match in list(_PAIR_LIST.finditer(found.text)):
+            pairs.extend(re.sub(r"\s", "", p) for p in re.split(r"\s*(?:;|,|and)\s*", match.group(0)))
+            found.take(match, "contingency_lines", ";".join(pairs), extends=True)
+
+    for match in list(_CLEAR_SETPOINTS.finditer(found.text)):
+        found.take(match, "gen_voltage_setpoints", "none")
+    setpoints = []
+    for match in list(_GEN_SETPOINT.finditer(found.text)):
+        setpoints.append(f"{int(match.group(1))}:{float(match.group(2))}")
+        found.take(match, "gen_voltage_setpoints", ",".join(setpoints), extends=True)
+    if re.search(_KEYWORDS["gen_voltage_setpoints"], message.lower()):
+        for match in list(_SETPOINT_LIST.finditer(found.text)):
+            setpoints.extend(
+                f"{int(k)}:{float(v)}" for k, v in re.findall(rf"(\d+)\s*:\s*{_NUM}", match.group(0))
+            )
+            found.take(match, "gen_voltage_setpoints", ",".join(setpoints), extends=True)
+
+    for pattern in _GRID:
+        for match in list(pattern.finditer(found.text)):
+            found.take(match, "grid", f"ieee{int(match.group(1))}")
+    for parameter, pattern, cast in _SCALARS:
+        for match in list(re.finditer(pattern, found.text)):
+            found.take(match, parameter, cast(match.group(1)))
+
+    for match in list(_CONTINUATION_ON.finditer(found.text)):
+        found.take(match, "continuation", True)
+    for match in list(_CONTINUATION_OFF.finditer(found.text)):
+        found.take(match, "continuation", False)
+    for match in list(_LOAD_TYPE.finditer(found.text)):
+        found.take(match, "capacitive", match.group(1) in ("capacitive", "leading"))
+
+    leftover = found.text
+    if found.ambiguous or re.search(r"\d", leftover) or _HAND_OFF.search(leftover):
+        return None
+    if any(re.search(pattern, leftover) for parameter, pattern in _KEYWORDS.items()
+           if parameter not in found.modifications):
+        return None
+    if not all(_validated(p, v) for p, v in found.modifications.items()
+               if p not in ("contingency_lines", "gen_voltage_setpoints")):
+        return None
+
+    return InputModifier(modifications=[
+        ParameterModification(parameter=parameter, value=value)
+        for parameter, value in found.modifications.items()
+    ])
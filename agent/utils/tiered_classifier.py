@@ -0,0 +1,315 @@
+"""Tiered message classification: rules, then embeddings, then the LLM.
+
+Most turns are short commands ("set power factor to 0.9", "generate the
+curve") that do not need a structured-output LLM round-trip to classify.
+``TieredClassifier`` tries, in order:
+
+  1. ``rules``: deterministic patterns over command verbs, parameter names
+     and question words (microseconds).
+  2. ``embedding``: nearest centroid over embeddings of the labeled examples
+     in the classifier prompt; the centroids are embedded once and cached.
+  3. ``llm``: the caller's fallback, used only when neither tier above
+     reaches its confidence threshold.
+
+Thresholds come from ``PV_CURVE_CLASSIFIER_RULE_THRESHOLD`` and
+``PV_CURVE_CLASSIFIER_EMBEDDING_THRESHOLD`` (a value above 1 disables that
+tier); ``PV_CURVE_CLASSIFIER_EMBEDDING_RETRY_S`` sets how long the embedding
+tier is skipped after the embedding model fails. Per-tier hit counts and rates
+are exposed through ``stats()``.
+"""
+
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+MESSAGE_TYPES = ("question_general", "question_parameter", "parameter", "generation", "analysis")
+TIERS = ("rules", "embedding", "llm")
+
+DEFAULT_RULE_THRESHOLD = 0.8
+DEFAULT_EMBEDDING_THRESHOLD = 0.7
+DEFAULT_EMBEDDING_RETRY_S = 60.0
+# Softmax temperature over centroid cosine similarities; sentence embeddings
+# put unrelated texts only ~0.1 apart, so the scores need sharpening.
+EMBEDDING_TEMPERATURE = 0.05
+
+_PARAMETER_TERMS = re.compile(
+    r"\b(grid|ieee\s*\d+|bus(es| id)?|step\s*size|max(imum)?\s*(load\s*)?(scale|multiplier)|power\s*factor|pf"
+    r"|voltage\s*(limit|threshold)|capacitive|inductive|load\s*type|continuation|continuous|curve\s*type"
+    r"|contingenc(y|ies)|outages?|trip(ped)?|setpoints?|set\s*points?|stops?\s+at\s+(the\s+)?nose"
+    r"|(upper|lower)\s+branch|mirror(ed|ing)?)\b"
+)
+_QUESTION_START = re.compile(
+    r"^(what|what's|whats|how|why|when|which|where|who|is|are|does|do|can|could|should|would|explain|describe"
+    r"|define|tell me)\b"
+)
+_POLITE_PREFIX = re.compile(r"^((please|ok(ay)?|now|then|and|also|let'?s)[\s,]+|(can|could|would) you (please )?)+")
+_SET_VERBS = re.compile(
+    r"^(set|change|update|use|switch|make|increase|decrease|raise|lower|reduce|select|pick|monitor|enable"
+    r"|disable|turn|add|remove|clear|apply|trip|reset)\b"
+)
+# "make" and "it" are left out on purpose: "make it capacitive" and "make the curve
+# stop at the nose" are parameter edits.
+_GENERATE_VERBS = re.compile(r"^(generate|run|create|plot|draw|compute|calculate|simulate|produce|show me|rerun|redo)\b")
+_GENERATE_OBJECTS = re.compile(r"\b(pv|p-v|curves?|graph|plot|simulation|visuali[sz]ation|again)\b")
+_ANALYSIS_VERBS = re.compile(r"^(analy[sz]e|interpret|evaluate|assess)\b")
+_RESULT_REFERENCE = re.compile(
+    r"\b((these|this|my|those|current|latest) (pv |p-v )?(results?|curves?|plots?|graphs?|outputs?|data|margin)"
+    r"|the (results?|outputs?|data))\b"
+)
+_CHAINED_GENERATE = re.compile(r"\b(and|then)\s+(generate|run|create|plot|simulate)\b")
+_CHAINED_ANALYSIS = re.compile(r"\b(and|then)\s+(analy[sz]e|interpret)\b")
+_COMPARE = re.compile(r"\b(compare|comparison|difference between the (last|previous))\b")
+_DOMAIN_TERMS = re.compile(
+    r"\b(pv|p-v|nose|voltage (stability|collapse)|load margin|reactive power|collapse|stability|power systems?)\b"
+)
+# Questions about how a specific bus fared ("is bus 5 weak?") are about the results.
+_WEAKNESS_TERMS = re.compile(r"\b(weak(er|est)?|strong(er|est)|stiff(er|est)?|vulnerable|stressed)\b")
+_DEFINITION = re.compile(r"^(what('s| is| are) (a|an)\b|define\b|what does .* mean$)")
+_YES_NO_START = re.compile(r"^(is|are|does|do|can|could|should|would|will|was|were)\b")
+_ASSIGNMENT = re.compile(r"\b(to|=|:|at)\s*-?\d|\b(pf|bus|grid)\s*\d|\bieee\s*\d+\b")
+
+
+@dataclass(frozen=True)
+class Prediction:
+    """A classification with the tier that produced it (``confidence`` is None for the LLM)."""
+
+    message_type: str
+    tier: str
+    confidence: Optional[float] = None
+
+
+def rule_classify(text: str) -> tuple:
+    """Classify ``text`` with deterministic patterns.
+
+    Every rule that fires proposes a label with a fixed confidence. If rules
+    disagree, the winner's confidence is reduced by the runner-up's, so mixed
+    requests ("set pf to 0.9 and explain the nose point") fall through.
+
+    Returns:
+        ``(message_type, confidence)``, or ``(None, 0.0)`` if no rule fires.
+    """
+    raw = text.strip().lower()
+    question = raw.endswith("?")
+    text = _POLITE_PREFIX.sub("", raw.rstrip("?!. ")).strip()
+    question = question or (bool(_QUESTION_START.match(text)) and not _POLITE_PREFIX.match(raw))
+    mentions_parameter = bool(_PARAMETER_TERMS.search(text))
+
+    votes = {}
+
+    def vote(label, confidence):
+        votes[label] = max(votes.get(label, 0.0), confidence)
+
+    if _COMPARE.search(text):
+        vote("question_general", 0.9)
+    elif question:
+        if _WEAKNESS_TERMS.search(text) and not _DEFINITION.match(text):
+            vote("analysis", 0.85)
+        elif _RESULT_REFERENCE.search(text) and not mentions_parameter:
+            vote("analysis", 0.85)
+        elif mentions_parameter:
+            # A yes/no question naming a parameter ("is bus 5 stable?") is as often
+            # about the results as about the setting; leave it to the next tier.
+            vote("question_parameter", 0.7 if _YES_NO_START.match(text) else 0.85)
+        elif _DOMAIN_TERMS.search(text):
+            vote("question_general", 0.85)
+        else:
+            vote("question_general", 0.6)
+    else:
+        if _ANALYSIS_VERBS.match(text):
+            vote("analysis", 0.95)
+        if _GENERATE_VERBS.match(text) and _GENERATE_OBJECTS.search(text):
+            vote("generation", 0.95)
+        elif _SET_VERBS.match(text) and mentions_parameter:
+            vote("parameter", 0.95)
+        elif mentions_parameter and _ASSIGNMENT.search(text):
+            vote("parameter", 0.85)
+        # "set pf to 0.9 and generate the curve" asks for two things; let the LLM decide
+        if _CHAINED_GENERATE.search(text):
+            vote("generation", 0.9)
+        if _CHAINED_ANALYSIS.search(text):
+            vote("analysis", 0.9)
+
+    if not votes:
+        return None, 0.0
+    ranked = sorted(votes.items(), key=lambda item: item[1], reverse=True)
+    label, confidence = ranked[0]
+    if len(ranked) > 1:
+        confidence -= ranked[1][1]
+    return label, round(confidence, 4)
+
+
+_EXAMPLE_PAIR = re.compile(r"MESSAGE user (.+)\nMESSAGE assistant (\w+)")
+
+
+def parse_examples(system_prompt: str) -> tuple:
+    """Extract ``(message, message_type)`` pairs from the classifier prompt's examples."""
+    return tuple(
+        (message.strip(), label)
+        for message, label in _EXAMPLE_PAIR.findall(system_prompt or "")
+        if label in MESSAGE_TYPES
+    )
+
+
+def _unit_rows(vectors) -> np.ndarray:
+    arr = np.asarray(vectors, dtype=float)
+    norms = np.linalg.norm(arr, axis=-1, keepdims=True)
+    return arr / np.where(norms > 0, norms, 1.0)
+
+
+class CentroidIndex:
+    """Nearest-centroid classifier over embeddings of labeled examples."""
+
+    def __init__(self, embeddings, examples):
+        """
+        Args:
+            embeddings: LangChain-style embeddings (``embed_documents`` / ``embed_query``).
+            examples: ``(message, message_type)`` pairs; embedded once here.
+        """
+        self.embeddings = embeddings
+        by_label = {}
+        for message, label in examples:
+            by_label.setdefault(label, []).append(message)
+        self.labels = tuple(sorted(by_label))
+        vectors = _unit_rows(embeddings.embed_documents([m for label in self.labels for m in by_label[label]]))
+        centroids, start = [], 0
+        for label in self.labels:
+            count = len(by_label[label])
+            centroids.append(vectors[start:start + count].mean(axis=0))
+            start += count
+        self.centroids = _unit_rows(centroids)
+
+    def classify(self, text: str) -> tuple:
+        """Return ``(message_type, confidence)``; confidence is the softmax weight of the nearest centroid."""
+        query = _unit_rows(self.embeddings.embed_query(text))
+        scores = self.centroids @ query
+        weights = np.exp((scores - scores.max()) / EMBEDDING_TEMPERATURE)
+        best = int(np.argmax(scores))
+        return self.labels[best], round(float(weights[best] / weights.sum()), 4)
+
+
+def _default_embeddings():
+    from langchain_ollama import OllamaEmbeddings
+    from agent.vector import EMBEDDING_MODEL
+    return OllamaEmbeddings(model=EMBEDDING_MODEL)
+
+
+def _env_threshold(name, default):
+    value = os.getenv(name)
+    return float(value) if value else default
+
+
+class TieredClassifier:
+    """
+    Rules, then embedding centroids, then the LLM fallback, with per-tier hit counters.
+
+    The embedding index is built on first use from the examples passed to
+    ``classify`` and reused while they are unchanged. If the embedding model is
+    unreachable, the tier is skipped for ``embedding_retry_s`` seconds
+    (``embedding_error`` in ``stats()``) instead of paying the failure on every
+    turn, then tried again.
+    """
+
+    def __init__(
+        self,
+        rule_threshold: float = None,
+        embedding_threshold: float = None,
+        embeddings_factory=None,
+        embedding_retry_s: float = None,
+    ):
+        """
+        Args:
+            rule_threshold: Minimum rule confidence to skip the other tiers.
+            embedding_threshold: Minimum centroid confidence to skip the LLM.
+            embeddings_factory: Zero-argument callable returning the embeddings
+                model; defaults to Ollama with ``agent.vector.EMBEDDING_MODEL``.
+            embedding_retry_s: Seconds to skip the embedding tier after it fails.
+        """
+        self.rule_threshold = rule_threshold if rule_threshold is not None else _env_threshold(
+            "PV_CURVE_CLASSIFIER_RULE_THRESHOLD", DEFAULT_RULE_THRESHOLD)
+        self.embedding_threshold = embedding_threshold if embedding_threshold is not None else _env_threshold(
+            "PV_CURVE_CLASSIFIER_EMBEDDING_THRESHOLD", DEFAULT_EMBEDDING_THRESHOLD)
+        self.embedding_retry_s = embedding_retry_s if embedding_retry_s is not None else _env_threshold(
+            "PV_CURVE_CLASSIFIER_EMBEDDING_RETRY_S", DEFAULT_EMBEDDING_RETRY_S)
+        self.embeddings_factory = embeddings_factory or _default_embeddings
+        self.hits = dict.fromkeys(TIERS, 0)
+        self.embedding_error = None
+        self._embedding_failed_at = None
+        self._index = None
+        self._index_examples = None
+        self._lock = threading.Lock()
+
+    def _centroids(self, examples):
+        with self._lock:
+            if self._index is None or self._index_examples != examples:
+                self._index = CentroidIndex(self.embeddings_factory(), examples)
+                self._index_examples = examples
+            return self._index
+
+    def _embedding_tier(self, text, examples):
+        if self.embedding_threshold > 1 or not examples:
+            return None, 0.0
+        failed_at = self._embedding_failed_at
+        if failed_at is not None and time.monotonic() - failed_at < self.embedding_retry_s:
+            return None, 0.0
+        try:
+            prediction = self._centroids(examples).classify(text)
+        except Exception as e:
+            self.embedding_error = f"{type(e).__name__}: {e}"
+            self._embedding_failed_at = time.monotonic()
+            return None, 0.0
+        self.embedding_error = None
+        self._embedding_failed_at = None
+        return prediction
+
+    def _record(self, prediction):
+        with self._lock:
+            self.hits[prediction.tier] += 1
+        return prediction
+
+    def classify(self, text: str, examples: tuple = (), fallback=None) -> Prediction:
+        """Classify ``text``, calling ``fallback(text) -> message_type`` only if both fast tiers are unsure.
+
+        Args:
+            text: User message.
+            examples: ``(message, message_type)`` pairs for the embedding tier
+                (see ``parse_examples``); the tier is skipped when empty.
+            fallback: LLM classifier; required whenever the fast tiers can miss.
+        """
+        label, confidence = rule_classify(text)
+        if label is not None and confidence >= self.rule_threshold:
+            return self._record(Prediction(label, "rules", confidence))
+
+        label, confidence = self._embedding_tier(text, tuple(examples))
+        if label is not None and confidence >= self.embedding_threshold:
+            return self._record(Prediction(label, "embedding", confidence))
+
+        if fallback is None:
+            raise ValueError("Message could not be classified without an LLM fallback")
+        return self._record(Prediction(fallback(text), "llm"))
+
+    def stats(self) -> dict:
+        """Return per-tier hit counts and rates plus thresholds."""
+        with self._lock:
+            total = sum(self.hits.values())
+            return {
+                "hits": dict(self.hits),
+                "hit_rates": {tier: count / total if total else 0.0 for tier, count in self.hits.items()},
+                "llm_calls_avoided": total - self.hits["llm"],
+                "rule_threshold": self.rule_threshold,
+                "embedding_threshold": self.embedding_threshold,
+                "embedding_index_built": self._index is not None,
+                "embedding_error": self.embedding_error,
+            }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.hits = dict.fromkeys(TIERS, 0)
+
+
+# Shared by the graph, the MCP tools and the web sessions
+message_classifier = TieredClassifier()
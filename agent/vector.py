@@ -30,7 +30,8 @@ class SimpleRetriever:
         
         return after
 
-def retriever():
+def retriever(reranker=None):
+    """Open the Chroma store and wrap it with a reranker (a new ``LocalReranker`` unless one is passed in)."""
     embeddings = OllamaEmbeddings(model=EMBEDDING_MODEL)
     
     if not os.path.exists(DB_LOCATION):
@@ -43,6 +44,7 @@ def retriever():
     )
     
     base_retriever = vector_store.as_retriever(search_kwargs={"k": CANDIDATE_VECTORS})
-    reranker = get_reranker(top_k=NUM_VECTORS)
+    if reranker is None:
+        reranker = get_reranker(top_k=NUM_VECTORS)
     
     return SimpleRetriever(base_retriever, reranker)
\ No newline at end of file
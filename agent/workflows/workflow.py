@@ -13,21 +13,45 @@ from agent.nodes.advance_step import advance_step
 from agent.nodes.summary import summary_agent
 from agent.nodes.error_handler import error_handler_agent
 
-def create_workflow(llm, prompts, retriever, generate_pv_curve):
+# Node dependencies that a run may supply through config["configurable"].
+DEPENDENCIES = ("llm", "prompts", "retriever", "generate_pv_curve")
+
+
+def create_workflow(llm=None, prompts=None, retriever=None, generate_pv_curve=None):
+    """Compile the agent graph.
+
+    The arguments are defaults. A run can override any of ``DEPENDENCIES`` in
+    ``config["configurable"]`` (e.g. ``{"configurable": {"llm": session_llm}}``),
+    so one compiled graph can serve sessions on different LLM configs. A
+    dependency left as None here must be supplied by every run that reaches a
+    node needing it.
+    """
+    defaults = {"llm": llm, "prompts": prompts, "retriever": retriever, "generate_pv_curve": generate_pv_curve}
+
+    def deps(config, *names):
+        configurable = (config or {}).get("configurable", {})
+        values = []
+        for name in names:
+            value = configurable.get(name, defaults[name])
+            if value is None:
+                raise ValueError(f"No '{name}' passed to create_workflow or in config['configurable'].")
+            values.append(value)
+        return values
+
     graph_builder = StateGraph(State)
     
-    graph_builder.add_node("classifier", lambda state: classify_message(state, llm, prompts))
+    graph_builder.add_node("classifier", lambda state, config: classify_message(state, *deps(config, "llm", "prompts")))
     graph_builder.add_node("router", router)
-    graph_builder.add_node("planner", lambda state: planner_agent(state, llm, prompts))
+    graph_builder.add_node("planner", lambda state, config: planner_agent(state, *deps(config, "llm", "prompts")))
     graph_builder.add_node("step_controller", step_controller)
     graph_builder.add_node("advance_step", advance_step)
     graph_builder.add_node("summary", summary_agent)
-    graph_builder.add_node("question_general", lambda state: question_general_agent(state, llm, prompts, retriever))
-    graph_builder.add_node("question_parameter", lambda state: question_parameter_agent(state, llm, prompts))
-    graph_builder.add_node("parameter", lambda state: parameter_agent(state, llm, prompts))
-    graph_builder.add_node("generation", lambda state: generation_agent(state, llm, prompts, retriever, generate_pv_curve))
-    graph_builder.add_node("analysis", lambda state: analysis_agent(state, llm, prompts, retriever, generate_pv_curve))
-    graph_builder.add_node("error_handler", lambda state: error_handler_agent(state, llm, prompts))
+    graph_builder.add_node("question_general", lambda state, config: question_general_agent(state, *deps(config, "llm", "prompts", "retriever")))
+    graph_builder.add_node("question_parameter", lambda state, config: question_parameter_agent(state, *deps(config, "llm", "prompts")))
+    graph_builder.add_node("parameter", lambda state, config: parameter_agent(state, *deps(config, "llm", "prompts")))
+    graph_builder.add_node("generation", lambda state, config: generation_agent(state, *deps(config, *DEPENDENCIES)))
+    graph_builder.add_node("analysis", lambda state, config: analysis_agent(state, *deps(config, *DEPENDENCIES)))
+    graph_builder.add_node("error_handler", lambda state, config: error_handler_agent(state, *deps(config, "llm", "prompts")))
     
     graph_builder.add_edge(START, "classifier")
     graph_builder.add_edge("classifier", "router")
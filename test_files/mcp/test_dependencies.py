@@ -0,0 +1,72 @@
+"""
+Tool-call latency with the shared MCP dependency container.
+
+The factory stands in for ``setup_dependencies`` with a realistic setup cost
+(a delay for opening Chroma and loading the CrossEncoder) and returns a local
+stub LLM. Only the first tool call may pay for setup; later calls reuse the
+same objects until ``refresh()``.
+"""
+import time
+from unittest.mock import patch
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from agent.mcp_server import tools
+from agent.mcp_server.dependencies import Dependencies
+from agent.utils.common_utils import create_initial_state
+
+SETUP_DELAY_S = 0.2
+CALLS = 10
+
+
+class _StubLLM:
+    def invoke(self, messages):
+        return AIMessage(content="ok")
+
+
+def _factory(provider):
+    time.sleep(SETUP_DELAY_S)
+    return _StubLLM(), {}, object()
+
+
+def _generation(state, llm, prompts, retriever, generate_pv_curve):
+    return {"messages": [llm.invoke(state["messages"])], "results": {"save_path": "/tmp/plot.png"}}
+
+
+def _timed_calls(count):
+    seconds = []
+    for _ in range(count):
+        start = time.perf_counter()
+        out = tools.generate_pv_curve_tool("generate", "s1")
+        seconds.append(time.perf_counter() - start)
+        assert out["success"] is True
+    return seconds
+
+
+@patch("agent.mcp_server.tools.generation_agent", side_effect=_generation)
+@patch("agent.mcp_server.tools.state_manager")
+def test_setup_cost_is_paid_once(mock_sm, mock_gen):
+    state = create_initial_state()
+    state["messages"] = [HumanMessage(content="generate")]
+    mock_sm.get_state.return_value = state
+    mock_sm.serialize_state.return_value = {}
+    deps = Dependencies(factory=_factory)
+
+    with patch("agent.mcp_server.tools.dependencies", deps):
+        assert deps.stats()["loaded"] is False  # Nothing built at import / construction
+        first, *later = _timed_calls(CALLS)
+
+        assert deps.builds == 1
+        assert first >= SETUP_DELAY_S
+        assert max(later) < SETUP_DELAY_S / 10
+        assert len({id(call.args[1]) for call in mock_gen.call_args_list}) == 1
+
+        out = tools.refresh_dependencies_tool("openai")
+        assert out["success"] is True and out["provider"] == "openai"
+        assert out["builds"] == 2 and out["build_ms"] >= SETUP_DELAY_S * 1000
+        llm_before_refresh = mock_gen.call_args_list[0].args[1]
+        _timed_calls(1)
+        assert mock_gen.call_args_list[-1].args[1] is not llm_before_refresh
+
+        assert tools.refresh_dependencies_tool("bogus")["success"] is False
+        assert deps.builds == 2
@@ -5,10 +5,10 @@ import pytest
 
 from agent.utils.common_utils import create_initial_state
 
-# Patch before importing tools so setup_dependencies doesn't run
-with patch("agent.core.setup_dependencies") as _:
-    _.return_value = (Mock(), {}, Mock())
-    from agent.mcp_server import tools
+from agent.mcp_server import tools
+
+# Stub the shared dependencies so tests don't need real Ollama, Chroma or the reranker.
+tools.dependencies.factory = lambda provider: (Mock(), {}, Mock())
 
 # (tool_name, node_name) - node_name is the attribute in agent.mcp_server.tools
 NODE_TOOL_MAPPING = [
@@ -1,11 +1,11 @@
 """Unit tests for FastMCP server: initialization, tool registration, and session_id handling."""
 from unittest.mock import Mock, patch
 
-# Patch at source so the patch is active when tools module is first loaded
-with patch("agent.core.setup_dependencies") as _:
-    _.return_value = (Mock(), {}, Mock())
-    from agent.mcp_server import server
-    from agent.mcp_server import tools
+from agent.mcp_server import server
+from agent.mcp_server import tools
+
+# Stub the shared dependencies so tests don't need real Ollama, Chroma or the reranker.
+tools.dependencies.factory = lambda provider: (Mock(), {}, Mock())
 
 from agent.utils.common_utils import create_initial_state
 from fastmcp.tools import FunctionTool
@@ -20,11 +20,14 @@ EXPECTED_TOOL_NAMES = [
     "question_parameter",
     "modify_parameters",
     "generate_pv_curve",
+    "wait_for_plot",
+    "sweep_pv_curves",
     "plan_steps",
     "step_controller",
     "advance_step",
     "handle_error",
     "summarize_results",
+    "refresh_dependencies",
 ]
 
 
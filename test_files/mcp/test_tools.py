@@ -7,10 +7,10 @@ from agent.utils.common_utils import create_initial_state
 from agent.schemas.inputs import Inputs
 from agent.schemas.planner import MultiStepPlan, StepType
 
-# Patch setup_dependencies before tools module runs so tests don't need real Ollama.
-with patch("agent.mcp_server.tools.setup_dependencies") as _mock_setup:
-    _mock_setup.return_value = (Mock(), {}, Mock())
-    from agent.mcp_server import tools
+from agent.mcp_server import tools
+
+# Stub the shared dependencies so tests don't need real Ollama, Chroma or the reranker.
+tools.dependencies.factory = lambda provider: (Mock(), {}, Mock())
 
 
 def _mock_state():
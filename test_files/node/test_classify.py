@@ -8,6 +8,8 @@ from agent.nodes.classify import classify_message
 from agent.schemas.classifier import MessageClassifier
 from agent.schemas.response import NodeResponse
 from agent.core import setup_dependencies
+from agent.prompts import get_prompts
+from agent.utils.tiered_classifier import TieredClassifier, parse_examples, rule_classify
 
 # --------------------------------------------------------------
 # Helper functions
@@ -36,6 +38,11 @@ def get_base_prompts():
     }
 
 
+def llm_only_classifier():
+    """Classifier with the rule and embedding tiers disabled, so every message reaches the LLM."""
+    return TieredClassifier(rule_threshold=2.0, embedding_threshold=2.0)
+
+
 def get_initial_state(user_message: str):
     """Create initial state with user message."""
     return {
@@ -79,65 +86,65 @@ def _assert_classify_api_calls_and_response(mock_llm, prompts, user_message, res
 
 @patch('agent.nodes.classify.display_executing_node')
 def test_classify_general_question(mock_display):
-    """Test that API is called with correct parameters and response is handled correctly."""
+    """With the fast tiers disabled, the LLM is called with the right messages and its label is returned."""
     mock_llm = create_mock_llm(message_type="question_general")
     prompts = get_base_prompts()
     user_message = "What is pv curve?"
     state = get_initial_state(user_message)
     
-    result = classify_message(state, mock_llm, prompts)
+    result = classify_message(state, mock_llm, prompts, llm_only_classifier())
     
     _assert_classify_api_calls_and_response(mock_llm, prompts, user_message, result)
 
 
 @patch('agent.nodes.classify.display_executing_node')
 def test_classify_parameter_request(mock_display):
-    """Test that API is called with correct parameters and response is handled correctly."""
+    """With the fast tiers disabled, the LLM is called with the right messages and its label is returned."""
     mock_llm = create_mock_llm(message_type="parameter")
     prompts = get_base_prompts()
     user_message = "Set power factor to 0.9"
     state = get_initial_state(user_message)
     
-    result = classify_message(state, mock_llm, prompts)
+    result = classify_message(state, mock_llm, prompts, llm_only_classifier())
     
     _assert_classify_api_calls_and_response(mock_llm, prompts, user_message, result)
 
 
 @patch('agent.nodes.classify.display_executing_node')
 def test_classify_generation_request(mock_display):
-    """Test that API is called with correct parameters and response is handled correctly."""
+    """With the fast tiers disabled, the LLM is called with the right messages and its label is returned."""
     mock_llm = create_mock_llm(message_type="generation")
     prompts = get_base_prompts()
     user_message = "Generate pv curve"
     state = get_initial_state(user_message)
     
-    result = classify_message(state, mock_llm, prompts)
+    result = classify_message(state, mock_llm, prompts, llm_only_classifier())
     
     _assert_classify_api_calls_and_response(mock_llm, prompts, user_message, result)
 
 
 @patch('agent.nodes.classify.display_executing_node')
 def test_classify_question_parameter(mock_display):
-    """Test that API is called with correct parameters and response is handled correctly."""
+    """With the fast tiers disabled, the LLM is called with the right messages and its label is returned."""
     mock_llm = create_mock_llm(message_type="question_parameter")
     prompts = get_base_prompts()
     user_message = "What does power factor mean?"
     state = get_initial_state(user_message)
     
-    result = classify_message(state, mock_llm, prompts)
+    result = classify_message(state, mock_llm, prompts, llm_only_classifier())
     
     _assert_classify_api_calls_and_response(mock_llm, prompts, user_message, result)
 
 
 @patch('agent.nodes.classify.display_executing_node')
 def test_classify_analysis(mock_display):
-    """Test that API is called with correct parameters and response is handled correctly."""
+    """With the fast tiers disabled, the LLM is called with the right messages and its label is returned."""
     mock_llm = create_mock_llm(message_type="analysis")
     prompts = get_base_prompts()
     user_message = "Analyze the results"
     state = get_initial_state(user_message)
     
-    result = classify_message(state, mock_llm, prompts)
+    result = classify_message(state, mock_llm, prompts, llm_only_classifier())
     
     _assert_classify_api_calls_and_response(mock_llm, prompts, user_message, result)
 
@@ -150,7 +157,7 @@ def test_api_failure_handling(mock_display):
     state = get_initial_state("This should fail")
     
     with pytest.raises(Exception, match="API Connection Failed"):
-        classify_message(state, mock_llm, prompts)
+        classify_message(state, mock_llm, prompts, llm_only_classifier())
     
     mock_llm.with_structured_output.assert_called_once_with(MessageClassifier)
 
@@ -188,6 +195,132 @@ def test_state_missing_messages_key(mock_display):
         classify_message(state, mock_llm, prompts)
 
 
+class _KeywordEmbeddings:
+    """Deterministic stand-in for the embedding model: one axis per keyword."""
+
+    KEYWORDS = ("alpha", "beta", "gamma")
+
+    def __init__(self):
+        self.documents_embedded = 0
+
+    def embed_documents(self, texts):
+        self.documents_embedded += len(texts)
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text):
+        return [text.lower().count(word) for word in self.KEYWORDS] + [0.01]
+
+
+# Prompt examples plus the integration-test messages, labeled as the LLM should classify them.
+FAST_PATH_CORPUS = parse_examples(get_prompts()["classifier"]["system"]) + (
+    ("Set power factor to 0.9", "parameter"),
+    ("pf 0.85", "parameter"),
+    ("please set the contingency to 2-3;3-4", "parameter"),
+    ("Generate PV curve for ieee39", "generation"),
+    ("can you plot the curve", "generation"),
+    ("What is the bus ID?", "question_parameter"),
+    ("What does this PV curve tell us?", "analysis"),
+    ("Interpret the load margin", "analysis"),
+    ("make it capacitive", "parameter"),
+    ("make it inductive", "parameter"),
+    ("make the curve stop at the nose", "parameter"),
+    ("is bus 5 weak?", "analysis"),
+    ("is bus 14 the weakest bus?", "analysis"),
+    ("Which bus is the weakest?", "analysis"),
+)
+
+
+def test_rule_tier_labels_corpus_without_llm():
+    classifier = TieredClassifier(rule_threshold=0.8, embedding_threshold=2.0)
+    fallback = Mock(return_value="question_general")
+
+    predictions = [classifier.classify(message, fallback=fallback) for message, _ in FAST_PATH_CORPUS]
+
+    fast = [(p, label) for p, (_, label) in zip(predictions, FAST_PATH_CORPUS) if p.tier == "rules"]
+    assert all(p.message_type == label for p, label in fast)
+    stats = classifier.stats()
+    assert stats["hit_rates"]["rules"] >= 0.9
+    assert stats["hits"]["llm"] == fallback.call_count
+    assert stats["llm_calls_avoided"] == len(fast)
+
+
+@pytest.mark.parametrize("message", ["make it capacitive", "make it inductive", "make the curve stop at the nose"])
+def test_make_edits_are_not_generation(message):
+    assert rule_classify(message)[0] == "parameter"
+
+
+def test_result_questions_naming_a_bus_are_not_parameter_questions():
+    assert rule_classify("What is a weak bus?")[0] != "analysis"
+    label, confidence = rule_classify("is bus 5 stable?")
+    assert label == "question_parameter" and confidence < 0.8
+
+
+def test_mixed_requests_fall_through_to_llm():
+    _, confidence = rule_classify("Set pf to 0.9 and generate the curve")
+    assert confidence < 0.8
+
+    classifier = TieredClassifier(embedding_threshold=2.0)
+    prediction = classifier.classify("Set pf to 0.9 and generate the curve", fallback=lambda text: "parameter")
+    assert (prediction.message_type, prediction.tier) == ("parameter", "llm")
+
+
+def test_embedding_tier_uses_cached_centroids():
+    embeddings = _KeywordEmbeddings()
+    classifier = TieredClassifier(embedding_threshold=0.7, embeddings_factory=lambda: embeddings)
+    examples = (("alpha one", "generation"), ("alpha two", "generation"), ("beta", "analysis"), ("gamma", "question_general"))
+    fallback = Mock(return_value="question_general")
+
+    first = classifier.classify("alpha alpha", examples, fallback)
+    second = classifier.classify("beta beta", examples, fallback)
+    unsure = classifier.classify("alpha beta", examples, fallback)
+
+    assert (first.message_type, first.tier) == ("generation", "embedding")
+    assert (second.message_type, second.tier) == ("analysis", "embedding")
+    assert unsure.tier == "llm"
+    assert embeddings.documents_embedded == len(examples)  # Examples embedded once
+    assert classifier.stats()["hits"] == {"rules": 0, "embedding": 2, "llm": 1}
+
+
+def test_embedding_failure_skips_tier_during_backoff():
+    factory = Mock(side_effect=ConnectionError("ollama not running"))
+    classifier = TieredClassifier(embeddings_factory=factory, embedding_retry_s=60.0)
+    examples = (("alpha", "generation"),)
+
+    for _ in range(3):
+        assert classifier.classify("hello", examples, lambda text: "question_general").tier == "llm"
+
+    factory.assert_called_once()
+    assert "ConnectionError" in classifier.stats()["embedding_error"]
+
+
+def test_embedding_tier_recovers_after_transient_failure():
+    factory = Mock(side_effect=[ConnectionError("ollama restarting"), _KeywordEmbeddings()])
+    classifier = TieredClassifier(embedding_threshold=0.7, embeddings_factory=factory, embedding_retry_s=0.0)
+    examples = (("alpha", "generation"), ("beta", "analysis"))
+    fallback = Mock(return_value="question_general")
+
+    failed = classifier.classify("alpha alpha", examples, fallback)
+    assert failed.tier == "llm"
+    assert "ConnectionError" in classifier.stats()["embedding_error"]
+
+    recovered = classifier.classify("alpha alpha", examples, fallback)
+    assert (recovered.message_type, recovered.tier) == ("generation", "embedding")
+    assert classifier.stats()["embedding_error"] is None
+    assert factory.call_count == 2
+
+
+@patch('agent.nodes.classify.display_executing_node')
+def test_fast_path_skips_llm(mock_display):
+    mock_llm = create_mock_llm(message_type="question_general")
+    classifier = TieredClassifier(embedding_threshold=2.0)
+
+    result = classify_message(get_initial_state("Set power factor to 0.9"), mock_llm, get_base_prompts(), classifier)
+
+    mock_llm.with_structured_output.assert_not_called()
+    assert result["message_type"] == "parameter"
+    assert result["node_response"].metadata["tier"] == "rules"
+
+
 # --------------------------------------------------------------
 # Integration Tests (Real API)
 # --------------------------------------------------------------
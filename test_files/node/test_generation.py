@@ -0,0 +1,74 @@
+from unittest.mock import Mock, patch
+
+from langchain_core.messages import HumanMessage
+from agent.nodes.generation import generation_agent
+from agent.schemas.inputs import Inputs
+from agent.schemas.parameter import InputModifier, ParameterModification
+
+
+# --------------------------------------------------------------
+# Helper functions
+# --------------------------------------------------------------
+
+def get_base_prompts():
+    return {
+        "parameter_agent": {
+            "system": "You can modify parameters based on current_inputs: {current_inputs}"
+        }
+    }
+
+
+def create_mock_llm(result):
+    llm = Mock()
+    llm.with_structured_output.return_value.invoke.return_value = result
+    return llm
+
+
+def fake_generate_pv_curve(**kwargs):
+    return {"save_path": "/tmp/pv.png", "converged_steps": 12, "load_margin_mw": 100.0, "inputs_used": kwargs}
+
+
+def run(message, llm, inputs=None):
+    state = {"messages": [HumanMessage(content=message)], "inputs": inputs or Inputs()}
+    return generation_agent(state, llm, get_base_prompts(), None, fake_generate_pv_curve)
+
+
+# --------------------------------------------------------------
+# Unit Tests (Mocked API)
+# --------------------------------------------------------------
+
+
+@patch('agent.nodes.generation.display_executing_node')
+def test_bare_request_skips_llm(mock_display):
+    llm = create_mock_llm(InputModifier(modifications=[]))
+
+    result = run("Generate a PV curve", llm)
+
+    llm.with_structured_output.assert_not_called()
+    assert "inputs" not in result
+    assert result["node_response"].metadata["parameter_extraction"] == "parser"
+
+
+@patch('agent.nodes.generation.display_executing_node')
+def test_inline_parameters_are_parsed(mock_display):
+    llm = create_mock_llm(InputModifier(modifications=[]))
+
+    result = run("Create a PV curve for ieee118 with bus 10 and pf 0.9", llm)
+
+    llm.with_structured_output.assert_not_called()
+    assert (result["inputs"].grid, result["inputs"].bus_id, result["inputs"].power_factor) == ("ieee118", 10, 0.9)
+    assert result["results"]["inputs_used"]["target_bus_idx"] == 10
+
+
+@patch('agent.nodes.generation.display_executing_node')
+def test_ambiguous_request_uses_llm(mock_display):
+    llm = create_mock_llm(InputModifier(modifications=[
+        ParameterModification(parameter="contingency_lines", value="none")
+    ]))
+
+    result = run("Generate the curve with the line between bus 1 and 2 connected back",
+                 llm, Inputs(contingency_lines=[(1, 2)]))
+
+    llm.with_structured_output.return_value.invoke.assert_called_once()
+    assert result["inputs"].contingency_lines is None
+    assert result["node_response"].metadata["parameter_extraction"] == "llm"
@@ -1,4 +1,6 @@
+import json
 import os
+import re
 from unittest.mock import Mock, patch
 import pytest
 from pydantic import ValidationError
@@ -8,6 +10,8 @@ from agent.nodes.parameter import parameter_agent
 from agent.schemas.inputs import Inputs
 from agent.schemas.parameter import InputModifier, ParameterModification
 from agent.core import setup_dependencies
+from agent.prompts import PARAMETER_AGENT_SYSTEM
+from agent.utils.parameter_parser import parse_modifications
 
 
 # --------------------------------------------------------------
@@ -94,7 +98,7 @@ def test_modify_single_parameter(mock_display):
     user_message = "Set grid to ieee14"
     state = get_initial_state(user_message, inputs=initial_inputs)
 
-    result = parameter_agent(state, mock_llm, prompts)
+    result = parameter_agent(state, mock_llm, prompts, preparse=False)
 
     mock_display.assert_called_once_with("parameter")
     expected_updates = {"grid": "ieee14"}
@@ -123,7 +127,7 @@ def test_modify_multiple_parameters(mock_display):
     user_message = "Set bus to 10 and power factor to 0.9"
     state = get_initial_state(user_message, inputs=initial_inputs)
 
-    result = parameter_agent(state, mock_llm, prompts)
+    result = parameter_agent(state, mock_llm, prompts, preparse=False)
 
     mock_display.assert_called_once_with("parameter")
     expected_updates = {"bus_id": 10, "power_factor": 0.9}
@@ -151,7 +155,7 @@ def test_extract_from_message(mock_display):
     user_message = "Please use a smaller step size of 0.02."
     state = get_initial_state(user_message, inputs=initial_inputs)
 
-    result = parameter_agent(state, mock_llm, prompts)
+    result = parameter_agent(state, mock_llm, prompts, preparse=False)
 
     mock_display.assert_called_once_with("parameter")
     expected_updates = {"step_size": 0.02}
@@ -179,7 +183,7 @@ def test_grid_normalization(mock_display):
     user_message = "Set grid to IEEE39"
     state = get_initial_state(user_message, inputs=initial_inputs)
 
-    result = parameter_agent(state, mock_llm, prompts)
+    result = parameter_agent(state, mock_llm, prompts, preparse=False)
 
     mock_display.assert_called_once_with("parameter")
     expected_updates = {"grid": "IEEE39"}
@@ -209,7 +213,7 @@ def test_type_validation(mock_display):
     user_message = "Set bus to 10, step size to 0.02, and capacitive to true."
     state = get_initial_state(user_message, inputs=initial_inputs)
 
-    result = parameter_agent(state, mock_llm, prompts)
+    result = parameter_agent(state, mock_llm, prompts, preparse=False)
 
     mock_display.assert_called_once_with("parameter")
     expected_updates = {"bus_id": 10, "step_size": 0.02, "capacitive": True}
@@ -242,7 +246,7 @@ def test_invalid_parameter(mock_display):
     user_message = "Set unknown_param to 123"
     state = get_initial_state(user_message, inputs=initial_inputs)
 
-    result = parameter_agent(state, mock_llm, prompts)
+    result = parameter_agent(state, mock_llm, prompts, preparse=False)
 
     mock_display.assert_called_once_with("parameter")
     expected_updates = {"unknown_param": "123"}
@@ -271,7 +275,7 @@ def test_range_validation(mock_display):
     user_message = "Set step size to 100"
     state = get_initial_state(user_message, inputs=initial_inputs)
 
-    result = parameter_agent(state, mock_llm, prompts)
+    result = parameter_agent(state, mock_llm, prompts, preparse=False)
 
     mock_display.assert_called_once_with("parameter")
     assert result["inputs"].step_size == 100.0
@@ -286,7 +290,7 @@ def test_no_modifications(mock_display):
     user_message = "Do nothing."
     state = get_initial_state(user_message, inputs=initial_inputs)
 
-    result = parameter_agent(state, mock_llm, prompts)
+    result = parameter_agent(state, mock_llm, prompts, preparse=False)
 
     mock_display.assert_called_once_with("parameter")
     expected_updates = {}
@@ -312,7 +316,7 @@ def test_api_failure(mock_display):
     state = get_initial_state(user_message, inputs=initial_inputs)
 
     with pytest.raises(Exception, match="API Connection Failed"):
-        parameter_agent(state, mock_llm, prompts)
+        parameter_agent(state, mock_llm, prompts, preparse=False)
 
 
 @patch('agent.nodes.parameter.display_executing_node')
@@ -323,7 +327,7 @@ def test_empty_state_handling(mock_display):
     state = {"messages": [], "inputs": initial_inputs}
 
     with pytest.raises((IndexError, KeyError)):
-        parameter_agent(state, mock_llm, prompts)
+        parameter_agent(state, mock_llm, prompts, preparse=False)
 
 
 @patch('agent.nodes.parameter.display_executing_node')
@@ -334,7 +338,7 @@ def test_state_missing_messages_key(mock_display):
     state = {"inputs": initial_inputs}
 
     with pytest.raises((KeyError, IndexError)):
-        parameter_agent(state, mock_llm, prompts)
+        parameter_agent(state, mock_llm, prompts, preparse=False)
 
 
 @patch('agent.nodes.parameter.display_executing_node')
@@ -346,7 +350,107 @@ def test_missing_prompts_key(mock_display):
     state = get_initial_state(user_message, inputs=initial_inputs)
 
     with pytest.raises((KeyError, AttributeError)):
-        parameter_agent(state, mock_llm, prompts)
+        parameter_agent(state, mock_llm, prompts, preparse=False)
+
+
+def _prompt_examples():
+    """Labeled (message, {parameter: value}) pairs from the parameter prompt's examples."""
+    examples = []
+    pairs = re.findall(r"MESSAGE user (.+)\nMESSAGE assistant (\[.*\])", PARAMETER_AGENT_SYSTEM)
+    for message, answer in pairs:
+        expected = {}
+        for name, value in re.findall(r'parameter: "(\w+)", value: ("[^"]*"|[\w.]+)', answer):
+            expected[name] = value.strip('"') if value.startswith('"') else json.loads(value)
+        examples.append((message, expected))
+    return examples
+
+
+# Prompt examples plus common turns that reach the parameter / generation nodes.
+PARSER_CORPUS = _prompt_examples() + [
+    ("Generate a PV curve", {}),
+    ("Run the simulation", {}),
+    ("Plot the curve again", {}),
+    ("pf 0.9", {"power_factor": 0.9}),
+    ("power factor 0.9 leading", {"power_factor": 0.9, "capacitive": True}),
+    ("power factor 0.9 lagging", {"power_factor": 0.9, "capacitive": False}),
+    ("set contingency to 2-3;3-4", {"contingency_lines": "2-3;3-4"}),
+    ("setpoints 1:1.05,2:1.02", {"gen_voltage_setpoints": "1:1.05,2:1.02"}),
+    ("Increase the power factor by 0.05", None),
+    ("Set step size to 100", None),
+]
+
+
+def test_parser_matches_corpus_and_skips_most_llm_calls():
+    parsed = 0
+    for message, expected in PARSER_CORPUS:
+        result = parse_modifications(message)
+        if result is None:
+            continue
+        parsed += 1
+        assert expected is not None, message
+        assert {m.parameter: m.value for m in result.modifications} == expected, message
+
+    skip_rate = parsed / len(PARSER_CORPUS)
+    print(f"\nParameter pre-parser: {parsed}/{len(PARSER_CORPUS)} turns skip the LLM ({skip_rate:.0%})")
+    assert skip_rate >= 0.75
+
+
+@pytest.mark.parametrize("message", [
+    "Connect the transmission line between bus 1 and 2 back",  # Needs the current outage list
+    "Use a 24 bus system",  # Not an available grid
+    "Don't use capacitive load",
+    "Set bus to 10 and bus to 12",
+    "make it capacitive with a lagging power factor",
+    # Removals are differences against the current outage list, not additions
+    "remove line 1-2 from the contingency list",
+    "drop line 1-2 from the outages",
+    "remove the 2-3 outage",
+    "delete the 1-2 contingency",
+    "exclude line 2-3",
+    "without the line between bus 1 and 2",
+])
+def test_parser_hands_off_ambiguous_messages(message):
+    assert parse_modifications(message) is None
+
+
+@patch('agent.nodes.parameter.display_executing_node')
+def test_simple_edit_skips_llm(mock_display):
+    mock_llm, modifier_llm = create_mock_llm(InputModifier(modifications=[]))
+    state = get_initial_state("Set power factor to 0.9 and bus to 10")
+
+    result = parameter_agent(state, mock_llm, get_base_prompts())
+
+    mock_llm.with_structured_output.assert_not_called()
+    assert result["inputs"].power_factor == 0.9
+    assert result["inputs"].bus_id == 10
+    assert result["node_response"].metadata["extraction"] == "parser"
+
+
+@patch('agent.nodes.parameter.display_executing_node')
+def test_outage_removal_uses_llm(mock_display):
+    api_result = InputModifier(modifications=[ParameterModification(parameter="contingency_lines", value="2-3")])
+    mock_llm, modifier_llm = create_mock_llm(api_result)
+    state = get_initial_state("remove line 1-2 from the contingency list",
+                              inputs=Inputs(contingency_lines=[(1, 2), (2, 3)]))
+
+    with patch("agent.nodes.parameter._validate_contingency_pairs_for_grid"):
+        result = parameter_agent(state, mock_llm, get_base_prompts())
+
+    modifier_llm.invoke.assert_called_once()
+    assert result["inputs"].contingency_lines == [(2, 3)]
+
+
+@patch('agent.nodes.parameter.display_executing_node')
+def test_unparsed_edit_uses_llm(mock_display):
+    api_result = InputModifier(modifications=[ParameterModification(parameter="power_factor", value="0.95")])
+    mock_llm, modifier_llm = create_mock_llm(api_result)
+    state = get_initial_state("Increase the power factor by 0.05", inputs=Inputs(power_factor=0.9))
+
+    result = parameter_agent(state, mock_llm, get_base_prompts())
+
+    modifier_llm.invoke.assert_called_once()
+    assert result["inputs"].power_factor == 0.95
+    assert result["node_response"].metadata["extraction"] == "llm"
 
 
 # --------------------------------------------------------------
@@ -0,0 +1,68 @@
+import numpy as np
+
+from agent.pv_curve.batch_pflow import outage_warm_starts, solve_power_flows
+from agent.pv_curve.case_cache import case_cache
+from agent.pv_curve.grid_catalog import get_catalog
+from agent.pv_curve.native_cpf import ContinuationPowerFlow, Network
+from agent.pv_curve.pv_curve import _apply_contingencies, _base_state, _solve_power_flow
+
+
+# --------------------------------------------------------------
+# Unit Tests
+# --------------------------------------------------------------
+
+
+def test_batch_matches_single_scenario_solves():
+    template = case_cache.get_template("ieee39")
+    catalog = get_catalog("ieee39")
+    outages = [(), catalog.line_uids(1, 2), catalog.line_uids(16, 17)]
+    net = Network(template)
+    scale = np.array([1.0, 1.1, 1.2])[:, None]
+
+    batch = solve_power_flows(net, net.p0 * scale, net.q0 * scale, line_outages=outages)
+
+    assert batch["converged"].all()
+    for k, uids in enumerate(outages):
+        single = Network(template, uids)
+        single.p0, single.q0 = single.p0 * scale[k], single.q0 * scale[k]
+        cpf = ContinuationPowerFlow(single, single.p0, single.q0)
+        converged, _, _ = cpf.solve_power_flow()
+        assert converged
+        assert np.allclose(batch["vm"][k], cpf.vm, atol=1e-8)
+        assert np.allclose(batch["va"][k], cpf.va, atol=1e-8)
+
+
+def test_failing_scenarios_do_not_stop_the_batch():
+    catalog = get_catalog("ieee39")
+    net = Network(case_cache.get_template("ieee39"))
+
+    batch = solve_power_flows(
+        net,
+        np.vstack([net.p0, net.p0 * 50.0, net.p0]),
+        np.vstack([net.q0, net.q0 * 50.0, net.q0]),
+        line_outages=[(), (), catalog.line_uids(2, 30)],  # Bus 30's generator is radial.
+    )
+
+    assert batch["converged"].tolist() == [True, False, False]
+    assert batch["islanded"].tolist() == [False, False, True]
+    assert batch["mismatch"][0] < 1e-6
+
+
+# --------------------------------------------------------------
+# ANDES Tests
+# --------------------------------------------------------------
+
+
+def test_outage_warm_starts_match_andes_power_flow():
+    catalog = get_catalog("ieee39")
+    states = outage_warm_starts("ieee39", [[(16, 17)], [(99, 100)], [(2, 30)]])
+
+    assert states[1] is None and states[2] is None
+    ss = case_cache.load("ieee39")
+    ss.setup()
+    _apply_contingencies(ss, [(16, 17)], catalog)
+    iterations, warm = _solve_power_flow(ss, states[0])
+
+    assert warm and iterations <= 2
+    assert np.allclose(ss.Bus.v.v, states[0]["v"], atol=1e-6)
+    assert not np.allclose(states[0]["v"], _base_state("ieee39")["v"], atol=1e-3)
@@ -0,0 +1,105 @@
+import pytest
+
+from agent.pv_curve.benchmark import PROFILES, build_cases, compare
+from agent.pv_curve.case_cache import CASE_MAP
+
+
+def _row(case_id, status="ok", **metrics):
+    base = {"wall_s": 1.0, "peak_rss_mb": 200.0, "cpf_points": 50, "points_per_s": 100.0, "timings": {"cpf": 0.5}}
+    return {"id": case_id, "status": status, **base, **metrics}
+
+
+def test_build_cases_covers_every_grid_and_axis():
+    cases = build_cases("quick")
+    matrix = PROFILES["quick"]
+    per_grid = (
+        len(matrix["step_size"]) * len(matrix["max_scale"]) * len(matrix["contingency"])
+        * len(matrix["plot"]) * len(matrix["backend"])
+    )
+
+    curves = [case for case in cases if case["kind"] == "curve"]
+
+    assert {case["grid"] for case in curves} == set(CASE_MAP)
+    assert len(curves) == per_grid * len(CASE_MAP)
+    assert len({case["id"] for case in cases}) == len(cases)
+    assert any(case["contingency_lines"] for case in curves)
+    assert any(case["plot"] for case in curves)
+    assert {case["backend"] for case in curves} == {"andes", "native"}
+
+
+def test_andes_case_ids_are_unchanged_by_backend_axis():
+    ids = {case["id"] for case in build_cases("quick", grids=["ieee14"])}
+
+    assert "ieee14/step=0.1/scale=3/n-1=no/plot=no" in ids
+    assert "ieee14/step=0.1/scale=3/n-1=no/plot=no/backend=native" in ids
+
+
+def test_full_profile_adds_warm_and_cold_n1_batches():
+    batches = [case for case in build_cases("full", grids=["ieee14", "ieee118"]) if case["kind"] == "n1_batch"]
+
+    assert [(case["grid"], case["warm_start"]) for case in batches] == [("ieee118", False), ("ieee118", True)]
+    assert len(batches[0]["lines"]) == PROFILES["full"]["n1_batch"]
+    assert batches[0]["id"] == "ieee118/n1-batch=8/warm=no"
+
+
+def test_case_load_cases_cover_every_grid_cached_and_uncached():
+    loads = [case for case in build_cases("quick") if case["kind"] == "case_load"]
+
+    assert [(case["grid"], case["cached"]) for case in loads] == [
+        (grid, cached) for grid in CASE_MAP for cached in (False, True)
+    ]
+    assert loads[0]["id"] == "ieee14/case-load/cached=no"
+
+
+def test_build_cases_rejects_unknown_profile_and_grid():
+    with pytest.raises(ValueError, match="Unknown profile"):
+        build_cases("huge")
+    with pytest.raises(ValueError, match="Unsupported grid"):
+        build_cases("quick", grids=["ieee9999"])
+
+
+def test_compare_flags_regressions_beyond_tolerance():
+    baseline = {"cases": [_row("a"), _row("b"), _row("c"), _row("gone")]}
+    report = {
+        "cases": [
+            _row("a", wall_s=1.5, points_per_s=60.0, timings={"cpf": 0.8}),
+            _row("b", wall_s=1.1, cpf_points=49),
+            _row("c", status="error"),
+            _row("fresh"),
+        ]
+    }
+
+    result = compare(report, baseline, tolerance=0.25)
+
+    assert {(entry["id"], entry["metric"]) for entry in result["regressions"]} == {
+        ("a", "wall_s"),
+        ("a", "points_per_s"),
+    }
+    assert [entry["id"] for entry in result["changed"]] == ["b"]
+    assert result["errors"] == ["c"]
+    assert result["missing"] == ["gone"]
+    assert result["new"] == ["fresh"]
+    assert result["ok"] is False
+
+
+def test_compare_reports_baseline_from_another_machine():
+    env = {"host": "bench-01", "cpu_count": 8, "python": "3.11.7"}
+    baseline = {"meta": {"environment": env}, "cases": [_row("a")]}
+
+    same = compare({"meta": {"environment": dict(env, python="3.12.1")}, "cases": [_row("a")]}, baseline)
+    other = compare({"meta": {"environment": dict(env, host="laptop", cpu_count=1)}, "cases": [_row("a")]}, baseline)
+
+    assert same["environment"] == {}
+    assert other["environment"] == {"host": ["bench-01", "laptop"], "cpu_count": [8, 1]}
+    assert other["ok"] is True
+
+
+def test_compare_ignores_sub_noise_wall_deltas():
+    baseline = {"cases": [_row("a", wall_s=0.1)]}
+    report = {"cases": [_row("a", wall_s=0.3, points_per_s=60.0, timings={"cpf": 0.6}, peak_rss_mb=120.0)]}
+
+    result = compare(report, baseline)
+
+    assert result["regressions"] == []
+    assert [entry["metric"] for entry in result["improvements"]] == ["peak_rss_mb"]
+    assert result["ok"] is True
@@ -0,0 +1,82 @@
+import threading
+import time
+
+import pytest
+
+from agent.pv_curve.cancellation import CancellationToken, SimulationCancelled
+from agent.pv_curve.pv_curve import generate_pv_curve
+from agent.pv_curve.trajectory_cache import trajectory_cache
+
+
+# --------------------------------------------------------------
+# Unit Tests
+# --------------------------------------------------------------
+
+
+def test_first_reason_wins():
+    token = CancellationToken()
+    assert not token.cancelled
+    token.cancel("first")
+    token.cancel("second")
+    assert token.cancelled
+    assert token.reason == "first"
+    with pytest.raises(SimulationCancelled, match="first"):
+        token.check()
+
+
+def test_wall_clock_budget():
+    token = CancellationToken(timeout_s=0.01)
+    time.sleep(0.02)
+    assert token.cancelled
+    assert "Wall-clock" in token.reason
+
+
+def test_step_budget():
+    token = CancellationToken(max_steps=3)
+    token.check(3)
+    with pytest.raises(SimulationCancelled, match="Step budget"):
+        token.check(4)
+
+
+# --------------------------------------------------------------
+# ANDES Tests
+# --------------------------------------------------------------
+
+
+def test_step_budget_returns_uncached_partial_curve():
+    trajectory_cache.clear()
+    partial = generate_pv_curve(grid="ieee14", target_bus_idx=5, skip_plot=True, cancel_token=CancellationToken(max_steps=5))
+
+    assert "Step budget" in partial["cancelled"]
+    assert partial["converged_steps"] == 6
+    assert len(trajectory_cache) == 0
+
+    full = generate_pv_curve(grid="ieee14", target_bus_idx=5, skip_plot=True)
+    assert full["cancelled"] is None
+    assert full["cpf_cached"] is False
+    assert full["voltage_values_pu"][:6] == pytest.approx(partial["voltage_values_pu"])
+
+
+def test_cancel_from_another_thread_stops_run():
+    token = CancellationToken()
+    points = []
+
+    def progress(point):
+        points.append(point)
+        if point["step"] == 3:
+            threading.Thread(target=token.cancel).start()
+            time.sleep(0.05)
+
+    result = generate_pv_curve(
+        grid="ieee14", target_bus_idx=5, skip_plot=True, use_cache=False,
+        progress_callback=progress, cancel_token=token,
+    )
+    assert result["cancelled"] == "Cancelled by user."
+    assert result["converged_steps"] <= 5
+
+
+def test_cancel_before_any_point_raises():
+    token = CancellationToken()
+    token.cancel()
+    with pytest.raises(SimulationCancelled):
+        generate_pv_curve(grid="ieee14", target_bus_idx=5, skip_plot=True, use_cache=False, cancel_token=token)
@@ -0,0 +1,101 @@
+from unittest.mock import patch
+
+import pytest
+
+from agent.pv_curve.case_cache import CaseTemplateCache
+
+
+def _fake_template(grid):
+    return {"mva": 100.0, "models": {}, "grid": grid}
+
+
+# --------------------------------------------------------------
+# Unit Tests
+# --------------------------------------------------------------
+
+
+@patch("agent.pv_curve.case_cache._parse_case", side_effect=_fake_template)
+def test_parses_each_grid_once(mock_parse):
+    cache = CaseTemplateCache()
+    first = cache.get_template("ieee14")
+    second = cache.get_template("ieee14")
+
+    assert first is second
+    mock_parse.assert_called_once_with("ieee14")
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+@patch("agent.pv_curve.case_cache._parse_case", side_effect=_fake_template)
+def test_lru_eviction(mock_parse):
+    cache = CaseTemplateCache(max_entries=2)
+    cache.get_template("ieee14")
+    cache.get_template("ieee39")
+    cache.get_template("ieee14")  # ieee39 becomes least recently used
+    cache.get_template("ieee118")
+
+    assert "ieee14" in cache
+    assert "ieee118" in cache
+    assert "ieee39" not in cache
+    assert cache.stats()["evictions"] == 1
+
+
+@patch("agent.pv_curve.case_cache._parse_case", side_effect=_fake_template)
+def test_warm_up_all_grids(mock_parse):
+    cache = CaseTemplateCache()
+    warmed = cache.warm_up()
+
+    assert set(warmed) == {"ieee14", "ieee39", "ieee118", "ieee300"}
+    assert mock_parse.call_count == 4
+
+
+def test_unsupported_grid():
+    cache = CaseTemplateCache()
+    with pytest.raises(ValueError, match="Unsupported grid"):
+        cache.get_template("ieee999")
+
+
+# --------------------------------------------------------------
+# ANDES Tests
+# --------------------------------------------------------------
+
+
+def test_working_copies_are_independent():
+    cache = CaseTemplateCache()
+    ss1 = cache.load("ieee14")
+    ss2 = cache.load("ieee14")
+
+    assert ss1 is not ss2
+    assert ss1.Line.n == ss2.Line.n
+    ss1.Line.u.v[0] = 0
+    assert ss2.Line.u.v[0] == 1
+    assert cache.load("ieee14").Line.u.v[0] == 1
+
+
+def test_pooled_system_is_restored_between_checkouts():
+    cache = CaseTemplateCache()
+    ss = cache.acquire("ieee14")
+    cache.setup(ss)
+    ss.PFlow.run()
+    base_v = ss.Bus.v.v.copy()
+
+    ss.Line.set_status(ss.Line.idx.v[0], 0)
+    ss.PV.set("v0", ss.PV.idx.v[0], 1.08)
+    ss.CPF.config.step = 0.5
+    ss.CPF._bus_vmag = lambda: None
+    cache.release("ieee14", ss)
+
+    reused = cache.acquire("ieee14")
+    cache.setup(reused)
+    assert reused is ss
+    assert reused.Line.u.v[0] == 1 and reused.Line.ue.v[0] == 1
+    assert reused.CPF.config.step == 0.1
+    assert "_bus_vmag" not in vars(reused.CPF)
+    reused.PFlow.run()
+    assert reused.Bus.v.v == pytest.approx(base_v)
+
+    other = cache.acquire("ieee14")  # pool empty while ``reused`` is checked out
+    assert other is not reused and not other.is_setup
+    stats = cache.stats()
+    assert (stats["system_builds"], stats["system_reuses"]) == (2, 1)
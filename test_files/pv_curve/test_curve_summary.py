@@ -0,0 +1,44 @@
+import json
+
+import numpy as np
+
+from agent.pv_curve.curve_summary import estimate_tokens, simplify_curve, summarize_results
+from agent.pv_curve.result import PVCurveResult
+
+
+def _curve(points=400):
+    """Synthetic P–V curve: flat upper branch that bends sharply into the nose."""
+    v = np.linspace(1.05, 0.45, points)
+    p = 1000.0 * (1.0 - ((v - 0.8) / 0.25) ** 2) + 2000.0
+    return PVCurveResult(p, v, {"grid_system": "ieee39", "target_bus": 5},
+                         load_margin_mw=float(p.max() - p[0]), voltage_limit=0.4)
+
+
+# --------------------------------------------------------------
+# Unit Tests
+# --------------------------------------------------------------
+
+
+def test_simplify_curve_keeps_anchors_and_follows_the_bend():
+    x = np.linspace(0.0, 1.0, 101)
+    y = np.where(x < 0.5, 0.0, x - 0.5)  # One kink at index 50.
+
+    assert simplify_curve(x, y, 3) == [0, 50, 100]
+    assert simplify_curve(x, y, 3, keep=(10,)) == [0, 10, 100]
+    assert simplify_curve(x, y, 50) == [0, 50, 100]  # Collinear points add nothing.
+
+
+def test_summary_fits_budget_and_keeps_the_nose():
+    result = _curve()
+    full = summarize_results(result)
+    small = summarize_results(result, token_budget=400)
+
+    nose_step = result.nose_index + 1
+    for summary in (full, small):
+        steps = [row[0] for row in summary["characteristic_points"]["rows"]]
+        assert steps[0] == 1 and steps[-1] == 400 and nose_step in steps
+        assert summary["nose_point"]["step"] == nose_step
+    assert estimate_tokens(json.dumps(small)) <= 400
+    assert len(small["characteristic_points"]["rows"]) < len(full["characteristic_points"]["rows"])
+    assert estimate_tokens(json.dumps(full)) < estimate_tokens(repr(result)) / 10
+    assert summarize_results(result.to_dict()) == full
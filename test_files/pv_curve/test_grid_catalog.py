@@ -0,0 +1,44 @@
+import pytest
+
+from agent.pv_curve.case_cache import case_cache
+from agent.pv_curve.grid_catalog import get_catalog, line_key
+from agent.pv_curve.pv_curve import _apply_contingencies
+
+
+def test_catalog_indexes_topology_once():
+    catalog = get_catalog("ieee14")
+
+    assert get_catalog("ieee14") is catalog
+    assert catalog.buses == frozenset(range(1, 15))
+    assert catalog.line_uids(2, 1) == catalog.line_uids(1, 2)
+    assert line_key(5, 4) == (4, 5)
+    assert 2 in catalog.pv_uids
+    assert catalog.total_load_mw == pytest.approx(sum(p for p, _ in catalog.base_loads.values()))
+
+
+def test_catalog_rejects_unknown_indices():
+    catalog = get_catalog("ieee14")
+
+    with pytest.raises(ValueError, match="No line found between bus 1 and bus 14"):
+        catalog.validate_contingencies([(1, 2), (1, 14)])
+    with pytest.raises(ValueError, match="Generator index 99"):
+        catalog.validate_gen_voltage_setpoints({99: 1.0}, 0.9)
+    with pytest.raises(ValueError, match="must be between"):
+        catalog.validate_gen_voltage_setpoints({2: 1.5}, 0.9)
+    with pytest.raises(ValueError, match="Bus 99 not found"):
+        catalog.validate_bus(99)
+    with pytest.raises(ValueError, match="Unsupported grid"):
+        get_catalog("ieee9999")
+
+
+def test_catalog_line_uids_match_built_system():
+    catalog = get_catalog("ieee39")
+    ss = case_cache.load("ieee39")
+    ss.setup()
+
+    _apply_contingencies(ss, [(2, 3)], catalog)
+
+    (uid,) = catalog.line_uids(3, 2)
+    assert line_key(ss.Line.bus1.v[uid], ss.Line.bus2.v[uid]) == (2, 3)
+    assert ss.Line.u.v[uid] == 0
+    assert sum(ss.Line.u.v) == len(ss.Line.u.v) - 1
@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from agent.pv_curve.cancellation import CancellationToken, SimulationCancelled
+from agent.pv_curve.margin_estimate import _aitken, _band, estimate_load_margin
+from agent.pv_curve.pv_curve import generate_pv_curve
+from agent.pv_curve.trajectory_cache import trajectory_cache
+
+
+# --------------------------------------------------------------
+# Unit Tests
+# --------------------------------------------------------------
+
+
+def test_band_is_exact_for_a_quadratic_upper_branch():
+    # Two-bus-like curve: lambda = 1 - (V^2 - 0.5)^2, nose at lambda = 1.
+    v2 = np.linspace(1.0, 0.6, 8)
+    lam = 1.0 - (v2 - 0.5) ** 2
+    V = np.vstack([np.sqrt(v2), np.ones_like(v2)])
+
+    low, high = _band(lam, V)
+
+    assert low == pytest.approx(1.0)
+    assert high == pytest.approx(1.0)
+
+
+def test_aitken_extrapolates_converging_estimates_only():
+    assert _aitken(1.0, 1.5, 1.75) == pytest.approx(2.0)
+    assert _aitken(1.0, 1.5, 2.5) is None
+    assert _aitken(1.0, 1.5, 1.25) is None
+
+
+# --------------------------------------------------------------
+# ANDES Tests
+# --------------------------------------------------------------
+
+
+def test_estimate_band_brackets_full_run_margin():
+    trajectory_cache.clear()
+    estimate = estimate_load_margin("ieee39", max_scale=3.0)
+    exact = generate_pv_curve("ieee39", 5, skip_plot=True, continuation=False, use_cache=False)
+
+    assert estimate["source"] == "extrapolated"
+    assert estimate["exact"] is False
+    assert estimate["points"] < exact["converged_steps"]
+    assert estimate["low_mw"] <= exact["load_margin_mw"] <= estimate["high_mw"]
+
+
+def test_native_estimate_band_brackets_andes_margin():
+    trajectory_cache.clear()
+    estimate = estimate_load_margin("ieee39", max_scale=3.0, backend="native")
+    exact = generate_pv_curve("ieee39", 5, skip_plot=True, continuation=False, use_cache=False)
+
+    assert estimate["exact"] is False
+    assert estimate["low_mw"] <= exact["load_margin_mw"] <= estimate["high_mw"]
+
+
+def test_estimate_raises_when_request_is_cancelled_mid_run():
+    class CancelAfterTwoPoints(CancellationToken):
+        checks = 0
+
+        def check(self, step=None):
+            self.checks += 1
+            if self.checks > 2:
+                self.cancel()
+            super().check(step)
+
+    trajectory_cache.clear()
+    token = CancelAfterTwoPoints()
+
+    with pytest.raises(SimulationCancelled):
+        estimate_load_margin("ieee39", cancel_token=token, backend="native")
+    assert token.checks == 3
+
+
+def test_estimate_reuses_cached_trajectory():
+    trajectory_cache.clear()
+    exact = generate_pv_curve("ieee14", 5, skip_plot=True)
+    estimate = estimate_load_margin("ieee14", step_size=0.1)
+
+    assert estimate["source"] == "cache"
+    assert estimate["exact"] is True
+    assert estimate["load_margin_mw"] == pytest.approx(exact["load_margin_mw"])
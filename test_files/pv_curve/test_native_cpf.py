@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from agent.pv_curve.case_cache import case_cache
+from agent.pv_curve.native_cpf import ContinuationPowerFlow, Network
+from agent.pv_curve.pv_curve import _base_state, _run_cpf, generate_pv_curve
+
+
+# --------------------------------------------------------------
+# ANDES Tests
+# --------------------------------------------------------------
+
+
+def test_native_power_flow_matches_andes_base_case():
+    andes_state = _base_state("ieee14")
+    net = Network(case_cache.get_template("ieee14"))
+    cpf = ContinuationPowerFlow(net, net.p0, net.q0)
+
+    converged, _, warm = cpf.solve_power_flow()
+
+    assert converged and not warm
+    assert np.allclose(cpf.vm, andes_state["v"], atol=1e-8)
+    assert np.allclose(cpf.va, andes_state["a"], atol=1e-8)
+
+
+@pytest.mark.parametrize("grid", ["ieee14", "ieee39", "ieee118"])
+def test_native_nose_matches_andes(grid):
+    andes = _run_cpf(grid, None, 0.1, 3.0, 0.95, False, False, None, None)
+    native = _run_cpf(grid, None, 0.1, 3.0, 0.95, False, False, None, None, backend="native")
+
+    assert native["cpf_converged"]
+    assert np.array_equal(native["bus_idx"], andes["bus_idx"])
+    assert np.allclose(native["V"][:, 0], andes["V"][:, 0], atol=1e-8)
+    assert native["lam"].max() == pytest.approx(andes["lam"].max(), rel=5e-3)
+
+
+def test_native_contingency_and_setpoints_match_andes():
+    kwargs = dict(contingency_lines=[(2, 25)], gen_voltage_setpoints={3: 1.02})
+    andes = _run_cpf("ieee39", None, 0.1, 3.0, 0.95, False, False, **kwargs)
+    native = _run_cpf("ieee39", None, 0.1, 3.0, 0.95, False, False, backend="native", **kwargs)
+
+    assert np.allclose(native["V"][:, 0], andes["V"][:, 0], atol=1e-8)
+    assert native["lam"].max() == pytest.approx(andes["lam"].max(), rel=5e-3)
+
+
+def test_native_full_curve_returns_to_base_loading():
+    result = generate_pv_curve("ieee14", 5, skip_plot=True, use_cache=False, backend="native")
+
+    assert result["backend"] == "native"
+    assert 0 < result["nose_point"]["index"] < result["converged_steps"] - 1
+    assert result["load_values_mw"][-1] == pytest.approx(result["load_values_mw"][0])
+
+
+def test_unknown_backend_rejected():
+    with pytest.raises(ValueError, match="Unknown backend"):
+        generate_pv_curve("ieee14", 5, skip_plot=True, backend="gpu")
@@ -0,0 +1,76 @@
+import os
+import threading
+
+import pytest
+
+from agent.pv_curve.plot_renderer import PlotRenderer, plot_renderer
+from agent.pv_curve.pv_curve import generate_pv_curve
+
+
+def _touch(path):
+    with open(path, "wb") as f:
+        f.write(b"png")
+
+
+# --------------------------------------------------------------
+# Unit Tests
+# --------------------------------------------------------------
+
+
+def test_submit_resolves_to_path_and_records_stats(tmp_path):
+    renderer = PlotRenderer(max_workers=1)
+    path = str(tmp_path / "a.png")
+    future = renderer.submit(_touch, path, save_path=path)
+
+    assert future.result(timeout=5) == path
+    assert os.path.exists(path)
+    assert renderer.get(path) is future
+    assert renderer.wait(path, timeout=5) is True
+    assert renderer.render_time(path) is not None
+
+    stats = renderer.stats()
+    assert stats["rendered"] == 1
+    assert stats["queue_depth"] == 0
+    assert stats["max_queue_depth"] == 1
+
+
+def test_full_queue_renders_inline(tmp_path):
+    gate = threading.Event()
+    renderer = PlotRenderer(max_workers=1, max_pending=1)
+
+    blocked = renderer.submit(gate.wait, save_path=str(tmp_path / "blocked.png"))
+    path = str(tmp_path / "inline.png")
+    inline = renderer.submit(_touch, path, save_path=path)
+
+    assert inline.done()
+    assert renderer.stats()["inline"] == 1
+    gate.set()
+    blocked.result(timeout=5)
+
+
+def test_failed_render_is_reported(tmp_path):
+    def _boom(path):
+        raise RuntimeError("render failed")
+
+    renderer = PlotRenderer(max_workers=1)
+    path = str(tmp_path / "bad.png")
+    future = renderer.submit(_boom, path, save_path=path)
+
+    with pytest.raises(RuntimeError):
+        future.result(timeout=5)
+    assert renderer.wait(path, timeout=5) is False
+    assert renderer.stats()["failed"] == 1
+
+
+# --------------------------------------------------------------
+# ANDES Tests
+# --------------------------------------------------------------
+
+
+def test_async_plot_returns_before_png_is_written(tmp_path, monkeypatch):
+    monkeypatch.setenv("PV_CURVE_OUTPUT_DIR", str(tmp_path))
+    result = generate_pv_curve(grid="ieee14", target_bus_idx=5, async_plot=True)
+
+    assert result["plot_pending"] is True
+    assert plot_renderer.wait(result["save_path"], timeout=60)
+    assert os.path.getsize(result["save_path"]) > 0
@@ -0,0 +1,89 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import matplotlib
+import numpy as np
+import pytest
+
+from agent.pv_curve.pv_curve import PLOT_STYLES, _build_plot
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt  # noqa: E402  (legacy baseline only)
+
+N_CURVES = 24
+N_THREADS = 8
+
+
+def _curve(seed):
+    P = list(np.linspace(100.0, 300.0 + seed, 40))
+    V = list(np.linspace(1.0, 0.6 - seed * 0.005, 40))
+    return P, V, 20
+
+
+_PYPLOT_LOCK = threading.Lock()
+
+
+def _legacy_pyplot_plot(P_vals, V_vals, nose_idx, target_bus_idx, save_path, style="preview"):
+    """Previous pyplot implementation; needs a global lock to be thread-safe."""
+    theme = PLOT_STYLES[style]
+    with _PYPLOT_LOCK:
+        plt.figure(figsize=theme["figsize"])
+        plt.plot(P_vals[: nose_idx + 1], V_vals[: nose_idx + 1], label="Upper Branch", **theme["upper"])
+        plt.plot(P_vals[nose_idx:], V_vals[nose_idx:], label="Lower Branch", **theme["lower"])
+        plt.scatter(P_vals[nose_idx], V_vals[nose_idx], zorder=5, label="Nose Point", **theme["nose"])
+        plt.annotate(
+            f"P={P_vals[nose_idx]:.1f} MW\nV={V_vals[nose_idx]:.3f} pu",
+            xy=(P_vals[nose_idx], V_vals[nose_idx]),
+            xytext=(P_vals[nose_idx] * 1.005, V_vals[nose_idx]),
+            arrowprops=dict(arrowstyle="->", color="black"),
+            fontsize=theme["annotation_fontsize"],
+        )
+        plt.xlabel("Total Active Load P (MW)")
+        plt.ylabel(f"Voltage at Bus {target_bus_idx} (pu)")
+        plt.title("System P–V Curve (Voltage Stability Analysis)")
+        plt.grid(True)
+        plt.legend()
+        plt.savefig(save_path, dpi=theme["dpi"], bbox_inches="tight")
+        plt.close()
+
+
+def _render_parallel(plot_fn, out_dir):
+    def _one(i):
+        P, V, nose = _curve(i)
+        path = os.path.join(out_dir, f"curve_{i}.png")
+        plot_fn(P, V, nose, 5, path, style="preview")
+        return path
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=N_THREADS) as executor:
+        paths = list(executor.map(_one, range(N_CURVES)))
+    return paths, N_CURVES / (time.perf_counter() - start)
+
+
+def test_parallel_renders_match_serial_renders(tmp_path):
+    serial_dir = tmp_path / "serial"
+    serial_dir.mkdir()
+    for i in range(N_CURVES):
+        P, V, nose = _curve(i)
+        _build_plot(P, V, nose, 5, str(serial_dir / f"curve_{i}.png"), style="preview")
+
+    parallel_dir = tmp_path / "parallel"
+    parallel_dir.mkdir()
+    paths, _ = _render_parallel(_build_plot, str(parallel_dir))
+
+    for i, path in enumerate(paths):
+        with open(path, "rb") as got, open(serial_dir / f"curve_{i}.png", "rb") as want:
+            assert got.read() == want.read(), f"curve {i} differs when rendered concurrently"
+
+
+@pytest.mark.skipif((os.cpu_count() or 1) < 2, reason="Throughput comparison needs more than one core")
+def test_figure_api_outpaces_locked_pyplot(tmp_path):
+    (tmp_path / "legacy").mkdir()
+    (tmp_path / "figure").mkdir()
+    _, legacy_rate = _render_parallel(_legacy_pyplot_plot, str(tmp_path / "legacy"))
+    _, figure_rate = _render_parallel(_build_plot, str(tmp_path / "figure"))
+
+    print(f"pyplot+lock: {legacy_rate:.1f} plots/s, Figure/Agg: {figure_rate:.1f} plots/s")
+    assert figure_rate > legacy_rate
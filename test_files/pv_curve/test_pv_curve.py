@@ -0,0 +1,178 @@
+import numpy as np
+import pytest
+
+from agent.pv_curve import pv_curve
+from agent.pv_curve.case_cache import case_cache
+from agent.pv_curve.pv_curve import _get_output_path, _parabolic_nose, _run_cpf, generate_pv_curve, rank_buses
+
+
+# --------------------------------------------------------------
+# Unit Tests
+# --------------------------------------------------------------
+
+
+def test_rank_buses_orders_by_nose_voltage_and_sensitivity():
+    lam = np.array([0.0, 0.5, 1.0, 0.8])
+    V = np.array([
+        [1.00, 0.98, 0.95, 0.90],  # stiff bus
+        [1.00, 0.90, 0.70, 0.50],  # weakest at the nose, steepest slope
+        [1.00, 0.95, 0.80, 0.60],
+    ])
+    ranking = rank_buses(lam, V, [10, 20, 30])
+
+    assert ranking["nose_index"] == 2
+    assert [row["bus"] for row in ranking["by_nose_voltage"]] == [20, 30, 10]
+    assert [row["bus"] for row in ranking["by_sensitivity"]] == [20, 30, 10]
+    assert ranking["by_sensitivity"][0]["dv_dlambda"] == pytest.approx(-0.4)
+
+
+def test_output_paths_are_unique_within_a_second(tmp_path, monkeypatch):
+    monkeypatch.setenv("PV_CURVE_OUTPUT_DIR", str(tmp_path))
+    paths = {_get_output_path("ieee14") for _ in range(50)}
+    assert len(paths) == 50
+
+
+def test_rank_buses_top_k():
+    lam = np.array([0.0, 1.0])
+    V = np.array([[1.0, 0.9], [1.0, 0.8], [1.0, 0.7]])
+    ranking = rank_buses(lam, V, [1, 2, 3], top_k=1)
+    assert len(ranking["by_nose_voltage"]) == 1
+    assert ranking["by_nose_voltage"][0]["bus"] == 3
+
+
+# --------------------------------------------------------------
+# ANDES Tests
+# --------------------------------------------------------------
+
+
+def test_all_buses_output_matches_single_bus_runs():
+    result = generate_pv_curve(grid="ieee14", target_bus_idx=5, skip_plot=True, all_buses=True)
+
+    matrix = result["bus_voltages"]
+    assert matrix.dtype == np.float32
+    assert matrix.shape == (14, result["converged_steps"])
+    assert result["bus_indices"] == list(range(1, 15))
+
+    row = result["bus_indices"].index(5)
+    np.testing.assert_allclose(matrix[row], result["voltage_values_pu"], rtol=1e-6)
+
+    weakest = result["bus_ranking"]["by_nose_voltage"][0]
+    nose_voltages = matrix[:, result["bus_ranking"]["nose_index"]]
+    assert weakest["nose_voltage_pu"] == pytest.approx(float(nose_voltages.min()), rel=1e-6)
+
+
+def test_all_buses_off_by_default():
+    result = generate_pv_curve(grid="ieee14", target_bus_idx=5, skip_plot=True)
+    assert "bus_voltages" not in result
+    assert "bus_ranking" not in result
+
+
+def test_progress_callback_streams_every_cpf_point():
+    points = []
+    trajectory = _run_cpf("ieee14", 5, 0.1, 3.0, 0.95, False, True, None, None, progress=points.append)
+
+    assert points[0]["step"] == 0
+    assert points[0]["lambda"] == 0.0
+    assert points[0]["load_mw"] == pytest.approx(trajectory["base_p_mw"])
+    # One report per point; FULL mode's final refinement is not re-reported.
+    assert [p["step"] for p in points] == list(range(trajectory["lam"].size))
+    assert [p["lambda"] for p in points[:-1]] == pytest.approx(trajectory["lam"][:-1].tolist())
+    nose = int(np.argmax(trajectory["lam"]))
+    streamed = [p for p in points if p["step"] == nose][-1]
+    assert streamed["lambda"] == pytest.approx(trajectory["lam"][nose])
+    assert streamed["voltage_pu"] == pytest.approx(trajectory["V"][4, nose])
+
+
+def test_progress_reported_after_run_without_cpf_hook(monkeypatch):
+    monkeypatch.setattr(pv_curve, "_observe_points", lambda ss, on_point: False)
+    points = []
+    trajectory = _run_cpf("ieee14", 5, 0.1, 3.0, 0.95, False, False, None, None, progress=points.append)
+
+    assert [p["step"] for p in points] == list(range(trajectory["lam"].size))
+    assert [p["lambda"] for p in points] == pytest.approx(trajectory["lam"].tolist())
+    assert points[-1]["voltage_pu"] == pytest.approx(trajectory["V"][4, -1])
+
+
+def test_progress_callback_skipped_on_cache_hit():
+    generate_pv_curve(grid="ieee14", target_bus_idx=5, skip_plot=True)
+    points = []
+    result = generate_pv_curve(grid="ieee14", target_bus_idx=5, skip_plot=True, progress_callback=points.append)
+    assert result["cpf_cached"] is True
+    assert points == []
+
+
+def test_contingency_variant_warm_starts_from_base_case():
+    case_cache.clear()
+    cold = _run_cpf("ieee14", None, 0.1, 3.0, 0.95, False, False, [(2, 3)], None)
+    assert cold["warm_start"] is False
+
+    base = _run_cpf("ieee14", None, 0.1, 3.0, 0.95, False, False, None, None)
+    assert case_cache.get_base_state("ieee14") is not None
+
+    warm = _run_cpf("ieee14", None, 0.1, 3.0, 0.95, False, False, [(2, 3)], None)
+    assert warm["warm_start"] is True
+    assert warm["pflow_iterations"] <= cold["pflow_iterations"]
+    assert base["lam"].size > 0
+    np.testing.assert_allclose(warm["lam"], cold["lam"], atol=1e-6)
+
+
+def test_failed_warm_start_falls_back_to_case_start():
+    case_cache.clear()
+    n_bus = case_cache.load("ieee14").Bus.n
+    bogus = {"v": np.full(n_bus, 1e-3), "a": np.full(n_bus, 3.0)}
+
+    trajectory = _run_cpf("ieee14", None, 0.1, 3.0, 0.95, False, False, None, None, warm_start=bogus)
+
+    assert trajectory["pflow_converged"] is True
+    assert trajectory["warm_start"] is False
+    assert trajectory["lam"].size > 0
+
+
+def test_parabolic_nose_recovers_vertex_between_samples():
+    V = np.array([[1.0, 0.9, 0.8, 0.7, 0.6]])
+    lam = 2.0 - (V[0] - 0.75) ** 2
+    assert _parabolic_nose(lam, V) == pytest.approx(2.0)
+    assert _parabolic_nose(lam[:2], V[:, :2]) is None
+
+
+def test_margin_mode_meets_tolerance_with_fewer_points():
+    full = generate_pv_curve(grid="ieee14", target_bus_idx=5, skip_plot=True, use_cache=False)
+    result = generate_pv_curve(
+        grid="ieee14", target_bus_idx=5, skip_plot=True, use_cache=False, mode="margin", margin_tol_mw=0.01
+    )
+
+    margin = result["margin"]
+    assert result["mode"] == "margin"
+    assert margin["converged"] is True
+    assert margin["tolerance_mw"] <= 0.01
+    assert margin["cpf_points"] < full["converged_steps"]
+    assert result["cpf_points"] == margin["cpf_points"]
+    assert result["load_margin_mw"] == pytest.approx(margin["load_margin_mw"])
+    assert result["load_margin_mw"] == pytest.approx(full["load_margin_mw"], abs=0.5)
+    assert result["nose_point"]["index"] == result["converged_steps"] - 1
+
+
+def test_cpf_points_count_solver_steps_past_the_voltage_limit():
+    full = generate_pv_curve(grid="ieee14", target_bus_idx=5, skip_plot=True, voltage_limit=0.0)
+    truncated = generate_pv_curve(grid="ieee14", target_bus_idx=5, skip_plot=True, voltage_limit=0.99)
+
+    assert truncated["converged_steps"] < full["converged_steps"]
+    assert truncated["cpf_points"] == full["cpf_points"] == full["converged_steps"]
+
+
+def test_restarted_cpf_continues_on_original_lambda_scale():
+    coarse = _run_cpf("ieee14", None, 0.1, 3.0, 0.95, False, False, None, None)
+    nose = int(np.argmax(coarse["lam"]))
+    start = float(coarse["lam"][nose - 1])
+
+    restarted = _run_cpf("ieee14", None, 0.05, 3.0, 0.95, False, False, None, None, start_lambda=start, step_max=0.05)
+
+    assert restarted["lam"][0] == pytest.approx(start)
+    assert restarted["base_p_mw"] == pytest.approx(coarse["base_p_mw"])
+    np.testing.assert_allclose(restarted["V"][:, 0], coarse["V"][:, nose - 1], atol=1e-6)
+    assert restarted["lam"].max() == pytest.approx(coarse["lam"].max(), abs=1e-4)
+
+
+def test_unknown_mode_rejected():
+    with pytest.raises(ValueError, match="Unknown mode"):
+        generate_pv_curve(grid="ieee14", target_bus_idx=5, skip_plot=True, mode="fast")
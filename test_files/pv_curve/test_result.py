@@ -0,0 +1,84 @@
+import json
+
+import numpy as np
+import pytest
+
+from agent.pv_curve.pv_curve import generate_pv_curve
+from agent.pv_curve.result import PVCurveResult
+
+
+# --------------------------------------------------------------
+# Unit Tests
+# --------------------------------------------------------------
+
+
+def _legacy_points(P_vals, V_vals):
+    """The per-point dicts generate_pv_curve used to build eagerly."""
+    nose = int(np.argmax(P_vals))
+    points = []
+    for i, (load, voltage) in enumerate(zip(P_vals, V_vals)):
+        drop = V_vals[0] - voltage
+        points.append({
+            "step": i + 1,
+            "load_mw": float(load),
+            "voltage_pu": float(voltage),
+            "load_scale_factor": float(load / P_vals[0] if P_vals[0] > 0 else 1.0),
+            "voltage_drop_from_initial_pu": float(drop),
+            "voltage_drop_percent": float(drop / V_vals[0] * 100 if V_vals[0] > 0 else 0),
+            "is_nose_point": i == nose,
+        })
+    return points
+
+
+def test_legacy_keys_are_derived_in_legacy_order():
+    result = PVCurveResult([100.0, 150.0, 180.0, 170.0], [1.0, 0.95, 0.8, 0.6], {"grid_system": "ieee14"},
+                           converged_steps=4)
+    result["timings"] = {"total": 0.1}
+
+    assert list(result) == ["grid_system", "load_values_mw", "voltage_values_pu", "curve_points",
+                            "converged_steps", "timings"]
+    assert result["load_values_mw"] == [100.0, 150.0, 180.0, 170.0]
+    assert result["curve_points"] == _legacy_points([100.0, 150.0, 180.0, 170.0], [1.0, 0.95, 0.8, 0.6])
+    assert result.voltage_drop_percent[-1] == pytest.approx(40.0)
+    assert "curve_points" not in result.to_dict(points=False)
+    with pytest.raises(ValueError):
+        result["curve_points"] = []
+    with pytest.raises(ValueError):
+        PVCurveResult([1.0, 2.0], [1.0])
+
+
+def test_serialization_round_trips():
+    bus_voltages = np.arange(12, dtype=np.float32).reshape(3, 4)
+    result = PVCurveResult(np.linspace(100, 200, 4), [1.0, 0.9, 0.8, 0.7], {"grid_system": "ieee14"},
+                           nose_point={"index": 3}, bus_voltages=bus_voltages, cancelled=None)
+
+    restored = PVCurveResult.from_bytes(result.to_bytes())
+    assert list(restored) == list(result)
+    assert restored["bus_voltages"].dtype == np.float32
+    np.testing.assert_array_equal(restored["bus_voltages"], bus_voltages)
+    assert restored["curve_points"] == result["curve_points"]
+
+    decoded = json.loads(result.to_json())
+    assert "curve_points" not in decoded
+    assert decoded["bus_voltages"] == bus_voltages.tolist()
+    assert PVCurveResult.from_dict(decoded)["curve_points"] == result["curve_points"]
+    with pytest.raises(ValueError):
+        PVCurveResult.from_bytes(b"not a result")
+
+
+# --------------------------------------------------------------
+# Native Tests
+# --------------------------------------------------------------
+
+
+def test_generate_pv_curve_matches_legacy_dict():
+    result = generate_pv_curve(grid="ieee14", target_bus_idx=5, skip_plot=True, backend="native", use_cache=False)
+    legacy = result.to_dict()
+    P_vals, V_vals = legacy["load_values_mw"], legacy["voltage_values_pu"]
+
+    assert isinstance(result, PVCurveResult)
+    assert legacy["curve_points"] == _legacy_points(P_vals, V_vals)
+    assert legacy["nose_point"]["index"] == result.nose_index
+    assert legacy["converged_steps"] == len(P_vals)
+    assert repr(result) == repr(legacy)
+    json.dumps(legacy)
@@ -0,0 +1,45 @@
+import pytest
+
+from agent.pv_curve.screening import in_service_line_pairs, screen_contingencies
+
+
+def test_in_service_line_pairs_are_unique_and_sorted():
+    pairs = in_service_line_pairs("ieee14")
+    assert pairs == sorted(set(pairs))
+    assert (1, 2) in pairs
+    assert all(fb < tb for fb, tb in pairs)
+
+
+def test_screening_ranks_outages_and_reports_failures():
+    report = screen_contingencies("ieee14", candidate_lines=[(2, 1), (4, 5), (99, 100)], max_workers=2)
+
+    assert report["base_case"]["status"] == "converged"
+    assert report["summary"]["total"] == 3
+    assert report["summary"]["error"] == 1
+
+    outages = report["outages"]
+    assert [row["rank"] for row in outages] == [1, 2, 3]
+    assert outages[0]["line"] == (1, 2)
+    assert outages[0]["load_margin_mw"] < outages[1]["load_margin_mw"]
+    assert outages[0]["margin_reduction_mw"] > 0
+    assert outages[-1]["line"] == (99, 100)
+    assert outages[-1]["status"] == "error"
+    assert "No line found" in outages[-1]["error"]
+
+
+def test_screening_shortlist_simulates_only_the_most_severe_outages():
+    report = screen_contingencies(
+        "ieee14", candidate_lines=[(1, 2), (4, 5), (7, 8), (12, 13), (99, 100)], shortlist=2, max_workers=1
+    )
+
+    # (7, 8) islands generator bus 8, so it is always on the shortlist.
+    simulated = {row["line"] for row in report["outages"] if row["status"] != "screened_out"}
+    assert (7, 8) in simulated and (99, 100) in simulated
+    assert len(simulated) == 3
+    assert report["summary"]["screened_out"] == 2
+    assert report["prescreen"]["ranked"] == 4
+    assert report["outages"][-1]["status"] == "screened_out"
+    assert "min_singular_value" in report["outages"][-1]["indices"]
+
+    with pytest.raises(ValueError, match="shortlist"):
+        screen_contingencies("ieee14", shortlist=0)
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from agent.pv_curve.batch_pflow import solve_power_flows, stacked_admittances
+from agent.pv_curve.case_cache import case_cache
+from agent.pv_curve.native_cpf import Network, _AugmentedJacobian
+from agent.pv_curve.stability_indices import min_singular_value, rank_outages, scenario_indices, weak_buses
+
+
+# --------------------------------------------------------------
+# Unit Tests
+# --------------------------------------------------------------
+
+
+def test_indices_move_toward_collapse_with_load():
+    light = scenario_indices("ieee14")
+    heavy = scenario_indices("ieee14", load_scale=3.5)
+
+    assert light["converged"].all() and heavy["converged"].all()
+    assert np.nanmax(heavy["l_index"]) > 2 * np.nanmax(light["l_index"])
+    assert np.nanmax(heavy["line_index"]) > np.nanmax(light["line_index"])
+    assert heavy["min_singular_value"][0] < light["min_singular_value"][0]
+
+
+def test_min_singular_value_matches_dense_svd():
+    net = Network(case_cache.get_template("ieee14"))
+    batch = solve_power_flows(net)
+    V = batch["vm"] * np.exp(1j * batch["va"])
+    ydata = stacked_admittances(net, [()])
+
+    sigma, participation = min_singular_value(net, V, ydata)
+
+    jac = _AugmentedJacobian(net, np.zeros(net.pvpq.size + net.pq.size))
+    row = np.zeros(jac.size + 1)
+    row[-1] = 1.0
+    jac.factor(net, V[0], row)
+    dense = np.linalg.svd(jac.matrix.toarray()[:-1, :-1], compute_uv=False)
+    assert sigma[0] == pytest.approx(dense.min(), rel=1e-6)
+    assert participation[0].sum() == pytest.approx(1.0)
+
+
+def test_rank_outages_puts_islanding_outages_first():
+    # Lines (2, 30) and (19, 33) are the only connections of generator buses 30 and 33.
+    rows = rank_outages("ieee39", [(16, 17), (2, 30), (19, 33), (1, 2)])
+
+    assert [row["islanded"] for row in rows] == [True, True, False, False]
+    assert rows[0]["generation_cut_mw"] >= rows[1]["generation_cut_mw"] > 0
+    assert rows[2]["min_singular_value"] <= rows[3]["min_singular_value"]
+    assert rows[0]["state"] is None and rows[2]["state"]["v"].shape == (39,)
+
+
+def test_weak_buses_are_ranked_by_critical_mode():
+    rows = weak_buses("ieee14", top_k=3)
+
+    assert len(rows) == 3
+    shares = [row["participation"] for row in rows]
+    assert shares == sorted(shares, reverse=True)
+    assert all(0 < row["voltage_pu"] < 1.2 for row in rows)
+    with pytest.raises(ValueError, match="No line found"):
+        weak_buses("ieee14", contingency_lines=[(99, 100)])
@@ -0,0 +1,105 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from agent.schemas.inputs import Inputs
+from agent.pv_curve import pv_curve, sweep
+from agent.pv_curve.sweep import MAX_SWEEP_POINTS, expand_sweep, sweep_pv_curves, sweep_table
+from agent.pv_curve.trajectory_cache import trajectory_cache
+
+
+# --------------------------------------------------------------
+# Unit Tests
+# --------------------------------------------------------------
+
+
+def test_expand_sweep_cartesian_product():
+    points = expand_sweep({"power_factor": [0.8, 0.9], "max_scale": [2.0, 3.0, 4.0]}, Inputs(grid="ieee14"))
+    assert len(points) == 6
+    assert all(p.grid == "ieee14" for p in points)
+    assert [(p.power_factor, p.max_scale) for p in points[:3]] == [(0.8, 2.0), (0.8, 3.0), (0.8, 4.0)]
+
+
+@pytest.mark.parametrize(
+    "axes,match",
+    [
+        ({}, "at least one"),
+        ({"bogus": [1]}, "Unknown sweep parameter"),
+        ({"power_factor": []}, "no values"),
+        ({"power_factor": [0.9, 1.2]}, "Invalid sweep point"),
+        ({"step_size": [0.1] * (MAX_SWEEP_POINTS + 1)}, "limit"),
+    ],
+)
+def test_expand_sweep_rejects_bad_definitions(axes, match):
+    with pytest.raises(ValueError, match=match):
+        expand_sweep(axes)
+
+
+def test_sweep_table_is_columnar_and_ordered():
+    rows = [
+        {"index": 1, "status": "ok", "inputs": {"power_factor": 0.9}, "load_margin_mw": 10.0},
+        {"index": 0, "status": "error", "inputs": {"power_factor": 0.8}},
+    ]
+    table = sweep_table(rows, ["power_factor"])
+    assert table["index"] == [0, 1]
+    assert table["power_factor"] == [0.8, 0.9]
+    assert table["load_margin_mw"] == [None, 10.0]
+
+
+# --------------------------------------------------------------
+# ANDES Tests
+# --------------------------------------------------------------
+
+
+def test_sweep_dedupes_physics_and_reports_bad_points():
+    events = list(sweep_pv_curves(
+        {"bus_id": [5, 12, 99]},
+        base_inputs=Inputs(grid="ieee14", power_factor=0.97),
+        max_workers=1,
+    ))
+
+    points = [e for e in events if e["type"] == "point"]
+    summary = events[-1]
+    assert summary["type"] == "summary"
+    assert summary["simulations"] <= 1
+    assert len(points) == 3
+    assert summary["table"]["status"] == ["ok", "ok", "error"]
+    assert "Bus 99 not found" in points[-1]["error"]
+
+
+def test_sweep_rows_never_rerun_uncacheable_trajectories(monkeypatch):
+    calls = []
+    run_cpf = sweep._run_cpf
+
+    def counting_run_cpf(*args, **kwargs):
+        calls.append(kwargs.get("power_factor"))
+        return run_cpf(*args, **kwargs)
+
+    monkeypatch.setattr(sweep, "_run_cpf", counting_run_cpf)
+    monkeypatch.setattr(pv_curve, "_run_cpf", counting_run_cpf)
+    monkeypatch.setattr(trajectory_cache, "max_bytes", 1)  # Nothing is stored
+    trajectory_cache.clear()
+
+    events = list(sweep_pv_curves(
+        {"power_factor": [0.9, 1.0], "bus_id": [5, 14]},
+        base_inputs=Inputs(grid="ieee14"),
+        max_workers=1,
+    ))
+
+    assert len(calls) == 2
+    assert events[-1]["table"]["status"] == ["ok"] * 4
+
+
+def test_sweep_uses_shared_executor_without_shutting_it_down():
+    trajectory_cache.clear()
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        events = list(sweep_pv_curves(
+            {"power_factor": [0.9, 1.0]},
+            base_inputs=Inputs(grid="ieee14"),
+            max_workers=2,
+            executor=executor,
+        ))
+        assert executor.submit(lambda: 1).result() == 1
+
+    assert events[-1]["workers"] == 2
+    assert events[-1]["table"]["status"] == ["ok", "ok"]
@@ -0,0 +1,57 @@
+import time
+
+from agent.pv_curve.pv_curve import generate_pv_curve
+from agent.pv_curve.timing import BUCKET_EDGES_S, PhaseTimer, TimingStats, timing_stats
+from agent.pv_curve.trajectory_cache import trajectory_cache
+
+
+# --------------------------------------------------------------
+# Unit Tests
+# --------------------------------------------------------------
+
+
+def test_phase_timer_accumulates_repeated_phases():
+    timer = PhaseTimer()
+    for _ in range(2):
+        with timer.phase("setup"):
+            time.sleep(0.01)
+    timer.update({"setup": 1.0, "cpf": 2.0})
+
+    assert timer.timings["setup"] > 1.02
+    assert timer.timings["cpf"] == 2.0
+
+
+def test_histograms_are_per_grid_and_phase():
+    stats = TimingStats()
+    stats.record("ieee14", {"cpf": 0.0015, "setup": 0.3})
+    stats.record("ieee14", {"cpf": 0.0030})
+    stats.record("ieee39", {"cpf": 100.0})
+
+    cpf = stats.stats()["ieee14"]["cpf"]
+    assert cpf["count"] == 2
+    assert cpf["mean_s"] == (0.0015 + 0.0030) / 2
+    assert cpf["buckets"][1] == 1  # (1 ms, 2 ms]
+    assert cpf["buckets"][2] == 1  # (2 ms, 5 ms]
+
+    overflow = stats.stats("ieee39")["ieee39"]["cpf"]["buckets"]
+    assert overflow[len(BUCKET_EDGES_S)] == 1
+
+
+# --------------------------------------------------------------
+# ANDES Tests
+# --------------------------------------------------------------
+
+
+def test_result_timings_cover_engine_phases(capsys):
+    trajectory_cache.clear()
+    timing_stats.clear()
+
+    fresh = generate_pv_curve(grid="ieee14", target_bus_idx=5, skip_plot=True)
+    cached = generate_pv_curve(grid="ieee14", target_bus_idx=5, skip_plot=True)
+
+    assert {"case_load", "contingencies", "setup", "pflow", "cpf", "post_processing"} <= set(fresh["timings"])
+    assert fresh["timings"]["total"] >= fresh["timings"]["cpf"]
+    assert "cpf" not in cached["timings"]
+    assert timing_stats.stats("ieee14")["ieee14"]["post_processing"]["count"] == 2
+    assert timing_stats.stats("ieee14")["ieee14"]["cpf"]["count"] == 1
+    assert capsys.readouterr().out == ""
@@ -0,0 +1,101 @@
+import numpy as np
+import pytest
+
+from agent.pv_curve.pv_curve import generate_pv_curve
+from agent.pv_curve.trajectory_cache import TrajectoryCache, trajectory_cache, trajectory_key
+
+
+def _trajectory(n_bus=3, n_points=4):
+    return {
+        "lam": np.linspace(0, 1, n_points),
+        "V": np.ones((n_bus, n_points)),
+        "bus_idx": np.arange(1, n_bus + 1),
+        "base_p_mw": 100.0,
+    }
+
+
+# --------------------------------------------------------------
+# Unit Tests
+# --------------------------------------------------------------
+
+
+def test_key_ignores_ordering_of_lines_and_setpoints():
+    a = trajectory_key("ieee14", 0.1, 3.0, 0.95, False, True, [(3, 2), (4, 3)], {2: 1.02, 1: 1.05})
+    b = trajectory_key("ieee14", 0.1, 3, 0.95, False, True, [(3, 4), (2, 3)], {1: 1.05, 2: 1.02})
+    assert a == b
+
+
+def test_key_changes_with_physics_inputs():
+    base = trajectory_key("ieee14", 0.1, 3.0, 0.95, False, True)
+    assert base != trajectory_key("ieee14", 0.1, 3.0, 0.9, False, True)
+    assert base != trajectory_key("ieee14", 0.1, 3.0, 0.95, True, True)
+    assert base != trajectory_key("ieee14", 0.1, 3.0, 0.95, False, True, [(2, 3)])
+
+
+def test_get_set_and_stats():
+    cache = TrajectoryCache()
+    assert cache.get("k") is None
+    cache.set("k", _trajectory())
+    assert cache.get("k") is not None
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["bytes"] > 0
+
+
+def test_cached_arrays_are_read_only():
+    cache = TrajectoryCache()
+    cache.set("k", _trajectory())
+    with pytest.raises(ValueError):
+        cache.get("k")["V"][0, 0] = 0.0
+
+
+def test_evicts_by_entry_count():
+    cache = TrajectoryCache(max_entries=2)
+    cache.set("a", _trajectory())
+    cache.set("b", _trajectory())
+    cache.get("a")
+    cache.set("c", _trajectory())
+
+    assert "a" in cache
+    assert "b" not in cache
+    assert cache.stats()["evictions"] == 1
+
+
+def test_evicts_by_memory():
+    one = _trajectory()
+    size = one["lam"].nbytes + one["V"].nbytes + one["bus_idx"].nbytes
+    cache = TrajectoryCache(max_bytes=2 * size)
+    for key in ("a", "b", "c"):
+        cache.set(key, _trajectory())
+
+    assert len(cache) == 2
+    assert cache.stats()["bytes"] <= 2 * size
+
+
+# --------------------------------------------------------------
+# ANDES Tests
+# --------------------------------------------------------------
+
+
+def test_post_processing_changes_reuse_trajectory():
+    trajectory_cache.clear()
+    first = generate_pv_curve(grid="ieee14", target_bus_idx=5, skip_plot=True)
+    other_bus = generate_pv_curve(grid="ieee14", target_bus_idx=12, skip_plot=True)
+    limited = generate_pv_curve(grid="ieee14", target_bus_idx=5, voltage_limit=0.9, skip_plot=True)
+
+    assert first["cpf_cached"] is False
+    assert other_bus["cpf_cached"] is True
+    assert limited["cpf_cached"] is True
+    assert other_bus["voltage_values_pu"] != first["voltage_values_pu"]
+    assert limited["converged_steps"] < first["converged_steps"]
+
+    uncached = generate_pv_curve(grid="ieee14", target_bus_idx=12, skip_plot=True, use_cache=False)
+    assert uncached["voltage_values_pu"] == other_bus["voltage_values_pu"]
+
+
+def test_invalid_bus_on_cached_trajectory():
+    generate_pv_curve(grid="ieee14", target_bus_idx=5, skip_plot=True)
+    with pytest.raises(ValueError, match="Bus 99 not found"):
+        generate_pv_curve(grid="ieee14", target_bus_idx=99, skip_plot=True)
@@ -5,7 +5,11 @@ Connection flow:
   1. Client opens ws://localhost:8000/ws?session_id=<uuid>
      (If session_id is omitted, a new one is generated and returned first)
   2. Client sends: {"type": "message", "content": "...", "conversation_id": "..."}
-  3. Server streams back node_update events, then complete
+     or {"type": "cancel"} to abort the running simulation
+  3. Server streams back node_update events (plus cpf_progress points while a
+     PV curve simulates and a margin_estimate during an analysis run), then complete; plot_ready follows
+     once the background PNG render for a generated curve finishes. The turn ends
+     at complete, so the next message is accepted while the PNG is still rendering
   4. Connection stays open for the whole browser session
 """
 import asyncio
@@ -23,6 +27,72 @@ from web.backend.schemas.chat import WebSocketIncoming
 router = APIRouter()
 
 
+async def _send(websocket: WebSocket, payload: dict) -> bool:
+    """Send JSON to the browser; False once the socket has gone away."""
+    try:
+        await websocket.send_json(payload)
+        return True
+    except (WebSocketDisconnect, RuntimeError):
+        return False
+
+
+async def _run_turn(
+    websocket: WebSocket, db: Session, manager, conversation_id: str, user_text: str, completed: asyncio.Event
+) -> None:
+    """Stream one agent turn to the browser and persist its outcome.
+
+    ``completed`` is set (and the turn persisted) at the ``complete`` event;
+    the task then only forwards ``plot_ready`` for renders still in flight.
+    """
+    assistant_chunks: list[str] = []
+    final_results: dict = {}
+    plot_path: str = ""
+    connected = True
+
+    try:
+        async for update in manager.execute_streaming(user_text):
+            update["conversation_id"] = conversation_id
+            if connected and not await _send(websocket, update):
+                # Browser went away mid-turn: stop the simulation, keep draining to persist.
+                connected = False
+                if not completed.is_set():
+                    manager.cancel("Client disconnected.")
+
+            if update["type"] == "node_update" and update.get("content"):
+                assistant_chunks.append(update["content"])
+            if update.get("results"):
+                final_results = update["results"]
+            if update.get("plot_path"):
+                plot_path = update["plot_path"]
+            if update["type"] == "complete" and not completed.is_set():
+                _persist_turn(db, manager, conversation_id, assistant_chunks, final_results, plot_path)
+                completed.set()
+    finally:
+        completed.set()
+
+
+def _persist_turn(db: Session, manager, conversation_id: str, assistant_chunks, final_results, plot_path) -> None:
+    """Save the assistant reply and any generated PV curve."""
+    # --- Persist assistant response ---
+    assistant_text = "\n\n".join(c for c in assistant_chunks if c).strip()
+    if assistant_text:
+        crud.create_message(db, conversation_id, role="assistant", content=assistant_text)
+
+    # --- Persist PV curve if generated ---
+    if final_results:
+        state = manager.get_state()
+        inputs_obj = state.get("inputs")
+        crud.create_pv_curve(
+            db=db,
+            conversation_id=conversation_id,
+            grid=getattr(inputs_obj, "grid", ""),
+            bus_id=getattr(inputs_obj, "bus_id", 0),
+            parameters=inputs_obj.model_dump() if inputs_obj else None,
+            results=final_results,
+            plot_path=plot_path,
+        )
+
+
 @router.websocket("/ws")
 async def websocket_chat(
     websocket: WebSocket,
@@ -37,6 +107,15 @@ async def websocket_chat(
     # Send the session_id back immediately so the browser can persist it
     await websocket.send_json({"type": "session", "session_id": session_id})
 
+    # The agent turn runs as a task so this loop keeps reading (e.g. "cancel").
+    # It is busy until ``turn_completed``; afterwards it may still be forwarding
+    # plot_ready, which does not block the next message.
+    turn: asyncio.Task | None = None
+    turn_completed = asyncio.Event()
+    turn_completed.set()
+    plot_tasks: set[asyncio.Task] = set()
+    manager = None
+
     try:
         while True:
             raw = await websocket.receive_text()
@@ -53,10 +132,23 @@ async def websocket_chat(
                 await websocket.send_json({"type": "pong"})
                 continue
 
+            if incoming.type == "cancel":
+                # The running turn reports {"type": "cancelled"} itself once the CPF stops
+                if not turn_completed.is_set():
+                    manager.cancel()
+                continue
+
             if incoming.type != "message" or not incoming.content:
                 await websocket.send_json({"type": "error", "content": "Expected type='message' with content"})
                 continue
 
+            if not turn_completed.is_set():
+                await websocket.send_json({
+                    "type": "error",
+                    "content": "A request is still running; send {\"type\": \"cancel\"} to stop it first.",
+                })
+                continue
+
             user_text = incoming.content.strip()
 
             # --- Ensure conversation record exists ---
@@ -82,39 +174,14 @@ async def websocket_chat(
             manager = await asyncio.to_thread(session_service.get_web_manager, db, session_id)
 
             # --- Stream agent responses ---
-            assistant_chunks: list[str] = []
-            final_results: dict = {}
-            plot_path: str = ""
-
-            async for update in manager.execute_streaming(user_text):
-                update["conversation_id"] = conversation_id
-                await websocket.send_json(update)
-
-                if update["type"] == "node_update" and update.get("content"):
-                    assistant_chunks.append(update["content"])
-                if update.get("results"):
-                    final_results = update["results"]
-                if update.get("plot_path"):
-                    plot_path = update["plot_path"]
-
-            # --- Persist assistant response ---
-            assistant_text = "\n\n".join(c for c in assistant_chunks if c).strip()
-            if assistant_text:
-                crud.create_message(db, conversation_id, role="assistant", content=assistant_text)
-
-            # --- Persist PV curve if generated ---
-            if final_results:
-                state = manager.get_state()
-                inputs_obj = state.get("inputs")
-                crud.create_pv_curve(
-                    db=db,
-                    conversation_id=conversation_id,
-                    grid=getattr(inputs_obj, "grid", ""),
-                    bus_id=getattr(inputs_obj, "bus_id", 0),
-                    parameters=inputs_obj.model_dump() if inputs_obj else None,
-                    results=final_results,
-                    plot_path=plot_path,
-                )
+            if turn is not None and not turn.done():
+                # Previous turn has completed and is only waiting on its plot
+                plot_tasks.add(turn)
+                turn.add_done_callback(plot_tasks.discard)
+            turn_completed = asyncio.Event()
+            turn = asyncio.create_task(
+                _run_turn(websocket, db, manager, conversation_id, user_text, turn_completed)
+            )
 
     except WebSocketDisconnect:
         pass
@@ -123,3 +190,15 @@ async def websocket_chat(
             await websocket.send_json({"type": "error", "content": str(exc)})
         except Exception:
             pass
+    finally:
+        # Closing the tab must not leave a CPF burning a worker thread
+        if turn is not None and not turn_completed.is_set():
+            manager.cancel("Client disconnected.")
+            try:
+                await turn
+            except Exception:
+                pass
+        # Nobody is left to receive plot_ready; the renders themselves finish regardless
+        for task in [turn, *plot_tasks]:
+            if task is not None and not task.done():
+                task.cancel()
@@ -6,10 +6,45 @@ from web.backend.database.database import get_db
 from web.backend.services import session_service
 from web.backend.schemas.parameters import ParametersResponse, ParametersUpdateRequest
 from agent.schemas.inputs import Inputs
+from agent.pv_curve.grid_catalog import get_catalog
 
 router = APIRouter()
 
 
+TOPOLOGY_FIELDS = ("bus_id", "contingency_lines", "gen_voltage_setpoints")
+
+
+def _topology_errors(inputs: Inputs, fields) -> list:
+    """Check grid-dependent fields against the pre-indexed grid catalog (no disk I/O).
+
+    Only the updated fields are checked, except that a ``grid`` change re-checks
+    every grid-dependent field (bus, outages and setpoints carried over from the
+    old grid) and a ``voltage_limit`` change re-checks the generator setpoints.
+    """
+    fields = set(fields)
+    if "grid" in fields:
+        fields.update(TOPOLOGY_FIELDS)
+    if "voltage_limit" in fields:
+        fields.add("gen_voltage_setpoints")
+    catalog = get_catalog(inputs.grid)
+    checks = {
+        "bus_id": lambda: catalog.validate_bus(inputs.bus_id),
+        "contingency_lines": lambda: catalog.validate_contingencies(inputs.contingency_lines),
+        "gen_voltage_setpoints": lambda: catalog.validate_gen_voltage_setpoints(
+            inputs.gen_voltage_setpoints, inputs.voltage_limit
+        ),
+    }
+    errors = []
+    for field in TOPOLOGY_FIELDS:
+        if field not in fields:
+            continue
+        try:
+            checks[field]()
+        except ValueError as exc:
+            errors.append({"loc": ["body", field], "msg": str(exc), "type": "value_error"})
+    return errors
+
+
 @router.get("/parameters", response_model=ParametersResponse)
 def get_parameters(session_id: str, db: Session = Depends(get_db)):
     """Return the current parameter state for a session."""
@@ -52,6 +87,9 @@ def update_parameters(body: ParametersUpdateRequest, db: Session = Depends(get_d
             current = Inputs(**merged)
         except ValidationError as exc:
             raise HTTPException(status_code=422, detail=exc.errors())
+        errors = _topology_errors(current, updates)
+        if errors:
+            raise HTTPException(status_code=422, detail=errors)
         if manager:
             manager.set_inputs(current)
 
@@ -0,0 +1,81 @@
+"""
+Parameter sweep endpoint.
+
+Streams one JSON object per line (NDJSON) as each sweep point finishes,
+followed by a final {"type": "summary", "table": {...}} line. All requests
+share one process pool of ``SWEEP_MAX_WORKERS`` workers.
+"""
+import json
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from web.backend.core.config import get_settings
+from web.backend.database.database import get_db
+from web.backend.services import session_service
+from web.backend.schemas.sweep import SweepRequest
+from agent.schemas.inputs import Inputs
+
+router = APIRouter()
+
+_pool = None
+_pool_size = 0
+_pool_lock = threading.Lock()
+
+
+def _sweep_pool():
+    """Return ``(executor, size)`` for the process pool shared by all sweeps, creating it on first use."""
+    global _pool, _pool_size
+    with _pool_lock:
+        if _pool is None:
+            _pool_size = get_settings().sweep_max_workers or os.cpu_count() or 1
+            # "spawn" keeps workers safe when forked from a threaded server.
+            _pool = ProcessPoolExecutor(max_workers=_pool_size, mp_context=multiprocessing.get_context("spawn"))
+        return _pool, _pool_size
+
+
+def shutdown_sweep_pool() -> None:
+    """Stop the shared sweep workers (app shutdown)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+@router.post("/sweep")
+def run_sweep(body: SweepRequest, db: Session = Depends(get_db)):
+    """Run a parameter sweep using the session's current inputs for non-swept fields."""
+    # Imported here so the app starts without loading ANDES
+    from agent.pv_curve.sweep import expand_sweep, sweep_pv_curves
+
+    session_service.get_or_create_session(db, body.session_id)
+    entry = session_service.session_cache.get(body.session_id)
+    manager = entry.get("web_manager") if entry else None
+    base = manager.current_inputs if manager else Inputs()
+
+    # Validate the whole grid before streaming so bad requests get a proper 422
+    try:
+        expand_sweep(body.axes, base)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+
+    def stream():
+        # Requests queue on the shared pool instead of each starting one per CPU core.
+        executor, pool_size = _sweep_pool()
+        for event in sweep_pv_curves(
+            body.axes,
+            base_inputs=base,
+            max_workers=min(body.max_workers or pool_size, pool_size),
+            include_curves=body.include_curves,
+            executor=executor,
+        ):
+            yield json.dumps(event, default=str) + "\n"
+
+    # Sync generator: Starlette iterates it in a worker thread
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
@@ -43,6 +43,19 @@ class Settings(BaseSettings):
     # Plots output directory
     plots_path: str = "plots"
 
+    # Parse every built-in PV case at startup instead of on first request
+    pv_case_warmup: bool = False
+
+    # Compile the agent graph (and load prompts, retriever, reranker) at startup
+    agent_warmup: bool = False
+
+    # Per-turn CPF budgets; a run that exceeds either stops and returns its partial curve
+    cpf_timeout_seconds: float = 300.0
+    cpf_max_steps: int = 2000
+
+    # Worker processes shared by every sweep request (0 = host CPU count)
+    sweep_max_workers: int = 0
+
     # CORS origins allowed to talk to this backend
     cors_origins: list[str] = [
         "http://localhost:5173",
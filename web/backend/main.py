@@ -18,12 +18,18 @@ import os
 from web.backend.core.config import get_settings
 from web.backend.database.database import init_db
 from web.backend.utils.cache import session_cache
+from web.backend.services.agent_registry import agent_registry
+from agent.pv_curve.plot_renderer import plot_renderer
+from agent.pv_curve.timing import timing_stats
+from agent.pv_curve.trajectory_cache import trajectory_cache
+from agent.utils.tiered_classifier import message_classifier
 
 # Import routers
 from web.backend.api.v1.chat import router as chat_router
 from web.backend.api.v1.parameters import router as parameters_router
 from web.backend.api.v1.settings import router as settings_router
 from web.backend.api.v1.history import router as history_router
+from web.backend.api.v1.sweep import router as sweep_router, shutdown_sweep_pool
 
 
 @asynccontextmanager
@@ -37,6 +43,17 @@ async def lifespan(app: FastAPI):
     # Create plots directory
     os.makedirs(settings.plots_path, exist_ok=True)
 
+    # Optionally pre-parse the IEEE cases so the first PV curve skips disk I/O
+    if settings.pv_case_warmup:
+        from agent.pv_curve.case_cache import case_cache
+        warmed = await asyncio.to_thread(case_cache.warm_up)
+        print(f"[cache] Warmed PV case templates: {', '.join(warmed)}")
+
+    # Optionally compile the shared agent graph so no session pays for it
+    if settings.agent_warmup:
+        await asyncio.to_thread(lambda: agent_registry.workflow)
+        print("[agent] Compiled shared workflow")
+
     # Background task: evict expired sessions every 10 minutes
     async def evict_loop():
         while True:
@@ -50,6 +67,7 @@ async def lifespan(app: FastAPI):
     yield
 
     task.cancel()
+    shutdown_sweep_pool()
 
 
 def create_app() -> FastAPI:
@@ -75,6 +93,7 @@ def create_app() -> FastAPI:
     app.include_router(parameters_router, prefix="/api/v1", tags=["parameters"])
     app.include_router(settings_router, prefix="/api/v1", tags=["settings"])
     app.include_router(history_router, prefix="/api/v1", tags=["history"])
+    app.include_router(sweep_router, prefix="/api/v1", tags=["sweep"])
 
     # WebSocket router (no /api/v1 prefix — ws://localhost:8000/ws)
     app.include_router(chat_router, tags=["chat"])
@@ -88,6 +107,11 @@ def create_app() -> FastAPI:
         return {
             "status": "ok",
             "active_sessions": len(session_cache),
+            "agent_registry": agent_registry.stats(),
+            "message_classifier": message_classifier.stats(),
+            "cpf_trajectory_cache": trajectory_cache.stats(),
+            "plot_renderer": plot_renderer.stats(),
+            "pv_timings": timing_stats.stats(),
         }
 
     return app
@@ -26,7 +26,7 @@ class ConversationDetail(ConversationSummary):
 
 class WebSocketIncoming(BaseModel):
     """Message sent from browser → backend over WebSocket."""
-    type: str                    # 'message' | 'ping'
+    type: str                    # 'message' | 'ping' | 'cancel'
     content: Optional[str] = None
     session_id: Optional[str] = None
     conversation_id: Optional[str] = None
@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+from typing import Any, Dict, List, Optional
+
+
+class SweepRequest(BaseModel):
+    """Cartesian parameter sweep over the session's current inputs."""
+    session_id: str
+    axes: Dict[str, List[Any]]           # e.g. {"power_factor": [0.8, 0.9, 1.0]}
+    max_workers: Optional[int] = None
+    include_curves: bool = False
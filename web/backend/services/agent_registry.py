@@ -0,0 +1,145 @@
+"""
+Agent Registry: process-wide owner of the agent's session-independent resources.
+
+Building an agent used to cost every browser session a fresh copy of the
+prompts, the Chroma retriever with its CrossEncoder reranker, an LLM client
+and a compiled LangGraph workflow. None of these hold per-user state, so the
+registry builds each one once and hands the same object to every session:
+
+  - prompts, retriever and reranker: one per process
+  - LLM clients: one per provider config (provider, API key, URL, model),
+    least recently used first out once ``MAX_LLM_CLIENTS`` are pooled
+  - the compiled workflow: one per process; each run passes its session's
+    LLM in ``config["configurable"]["llm"]`` (see ``create_workflow``)
+
+Sessions keep only their own ``SessionManager`` state and LLM reference.
+Everything is built lazily on first use (or at startup with
+``AGENT_WARMUP``) and guarded by a lock, so concurrent first messages never
+build a resource twice.
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Any
+
+from web.backend.core.config import get_settings
+from web.backend.services.llm_service import build_llm
+
+# Each distinct user API key gets its own client; bound the pool so a
+# long-running server does not keep one per key forever.
+MAX_LLM_CLIENTS = 32
+
+
+def llm_key(provider: str, api_key: str = "", ollama_url: str = "", ollama_model: str = "") -> tuple:
+    """Pool key for an LLM config. The API key is hashed so it never appears in stats or logs."""
+    digest = hashlib.sha256(api_key.encode()).hexdigest()[:16] if api_key else ""
+    return (provider, digest, ollama_url, ollama_model)
+
+
+class AgentRegistry:
+    """
+    Lazily built, shared agent resources.
+
+    ``llm()`` pools up to ``max_llm_clients`` clients by ``llm_key`` (LRU); ``prompts``, ``reranker``,
+    ``retriever`` and ``workflow`` are single instances. ``clear()`` drops
+    everything (tests, or after changing the vector DB).
+    """
+
+    def __init__(self, max_llm_clients: int = MAX_LLM_CLIENTS):
+        self._lock = threading.RLock()
+        self.max_llm_clients = max_llm_clients
+        self.llm_evictions = 0
+        self._prompts = None
+        self._reranker = None
+        self._retriever = None
+        self._llms: OrderedDict[tuple, Any] = OrderedDict()
+        self._workflow = None
+        self.builds: dict[str, int] = {"prompts": 0, "reranker": 0, "retriever": 0, "llm": 0, "workflow": 0}
+
+    @property
+    def prompts(self) -> dict:
+        with self._lock:
+            if self._prompts is None:
+                from agent.prompts import get_prompts
+                self._prompts = get_prompts()
+                self.builds["prompts"] += 1
+            return self._prompts
+
+    @property
+    def reranker(self):
+        with self._lock:
+            if self._reranker is None:
+                from agent.utils.reranker import get_reranker
+                from agent.vector import NUM_VECTORS
+                self._reranker = get_reranker(top_k=NUM_VECTORS)
+                self.builds["reranker"] += 1
+            return self._reranker
+
+    @property
+    def retriever(self):
+        with self._lock:
+            if self._retriever is None:
+                from agent.vector import retriever as make_retriever
+                self._retriever = make_retriever(reranker=self.reranker)
+                self.builds["retriever"] += 1
+            return self._retriever
+
+    def llm(self, provider: str, api_key: str = "", ollama_url: str = "", ollama_model: str = ""):
+        """Return the pooled LLM client for this provider config."""
+        key = llm_key(provider, api_key, ollama_url, ollama_model)
+        with self._lock:
+            llm = self._llms.get(key)
+            if llm is None:
+                llm = build_llm(provider, api_key=api_key, ollama_url=ollama_url, ollama_model=ollama_model)
+                self._llms[key] = llm
+                self.builds["llm"] += 1
+                while len(self._llms) > self.max_llm_clients:
+                    # Sessions already holding the evicted client keep using it
+                    self._llms.popitem(last=False)
+                    self.llm_evictions += 1
+            else:
+                self._llms.move_to_end(key)
+            return llm
+
+    @property
+    def workflow(self):
+        """The compiled agent graph; runs pass their LLM as ``config["configurable"]["llm"]``."""
+        with self._lock:
+            if self._workflow is None:
+                from agent.workflows.workflow import create_workflow
+                from agent.pv_curve.pv_curve import generate_pv_curve
+
+                # Point PV curve output at the configured plots directory
+                settings = get_settings()
+                os.environ["PV_CURVE_OUTPUT_DIR"] = settings.plots_path
+                os.makedirs(settings.plots_path, exist_ok=True)
+
+                self._workflow = create_workflow(
+                    prompts=self.prompts, retriever=self.retriever, generate_pv_curve=generate_pv_curve
+                )
+                self.builds["workflow"] += 1
+            return self._workflow
+
+    def clear(self) -> None:
+        with self._lock:
+            self._prompts = None
+            self._reranker = None
+            self._retriever = None
+            self._workflow = None
+            self._llms.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "retriever_loaded": self._retriever is not None,
+                "reranker_loaded": self._reranker is not None,
+                "llm_clients": len(self._llms),
+                "llm_evictions": self.llm_evictions,
+                "workflow_compiled": self._workflow is not None,
+                "builds": dict(self.builds),
+            }
+
+
+# Singleton registry shared by every web session
+agent_registry = AgentRegistry()
@@ -8,11 +8,13 @@ generator that the WebSocket handler can await.
 """
 import asyncio
 import json
+import os
 from typing import AsyncGenerator, Optional
 
+from agent.pv_curve.result import PVCurveResult
 from agent.session import SessionManager
 from agent.schemas.inputs import Inputs
-from web.backend.services.llm_service import build_llm
+from web.backend.services.agent_registry import agent_registry
 from web.backend.core.config import get_settings
 
 
@@ -35,6 +37,9 @@ def _extract_results(state_update: dict) -> Optional[dict]:
     results = state_update.get("results")
     if not results:
         return None
+    if isinstance(results, PVCurveResult):
+        # The browser reads the summary fields only; skip the per-point dicts.
+        results = results.to_dict(points=False)
     # Convert Pydantic models / numpy arrays to plain dicts for JSON
     try:
         return json.loads(json.dumps(results, default=str))
@@ -45,56 +50,71 @@ def _extract_results(state_update: dict) -> Optional[dict]:
 class WebSessionManager:
     """
     Holds one user's agent state for the duration of their browser session.
-    Created once per session_id and kept in the session cache.
+    Created once per session_id and kept in the session cache; the heavy,
+    stateless resources come from ``agent_registry``.
     """
 
     def __init__(self, provider: str, api_key: str = "", ollama_url: str = "", ollama_model: str = ""):
-        settings = get_settings()
-        llm = build_llm(provider, api_key=api_key, ollama_url=ollama_url, ollama_model=ollama_model)
-
-        from agent.core import setup_dependencies
-        from agent.workflows.workflow import create_workflow
-        from agent.pv_curve.pv_curve import generate_pv_curve
-        from agent.prompts import get_prompts
-        from agent.vector import retriever as make_retriever
-        import os
-
-        # Point PV curve output at the configured plots directory
-        os.environ["PV_CURVE_OUTPUT_DIR"] = settings.plots_path
-        os.makedirs(settings.plots_path, exist_ok=True)
-
-        prompts = get_prompts()
-        retriever = make_retriever()
-        workflow = create_workflow(llm, prompts, retriever, generate_pv_curve)
-
-        self.session_manager = SessionManager(workflow, provider, llm._model_name)
+        # Prompts, retriever, LLM client and compiled graph are shared process-wide;
+        # this session's LLM reaches the graph through each run's config.
+        self.llm = agent_registry.llm(provider, api_key=api_key, ollama_url=ollama_url, ollama_model=ollama_model)
+        self.session_manager = SessionManager(agent_registry.workflow, provider, self.llm._model_name)
         self.current_inputs = Inputs()
+        self.active_token = None
 
     def set_inputs(self, inputs: Inputs) -> None:
         """Update parameters in BOTH the REST surface and the live agent state."""
         self.current_inputs = inputs
         self.session_manager.state["inputs"] = inputs
 
+    def cancel(self, reason: str = "Cancelled by user.") -> bool:
+        """Abort the in-flight turn's CPF run, if any. Returns True if a run was cancelled."""
+        token = self.active_token
+        if token is None or token.cancelled:
+            return False
+        token.cancel(reason)
+        return True
+
     async def execute_streaming(self, user_input: str) -> AsyncGenerator[dict, None]:
         """
         Async generator that yields WebSocket-friendly dicts for each node update.
 
+        The turn runs under a ``CancellationToken`` bounded by the configured CPF
+        wall-clock and step budgets; ``cancel()`` fires it from another task.
+
         Example yielded values:
           {"type": "node_update", "node": "classifier", "content": "..."}
+          {"type": "cpf_progress", "step": 3, "lambda": 0.21, "load_mw": 6540.2, "voltage_pu": 0.97, ...}
+          {"type": "margin_estimate", "load_margin_mw": 2470.6, "low_mw": 2411.3, "high_mw": 2529.9, "exact": false, ...}
           {"type": "result", "results": {...}, "plot_path": "..."}
+          {"type": "cancelled", "reason": "Cancelled by user."}
           {"type": "complete"}
+          {"type": "plot_ready", "plot_path": "/plots/<file>.png", "render_ms": 412.0}
+
+        PNGs are rendered in the background, so ``plot_ready`` may arrive after
+        ``complete``; the generator ends once every pending plot has resolved.
         """
+        from agent.pv_curve.cancellation import CancellationToken, SimulationCancelled
+        from agent.pv_curve.plot_renderer import plot_renderer
+
+        settings = get_settings()
+        token = CancellationToken(timeout_s=settings.cpf_timeout_seconds, max_steps=settings.cpf_max_steps)
+        self.active_token = token
+        config = {"recursion_limit": 50, "configurable": {"cancel_token": token, "llm": self.llm}}
+
         loop = asyncio.get_event_loop()
         queue: asyncio.Queue = asyncio.Queue()
 
         def run_agent():
             """Runs synchronous generator in a background thread, pushes to queue."""
             try:
-                for node_name, state_update in self.session_manager.execute_turn_streaming(user_input):
+                for node_name, state_update in self.session_manager.execute_turn_streaming(user_input, config):
                     # Push each update; loop.call_soon_threadsafe is thread-safe
                     asyncio.run_coroutine_threadsafe(
                         queue.put(("update", node_name, state_update)), loop
                     ).result()
+            except SimulationCancelled:
+                pass  # Reported as "cancelled" below; nothing converged worth showing.
             except Exception as exc:
                 asyncio.run_coroutine_threadsafe(
                     queue.put(("error", str(exc), {})), loop
@@ -107,18 +127,59 @@ class WebSessionManager:
         # Start agent in background thread
         thread_future = loop.run_in_executor(None, run_agent)
 
+        def watch_plot(save_path: str) -> bool:
+            """Queue a plot_ready event once the background render finishes."""
+            future = plot_renderer.get(save_path)
+            if future is None:
+                return False
+
+            def on_done(fut):
+                render_s = plot_renderer.render_time(save_path)
+                payload = {
+                    "type": "plot_ready",
+                    "plot_path": f"/plots/{os.path.basename(save_path)}",
+                    "render_ms": round(render_s * 1000, 1) if render_s is not None else None,
+                }
+                if fut.exception() is not None:
+                    payload["error"] = str(fut.exception())
+                loop.call_soon_threadsafe(queue.put_nowait, ("plot_ready", None, payload))
+
+            future.add_done_callback(on_done)
+            return True
+
         # Consume queue as async generator
-        while True:
+        agent_done = False
+        pending_plots = 0
+        while not agent_done or pending_plots:
             kind, node_name, state_update = await queue.get()
 
             if kind == "done":
-                break
+                await thread_future  # Ensure thread completed cleanly
+                agent_done = True
+                if self.active_token is token:
+                    self.active_token = None
+                if token.cancelled:
+                    yield {"type": "cancelled", "reason": token.reason}
+                yield {"type": "complete"}
+                continue
+
+            if kind == "plot_ready":
+                pending_plots -= 1
+                yield state_update
+                continue
 
             if kind == "error":
                 yield {"type": "error", "content": node_name}
-                break
+                continue
 
             # kind == "update"
+            if node_name == "cpf_progress":
+                yield {"type": "cpf_progress", **state_update["cpf_progress"]}
+                continue
+            if node_name == "margin_estimate":
+                yield {"type": "margin_estimate", **state_update["margin_estimate"]}
+                continue
+
             text = _extract_ai_text(state_update)
             results = _extract_results(state_update)
 
@@ -130,6 +191,10 @@ class WebSessionManager:
                 plot_path = state_update.get("results", {}).get("plot_path", "")
                 if plot_path:
                     msg["plot_path"] = plot_path
+                raw_results = state_update.get("results") or {}
+                if raw_results.get("plot_pending") and watch_plot(raw_results["save_path"]):
+                    pending_plots += 1
+                    msg["plot_pending"] = True
 
             # Keep both copies in sync so the next turn's graph sees the latest inputs
             if "inputs" in state_update:
@@ -137,8 +202,5 @@ class WebSessionManager:
 
             yield msg
 
-        await thread_future  # Ensure thread completed cleanly
-        yield {"type": "complete"}
-
     def get_state(self) -> dict:
         return self.session_manager.get_state()
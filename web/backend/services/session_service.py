@@ -55,7 +55,8 @@ def get_or_create_session(db: DBSession, session_id: Optional[str] = None) -> st
 def get_web_manager(db: DBSession, session_id: str) -> WebSessionManager:
     """
     Return the WebSessionManager for a session, creating it lazily on first use.
-    The manager is expensive to create (loads LLM + vector DB), so we cache it.
+    The LLM client, vector DB and compiled graph come from the shared
+    ``agent_registry``; the manager itself only holds this session's state.
     """
     entry = session_cache.get(session_id)
     if entry is None:
@@ -65,6 +65,18 @@ export default function ChatInterface() {
         <div ref={bottomRef} />
       </div>
 
+      {/* Stop the running simulation (server cancels the CPF and returns any partial curve) */}
+      {isProcessing && connectionStatus === "connected" && (
+        <div className="flex justify-center pb-1">
+          <button
+            onClick={() => wsService.cancelRun()}
+            className="text-xs px-3 py-1 rounded-full border border-gray-300 dark:border-gray-600 text-gray-600 dark:text-gray-300 hover:border-red-400 hover:text-red-600 dark:hover:text-red-400 transition-colors"
+          >
+            ■ Stop
+          </button>
+        </div>
+      )}
+
       {/* Message input */}
       <MessageInput
         onSend={handleSend}
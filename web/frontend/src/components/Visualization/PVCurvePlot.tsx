@@ -1,15 +1,25 @@
 import { useMemo } from "react";
 import Plot from "react-plotly.js";
 import { useAppStore } from "../../store/appStore";
+import type { CPFProgressPoint } from "../../types";
+
+const NO_POINTS: CPFProgressPoint[] = [];
 
 export default function PVCurvePlot() {
   const result = useAppStore((s) => s.latestResult);
   const plotPath = useAppStore((s) => s.latestPlotPath);
   const isDark = useAppStore((s) => s.isDark);
+  const liveCurve = useAppStore((s) => s.liveCurve);
+  const isProcessing = useAppStore((s) => s.isProcessing);
+  const marginEstimate = useAppStore((s) => s.marginEstimate);
+  // The estimate is only meaningful until the run it precedes has finished.
+  const estimate = isProcessing ? marginEstimate : null;
+  // Show streamed CPF points only while the run is in progress (or nothing else exists yet).
+  const live = isProcessing || !result ? liveCurve : NO_POINTS;
 
-  const { data, layout } = useMemo(() => buildPlot(result, isDark), [result, isDark]);
+  const { data, layout } = useMemo(() => buildPlot(result, isDark, live), [result, isDark, live]);
 
-  if (!result) {
+  if (!result && live.length === 0 && !estimate) {
     return (
       <div className="flex flex-col items-center justify-center h-full text-center py-12 px-6 select-none">
         <div className="text-4xl mb-3">📈</div>
@@ -43,25 +53,40 @@ export default function PVCurvePlot() {
         />
       </div>
 
-      {/* Results stats */}
-      <div className="grid grid-cols-2 gap-3 sm:grid-cols-3">
+      {/* Quick estimate while the full CPF runs */}
+      {estimate && (
         <StatCard
-          label="Load Margin"
-          value={result.load_margin_mw != null ? `${result.load_margin_mw.toFixed(2)} MW` : "—"}
+          label={estimate.exact ? "Load Margin (preliminary)" : "Estimated Load Margin"}
+          value={
+            estimate.exact
+              ? `${estimate.load_margin_mw.toFixed(2)} MW`
+              : `≈ ${estimate.load_margin_mw.toFixed(0)} MW (${estimate.low_mw.toFixed(0)}–${estimate.high_mw.toFixed(0)})`
+          }
           accent
         />
-        <StatCard
-          label="Nose Voltage"
-          value={result.nose_point_voltage != null ? `${result.nose_point_voltage.toFixed(4)} pu` : "—"}
-        />
-        <StatCard
-          label="Steps"
-          value={result.convergence_steps != null ? String(result.convergence_steps) : "—"}
-        />
-        <StatCard label="Grid"    value={formatGrid(result.grid)} />
-        <StatCard label="Bus"     value={result.bus_id != null ? `Bus ${result.bus_id}` : "—"} />
-        <StatCard label="PF"      value={result.power_factor != null ? result.power_factor.toFixed(2) : "—"} />
-      </div>
+      )}
+
+      {/* Results stats */}
+      {result && (
+        <div className="grid grid-cols-2 gap-3 sm:grid-cols-3">
+          <StatCard
+            label="Load Margin"
+            value={result.load_margin_mw != null ? `${result.load_margin_mw.toFixed(2)} MW` : "—"}
+            accent
+          />
+          <StatCard
+            label="Nose Voltage"
+            value={result.nose_point_voltage != null ? `${result.nose_point_voltage.toFixed(4)} pu` : "—"}
+          />
+          <StatCard
+            label="Steps"
+            value={result.convergence_steps != null ? String(result.convergence_steps) : "—"}
+          />
+          <StatCard label="Grid"    value={formatGrid(result.grid)} />
+          <StatCard label="Bus"     value={result.bus_id != null ? `Bus ${result.bus_id}` : "—"} />
+          <StatCard label="PF"      value={result.power_factor != null ? result.power_factor.toFixed(2) : "—"} />
+        </div>
+      )}
 
       {/* Download PNG generated by backend */}
       {plotPath && (
@@ -80,7 +105,11 @@ export default function PVCurvePlot() {
 
 // ─── Plotly builder ───────────────────────────────────────────────────────────
 
-function buildPlot(result: ReturnType<typeof useAppStore.getState>["latestResult"], isDark: boolean) {
+function buildPlot(
+  result: ReturnType<typeof useAppStore.getState>["latestResult"],
+  isDark: boolean,
+  live: CPFProgressPoint[] = [],
+) {
   const bg = isDark ? "#1f2937" : "#ffffff";
   const gridColor = isDark ? "#374151" : "#e5e7eb";
   const textColor = isDark ? "#d1d5db" : "#374151";
@@ -112,6 +141,20 @@ function buildPlot(result: ReturnType<typeof useAppStore.getState>["latestResult
     });
   }
 
+  // Points streamed while the CPF is still running
+  if (live.length > 0) {
+    traces.push({
+      x: live.map((p) => p.load_mw),
+      y: live.map((p) => p.voltage_pu ?? p.min_voltage_pu),
+      name: "Live CPF",
+      type: "scatter",
+      mode: "lines+markers",
+      line: { color: "#10b981", width: 2 },
+      marker: { size: 4 },
+      hovertemplate: "Load: %{x:.1f} MW<br>Voltage: %{y:.4f} pu<extra></extra>",
+    });
+  }
+
   // Nose point
   if (result?.nose_load != null && result?.nose_voltage != null) {
     traces.push({
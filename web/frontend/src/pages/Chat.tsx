@@ -19,6 +19,8 @@ export default function ChatPage() {
   const { conversationId } = useParams<{ conversationId?: string }>();
   const [sidebarOpen, setSidebarOpen] = useState(false);
   const latestResult = useAppStore((s) => s.latestResult);
+  const hasLiveCurve = useAppStore((s) => s.liveCurve.length > 0);
+  const showPlot = latestResult != null || hasLiveCurve;
 
   // Close drawer on Escape key (keyboard accessibility)
   useEffect(() => {
@@ -56,12 +58,12 @@ export default function ChatPage() {
         {/* Split: chat top, plot bottom — flex column */}
         <div className="flex-1 flex flex-col min-h-0">
           {/* Chat takes flexible space */}
-          <div className={`flex flex-col min-h-0 ${latestResult ? "flex-[2]" : "flex-1"}`}>
+          <div className={`flex flex-col min-h-0 ${showPlot ? "flex-[2]" : "flex-1"}`}>
             <ChatInterface />
           </div>
 
-          {/* PV Curve plot — only rendered after first result */}
-          {latestResult && (
+          {/* PV Curve plot — rendered once a CPF starts streaming or a result arrives */}
+          {showPlot && (
             <div className="flex-1 border-t border-gray-200 dark:border-gray-700 min-h-0 overflow-y-auto">
               <PVCurvePlot />
             </div>
@@ -4,11 +4,15 @@
  * Protocol summary:
  *   Client → Server:  { type: "message", content: "...", conversation_id?: "..." }
  *                     { type: "ping" }
+ *                     { type: "cancel" }  (abort the running simulation)
  *   Server → Client:  { type: "session",              session_id }
  *                     { type: "conversation_created",  conversation_id, title }
  *                     { type: "node_update",           node, content, conversation_id }
+ *                     { type: "cpf_progress",          step, lambda, load_mw, voltage_pu, min_voltage_pu }
  *                     { type: "result",                results, plot_path }
+ *                     { type: "cancelled",             reason }  (simulation stopped; partial results may follow)
  *                     { type: "complete" }  (client refetches GET /parameters so sidebar matches agent state)
+ *                     { type: "plot_ready",           plot_path, render_ms }  (PNG finished rendering; may follow "complete")
  *                     { type: "error",                 content }
  *                     { type: "pong" }
  */
@@ -120,12 +124,50 @@ class WebSocketService {
         break;
       }
 
+      case "cpf_progress":
+        if (msg.step != null && msg.lambda != null && msg.load_mw != null) {
+          store.addProgressPoint({
+            step: msg.step,
+            lambda: msg.lambda,
+            load_mw: msg.load_mw,
+            voltage_pu: msg.voltage_pu ?? null,
+            min_voltage_pu: msg.min_voltage_pu ?? 0,
+          });
+        }
+        break;
+
+      case "margin_estimate":
+        if (msg.load_margin_mw != null && msg.low_mw != null && msg.high_mw != null) {
+          store.setMarginEstimate({
+            load_margin_mw: msg.load_margin_mw,
+            low_mw: msg.low_mw,
+            high_mw: msg.high_mw,
+            exact: msg.exact ?? false,
+            source: msg.source ?? "",
+          });
+        }
+        break;
+
       case "result":
         if (msg.results) {
           store.setResult(msg.results, msg.plot_path ?? "");
         }
         break;
 
+      case "plot_ready":
+        if (msg.plot_path && !msg.error) {
+          store.setPlotPath(msg.plot_path);
+        }
+        break;
+
+      case "cancelled":
+        store.finaliseLastMessage();
+        store.addMessage({
+          role: "assistant",
+          content: `⏹ Simulation stopped: ${msg.reason ?? "cancelled"}`,
+        });
+        break;
+
       case "complete":
         store.finaliseLastMessage();
         store.setProcessing(false, null);
@@ -177,6 +219,10 @@ class WebSocketService {
     });
   }
 
+  cancelRun() {
+    this.send({ type: "cancel" });
+  }
+
   disconnect() {
     this.destroyed = true;
     this.clearTimers();
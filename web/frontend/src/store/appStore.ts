@@ -7,6 +7,8 @@ import type {
   Parameters,
   LLMConfigResponse,
   PVCurveResult,
+  CPFProgressPoint,
+  MarginEstimate,
 } from "../types";
 
 interface AppState {
@@ -40,6 +42,13 @@ interface AppState {
   latestResult: PVCurveResult | null;
   latestPlotPath: string | null;
   setResult: (result: PVCurveResult, plotPath: string) => void;
+  setPlotPath: (plotPath: string) => void;
+  /** Points streamed while the current CPF runs; cleared when a new curve starts */
+  liveCurve: CPFProgressPoint[];
+  addProgressPoint: (point: CPFProgressPoint) => void;
+  /** Quick margin estimate shown until the exact result arrives */
+  marginEstimate: MarginEstimate | null;
+  setMarginEstimate: (estimate: MarginEstimate | null) => void;
 
   // ── Parameters ────────────────────────────────────────────────────────────
   parameters: Parameters | null;
@@ -114,7 +123,18 @@ export const useAppStore = create<AppState>()(
       latestResult: null,
       latestPlotPath: null,
       setResult: (result, plotPath) =>
-        set({ latestResult: result, latestPlotPath: plotPath }),
+        set({ latestResult: result, latestPlotPath: plotPath, marginEstimate: null }),
+      setPlotPath: (plotPath) => set({ latestPlotPath: plotPath }),
+      liveCurve: [],
+      addProgressPoint: (point) =>
+        set((s) => {
+          // Step 0 starts a new run; a repeated step revises the last point.
+          if (point.step === 0) return { liveCurve: [point] };
+          const kept = s.liveCurve.filter((p) => p.step < point.step);
+          return { liveCurve: [...kept, point] };
+        }),
+      marginEstimate: null,
+      setMarginEstimate: (estimate) => set({ marginEstimate: estimate }),
 
       // Parameters
       parameters: null,
@@ -139,6 +159,8 @@ export const useAppStore = create<AppState>()(
           messages: [],
           latestResult: null,
           latestPlotPath: null,
+          liveCurve: [],
+          marginEstimate: null,
           isProcessing: false,
           currentNode: null,
         }),
@@ -64,19 +64,44 @@ export interface PVCurveResult {
   [key: string]: unknown;
 }
 
+// ─── Live CPF progress ───────────────────────────────────────────────────────
+
+export interface CPFProgressPoint {
+  step: number;
+  lambda: number;
+  load_mw: number;
+  voltage_pu: number | null;
+  min_voltage_pu: number;
+}
+
+// ─── Quick margin estimate ───────────────────────────────────────────────────
+
+export interface MarginEstimate {
+  load_margin_mw: number;
+  low_mw: number;
+  high_mw: number;
+  /** True when the nose was sampled (or a cached curve was reused) */
+  exact: boolean;
+  source: string;
+}
+
 // ─── WebSocket message types ─────────────────────────────────────────────────
 
 export type WSMessageType =
   | "session"
   | "conversation_created"
   | "node_update"
+  | "cpf_progress"
+  | "margin_estimate"
   | "result"
+  | "cancelled"
   | "complete"
+  | "plot_ready"
   | "error"
   | "pong";
 
 export interface WSOutgoing {
-  type: "message" | "ping";
+  type: "message" | "ping" | "cancel";
   content?: string;
   session_id?: string;
   conversation_id?: string;
@@ -94,6 +119,23 @@ export interface WSIncoming {
   content?: string;
   results?: PVCurveResult;
   plot_path?: string;
+  // cpf_progress
+  step?: number;
+  lambda?: number;
+  load_mw?: number;
+  voltage_pu?: number | null;
+  min_voltage_pu?: number;
+  // margin_estimate (load_margin_mw)
+  load_margin_mw?: number;
+  low_mw?: number;
+  high_mw?: number;
+  exact?: boolean;
+  source?: string;
+  // cancelled
+  reason?: string;
+  // plot_ready
+  render_ms?: number | null;
+  error?: string;
 }
 
 // ─── LLM Config ─────────────────────────────────────────────────────────────
@@ -0,0 +1,118 @@
+"""
+Tests for the shared agent resource registry.
+
+The reranker and retriever are replaced by fakes with a realistic load cost
+(a 32 MB buffer standing in for the CrossEncoder weights, plus a load delay),
+while prompts and the LangGraph workflow are built for real. Each session
+after the first must reuse them, so it should be far cheaper in both
+memory and construction (first-message) latency.
+"""
+import threading
+import time
+import tracemalloc
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from web.backend.services.agent_registry import AgentRegistry
+from web.backend.services.agent_service import WebSessionManager
+
+MODEL_BYTES = 32 * 1024 * 1024
+LOAD_DELAY_S = 0.3
+
+
+def _load_reranker(top_k=10):
+    time.sleep(LOAD_DELAY_S)
+    return SimpleNamespace(weights=bytearray(MODEL_BYTES), top_k=top_k)
+
+
+def _fake_llm(provider, **config):
+    llm = MagicMock()
+    llm._model_name = config.get("ollama_model") or provider
+    return llm
+
+
+def _patched(registry):
+    return (
+        patch("web.backend.services.agent_service.agent_registry", registry),
+        patch("web.backend.services.agent_registry.build_llm", side_effect=_fake_llm),
+        patch("agent.utils.reranker.get_reranker", side_effect=_load_reranker),
+        patch("agent.vector.retriever", side_effect=lambda reranker: SimpleNamespace(reranker=reranker)),
+    )
+
+
+def _new_session(**config):
+    """Return (manager, seconds, bytes retained) for one new session."""
+    before, _ = tracemalloc.get_traced_memory()
+    start = time.perf_counter()
+    manager = WebSessionManager(provider="ollama", **config)
+    elapsed = time.perf_counter() - start
+    after, _ = tracemalloc.get_traced_memory()
+    return manager, elapsed, after - before
+
+
+def test_sessions_share_heavy_resources():
+    registry = AgentRegistry()
+    p1, p2, p3, p4 = _patched(registry)
+    with p1, p2, p3, p4:
+        tracemalloc.start()
+        try:
+            first, first_s, first_bytes = _new_session()
+            later = [_new_session() for _ in range(5)]
+        finally:
+            tracemalloc.stop()
+
+    assert registry.builds == {"prompts": 1, "reranker": 1, "retriever": 1, "llm": 1, "workflow": 1}
+    assert all(manager.session_manager.graph is first.session_manager.graph for manager, _, _ in later)
+    assert first.session_manager.state is not later[0][0].session_manager.state
+
+    assert first_bytes > MODEL_BYTES
+    assert max(size for _, _, size in later) < first_bytes / 100
+    assert first_s >= LOAD_DELAY_S
+    assert max(seconds for _, seconds, _ in later) < first_s / 10
+
+
+def test_llm_clients_are_pooled_per_provider_config():
+    registry = AgentRegistry()
+    p1, p2, p3, p4 = _patched(registry)
+    with p1, p2, p3, p4:
+        a = WebSessionManager(provider="ollama", ollama_model="llama3.1:8b")
+        b = WebSessionManager(provider="ollama", ollama_model="qwen2.5:7b")
+        c = WebSessionManager(provider="ollama", ollama_model="llama3.1:8b")
+
+    assert a.llm is c.llm
+    assert a.llm is not b.llm
+    assert a.session_manager.graph is b.session_manager.graph
+    assert registry.builds["llm"] == 2
+    assert registry.builds["reranker"] == 1
+    assert registry.builds["workflow"] == 1
+
+
+def test_llm_pool_evicts_least_recently_used():
+    registry = AgentRegistry(max_llm_clients=2)
+    p1, p2, p3, p4 = _patched(registry)
+    with p1, p2, p3, p4:
+        a = registry.llm("openai", api_key="key-a")
+        registry.llm("openai", api_key="key-b")
+        assert registry.llm("openai", api_key="key-a") is a  # a is now most recent
+        registry.llm("openai", api_key="key-c")  # evicts b
+
+        assert registry.llm("openai", api_key="key-a") is a
+        assert registry.stats()["llm_clients"] == 2
+        assert registry.llm_evictions == 1
+        registry.llm("openai", api_key="key-b")
+
+    assert registry.builds["llm"] == 4
+
+
+def test_concurrent_first_sessions_build_once():
+    registry = AgentRegistry()
+    p1, p2, p3, p4 = _patched(registry)
+    with p1, p2, p3, p4:
+        threads = [threading.Thread(target=WebSessionManager, kwargs={"provider": "ollama"}) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert registry.builds["reranker"] == 1
+    assert registry.builds["workflow"] == 1
@@ -0,0 +1,133 @@
+"""
+Tests for cancelling an in-flight turn.
+
+The fake generation node polls the turn's CancellationToken the same way the
+CPF loop does after each continuation point, so these tests exercise the
+plumbing (config → node, cancel() → token, "cancelled" message) without ANDES.
+"""
+import asyncio
+import time
+from typing import Annotated, TypedDict
+from unittest.mock import Mock
+
+from langchain_core.messages import AIMessage
+from langgraph.config import get_config, get_stream_writer
+from langgraph.graph import END, START, StateGraph
+from langgraph.graph.message import add_messages
+
+from agent.nodes import analysis
+from agent.schemas.inputs import Inputs
+from agent.session import SessionManager
+from web.backend.services.agent_service import WebSessionManager
+
+
+class _State(TypedDict, total=False):
+    messages: Annotated[list, add_messages]
+    conversation_context: list
+    inputs: Inputs
+    results: dict
+    node_response: object
+
+
+def _slow_generation(state):
+    token = get_config()["configurable"]["cancel_token"]
+    writer = get_stream_writer()
+    for step in range(500):
+        if token.cancelled:
+            return {"messages": [AIMessage(content=f"stopped after {step} points")]}
+        writer({"cpf_progress": {"step": step, "lambda": step / 500, "load_mw": 100.0, "voltage_pu": 1.0}})
+        time.sleep(0.01)
+    return {"messages": [AIMessage(content="finished")]}
+
+
+def _never_reached(state):
+    raise AssertionError("graph kept running after cancel")
+
+
+def _make_manager() -> WebSessionManager:
+    graph = StateGraph(_State)
+    graph.add_node("generation", _slow_generation)
+    graph.add_node("analysis", _never_reached)
+    graph.add_edge(START, "generation")
+    graph.add_edge("generation", "analysis")
+    graph.add_edge("analysis", END)
+
+    manager = WebSessionManager.__new__(WebSessionManager)
+    manager.session_manager = SessionManager(graph.compile(), "mock", "mock-model")
+    manager.llm = None
+    manager.active_token = None
+    return manager
+
+
+def test_cancel_stops_run_and_reports_reason():
+    manager = _make_manager()
+
+    async def run():
+        messages = []
+        async for msg in manager.execute_streaming("generate"):
+            messages.append(msg)
+            if msg["type"] == "cpf_progress" and msg["step"] == 2:
+                assert manager.cancel() is True
+        return messages
+
+    messages = asyncio.run(run())
+    types = [m["type"] for m in messages]
+
+    assert types[-2:] == ["cancelled", "complete"]
+    assert messages[-2]["reason"] == "Cancelled by user."
+    assert types.count("cpf_progress") < 10
+    assert "stopped after" in next(m["content"] for m in messages if m["type"] == "node_update")
+    assert manager.cancel() is False  # Nothing left running
+
+
+def _slow_pv_curve(progress_callback=None, cancel_token=None, **kwargs):
+    """Stand-in for ``generate_pv_curve`` that stops like the CPF loop when its token fires."""
+    for step in range(500):
+        if cancel_token is not None and cancel_token.cancelled:
+            return {"converged_steps": step, "load_margin_mw": 10.0 * step, "cancelled": cancel_token.reason}
+        progress_callback({"step": step, "lambda": step / 500, "load_mw": 100.0, "voltage_pu": 1.0})
+        time.sleep(0.01)
+    return {"converged_steps": 500, "load_margin_mw": 5000.0, "cancelled": None}
+
+
+def test_cancel_stops_analysis_turn(monkeypatch):
+    monkeypatch.setattr(analysis, "estimate_load_margin", Mock(return_value={"load_margin_mw": None}))
+    llm = Mock()
+
+    def analysis_node(state):
+        return analysis.analysis_agent(state, llm, {}, None, _slow_pv_curve)
+
+    graph = StateGraph(_State)
+    graph.add_node("analysis", analysis_node)
+    graph.add_edge(START, "analysis")
+    graph.add_edge("analysis", END)
+    manager = _make_manager()
+    manager.session_manager = SessionManager(graph.compile(), "mock", "mock-model")
+
+    async def run():
+        messages = []
+        async for msg in manager.execute_streaming("analyze the curve"):
+            messages.append(msg)
+            if msg["type"] == "cpf_progress" and msg["step"] == 2:
+                assert manager.cancel() is True
+        return messages
+
+    messages = asyncio.run(run())
+    types = [m["type"] for m in messages]
+
+    assert types[-2:] == ["cancelled", "complete"]
+    assert types.count("cpf_progress") < 10
+    assert "stopped early (Cancelled by user.)" in next(m["content"] for m in messages if m["type"] == "node_update")
+    llm.invoke.assert_not_called()
+
+
+def test_cancel_without_running_turn_is_noop():
+    assert _make_manager().cancel() is False
+
+
+def test_websocket_accepts_cancel_message(client):
+    with client.websocket_connect("/ws") as ws:
+        ws.receive_json()
+        ws.send_json({"type": "cancel"})
+        ws.send_json({"type": "ping"})
+        assert ws.receive_json()["type"] == "pong"
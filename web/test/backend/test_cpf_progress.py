@@ -0,0 +1,148 @@
+"""
+Tests for live CPF progress streaming.
+
+A node that writes ``{"cpf_progress": {...}}`` to the LangGraph stream writer
+(as the generation node does while ANDES runs) must reach the WebSocket as
+``cpf_progress`` messages ahead of that node's own node_update, without
+leaking into the session state.
+"""
+import asyncio
+import threading
+import time
+from typing import Annotated, TypedDict
+from unittest.mock import Mock
+
+from langchain_core.messages import AIMessage
+from langgraph.config import get_stream_writer
+from langgraph.graph import END, START, StateGraph
+from langgraph.graph.message import add_messages
+
+from agent.nodes import analysis
+from agent.schemas.inputs import Inputs
+from agent.session import SessionManager
+from web.backend.services.agent_service import WebSessionManager
+
+
+class _State(TypedDict, total=False):
+    messages: Annotated[list, add_messages]
+    conversation_context: list
+    inputs: Inputs
+    results: dict
+    node_response: object
+
+
+def _fake_generation(state):
+    writer = get_stream_writer()
+    for step, lam in enumerate((0.0, 0.5, 1.0)):
+        writer({"cpf_progress": {"step": step, "lambda": lam, "load_mw": 100.0 + lam, "voltage_pu": 1.0 - lam / 4}})
+    return {"messages": [AIMessage(content="done")]}
+
+
+def _make_manager() -> WebSessionManager:
+    graph = StateGraph(_State)
+    graph.add_node("generation", _fake_generation)
+    graph.add_edge(START, "generation")
+    graph.add_edge("generation", END)
+
+    manager = WebSessionManager.__new__(WebSessionManager)
+    manager.session_manager = SessionManager(graph.compile(), "mock", "mock-model")
+    manager.llm = None
+    return manager
+
+
+def test_session_yields_progress_without_touching_state():
+    manager = _make_manager()
+    updates = list(manager.session_manager.execute_turn_streaming("generate"))
+
+    assert [name for name, _ in updates] == ["cpf_progress"] * 3 + ["generation"]
+    assert "cpf_progress" not in manager.session_manager.state
+
+
+def test_websocket_stream_carries_cpf_progress():
+    manager = _make_manager()
+
+    async def run():
+        return [msg async for msg in manager.execute_streaming("generate")]
+
+    messages = asyncio.run(run())
+
+    assert [m["type"] for m in messages] == ["cpf_progress"] * 3 + ["node_update", "complete"]
+    assert [m["step"] for m in messages[:3]] == [0, 1, 2]
+    assert messages[2]["voltage_pu"] == 0.75
+
+
+def test_margin_estimate_streams_before_node_update():
+    def _fake_analysis(state):
+        get_stream_writer()({"margin_estimate": {"load_margin_mw": 2470.6, "low_mw": 2411.3, "high_mw": 2529.9, "exact": False}})
+        return {"messages": [AIMessage(content="done")]}
+
+    graph = StateGraph(_State)
+    graph.add_node("analysis", _fake_analysis)
+    graph.add_edge(START, "analysis")
+    graph.add_edge("analysis", END)
+    manager = WebSessionManager.__new__(WebSessionManager)
+    manager.session_manager = SessionManager(graph.compile(), "mock", "mock-model")
+    manager.llm = None
+
+    async def run():
+        return [msg async for msg in manager.execute_streaming("analyze")]
+
+    messages = asyncio.run(run())
+
+    assert [m["type"] for m in messages] == ["margin_estimate", "node_update", "complete"]
+    assert messages[0]["low_mw"] == 2411.3
+    assert "margin_estimate" not in manager.session_manager.state
+
+
+_ESTIMATE = {"load_margin_mw": 2470.6, "low_mw": 2411.3, "high_mw": 2529.9, "exact": False}
+_PROMPTS = {"analysis_agent": {"system": "{context}", "user": "{grid_system} {results}"}}
+
+
+def _analysis_turn(estimate_load_margin, generate_pv_curve, monkeypatch):
+    """Run the real analysis node once and return the streamed update names."""
+    monkeypatch.setattr(analysis, "estimate_load_margin", estimate_load_margin)
+    monkeypatch.setattr(analysis, "display_executing_node", Mock())
+    llm = Mock()
+    llm.invoke.return_value = AIMessage(content="analysis")
+    retriever = Mock()
+    retriever.invoke.return_value = []
+
+    graph = StateGraph(_State)
+    graph.add_node("analysis", lambda state: analysis.analysis_agent(state, llm, _PROMPTS, retriever, generate_pv_curve))
+    graph.add_edge(START, "analysis")
+    graph.add_edge("analysis", END)
+    session = SessionManager(graph.compile(), "mock", "mock-model")
+    return [name for name, _ in session.execute_turn_streaming("analyze")]
+
+
+def _pv_results(**kwargs):
+    return {"grid_system": "ieee39", "load_values_mw": [0.0, 2465.0], "voltage_values_pu": [1.0, 0.8],
+            "load_margin_mw": 2465.0, "converged_steps": 2, "cancelled": None}
+
+
+def test_analysis_estimate_runs_alongside_full_run(monkeypatch):
+    estimate_started = threading.Event()
+
+    def estimate(**kwargs):
+        estimate_started.set()
+        return dict(_ESTIMATE)
+
+    def slow_full_run(**kwargs):
+        # A serial estimate would finish before the full run starts.
+        assert estimate_started.wait(2.0)
+        time.sleep(0.2)
+        return _pv_results()
+
+    names = _analysis_turn(estimate, slow_full_run, monkeypatch)
+
+    assert names == ["margin_estimate", "analysis"]
+
+
+def test_analysis_estimate_dropped_once_exact_result_is_ready(monkeypatch):
+    def slow_estimate(**kwargs):
+        time.sleep(0.2)
+        return dict(_ESTIMATE)
+
+    names = _analysis_turn(slow_estimate, _pv_results, monkeypatch)
+
+    assert names == ["analysis"]
@@ -2,7 +2,10 @@
 Tests for parameter REST endpoints.
 These don't need a real LLM — they only touch the parameter cache logic.
 """
+from unittest.mock import MagicMock
+
 import pytest
+from agent.schemas.inputs import Inputs
 from web.backend.utils.cache import session_cache
 
 SESSION_ID = "test-session-params-001"
@@ -70,3 +73,52 @@ def test_update_power_factor_out_of_range(client):
         "power_factor": 1.5,
     })
     assert response.status_code == 422
+
+
+def test_update_rejects_unknown_contingency_line(client):
+    """Contingency pairs are checked against the grid's line index."""
+    response = client.post("/api/v1/parameters", json={
+        "session_id": SESSION_ID,
+        "grid": "ieee14",
+        "contingency_lines": [[1, 14]],
+    })
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["body", "contingency_lines"]
+
+
+def test_update_rejects_unknown_generator(client):
+    response = client.post("/api/v1/parameters", json={
+        "session_id": SESSION_ID,
+        "grid": "ieee14",
+        "gen_voltage_setpoints": {"99": 1.02},
+    })
+    assert response.status_code == 422
+    assert "Generator index 99" in response.json()["detail"][0]["msg"]
+
+
+def test_update_accepts_valid_topology(client):
+    response = client.post("/api/v1/parameters", json={
+        "session_id": SESSION_ID,
+        "grid": "ieee14",
+        "bus_id": 14,
+        "contingency_lines": [[2, 1]],
+        "gen_voltage_setpoints": {"2": 1.03},
+    })
+    assert response.status_code == 200
+    params = response.json()["parameters"]
+    assert params["contingency_lines"] == [[2, 1]]
+
+
+def test_grid_only_update_rechecks_carried_over_fields(client):
+    """Switching grid validates the bus, outages and setpoints kept from the old grid."""
+    session_id = "test-session-grid-switch"
+    client.get("/api/v1/parameters", params={"session_id": session_id})
+    manager = MagicMock()
+    manager.current_inputs = Inputs(grid="ieee118", bus_id=100)
+    session_cache.get(session_id)["web_manager"] = manager
+
+    response = client.post("/api/v1/parameters", json={"session_id": session_id, "grid": "ieee14"})
+
+    assert response.status_code == 422
+    assert [err["loc"] for err in response.json()["detail"]] == [["body", "bus_id"]]
+    manager.set_inputs.assert_not_called()
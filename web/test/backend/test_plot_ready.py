@@ -0,0 +1,102 @@
+"""
+Tests for background plot delivery in WebSessionManager.execute_streaming.
+
+The generation node returns as soon as the CPF numbers exist and the PNG is
+rendered by ``plot_renderer``; the stream must still end with a plot_ready
+event for it, even when that arrives after complete.
+"""
+import asyncio
+import threading
+from unittest.mock import MagicMock, patch
+
+from agent.pv_curve.plot_renderer import plot_renderer
+from web.backend.services.agent_service import WebSessionManager
+
+
+def _collect(manager, text="generate"):
+    async def run():
+        return [msg async for msg in manager.execute_streaming(text)]
+
+    return asyncio.run(run())
+
+
+def _manager_with_updates(updates) -> WebSessionManager:
+    manager = WebSessionManager.__new__(WebSessionManager)
+    manager.session_manager = MagicMock()
+    manager.llm = None
+    manager.session_manager.execute_turn_streaming.return_value = iter(updates)
+    return manager
+
+
+def test_plot_ready_follows_complete(tmp_path):
+    gate = threading.Event()
+    save_path = str(tmp_path / "pv_curve_ieee14_test.png")
+
+    def render(path):
+        gate.wait(5)
+        with open(path, "wb") as f:
+            f.write(b"png")
+
+    plot_renderer.submit(render, save_path, save_path=save_path)
+    results = {"load_margin_mw": 100.0, "save_path": save_path, "plot_pending": True}
+    manager = _manager_with_updates([("generation", {"messages": [], "results": results})])
+
+    # Release the render only after the agent turn has finished streaming.
+    threading.Timer(0.2, gate.set).start()
+    messages = _collect(manager)
+
+    assert [m["type"] for m in messages] == ["node_update", "complete", "plot_ready"]
+    assert messages[0]["plot_pending"] is True
+    assert messages[-1]["plot_path"] == "/plots/pv_curve_ieee14_test.png"
+    assert messages[-1]["render_ms"] is not None
+
+
+def test_no_plot_ready_without_pending_plot():
+    results = {"load_margin_mw": 100.0, "save_path": None, "plot_pending": False}
+    manager = _manager_with_updates([("analysis", {"messages": [], "results": results})])
+
+    assert [m["type"] for m in _collect(manager)] == ["node_update", "complete"]
+
+
+class _PlotPendingManager:
+    """Turn completes immediately; its plot_ready waits on ``release``."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.turns = 0
+
+    async def execute_streaming(self, text):
+        self.turns += 1
+        turn = self.turns
+        yield {"type": "node_update", "node": "generation", "content": f"curve {turn}", "plot_pending": True}
+        yield {"type": "complete"}
+        if turn == 1:
+            while not self.release.is_set():
+                await asyncio.sleep(0.01)
+            yield {"type": "plot_ready", "plot_path": "/plots/first.png", "render_ms": 1.0}
+
+    def cancel(self, reason=None):
+        pass
+
+    def get_state(self):
+        return {}
+
+
+def test_next_message_accepted_while_plot_renders(client):
+    manager = _PlotPendingManager()
+    with patch("web.backend.api.v1.chat.session_service.get_web_manager", return_value=manager):
+        with client.websocket_connect("/ws") as ws:
+            ws.receive_json()  # session
+            ws.send_json({"type": "message", "content": "generate"})
+            first = [ws.receive_json() for _ in range(3)]
+            assert [m["type"] for m in first] == ["conversation_created", "node_update", "complete"]
+
+            # Plot 1 is still pending, but the turn is over
+            ws.send_json({"type": "message", "content": "generate again"})
+            second = [ws.receive_json() for _ in range(3)]
+            assert [m["type"] for m in second] == ["conversation_created", "node_update", "complete"]
+            assert second[1]["content"] == "curve 2"
+
+            manager.release.set()
+            plot = ws.receive_json()
+            assert plot["type"] == "plot_ready" and plot["plot_path"] == "/plots/first.png"
@@ -0,0 +1,85 @@
+"""
+Tests for the compile-once agent graph.
+
+Sessions on different LLM configs share one compiled workflow; each run
+passes its session's LLM through ``config["configurable"]["llm"]``. The
+measurement test compares the old cost (one compiled graph per LLM config)
+with the shared graph.
+"""
+import asyncio
+import time
+import tracemalloc
+from unittest.mock import MagicMock, patch
+
+from langchain_core.messages import AIMessage
+
+from agent.session import SessionManager
+from agent.workflows.workflow import create_workflow
+from web.backend.services.agent_service import WebSessionManager
+
+CONFIGS = 6
+
+
+def _compile(**deps):
+    """Return (graph, seconds, bytes retained) for one compile."""
+    before, _ = tracemalloc.get_traced_memory()
+    start = time.perf_counter()
+    graph = create_workflow(**deps)
+    elapsed = time.perf_counter() - start
+    after, _ = tracemalloc.get_traced_memory()
+    return graph, elapsed, after - before
+
+
+def test_one_compile_replaces_one_per_llm_config():
+    prompts, retriever = {}, MagicMock()
+    tracemalloc.start()
+    try:
+        per_config = [_compile(llm=MagicMock(), prompts=prompts, retriever=retriever) for _ in range(CONFIGS)]
+        shared, shared_s, shared_bytes = _compile(prompts=prompts, retriever=retriever)
+    finally:
+        tracemalloc.stop()
+
+    old_s = sum(seconds for _, seconds, _ in per_config)
+    old_bytes = sum(size for _, _, size in per_config)
+    print(f"\n{CONFIGS} per-config graphs: {old_s * 1e3:.1f} ms, {old_bytes / 1024:.0f} KiB; "
+          f"shared graph: {shared_s * 1e3:.1f} ms, {shared_bytes / 1024:.0f} KiB")
+    assert old_s > shared_s * CONFIGS / 2
+    assert old_bytes > shared_bytes * CONFIGS / 2
+
+
+def _manager(graph, llm):
+    manager = WebSessionManager.__new__(WebSessionManager)
+    manager.session_manager = SessionManager(graph, "ollama", llm)
+    manager.llm = llm
+    manager.active_token = None
+    return manager
+
+
+def test_sessions_on_different_llms_share_one_graph():
+    graph = create_workflow(prompts={}, retriever=MagicMock())
+    seen = []
+
+    def classify(state, llm, prompts):
+        seen.append(("classifier", llm))
+        return {"message_type": "question_general"}
+
+    def answer(state, llm, prompts, retriever):
+        seen.append(("question_general", llm))
+        return {"messages": [AIMessage(content=f"answered by {llm}")]}
+
+    async def turn(manager, text):
+        return [msg async for msg in manager.execute_streaming(text)]
+
+    with (
+        patch("agent.workflows.workflow.classify_message", side_effect=classify),
+        patch("agent.workflows.workflow.question_general_agent", side_effect=answer),
+    ):
+        first = asyncio.run(turn(_manager(graph, "llm-a"), "what is a nose point"))
+        second = asyncio.run(turn(_manager(graph, "llm-b"), "what is a load margin"))
+
+    assert seen == [
+        ("classifier", "llm-a"), ("question_general", "llm-a"),
+        ("classifier", "llm-b"), ("question_general", "llm-b"),
+    ]
+    assert any(msg.get("content") == "answered by llm-a" for msg in first)
+    assert any(msg.get("content") == "answered by llm-b" for msg in second)
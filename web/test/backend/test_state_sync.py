@@ -26,7 +26,7 @@ def _make_manager() -> WebSessionManager:
     mock_workflow = MagicMock()
 
     with (
-        patch("web.backend.services.agent_service.build_llm", return_value=mock_llm),
+        patch("web.backend.services.agent_registry.build_llm", return_value=mock_llm),
         patch("web.backend.services.agent_service.get_settings", return_value=MagicMock(plots_path="/tmp")),
         patch("agent.core.setup_dependencies", return_value=(mock_llm, {}, MagicMock())),
         patch("agent.workflows.workflow.create_workflow", return_value=mock_workflow),
@@ -39,6 +39,7 @@ def _make_manager() -> WebSessionManager:
         from agent.session import SessionManager
         manager.session_manager = SessionManager(mock_workflow, "mock", "mock-model")
         manager.current_inputs = Inputs()
+        manager.llm = mock_llm
         return manager
 
 
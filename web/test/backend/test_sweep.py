@@ -0,0 +1,63 @@
+"""
+Tests for the parameter sweep endpoint.
+Runs a tiny inline (single worker) sweep on IEEE 14 — no LLM needed.
+"""
+import json
+
+from web.backend.api.v1 import sweep as sweep_api
+from web.backend.core.config import get_settings
+
+SESSION_ID = "test-session-sweep-001"
+
+
+def test_sweep_streams_points_then_summary(client):
+    response = client.post("/api/v1/sweep", json={
+        "session_id": SESSION_ID,
+        "axes": {"grid": ["ieee14"], "power_factor": [0.9, 1.0], "bus_id": [5, 14]},
+        "max_workers": 1,
+    })
+    assert response.status_code == 200
+    events = [json.loads(line) for line in response.text.splitlines() if line]
+
+    points = [e for e in events if e["type"] == "point"]
+    assert len(points) == 4
+    assert all(p["status"] == "ok" for p in points)
+
+    summary = events[-1]
+    assert summary["type"] == "summary"
+    assert summary["points"] == 4
+    assert summary["simulations"] <= 2  # bus_id only changes post-processing
+    assert summary["table"]["power_factor"] == [0.9, 0.9, 1.0, 1.0]
+
+
+def test_sweep_rejects_unknown_parameter(client):
+    response = client.post("/api/v1/sweep", json={
+        "session_id": SESSION_ID,
+        "axes": {"not_a_field": [1, 2]},
+    })
+    assert response.status_code == 422
+
+
+def test_sweep_rejects_invalid_value(client):
+    response = client.post("/api/v1/sweep", json={
+        "session_id": SESSION_ID,
+        "axes": {"power_factor": [0.9, 1.5]},
+    })
+    assert response.status_code == 422
+
+
+def test_sweep_workers_capped_by_shared_pool(client, monkeypatch):
+    sweep_api.shutdown_sweep_pool()
+    monkeypatch.setattr(get_settings(), "sweep_max_workers", 1)
+    try:
+        response = client.post("/api/v1/sweep", json={
+            "session_id": SESSION_ID,
+            "axes": {"grid": ["ieee14"], "power_factor": [0.85, 0.95]},
+            "max_workers": 8,
+        })
+    finally:
+        sweep_api.shutdown_sweep_pool()
+    events = [json.loads(line) for line in response.text.splitlines() if line]
+
+    assert events[-1]["workers"] == 1
+    assert events[-1]["table"]["status"] == ["ok", "ok"]